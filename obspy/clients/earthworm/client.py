@@ -14,10 +14,12 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA @UnusedWildImport
 
+import threading
 from fnmatch import fnmatch
 
 from obspy import Stream, UTCDateTime
-from .waveserver import get_menu, read_wave_server_v
+from .waveserver import (WaveServerConnection, get_menu,
+                         read_wave_server_v_bulk)
 
 
 class Client(object):
@@ -34,8 +36,14 @@ class Client(object):
     :type debug: bool, optional
     :param debug: Enables verbose output of the connection handling (default is
         ``False``).
+    :type persistent: bool, optional
+    :param persistent: Keep the connections to the server open and reuse
+        them for later requests (default is ``True``). Connections closed by
+        the server in the meantime are opened again. Use :meth:`close` or
+        the client as a context manager to close them.
     """
-    def __init__(self, host, port, timeout=None, debug=False):
+    def __init__(self, host, port, timeout=None, debug=False,
+                 persistent=True):
         """
         Initializes a Earthworm Wave Server client.
 
@@ -45,6 +53,39 @@ class Client(object):
         self.port = port
         self.timeout = timeout
         self.debug = debug
+        self.persistent = persistent
+        # idle connections
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close all idle connections to the server.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    def _get_connection(self):
+        with self._lock:
+            if self._connections:
+                return self._connections.pop()
+        return WaveServerConnection(self.host, self.port,
+                                    timeout=self.timeout)
+
+    def _release_connection(self, connection):
+        if not self.persistent or connection.sock is None:
+            connection.close()
+            return
+        with self._lock:
+            self._connections.append(connection)
 
     def get_waveforms(self, network, station, location, channel, starttime,
                       endtime, cleanup=True):
@@ -95,29 +136,102 @@ class Client(object):
             st = client.get_waveforms('AV', 'ACH', '', 'EH*', dt, dt + 10)
             st.plot()
         """
-        # replace wildcards in last char of channel and fetch all 3 components
-        if channel[-1] in "?*":
-            st = Stream()
-            for comp in ("Z", "N", "E"):
-                channel_new = channel[:-1] + comp
-                st += self.get_waveforms(network, station, location,
-                                         channel_new, starttime, endtime,
-                                         cleanup=cleanup)
-            return st
-        if location == '':
-            location = '--'
-        scnl = (station, channel, network, location)
-        # fetch waveform
-        tbl = read_wave_server_v(self.host, self.port, scnl, starttime,
-                                 endtime, timeout=self.timeout,
-                                 cleanup=cleanup)
-        # create new stream
+        return self.get_waveforms_bulk(
+            [(network, station, location, channel, starttime, endtime)],
+            cleanup=cleanup)
+
+    def get_waveforms_bulk(self, bulk, cleanup=True, max_threads=1,
+                           pipeline=10):
+        """
+        Retrieves waveform data for many channels from Earthworm Wave Server
+        and returns an ObsPy Stream object.
+
+        The requests are pipelined, i.e. up to ``pipeline`` requests are sent
+        over a connection before the responses are read. With
+        ``max_threads`` larger than one, the requests are distributed over
+        as many connections that are served in parallel.
+
+        :type bulk: list
+        :param bulk: List of ``(network, station, location, channel,
+            starttime, endtime)`` tuples, see :meth:`get_waveforms`.
+        :type cleanup: bool
+        :param cleanup: Specifies whether perfectly aligned traces should be
+            merged or not. See :meth:`obspy.core.stream.Stream.merge` for
+            ``method=-1``.
+        :type max_threads: int
+        :param max_threads: Number of connections used in parallel.
+        :type pipeline: int
+        :param pipeline: Number of requests sent over a connection before
+            waiting for responses.
+        :return: ObsPy :class:`~obspy.core.stream.Stream` object.
+
+        .. rubric:: Example
+
+        >>> from obspy.clients.earthworm import Client
+        >>> client = Client("pubavo1.wr.usgs.gov", 16022)
+        >>> dt = UTCDateTime() - 2000  # now - 2000 seconds
+        >>> bulk = [('AV', 'ACH', '', 'EH*', dt, dt + 10),
+        ...         ('AV', 'AKV', '', 'BHZ', dt, dt + 10)]
+        >>> st = client.get_waveforms_bulk(bulk, max_threads=2)
+        >>> st.plot()  # doctest: +SKIP
+        """
+        requests = []
+        for network, station, location, channel, starttime, endtime in bulk:
+            if location == '':
+                location = '--'
+            # replace wildcards in last char of channel and fetch all 3
+            # components
+            if channel[-1] in "?*":
+                channels = [channel[:-1] + comp for comp in ("Z", "N", "E")]
+            else:
+                channels = [channel]
+            for channel_new in channels:
+                scnl = (station, channel_new, network, location)
+                requests.append((scnl, starttime, endtime))
+
+        results = [[] for _ in requests]
+        errors = []
+        max_threads = max(1, min(max_threads, len(requests)))
+
+        def _worker(indices):
+            connection = self._get_connection()
+            try:
+                tbls = read_wave_server_v_bulk(
+                    connection, [requests[i] for i in indices],
+                    cleanup=cleanup, pipeline=pipeline)
+            except Exception as e:
+                connection.close()
+                errors.append(e)
+                return
+            finally:
+                self._release_connection(connection)
+            for i, tbl in zip(indices, tbls):
+                results[i] = tbl
+
+        shares = [list(range(i, len(requests), max_threads))
+                  for i in range(max_threads)]
+        if max_threads == 1:
+            _worker(shares[0])
+        else:
+            threads = [threading.Thread(target=_worker, args=(share,))
+                       for share in shares]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+
         st = Stream()
-        for tb in tbl:
-            st.append(tb.get_obspy_trace())
-        if cleanup:
-            st._cleanup()
-        st.trim(starttime, endtime)
+        for (_, starttime, endtime), tbl in zip(requests, results):
+            # create new stream
+            st_request = Stream()
+            for tb in tbl:
+                st_request.append(tb.get_obspy_trace())
+            if cleanup:
+                st_request._cleanup()
+            st_request.trim(starttime, endtime)
+            st += st_request
         return st
 
     def save_waveforms(self, filename, network, station, location, channel,
@@ -221,7 +335,12 @@ class Client(object):
         pattern = ".".join((network, station, location, channel))
         # get overview of all available data, winston wave servers can not
         # restrict the query via network, station etc. so we do that manually
-        response = get_menu(self.host, self.port, timeout=self.timeout)
+        connection = self._get_connection()
+        try:
+            response = get_menu(self.host, self.port, timeout=self.timeout,
+                                connection=connection)
+        finally:
+            self._release_connection(connection)
         # reorder items and convert time info to UTCDateTime
         response = [(x[3], x[1], x[4], x[2], UTCDateTime(x[5]),
                      UTCDateTime(x[6])) for x in response]
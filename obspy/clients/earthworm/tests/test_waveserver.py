@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+The obspy.clients.earthworm.waveserver test suite.
+
+Uses a local wave server, so it does not require network access.
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import PY2, native_str
+
+import struct
+import threading
+import unittest
+
+import numpy as np
+
+from obspy import UTCDateTime
+from obspy.core.util.misc import CatchOutput
+from obspy.clients.earthworm import Client
+from obspy.clients.earthworm.waveserver import (TraceBuf2,
+                                                WaveServerConnection,
+                                                get_menu, get_numpy_type,
+                                                parse_tracebufs,
+                                                read_wave_server_v,
+                                                read_wave_server_v_bulk)
+
+if PY2:
+    from SocketServer import StreamRequestHandler, ThreadingTCPServer
+else:
+    from socketserver import StreamRequestHandler, ThreadingTCPServer
+
+
+T0 = UTCDateTime(2018, 1, 1)
+CHANNELS = [('STA%d' % i, 'EH' + cha, 'XX', '--')
+            for i in range(10) for cha in 'ZNE']
+
+
+def _make_tracebuf(scnl, starttime, data, sampling_rate=100.0,
+                   datatype='i4'):
+    """
+    Create a TraceBuf2 packet, by default with little endian int32 data.
+    """
+    sta, cha, net, loc = [native_str(x).encode() for x in scnl]
+    endtime = starttime + (len(data) - 1) / sampling_rate
+    endian = '>' if datatype[0] in 'ts' else '<'
+    head = struct.pack(native_str(endian + '2i3d7s9s4s3s2s3s2s2s'), 1,
+                       len(data), starttime, endtime, sampling_rate, sta,
+                       net, cha, loc, b'20', datatype.encode(), b'\x00\x00',
+                       b'\x00\x00')
+    return head + data.astype(get_numpy_type(datatype.encode())).tobytes()
+
+
+def _get_data(scnl, start, end, npts=100):
+    """
+    Tracebufs of 1 second of 100 Hz data covering the requested interval,
+    sample values are the number of samples since T0 plus an offset for
+    each channel.
+    """
+    offset = CHANNELS.index(scnl) * 10 ** 6
+    first = int((start - T0) // 1)
+    last = int((end - T0) // 1)
+    packets = []
+    for i in range(first, last + 1):
+        data = np.arange(i * npts, (i + 1) * npts) + offset
+        packets.append(_make_tracebuf(scnl, float(T0 + i), data))
+    return b''.join(packets)
+
+
+class _Handler(StreamRequestHandler):
+
+    def handle(self):
+        self.server.connections.append(self.client_address)
+        num_responses = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            self.server.requests.append((self.client_address, line))
+            tokens = line.decode().split()
+            if tokens[0] == 'MENU:':
+                menu = ' '.join(
+                    '1 %s %s %s %s %f %f s4' % (sta, cha, net, loc,
+                                                float(T0), float(T0 + 3600))
+                    for sta, cha, net, loc in CHANNELS)
+                self.wfile.write(('%s %s\n' % (tokens[1], menu)).encode())
+            elif tokens[0] == 'GETSCNLRAW:':
+                scnl = tuple(tokens[2:6])
+                start, end = float(tokens[6]), float(tokens[7])
+                head = '%s 1 %s' % (tokens[1], ' '.join(scnl))
+                if scnl not in CHANNELS:
+                    self.wfile.write(('%s FN\n' % head).encode())
+                else:
+                    data = _get_data(scnl, UTCDateTime(start),
+                                     UTCDateTime(end))
+                    self.wfile.write(('%s F i4 %f %f %d\n' % (
+                        head, start, end, len(data))).encode())
+                    self.wfile.write(data)
+            num_responses += 1
+            if num_responses == self.server.max_responses:
+                break
+
+
+class _Server(ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class WaveServerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.connections = []
+        self.server.requests = []
+        self.server.max_responses = None
+        self.port = self.server.server_address[1]
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.client = Client('127.0.0.1', self.port, timeout=10)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _check_trace(self, tr, scnl, start, end):
+        sta, cha, net, _ = scnl
+        self.assertEqual(tr.id, '%s.%s..%s' % (net, sta, cha))
+        self.assertEqual(tr.stats.starttime, start)
+        self.assertEqual(tr.stats.endtime, end)
+        offset = CHANNELS.index(scnl) * 10 ** 6
+        expected = np.arange(int(round((start - T0) * 100)),
+                             int(round((end - T0) * 100)) + 1) + offset
+        np.testing.assert_array_equal(tr.data, expected)
+
+    def test_connection_buffering(self):
+        connection = WaveServerConnection('127.0.0.1', self.port, timeout=10)
+        scnl = CHANNELS[0]
+        # two requests are sent before the first response is read
+        tbl_1, tbl_2 = read_wave_server_v_bulk(
+            connection, [(scnl, T0, T0 + 2), (scnl, T0 + 5, T0 + 6)])
+        self.assertEqual([len(tb.data) for tb in tbl_1], [100] * 3)
+        self.assertEqual([len(tb.data) for tb in tbl_2], [100] * 2)
+        self.assertEqual(tbl_2[0].start, T0 + 5)
+        tbl = read_wave_server_v('127.0.0.1', self.port, scnl, T0, T0 + 2,
+                                 cleanup=True, connection=connection)
+        self.assertEqual(len(tbl), 1)
+        self.assertEqual(len(tbl[0].data), 300)
+        menu = get_menu('127.0.0.1', self.port, connection=connection)
+        self.assertEqual(len(menu), len(CHANNELS))
+        self.assertEqual(menu[0][1:5], ('STA0', 'EHZ', 'XX', '--'))
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertEqual(connection.responses, 4)
+        connection.close()
+
+    def test_connections_are_reused(self):
+        for i in range(3):
+            st = self.client.get_waveforms('XX', 'STA1', '', 'EH?',
+                                           T0 + 10, T0 + 20)
+            self.assertEqual(len(st), 3)
+            for tr, cha in zip(st, 'ZNE'):
+                self._check_trace(tr, ('STA1', 'EH' + cha, 'XX', '--'),
+                                  T0 + 10, T0 + 20)
+        self.assertEqual(len(self.client.get_availability(station='STA1')),
+                         3)
+        self.assertEqual(len(self.server.requests), 10)
+        self.assertEqual(len(self.server.connections), 1)
+
+        client = Client('127.0.0.1', self.port, persistent=False)
+        client.get_waveforms('XX', 'STA1', '', 'EHZ', T0, T0 + 1)
+        client.get_waveforms('XX', 'STA1', '', 'EHZ', T0, T0 + 1)
+        self.assertEqual(len(self.server.connections), 3)
+
+    def test_reconnect(self):
+        """
+        Connections closed by the server are opened again.
+        """
+        self.server.max_responses = 2
+        bulk = [('XX', 'STA2', '', 'EH*', T0 + 1.5, T0 + 3.5),
+                ('XX', 'STA3', '', 'EHZ', T0 + 1.5, T0 + 3.5)]
+        for i in range(3):
+            st = self.client.get_waveforms_bulk(bulk, pipeline=1)
+            self.assertEqual(len(st), 4)
+            for tr in st:
+                scnl = (tr.stats.station, tr.stats.channel, 'XX', '--')
+                self._check_trace(tr, scnl, T0 + 1.5, T0 + 3.5)
+        self.assertEqual(len(self.server.connections), 6)
+
+    def test_get_waveforms_bulk(self):
+        start = T0 + 100
+        bulk = [('XX', sta, '', cha, start, start + 30)
+                for sta, cha, _, _ in CHANNELS]
+        bulk.append(('XX', 'UNKNOWN', '', 'EHZ', start, start + 30))
+        with CatchOutput() as out:
+            st = self.client.get_waveforms_bulk(bulk, pipeline=5)
+        self.assertIn('requested tank not found', out.stderr)
+        self.assertEqual(len(st), len(CHANNELS))
+        for tr, scnl in zip(st, CHANNELS):
+            self._check_trace(tr, scnl, start, start + 30)
+        self.assertEqual(len(self.server.connections), 1)
+
+        # the requests are distributed over several connections
+        with CatchOutput():
+            st_threads = self.client.get_waveforms_bulk(bulk, max_threads=4)
+        self.assertEqual(st_threads, st)
+        self.assertLessEqual(len(self.server.connections), 4)
+        self.assertEqual(len(self.client._connections),
+                         len(self.server.connections))
+
+
+class ParseTracebufsTestCase(unittest.TestCase):
+
+    def _parse_single(self, dat):
+        """
+        Parse tracebufs one by one.
+        """
+        tbl = []
+        p = 0
+        while p < len(dat):
+            tb = TraceBuf2()
+            nbytes = tb.read_tb2(dat[p:])
+            if not nbytes:
+                break
+            tbl.append(tb)
+            p += nbytes
+        return tbl
+
+    def _check(self, dat):
+        expected = self._parse_single(dat)
+        tbl = parse_tracebufs(dat)
+        self.assertEqual(len(tbl), len(expected))
+        for tb, tb_expected in zip(tbl, expected):
+            tr = tb.get_obspy_trace()
+            tr_expected = tb_expected.get_obspy_trace()
+            self.assertEqual(tr.stats, tr_expected.stats)
+            self.assertEqual(tr.data.dtype, tr_expected.data.dtype)
+            np.testing.assert_array_equal(tr.data, tr_expected.data)
+            self.assertEqual(tb.end, tb_expected.end)
+        return tbl
+
+    def test_parse(self):
+        scnl = CHANNELS[0]
+        # equally sized tracebufs
+        dat = _get_data(scnl, T0, T0 + 9.5)
+        self._check(dat)
+        tbl = parse_tracebufs(dat, cleanup=True)
+        self.assertEqual(len(tbl), 1)
+        np.testing.assert_array_equal(tbl[0].data, np.arange(1000))
+        self.assertEqual(tbl[0].start, T0)
+        self.assertEqual(tbl[0].end, T0 + 9.99)
+        self.assertTrue(tbl[0].data.flags.writeable)
+        # truncated data
+        self.assertEqual(len(self._check(dat[:-10])), 9)
+        self.assertEqual(len(parse_tracebufs(dat[:-10], cleanup=True)), 1)
+        self.assertEqual(parse_tracebufs(dat[:64]), [])
+
+    def test_parse_mixed(self):
+        """
+        Tracebufs with different sizes, data types and gaps.
+        """
+        scnl = CHANNELS[0]
+        dat = b''.join([
+            _make_tracebuf(scnl, float(T0), np.arange(100)),
+            _make_tracebuf(scnl, float(T0 + 1), np.arange(100, 150),
+                           datatype='s4'),
+            _make_tracebuf(scnl, float(T0 + 1.5), np.arange(150, 200),
+                           datatype='s4'),
+            # gap
+            _make_tracebuf(scnl, float(T0 + 3), np.arange(300, 400),
+                           datatype='s4'),
+            _make_tracebuf(scnl, float(T0 + 4), np.arange(400, 500) / 2.0,
+                           datatype='t8'),
+            _make_tracebuf(CHANNELS[1], float(T0 + 5), np.arange(500, 600),
+                           datatype='t8')])
+        self._check(dat)
+        tbl = parse_tracebufs(dat, cleanup=True)
+        self.assertEqual([(tb.start, tb.end, tb.ndata, tb.data.dtype.name)
+                          for tb in tbl],
+                         [(T0, T0 + 0.99, 100, 'int32'),
+                          (T0 + 1, T0 + 1.99, 100, 'int32'),
+                          (T0 + 3, T0 + 3.99, 100, 'int32'),
+                          (T0 + 4, T0 + 4.99, 100, 'float64'),
+                          (T0 + 5, T0 + 5.99, 100, 'float64')])
+        np.testing.assert_array_equal(tbl[1].data, np.arange(100, 200))
+        self.assertEqual(tbl[-1].get_obspy_trace().id, 'XX.STA0..EHN')
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(WaveServerTestCase, 'test'))
+    suite.addTest(unittest.makeSuite(ParseTracebufsTestCase, 'test'))
+    return suite
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -16,6 +16,7 @@ from future.utils import native_str
 import socket
 import struct
 import sys
+from collections import deque
 
 import numpy as np
 
@@ -42,6 +43,47 @@ DATATYPE_KEY = {
     b'i4': '<i4', b'i2': '<i2'
 }
 
+# maximum number of bytes received from a socket at once
+RECV_SIZE = 1024 ** 2
+
+
+# header of a TraceBuf2 packet, the byte order depends on the data type
+TRACEBUF2_HEADER = np.dtype([
+    (native_str('pinno'), native_str('i4')),
+    (native_str('nsamp'), native_str('i4')),
+    (native_str('starttime'), native_str('f8')),
+    (native_str('endtime'), native_str('f8')),
+    (native_str('samprate'), native_str('f8')),
+    (native_str('sta'), native_str('S7')),
+    (native_str('net'), native_str('S9')),
+    (native_str('chan'), native_str('S4')),
+    (native_str('loc'), native_str('S3')),
+    (native_str('version'), native_str('S2')),
+    (native_str('datatype'), native_str('S3')),
+    (native_str('quality'), native_str('S2')),
+    (native_str('pad'), native_str('S2'))])
+
+
+def _get_endian(tpstr):
+    """
+    Byte order of a TraceBuf2 type string.
+    """
+    if tpstr[0:1] in b'ts':
+        return '>'
+    elif tpstr[0:1] in b'if':
+        return '<'
+    raise ValueError('unknown TraceBuf2 data type: %r' % tpstr)
+
+
+def _get_tracebuf_nbytes(dat, p):
+    """
+    Number of data bytes of the tracebuf with the header at offset p.
+    """
+    tpstr = dat[p + 57:p + 59]
+    nsamp = struct.unpack(native_str(_get_endian(tpstr) + 'i'),
+                          dat[p + 4:p + 8])[0]
+    return nsamp * get_numpy_type(tpstr).itemsize
+
 
 def get_numpy_type(tpstr):
     """
@@ -204,9 +246,136 @@ def get_sock_bytes(sock, nbytes, timeout=None):
         return None
 
 
-def get_menu(server, port, scnl=None, timeout=None):
+class WaveServerConnection(object):
+    """
+    Persistent connection to a wave server with buffered reads.
+
+    Wave servers keep connections open between requests, so any number of
+    requests can be sent over one connection, also without waiting for the
+    responses of the previous requests. The connection is opened on the
+    first request and opened again if the server closed it in the
+    meantime.
+
+    :type server: str
+    :param server: Host name of the wave server.
+    :type port: int
+    :param port: Port of the wave server.
+    :type timeout: float
+    :param timeout: Seconds before a connection timeout is raised (default
+        is ``None``).
+    """
+    def __init__(self, server, port, timeout=None):
+        self.server = server
+        self.port = port
+        self.timeout = timeout
+        self.sock = None
+        self._buffer = b''
+        # number of complete responses received since connecting
+        self.responses = 0
+
+    def connect(self):
+        """
+        (Re)open the connection.
+        """
+        self.close()
+        self.sock = socket.create_connection((self.server, self.port),
+                                             self.timeout)
+
+    def close(self):
+        """
+        Close the connection, unread data is discarded.
+        """
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except socket.error:
+                pass
+        self.sock = None
+        self._buffer = b''
+        self.responses = 0
+
+    def send(self, req_str):
+        """
+        Send a request, opening the connection if necessary.
+        """
+        if self.sock is None:
+            self.connect()
+        if not req_str.endswith(b'\n'):
+            req_str += b'\n'
+        self.sock.sendall(req_str)
+
+    def _recv(self, nbytes=RECV_SIZE):
+        data = self.sock.recv(nbytes)
+        if not data:
+            raise socket.error('connection closed by wave server')
+        return data
+
+    def readline(self):
+        """
+        Read one newline terminated line.
+        """
+        start = 0
+        while True:
+            pos = self._buffer.find(b'\n', start)
+            if pos >= 0:
+                line = self._buffer[:pos + 1]
+                self._buffer = self._buffer[pos + 1:]
+                return line
+            start = len(self._buffer)
+            self._buffer += self._recv()
+
+    def read(self, nbytes):
+        """
+        Read exactly nbytes bytes.
+        """
+        chunks = [self._buffer[:nbytes]]
+        received = len(chunks[0])
+        self._buffer = self._buffer[nbytes:]
+        while received < nbytes:
+            chunks.append(self._recv(min(nbytes - received, RECV_SIZE)))
+            received += len(chunks[-1])
+        return b''.join(chunks)
+
+
+def _parse_menu(r, rid):
+    """
+    Parse the response line of a MENU or MENUSCNL request.
+    """
+    # XXX: we got here from bytes to utf-8 to keep the remaining code
+    # intact
+    tokens = str(r.decode()).split()
+    if tokens[0] == rid:
+        tokens = tokens[1:]
+    flag = tokens[-1]
+    if flag in ['FN', 'FC', 'FU']:
+        msg = 'request returned %s - %s'
+        print(msg % (flag, RETURNFLAG_KEY[flag]), file=sys.stderr)
+        return []
+    if tokens[7].encode() in DATATYPE_KEY:
+        elen = 8  # length of return entry if location included
+    elif tokens[6].encode() in DATATYPE_KEY:
+        elen = 7  # length of return entry if location omitted
+    else:
+        print('no type token found in get_menu', file=sys.stderr)
+        return []
+    outlist = []
+    for p in range(0, len(tokens), elen):
+        l = tokens[p:p + elen]  # NOQA
+        if elen == 8:
+            outlist.append((int(l[0]), l[1], l[2], l[3], l[4],
+                            float(l[5]), float(l[6]), l[7]))
+        else:
+            outlist.append((int(l[0]), l[1], l[2], l[3], '--',
+                            float(l[4]), float(l[5]), l[6]))
+    return outlist
+
+
+def get_menu(server, port, scnl=None, timeout=None, connection=None):
     """
     Return list of tanks on server
+
+    If an open :class:`WaveServerConnection` is given, it is used instead of
+    a new connection to server and port.
     """
     rid = 'get_menu'
     if scnl:
@@ -216,116 +385,230 @@ def get_menu(server, port, scnl=None, timeout=None):
     else:
         # added SCNL not documented but required
         getstr = 'MENU: %s SCNL\n' % rid
-    sock = send_sock_req(server, port, getstr.encode('ascii', 'strict'),
-                         timeout=timeout)
-    r = get_sock_char_line(sock, timeout=timeout)
-    sock.close()
+    getstr = getstr.encode('ascii', 'strict')
+    close = connection is None
+    if close:
+        connection = WaveServerConnection(server, port, timeout=timeout)
+    try:
+        for attempt in range(2):
+            # reused connections might have been closed by the server
+            reused = connection.responses > 0
+            try:
+                connection.send(getstr)
+                r = connection.readline()
+                connection.responses += 1
+                break
+            except socket.timeout:
+                connection.close()
+                print('socket timeout in get_menu()', file=sys.stderr)
+                return []
+            except socket.error:
+                connection.close()
+                if not reused or attempt:
+                    raise
+    finally:
+        if close:
+            connection.close()
     if r:
-        # XXX: we got here from bytes to utf-8 to keep the remaining code
-        # intact
-        tokens = str(r.decode()).split()
-        if tokens[0] == rid:
-            tokens = tokens[1:]
-        flag = tokens[-1]
-        if flag in ['FN', 'FC', 'FU']:
-            msg = 'request returned %s - %s'
-            print(msg % (flag, RETURNFLAG_KEY[flag]), file=sys.stderr)
-            return []
-        if tokens[7].encode() in DATATYPE_KEY:
-            elen = 8  # length of return entry if location included
-        elif tokens[6].encode() in DATATYPE_KEY:
-            elen = 7  # length of return entry if location omitted
-        else:
-            print('no type token found in get_menu', file=sys.stderr)
-            return []
-        outlist = []
-        for p in range(0, len(tokens), elen):
-            l = tokens[p:p + elen]  # NOQA
-            if elen == 8:
-                outlist.append((int(l[0]), l[1], l[2], l[3], l[4],
-                                float(l[5]), float(l[6]), l[7]))
-            else:
-                outlist.append((int(l[0]), l[1], l[2], l[3], '--',
-                                float(l[4]), float(l[5]), l[6]))
-        return outlist
+        return _parse_menu(r, rid)
     return []
 
 
-def read_wave_server_v(server, port, scnl, start, end, timeout=None,
-                       cleanup=False):
+def _read_scnlraw_response(connection, rid, cleanup):
     """
-    Reads data for specified time interval and scnl on specified waveserverV.
+    Read the response of a GETSCNLRAW request from a connection.
 
     Returns list of TraceBuf2 objects
     """
-    rid = 'rwserv'
-    scnlstr = '%s %s %s %s' % scnl
-    reqstr = 'GETSCNLRAW: %s %s %f %f\n' % (rid, scnlstr, start, end)
-    sock = send_sock_req(server, port, reqstr.encode('ascii', 'strict'),
-                         timeout=timeout)
-    r = get_sock_char_line(sock, timeout=timeout)
-    if not r:
-        return []
+    r = connection.readline()
     tokens = str(r.decode()).split()
+    if not tokens or tokens[0] != rid:
+        # the position in the response stream is lost
+        raise socket.error('unexpected response from wave server: %r' % r)
     flag = tokens[6]
     if flag != 'F':
+        connection.responses += 1
         msg = 'read_wave_server_v returned flag %s - %s'
         print(msg % (flag, RETURNFLAG_KEY[flag]), file=sys.stderr)
         return []
     nbytes = int(tokens[-1])
-    dat = get_sock_bytes(sock, nbytes, timeout=timeout)
-    sock.close()
+    dat = connection.read(nbytes)
+    connection.responses += 1
+    return parse_tracebufs(dat, cleanup=cleanup)
 
-    tbl = []
-    bytesread = 1
-    p = 0
-    dat_len = len(dat)
-    current_tb = None
-    period = None
-    bufs = None
 
-    while bytesread and p < dat_len:
-        if not dat_len > p + 64:
-            break  # no tracebufs left
+def read_wave_server_v_bulk(connection, requests, cleanup=False,
+                            pipeline=10):
+    """
+    Reads data for many scnls and time intervals over one connection.
+
+    Up to ``pipeline`` requests are sent to the server before waiting for
+    their responses, so the round trip time to the server is not paid for
+    every request. If a connection that has been used before turns out to
+    be closed by the server, it is opened again.
+
+    :type connection: :class:`WaveServerConnection`
+    :param connection: Connection to the wave server.
+    :type requests: list
+    :param requests: List of ``(scnl, start, end)`` tuples.
+    :type cleanup: bool
+    :param cleanup: Merge perfectly aligned tracebufs.
+    :type pipeline: int
+    :param pipeline: Maximum number of requests waiting for a response.
+
+    Returns list of lists of TraceBuf2 objects, one per request.
+    """
+    results = [[] for _ in requests]
+    todo = deque(range(len(requests)))
+    pending = deque()
+    while todo or pending:
+        reused = connection.responses > 0
+        try:
+            while todo and len(pending) < max(pipeline, 1):
+                i = todo[0]
+                scnl, start, end = requests[i]
+                reqstr = 'GETSCNLRAW: rwserv%d %s %f %f\n' % (
+                    i, '%s %s %s %s' % tuple(scnl), start, end)
+                connection.send(reqstr.encode('ascii', 'strict'))
+                pending.append(todo.popleft())
+            i = pending[0]
+            results[i] = _read_scnlraw_response(connection, 'rwserv%d' % i,
+                                                cleanup)
+            pending.popleft()
+        except socket.timeout:
+            connection.close()
+            print('socket timeout in read_wave_server_v()', file=sys.stderr)
+            break
+        except socket.error:
+            connection.close()
+            if not reused:
+                raise
+            # send the unanswered requests again over a new connection
+            todo.extendleft(reversed(pending))
+            pending.clear()
+    return results
 
-        new_tb = TraceBuf2()
-        new_tb.parse_header(dat[p:p + 64])
-        p += 64
-        nbytes = new_tb.ndata * new_tb.inputType.itemsize
 
-        if dat_len < p + nbytes:
-            break   # not enough array to hold data specified in header
+def read_wave_server_v(server, port, scnl, start, end, timeout=None,
+                       cleanup=False, connection=None):
+    """
+    Reads data for specified time interval and scnl on specified waveserverV.
 
-        if current_tb is not None:
-            if cleanup and new_tb.start - current_tb.end == period:
-                buf = dat[p:p + nbytes]
-                bufs.append(from_buffer(buf, current_tb.inputType))
-                current_tb.end = new_tb.end
+    If an open :class:`WaveServerConnection` is given, it is used instead of
+    a new connection to server and port.
 
-            else:
-                if len(bufs) > 1:
-                    current_tb.data = np.concatenate(bufs)
-                else:
-                    current_tb.data = bufs[0]
+    Returns list of TraceBuf2 objects
+    """
+    close = connection is None
+    if close:
+        connection = WaveServerConnection(server, port, timeout=timeout)
+    try:
+        return read_wave_server_v_bulk(connection, [(scnl, start, end)],
+                                       cleanup=cleanup, pipeline=1)[0]
+    finally:
+        if close:
+            connection.close()
 
-                current_tb.ndata = len(current_tb.data)
-                current_tb = None
 
-        if current_tb is None:
-            current_tb = new_tb
-            tbl.append(current_tb)
-            period = 1 / current_tb.rate
-            bufs = [from_buffer(dat[p:p + nbytes], current_tb.inputType)]
+def _parse_tracebuf_headers(dat):
+    """
+    Locate and parse the headers of all tracebufs in a buffer.
 
-        p += nbytes
+    Returns a structured array with the headers in native byte order and
+    the offsets of the data of the tracebufs. If all tracebufs have the same
+    data type and number of samples, the returned offsets are ``None`` and
+    the headers are parsed from a strided view of the buffer without
+    looping over the tracebufs.
+    """
+    dat_len = len(dat)
+    if not dat_len > 64:
+        return np.empty(0, dtype=TRACEBUF2_HEADER), []
+    size = 64 + _get_tracebuf_nbytes(dat, 0)
+    if dat_len % size == 0:
+        endian = _get_endian(dat[57:59])
+        headers = np.ndarray((dat_len // size, ), buffer=dat, strides=(size, ),
+                             dtype=TRACEBUF2_HEADER.newbyteorder(endian))
+        if (headers['datatype'] == headers['datatype'][0]).all() and \
+                (headers['nsamp'] == headers['nsamp'][0]).all():
+            return headers.astype(TRACEBUF2_HEADER), None
+
+    offsets = []
+    p = 0
+    while dat_len > p + 64:
+        nbytes = _get_tracebuf_nbytes(dat, p)
+        if dat_len < p + 64 + nbytes:
+            break   # not enough array to hold data specified in header
+        offsets.append(p)
+        p += 64 + nbytes
+    raw = b''.join([dat[p:p + 64] for p in offsets])
+    headers = np.frombuffer(raw, dtype=TRACEBUF2_HEADER.newbyteorder('<'))
+    headers = headers.astype(TRACEBUF2_HEADER)
+    big = np.array([dtype[0:1] in b'ts' for dtype in headers['datatype']],
+                   dtype=np.bool_)
+    if big.any():
+        headers[big] = np.frombuffer(
+            raw, dtype=TRACEBUF2_HEADER.newbyteorder('>'))[big]
+    return headers, [p + 64 for p in offsets]
+
+
+def parse_tracebufs(dat, cleanup=False):
+    """
+    Parse the tracebufs of a GETSCNLRAW response.
+
+    All headers are parsed at once into a structured array. With
+    ``cleanup``, consecutive tracebufs of the same channel that are aligned
+    to within 1% of the sampling interval are merged and returned as a
+    single TraceBuf2 object, so their data is only copied once.
+
+    Returns list of TraceBuf2 objects
+    """
+    headers, offsets = _parse_tracebuf_headers(dat)
+    num = len(headers)
+    if not num:
+        return []
 
-    if len(bufs) > 1:
-        current_tb.data = np.concatenate(bufs)
+    if cleanup and num > 1:
+        period = 1.0 / headers['samprate'][:-1]
+        gap = headers['starttime'][1:] - headers['endtime'][:-1]
+        same = np.abs(gap - period) <= 1e-2 * period
+        for key in ('sta', 'net', 'chan', 'loc', 'datatype', 'samprate'):
+            same &= headers[key][1:] == headers[key][:-1]
+        breaks = np.nonzero(~same)[0] + 1
     else:
-        current_tb.data = bufs[0]
+        breaks = np.arange(1, num)
+    bounds = [0] + breaks.tolist() + [num]
 
-    current_tb.ndata = len(current_tb.data)
+    if offsets is None:
+        # all tracebufs have the same size, view the data as a 2D array
+        tp = get_numpy_type(headers['datatype'][0][:2])
+        npts = int(headers['nsamp'][0])
+        samples = np.ndarray((num, npts), dtype=tp, buffer=dat, offset=64,
+                             strides=(64 + npts * tp.itemsize, tp.itemsize))
 
+    tbl = []
+    for i, j in zip(bounds[:-1], bounds[1:]):
+        header = headers[i]
+        tb = TraceBuf2()
+        tb.inputType = get_numpy_type(header['datatype'][:2])
+        if offsets is None:
+            tb.data = samples[i:j].flatten()
+        else:
+            bufs = [from_buffer(
+                dat[p:p + int(n) * tb.inputType.itemsize], tb.inputType)
+                for p, n in zip(offsets[i:j], headers['nsamp'][i:j])]
+            tb.data = bufs[0] if len(bufs) == 1 else np.concatenate(bufs)
+        tb.ndata = len(tb.data)
+        tb.pinno = int(header['pinno'])
+        tb.rate = float(header['samprate'])
+        tb.sta = bytes(header['sta'])
+        tb.net = bytes(header['net'])
+        tb.chan = bytes(header['chan'])
+        tb.loc = bytes(header['loc'])
+        tb.version = bytes(header['version'])
+        tb.qual = bytes(header['quality'])
+        tb.start = UTCDateTime(float(header['starttime']))
+        tb.end = UTCDateTime(float(headers['endtime'][j - 1]))
+        tbl.append(tb)
     return tbl
 
 
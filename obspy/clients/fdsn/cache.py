@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk cache for responses of FDSN web services.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import PY2
+
+import email.utils
+import glob
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+
+if PY2:
+    from urllib import urlencode
+    from urlparse import parse_qsl, urlsplit, urlunsplit
+else:
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+class HTTPCache(object):
+    """
+    Size bounded on-disk cache for HTTP responses.
+
+    Responses are keyed by the normalized URL (query parameters sorted) and
+    the POST payload. The time a response is considered fresh is taken from
+    the ``Cache-Control`` (``max-age``, ``no-store``, ``no-cache``) or
+    ``Expires`` headers of the response, ``default_max_age`` is used if the
+    server does not send any of them. Stale responses with an ``ETag`` or
+    ``Last-Modified`` header are revalidated with a conditional request.
+    If the total size of the cached responses exceeds ``max_size_in_mb``,
+    the least recently used responses are removed.
+
+    >>> from obspy.clients.fdsn import Client
+    >>> from obspy.clients.fdsn.cache import HTTPCache
+    >>> cache = HTTPCache("/tmp/fdsn_cache",
+    ...                   max_size_in_mb=100)  # doctest: +SKIP
+    >>> client = Client("IRIS", cache=cache)  # doctest: +SKIP
+
+    Once the responses are cached, the client can also be used without
+    network access:
+
+    >>> cache = HTTPCache("/tmp/fdsn_cache", offline=True)  # doctest: +SKIP
+    >>> client = Client("IRIS", cache=cache)  # doctest: +SKIP
+
+    :type directory: str
+    :param directory: Directory to store the responses in. Can be shared by
+        many clients and processes.
+    :type max_size_in_mb: float
+    :param max_size_in_mb: Maximum total size of the cached responses.
+    :type default_max_age: float
+    :param default_max_age: Time in seconds responses without caching
+        headers are considered fresh.
+    :type offline: bool
+    :param offline: Only serve responses from the cache, regardless of their
+        age, and never send requests.
+    """
+    def __init__(self, directory, max_size_in_mb=500.0,
+                 default_max_age=86400.0, offline=False):
+        self.directory = directory
+        self.max_size_in_mb = max_size_in_mb
+        self.default_max_age = default_max_age
+        self.offline = offline
+        self._lock = threading.Lock()
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    def __str__(self):
+        return "HTTPCache(%r, max_size_in_mb=%s, offline=%s)" % (
+            self.directory, self.max_size_in_mb, self.offline)
+
+    @staticmethod
+    def normalize_url(url):
+        """
+        Normalize a URL so that equivalent requests share a cache entry.
+
+        >>> print(HTTPCache.normalize_url(
+        ...     "HTTP://Service.IRIS.edu/fdsnws/station/1/query?"
+        ...     "station=ANMO&network=IU"))
+        http://service.iris.edu/fdsnws/station/1/query?network=IU&station=ANMO
+        """
+        scheme, netloc, path, query, _ = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+        return urlunsplit((scheme.lower(), netloc.lower(), path, query, ""))
+
+    def _key(self, url, data=None):
+        key = hashlib.sha1(self.normalize_url(url).encode("utf-8"))
+        if data is not None:
+            key.update(b"\0")
+            key.update(data)
+        return key.hexdigest()
+
+    def _paths(self, key):
+        path = os.path.join(self.directory, key)
+        return path + ".json", path + ".body"
+
+    def lookup(self, url, data=None):
+        """
+        Look up the cached response of a request.
+
+        :rtype: dict
+        :return: Metadata of the cached response or ``None``. The keys
+            ``"fresh"`` (whether the response may be used without
+            revalidation), ``"etag"`` and ``"last_modified"`` are set.
+        """
+        meta_file, body_file = self._paths(self._key(url, data))
+        try:
+            with open(meta_file, "rt") as fh:
+                meta = json.load(fh)
+        except (IOError, OSError, ValueError):
+            return None
+        if not os.path.exists(body_file):
+            return None
+        meta["fresh"] = time.time() < meta["expires"]
+        return meta
+
+    def read(self, url, data=None):
+        """
+        Read the body of a cached response.
+
+        :rtype: bytes
+        """
+        _, body_file = self._paths(self._key(url, data))
+        with open(body_file, "rb") as fh:
+            body = fh.read()
+        # The modification time of the body is used for the least recently
+        # used eviction.
+        try:
+            os.utime(body_file, None)
+        except OSError:
+            pass
+        return body
+
+    def _get_expires(self, headers, now):
+        """
+        Time until which a response is fresh, ``None`` if it must not be
+        stored at all.
+        """
+        cache_control = (headers.get("Cache-Control") or "").lower()
+        if "no-store" in cache_control:
+            return None
+        if "no-cache" in cache_control:
+            return now
+        match = re.search(r"max-age\s*=\s*(\d+)", cache_control)
+        if match:
+            return now + int(match.group(1))
+        expires = headers.get("Expires")
+        if expires:
+            expires = email.utils.parsedate_tz(expires)
+            # Invalid dates mean the response is already expired.
+            return email.utils.mktime_tz(expires) if expires else now
+        return now + self.default_max_age
+
+    def store(self, url, body, headers, data=None):
+        """
+        Store a response.
+
+        :type url: str
+        :param url: URL of the request.
+        :type body: bytes
+        :param body: Body of the response.
+        :type headers: dict
+        :param headers: Headers of the response.
+        :type data: bytes
+        :param data: Payload of a POST request.
+        """
+        now = time.time()
+        expires = self._get_expires(headers, now)
+        if expires is None:
+            return
+        meta = {"url": url, "stored": now, "expires": expires,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified")}
+        meta_file, body_file = self._paths(self._key(url, data))
+        self._write_atomic(body_file, body)
+        self._write_atomic(meta_file, json.dumps(meta).encode("utf-8"))
+        self._evict()
+
+    def refresh(self, url, headers, data=None):
+        """
+        Update the expiry time of a cached response after a successful
+        revalidation.
+        """
+        meta = self.lookup(url, data)
+        if meta is None:
+            return
+        now = time.time()
+        expires = self._get_expires(headers, now)
+        meta.pop("fresh")
+        meta["expires"] = now if expires is None else expires
+        meta_file, _ = self._paths(self._key(url, data))
+        self._write_atomic(meta_file, json.dumps(meta).encode("utf-8"))
+
+    def _write_atomic(self, filename, content):
+        # Other clients might read the cache at the same time.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(content)
+        if os.path.exists(filename) and os.name == "nt":
+            os.remove(filename)
+        os.rename(tmp, filename)
+
+    def _evict(self):
+        """
+        Remove the least recently used responses until the cache is not
+        larger than the allowed maximum size.
+        """
+        with self._lock:
+            entries = []
+            for body_file in glob.glob(os.path.join(self.directory,
+                                                    "*.body")):
+                try:
+                    stat = os.stat(body_file)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, body_file))
+            size = sum(entry[1] for entry in entries)
+            max_size = self.max_size_in_mb * 1024 ** 2
+            for _, file_size, body_file in sorted(entries):
+                if size <= max_size:
+                    break
+                for filename in (body_file[:-5] + ".json", body_file):
+                    try:
+                        os.remove(filename)
+                    except OSError:
+                        pass
+                size -= file_size
+
+    def clear(self):
+        """
+        Remove all cached responses.
+        """
+        for pattern in ("*.json", "*.body"):
+            for filename in glob.glob(os.path.join(self.directory, pattern)):
+                try:
+                    os.remove(filename)
+                except OSError:
+                    pass
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
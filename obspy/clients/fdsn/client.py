@@ -27,6 +27,7 @@ import warnings
 from collections import OrderedDict
 
 from lxml import etree
+import requests
 
 import obspy
 from obspy import UTCDateTime, read_inventory
@@ -34,15 +35,20 @@ from obspy.core.compatibility import urlparse
 from .header import (DEFAULT_PARAMETERS, DEFAULT_USER_AGENT, FDSNWS,
                      OPTIONAL_PARAMETERS, PARAMETER_ALIASES, URL_MAPPINGS,
                      WADL_PARAMETERS_NOT_TO_BE_PARSED, FDSNException,
-                     FDSNRedirectException, FDSNNoDataException)
+                     FDSNRedirectException, FDSNNoDataException,
+                     FDSNRequestTooLargeException, FDSNTimeoutException,
+                     FDSNTooManyRequestsException,
+                     FDSNServiceUnavailableException)
+from .cache import HTTPCache
 from .wadl_parser import WADLParser
 
 if PY2:
     from urllib import urlencode
+    from urlparse import urljoin
     import urllib2 as urllib_request
     import Queue as queue
 else:
-    from urllib.parse import urlencode
+    from urllib.parse import urlencode, urljoin
     import urllib.request as urllib_request
     import queue
 
@@ -96,6 +102,53 @@ class NoRedirectionHandler(urllib_request.HTTPRedirectHandler):
             "when initializing the Client.")
 
 
+class FDSNSession(requests.Session):
+    """
+    HTTP session keeping a pool of persistent (keep-alive) connections.
+
+    Used by :class:`Client` for all its requests, so that consecutive
+    requests to the same data center reuse already established TCP (and TLS)
+    connections. Redirects are handled by :func:`download_url` and follow
+    the same rules as :class:`CustomRedirectHandler` and
+    :class:`NoRedirectionHandler`.
+
+    :type user: str
+    :param user: User name of HTTP Digest Authentication.
+    :type password: str
+    :param password: Password of HTTP Digest Authentication.
+    :type auth_url: str
+    :param auth_url: Only requests to URLs starting with this URL are
+        authenticated.
+    :type follow_redirects: bool
+    :param follow_redirects: Whether redirects are followed. If ``False``,
+        a :class:`~obspy.clients.fdsn.header.FDSNRedirectException` is
+        returned for redirected requests.
+    :type pool_maxsize: int
+    :param pool_maxsize: Maximum number of connections kept open per host.
+    """
+    def __init__(self, user=None, password=None, auth_url=None,
+                 follow_redirects=True, pool_maxsize=10):
+        super(FDSNSession, self).__init__()
+        self.follow_redirects = follow_redirects
+        self.auth_url = auth_url
+        if user is not None and password is not None:
+            self.digest_auth = requests.auth.HTTPDigestAuth(user, password)
+        else:
+            self.digest_auth = None
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def get_auth(self, url):
+        """
+        Authentication to use for a request to the given URL.
+        """
+        if self.digest_auth is not None and \
+                url.startswith(self.auth_url or ""):
+            return self.digest_auth
+        return None
+
+
 class Client(object):
     """
     FDSN Web service request client.
@@ -140,7 +193,7 @@ class Client(object):
     def __init__(self, base_url="IRIS", major_versions=None, user=None,
                  password=None, user_agent=DEFAULT_USER_AGENT, debug=False,
                  timeout=120, service_mappings=None, force_redirect=False,
-                 eida_token=None):
+                 eida_token=None, cache=None):
         """
         Initializes an FDSN Web Service client.
 
@@ -202,11 +255,20 @@ class Client(object):
             used. This mechanism is only available on select EIDA nodes. The
             token can be provided in form of the PGP message as a string, or
             the filename of a local file with the PGP message in it.
+        :type cache: :class:`~obspy.clients.fdsn.cache.HTTPCache` or str
+        :param cache: Cache responses of station and event queries as well
+            as the service discovery on disk, either in the given
+            :class:`~obspy.clients.fdsn.cache.HTTPCache` or in a cache with
+            default settings in the given directory. Waveform data is never
+            cached.
         """
         self.debug = debug
         self.user = user
         self.timeout = timeout
         self._force_redirect = force_redirect
+        if isinstance(cache, (str, native_str)):
+            cache = HTTPCache(cache)
+        self._cache = cache
 
         # Cache for the webservice versions. This makes interactive use of
         # the client more convenient.
@@ -312,25 +374,19 @@ class Client(object):
         self.set_credentials(user, password)
 
     def _set_opener(self, user, password):
-        # Only add the authentication handler if required.
-        handlers = []
-        if user is not None and password is not None:
-            # Create an OpenerDirector for HTTP Digest Authentication
-            password_mgr = urllib_request.HTTPPasswordMgrWithDefaultRealm()
-            password_mgr.add_password(None, self.base_url, user, password)
-            handlers.append(urllib_request.HTTPDigestAuthHandler(password_mgr))
-
-        if (user is None and password is None) or self._force_redirect is True:
-            # Redirect if no credentials are given or the force_redirect
-            # flag is True.
-            handlers.append(CustomRedirectHandler())
-        else:
-            handlers.append(NoRedirectionHandler())
-
-        # Don't install globally to not mess with other codes.
-        self._url_opener = urllib_request.build_opener(*handlers)
+        # Redirect if no credentials are given or the force_redirect flag is
+        # True.
+        follow_redirects = (user is None and password is None) or \
+            self._force_redirect is True
+        # The session keeps connections alive between requests.
+        self._session = FDSNSession(
+            user=user, password=password, auth_url=self.base_url,
+            follow_redirects=follow_redirects)
         if self.debug:
-            print('Installed new opener with handlers: {!s}'.format(handlers))
+            print('Installed new session with {!s}redirects and {!s}'
+                  'authentication'.format(
+                      '' if follow_redirects else 'no ',
+                      '' if self._session.digest_auth else 'no '))
 
     def _resolve_eida_token(self, token):
         """
@@ -510,15 +566,14 @@ class Client(object):
         url = self._create_url_from_parameters(
             "event", DEFAULT_PARAMETERS['event'], kwargs)
 
-        data_stream = self._download(url)
-        data_stream.seek(0, 0)
+        data_stream = self._download(url, filename=filename, use_cache=True)
         if filename:
-            self._write_to_file_object(filename, data_stream)
-            data_stream.close()
-        else:
-            cat = obspy.read_events(data_stream, format="quakeml")
-            data_stream.close()
-            return cat
+            # The response has been streamed to the file.
+            return
+        data_stream.seek(0, 0)
+        cat = obspy.read_events(data_stream, format="quakeml")
+        data_stream.close()
+        return cat
 
     def get_stations(self, starttime=None, endtime=None, startbefore=None,
                      startafter=None, endbefore=None, endafter=None,
@@ -708,16 +763,15 @@ class Client(object):
         url = self._create_url_from_parameters(
             "station", DEFAULT_PARAMETERS['station'], kwargs)
 
-        data_stream = self._download(url)
-        data_stream.seek(0, 0)
+        data_stream = self._download(url, filename=filename, use_cache=True)
         if filename:
-            self._write_to_file_object(filename, data_stream)
-            data_stream.close()
-        else:
-            # This works with XML and StationXML data.
-            inventory = read_inventory(data_stream)
-            data_stream.close()
-            return inventory
+            # The response has been streamed to the file.
+            return
+        data_stream.seek(0, 0)
+        # This works with XML and StationXML data.
+        inventory = read_inventory(data_stream)
+        data_stream.close()
+        return inventory
 
     def get_waveforms(self, network, station, location, channel, starttime,
                       endtime, quality=None, minimumlength=None,
@@ -827,18 +881,17 @@ class Client(object):
 
         # Gzip not worth it for MiniSEED and most likely disabled for this
         # route in any case.
-        data_stream = self._download(url, use_gzip=False)
-        data_stream.seek(0, 0)
+        data_stream = self._download(url, use_gzip=False, filename=filename)
         if filename:
-            self._write_to_file_object(filename, data_stream)
-            data_stream.close()
-        else:
-            st = obspy.read(data_stream, format="MSEED")
-            data_stream.close()
-            if attach_response:
-                self._attach_responses(st)
-            self._attach_dataselect_url_to_stream(st)
-            return st
+            # The response has been streamed to the file.
+            return
+        data_stream.seek(0, 0)
+        st = obspy.read(data_stream, format="MSEED")
+        data_stream.close()
+        if attach_response:
+            self._attach_responses(st)
+        self._attach_dataselect_url_to_stream(st)
+        return st
 
     def _attach_responses(self, st):
         """
@@ -1005,19 +1058,17 @@ class Client(object):
 
         url = self._build_url("dataselect", "query")
 
-        data_stream = self._download(url,
-                                     data=bulk)
-        data_stream.seek(0, 0)
+        data_stream = self._download(url, data=bulk, filename=filename)
         if filename:
-            self._write_to_file_object(filename, data_stream)
-            data_stream.close()
-        else:
-            st = obspy.read(data_stream, format="MSEED")
-            data_stream.close()
-            if attach_response:
-                self._attach_responses(st)
-            self._attach_dataselect_url_to_stream(st)
-            return st
+            # The response has been streamed to the file.
+            return
+        data_stream.seek(0, 0)
+        st = obspy.read(data_stream, format="MSEED")
+        data_stream.close()
+        if attach_response:
+            self._attach_responses(st)
+        self._attach_dataselect_url_to_stream(st)
+        return st
 
     def get_stations_bulk(self, bulk, level=None, includerestricted=None,
                           includeavailability=None, filename=None, **kwargs):
@@ -1151,25 +1202,16 @@ class Client(object):
 
         url = self._build_url("station", "query")
 
-        data_stream = self._download(url,
-                                     data=bulk)
-        data_stream.seek(0, 0)
+        data_stream = self._download(url, data=bulk, filename=filename,
+                                     use_cache=True)
         if filename:
-            self._write_to_file_object(filename, data_stream)
-            data_stream.close()
-            return
-        else:
-            # Works with text and StationXML data.
-            inv = obspy.read_inventory(data_stream)
-            data_stream.close()
-            return inv
-
-    def _write_to_file_object(self, filename_or_object, data_stream):
-        if hasattr(filename_or_object, "write"):
-            filename_or_object.write(data_stream.read())
+            # The response has been streamed to the file.
             return
-        with open(filename_or_object, "wb") as fh:
-            fh.write(data_stream.read())
+        data_stream.seek(0, 0)
+        # Works with text and StationXML data.
+        inv = obspy.read_inventory(data_stream)
+        data_stream.close()
+        return inv
 
     def _create_url_from_parameters(self, service, default_params, parameters):
         """
@@ -1374,11 +1416,13 @@ class Client(object):
 
         print("\n".join(msg))
 
-    def _download(self, url, return_string=False, data=None, use_gzip=True):
+    def _download(self, url, return_string=False, data=None, use_gzip=True,
+                  filename=None, use_cache=False):
         code, data = download_url(
-            url, opener=self._url_opener, headers=self.request_headers,
+            url, opener=self._session, headers=self.request_headers,
             debug=self.debug, return_string=return_string, data=data,
-            timeout=self.timeout, use_gzip=use_gzip)
+            timeout=self.timeout, use_gzip=use_gzip, filename=filename,
+            cache=self._cache if use_cache else None)
         raise_on_error(code, data)
         return data
 
@@ -1429,7 +1473,8 @@ class Client(object):
 
         headers = self.request_headers
         debug = self.debug
-        opener = self._url_opener
+        opener = self._session
+        cache = self._cache
 
         def get_download_thread(url):
             class ThreadURL(threading.Thread):
@@ -1438,7 +1483,7 @@ class Client(object):
                     try:
                         code, data = download_url(
                             url, opener=opener, headers=headers,
-                            debug=debug)
+                            debug=debug, cache=cache)
                         if code == 200:
                             wadl_queue.put((url, data))
                         # Pass on the redirect exception.
@@ -1714,22 +1759,28 @@ def raise_on_error(code, data):
     elif code == 403:
         raise FDSNException("Authentication failed.", server_info)
     elif code == 413:
-        raise FDSNException("Request would result in too much data. "
-                            "Denied by the datacenter. Split the request "
-                            "in smaller parts", server_info)
+        raise FDSNRequestTooLargeException(
+            "Request would result in too much data. Denied by the "
+            "datacenter. Split the request in smaller parts", server_info)
     # Request URI too large.
     elif code == 414:
         msg = ("The request URI is too large. Please contact the ObsPy "
                "developers.", server_info)
         raise NotImplementedError(msg)
+    elif code == 429:
+        raise FDSNTooManyRequestsException(
+            "Too many requests. The datacenter asks to slow down.",
+            server_info)
     elif code == 500:
         raise FDSNException("Service responds: Internal server error",
                             server_info)
     elif code == 503:
-        raise FDSNException("Service temporarily unavailable", server_info)
+        raise FDSNServiceUnavailableException(
+            "Service temporarily unavailable", server_info)
     elif code is None:
-        if "timeout" in str(data).lower():
-            raise FDSNException("Timed Out")
+        if "timeout" in str(data).lower() or \
+                "timed out" in str(data).lower():
+            raise FDSNTimeoutException("Timed Out")
         else:
             raise FDSNException("Unknown Error (%s): %s" % (
                 (str(data.__class__.__name__), str(data))))
@@ -1739,7 +1790,8 @@ def raise_on_error(code, data):
 
 
 def download_url(url, opener, timeout=10, headers={}, debug=False,
-                 return_string=True, data=None, use_gzip=True):
+                 return_string=True, data=None, use_gzip=True, filename=None,
+                 cache=None):
     """
     Returns a pair of tuples.
 
@@ -1751,6 +1803,15 @@ def download_url(url, opener, timeout=10, headers={}, debug=False,
     specified.
 
     Performs a http GET if data=None, otherwise a http POST.
+
+    If ``opener`` is a :class:`FDSNSession`, connections are kept alive and
+    reused for subsequent requests and the response is streamed: gzip
+    compressed responses are decompressed on the fly and, if ``filename``
+    (a file name or an open file-like object) is given, a successful response
+    is written there chunk by chunk instead of being returned. Responses are
+    then also looked up in and stored to the
+    :class:`~obspy.clients.fdsn.cache.HTTPCache` passed as ``cache``.
+    Otherwise ``opener`` is a :class:`urllib.request.OpenerDirector`.
     """
     if debug is True:
         print("Downloading %s %s requesting gzip compression" % (
@@ -1761,6 +1822,12 @@ def download_url(url, opener, timeout=10, headers={}, debug=False,
             print(data.decode())
             print("-" * 70)
 
+    if isinstance(opener, requests.Session):
+        return _download_url_with_session(
+            url, session=opener, timeout=timeout, headers=headers,
+            debug=debug, return_string=return_string, data=data,
+            use_gzip=use_gzip, filename=filename, cache=cache)
+
     try:
         request = urllib_request.Request(url=url, headers=headers)
         # Request gzip encoding if desired.
@@ -1794,7 +1861,10 @@ def download_url(url, opener, timeout=10, headers={}, debug=False,
     else:
         f = url_obj
 
-    if return_string is False:
+    if filename is not None and code == 200:
+        _copy_to_file(iter(lambda: f.read(CHUNK_SIZE), b""), filename)
+        data = None
+    elif return_string is False:
         data = io.BytesIO(f.read())
     else:
         data = f.read()
@@ -1805,6 +1875,142 @@ def download_url(url, opener, timeout=10, headers={}, debug=False,
     return code, data
 
 
+# Redirects followed for a single request before giving up.
+MAX_REDIRECTS = 10
+# Size of the chunks responses are streamed in.
+CHUNK_SIZE = 1024 * 1024
+
+
+def _copy_to_file(chunks, filename_or_object):
+    """
+    Write chunks of data to a file name or file-like object.
+    """
+    if hasattr(filename_or_object, "write"):
+        for chunk in chunks:
+            filename_or_object.write(chunk)
+        return
+    with open(filename_or_object, "wb") as fh:
+        for chunk in chunks:
+            fh.write(chunk)
+
+
+def _return_body(body, return_string, filename):
+    """
+    Return a complete response body the way :func:`download_url` does.
+    """
+    if filename is not None:
+        _copy_to_file([body], filename)
+        return None
+    elif return_string is False:
+        return io.BytesIO(body)
+    return body
+
+
+def _download_url_with_session(url, session, timeout, headers, debug,
+                               return_string, data, use_gzip, filename,
+                               cache=None):
+    """
+    Implementation of :func:`download_url` for a :class:`FDSNSession`.
+    """
+    headers = dict(headers)
+    # The session would request compressed responses by default.
+    headers["Accept-Encoding"] = "gzip" if use_gzip else "identity"
+    method = "GET" if data is None else "POST"
+
+    cache_url = url
+    if cache is not None:
+        entry = cache.lookup(cache_url, data)
+        if entry is not None and (entry["fresh"] or cache.offline):
+            if debug is True:
+                print("Using cached response for %s" % url)
+            return 200, _return_body(cache.read(cache_url, data),
+                                     return_string, filename)
+        if cache.offline:
+            return None, FDSNException(
+                "No cached response for '%s' (offline mode)." % url)
+        # Revalidate stale responses.
+        if entry is not None and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry is not None and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            r = session.request(method, url, data=data, headers=headers,
+                                timeout=timeout, stream=True,
+                                allow_redirects=False,
+                                auth=session.get_auth(url))
+            if not r.is_redirect:
+                break
+            r.close()
+            if not session.follow_redirects:
+                raise FDSNRedirectException(
+                    "Requests with credentials (username, password) are not "
+                    "being redirected by default to improve security. To "
+                    "force redirects and if you trust the data center, set "
+                    "`force_redirect` to True when initializing the Client.")
+            # Same behaviour as the CustomRedirectHandler: keep the method
+            # and the data for all kinds of redirects.
+            url = urljoin(url, r.headers["location"].replace(" ", "%20"))
+            if debug is True:
+                print("Redirected to %s" % url)
+        else:
+            raise FDSNException("Exceeded %i redirects." % MAX_REDIRECTS)
+    except Exception as e:
+        if debug is True:
+            print("Error while downloading: %s" % url)
+        return None, e
+
+    code = r.status_code
+    try:
+        if code == 304 and cache is not None:
+            if debug is True:
+                print("Cached response for %s is still valid" % url)
+            cache.refresh(cache_url, r.headers, data)
+            return 200, _return_body(cache.read(cache_url, data),
+                                     return_string, filename)
+        elif code == 200 and cache is not None:
+            body = r.content
+            cache.store(cache_url, body, r.headers, data)
+            return code, _return_body(body, return_string, filename)
+        elif code != 200:
+            # Error messages are small, keep them for raise_on_error().
+            data = io.BytesIO(r.content)
+            if debug is True:
+                msg = "HTTP error %i, reason %s, while downloading '%s': %s" \
+                    % (code, r.reason, url, data.getvalue())
+                print(msg)
+            return code, data
+
+        if debug is True and \
+                r.headers.get("Content-Encoding") == "gzip":
+            print("Uncompressing gzipped response for %s" % url)
+        # Chunks are decompressed on the fly, so the compressed response is
+        # never held in memory as a whole.
+        if filename is not None:
+            _copy_to_file(r.iter_content(CHUNK_SIZE), filename)
+            data = None
+        elif return_string is False:
+            data = io.BytesIO()
+            _copy_to_file(r.iter_content(CHUNK_SIZE), data)
+            data.seek(0, 0)
+        else:
+            data = r.content
+    except Exception as e:
+        if debug is True:
+            print("Error while downloading: %s" % url)
+        return None, e
+    finally:
+        # Hands the connection back to the pool (or closes it, if the
+        # response was not read completely).
+        r.close()
+
+    if debug is True:
+        print("Downloaded %s with HTTP code: %i" % (url, code))
+
+    return code, data
+
+
 def setup_query_dict(service, locs, kwargs):
     """
     """
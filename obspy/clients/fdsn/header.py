@@ -35,6 +35,22 @@ class FDSNNoDataException(FDSNException):
     pass
 
 
+class FDSNTimeoutException(FDSNException):
+    pass
+
+
+class FDSNRequestTooLargeException(FDSNException):
+    pass
+
+
+class FDSNTooManyRequestsException(FDSNException):
+    pass
+
+
+class FDSNServiceUnavailableException(FDSNException):
+    pass
+
+
 # A curated list collecting some implementations:
 # https://www.fdsn.org/webservices/datacenters/
 # http://www.orfeus-eu.org/eida/eida_odc.html
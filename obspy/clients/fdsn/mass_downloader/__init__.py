@@ -412,6 +412,18 @@ value in agreement with some data centers.
 ...              threads_per_client=3, mseed_storage=mseed_storage,
 ...              stationxml_storage=stationxml_storage)  # doctest: +SKIP
 
+Repeated downloads into a large existing archive spend a lot of time finding
+out which files already exist and which channels the existing StationXML files
+contain. Pass a ``manifest`` database file to record the downloaded files.
+Time intervals recorded in it are not looked up in the storage again and
+StationXML files are only parsed again once they changed. Files that were
+deleted or changed by other means can be dropped from the manifest with
+:meth:`~obspy.clients.fdsn.mass_downloader.manifest.Manifest.verify`.
+
+>>> mdl.download(domain, restrictions, mseed_storage=mseed_storage,
+...              stationxml_storage=stationxml_storage,
+...              manifest="manifest.sqlite")  # doctest: +SKIP
+
 
 How it Works
 ------------
@@ -450,7 +462,12 @@ and downloading whatever it offers. A bit more detail:
       request honoring the desired ``chunk_size_in_mb`` setting. Afterwards it
       splits the MiniSEED files again to match the desired restrictions. The
       split happens at the record level thus no information available in the
-      original MiniSEED records is lost.
+      original MiniSEED records is lost. The size of the requests is reduced
+      if they take too long at the observed throughput. If a data center
+      responds that it is overloaded (HTTP 429 or 503), fewer threads are
+      used and no new requests are sent for some time. Time intervals of
+      throttled, timed out or too large requests are requested again in
+      smaller chunks.
 
    f) Any MiniSEED files not fulfilling the minimum length or no/gap overlap
       restrictions will be deleted. Faulty MiniSEED files as well.
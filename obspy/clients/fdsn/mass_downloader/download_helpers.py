@@ -23,6 +23,7 @@ import itertools
 import sys
 from multiprocessing.pool import ThreadPool
 import os
+import threading
 import time
 import timeit
 
@@ -120,11 +121,15 @@ class Station(object):
                     return True
         return False
 
-    def remove_files(self, logger, reason):
+    def remove_files(self, logger, reason, manifest=None):
         """
         Delete all files under it. Only delete stuff that actually has been
         downloaded!
+
+        :param manifest: The files will also be removed from this manifest.
+        :type manifest: :class:`~.manifest.Manifest`
         """
+        deleted = []
         for chan in self.channels:
             for ti in chan.intervals:
                 if ti.status != STATUS.DOWNLOADED or not ti.filename:
@@ -133,6 +138,7 @@ class Station(object):
                     logger.info("Deleting MiniSEED file '%s'. Reason: %s" % (
                         ti.filename, reason))
                     utils.safe_delete(ti.filename)
+                    deleted.append(ti.filename)
 
         if self.stationxml_status == STATUS.DOWNLOADED and \
                 self.stationxml_filename and \
@@ -140,6 +146,10 @@ class Station(object):
             logger.info("Deleting StationXMl file '%s'. Reason: %s" %
                         (self.stationxml_filename, reason))
             utils.safe_delete(self.stationxml_filename)
+            deleted.append(self.stationxml_filename)
+
+        if manifest is not None:
+            manifest.remove_files(deleted)
 
     @property
     def stationxml_filename(self):
@@ -197,11 +207,15 @@ class Station(object):
                            self.miss_station_information.keys()]),
             channels=channels)
 
-    def prepare_stationxml_download(self, stationxml_storage, logger):
+    def prepare_stationxml_download(self, stationxml_storage, logger,
+                                    manifest=None):
         """
         Figure out what to download.
 
         :param stationxml_storage:
+        :param manifest: If given, the contents of existing StationXML files
+            are taken from it instead of parsing the files again.
+        :type manifest: :class:`~.manifest.Manifest`
         """
         # Determine what channels actually want to have station information.
         # This will be a tuple of location code, channel code, starttime,
@@ -243,7 +257,10 @@ class Station(object):
             # necessary information, nothing will happen. Otherwise it will
             # be overwritten.
             else:
-                info = utils.get_stationxml_contents(filename)
+                if manifest is not None:
+                    info = manifest.get_stationxml_contents(filename)
+                else:
+                    info = utils.get_stationxml_contents(filename)
                 for c_id, times in self.want_station_information.items():
                     # Get the temporal range of information in the file.
                     c_info = [_i for _i in info if
@@ -320,7 +337,7 @@ class Station(object):
             else:
                 self.stationxml_status = STATUS.IGNORE
 
-    def prepare_mseed_download(self, mseed_storage):
+    def prepare_mseed_download(self, mseed_storage, manifest=None):
         """
         Loop through all channels of the station and distribute filenames
         and the current status of the channel.
@@ -331,7 +348,12 @@ class Station(object):
         NEEDS_DOWNLOADING.
 
         :param mseed_storage:
+        :param manifest: Time intervals recorded in the manifest exist
+            without checking the storage. Existing files that are not yet
+            recorded will be added to it.
+        :type manifest: :class:`~.manifest.Manifest`
         """
+        unrecorded = []
         for channel in self.channels:
             for interval in channel.intervals:
                 interval.filename = utils.get_mseed_filename(
@@ -340,14 +362,25 @@ class Station(object):
                     interval.end)
                 if interval.filename is True:
                     interval.status = STATUS.IGNORE
+                elif manifest is not None and \
+                        manifest.has_mseed(interval.filename):
+                    interval.status = STATUS.EXISTS
                 elif os.path.exists(interval.filename):
                     interval.status = STATUS.EXISTS
+                    unrecorded.append((
+                        self.network, self.station, channel.location,
+                        channel.channel, interval.start, interval.end,
+                        interval.filename))
                 else:
                     if not os.path.exists(os.path.dirname(interval.filename)):
                         os.makedirs(os.path.dirname(interval.filename))
                     interval.status = STATUS.NEEDS_DOWNLOADING
+        # Checksums would require reading the files which is exactly what
+        # the manifest should avoid.
+        if manifest is not None:
+            manifest.add_mseed_files(unrecorded, checksum=False)
 
-    def sanitize_downloads(self, logger):
+    def sanitize_downloads(self, logger, manifest=None):
         """
         Should be run after the MiniSEED and StationXML downloads finished.
         It will make sure that every MiniSEED file also has a corresponding
@@ -356,6 +389,10 @@ class Station(object):
         It will delete MiniSEED files but never a StationXML file. The logic
         of the download helpers does not allow for a StationXML file with no
         data.
+
+        :param manifest: Deleted files will also be removed from this
+            manifest.
+        :type manifest: :class:`~.manifest.Manifest`
         """
         from obspy.io.mseed.util import get_start_and_end_time
         # All or nothing for each channel.
@@ -383,6 +420,8 @@ class Station(object):
                     if miss_start <= time_interval.start <= miss_end and \
                        miss_start <= time_interval.end <= miss_end:
                         utils.safe_delete(time_interval.filename)
+                        if manifest is not None:
+                            manifest.remove_files([time_interval.filename])
                         time_interval.status = STATUS.DOWNLOAD_REJECTED
 
 
@@ -474,9 +513,11 @@ class ClientDownloadHelper(object):
     :param mseed_storage: The MiniSEED storage settings.
     :param stationxml_storage: The StationXML storage settings.
     :param logger: An active logger instance.
+    :param manifest: Optional manifest recording the downloaded files.
+    :type manifest: :class:`~.manifest.Manifest`
     """
     def __init__(self, client, client_name, restrictions, domain,
-                 mseed_storage, stationxml_storage, logger):
+                 mseed_storage, stationxml_storage, logger, manifest=None):
         self.client = client
         self.client_name = client_name
         self.restrictions = restrictions
@@ -484,6 +525,7 @@ class ClientDownloadHelper(object):
         self.mseed_storage = mseed_storage
         self.stationxml_storage = stationxml_storage
         self.logger = logger
+        self.manifest = manifest
         self.stations = {}
         self.is_availability_reliable = None
 
@@ -518,7 +560,8 @@ class ClientDownloadHelper(object):
         downloading.
         """
         for station in self.stations.values():
-            station.prepare_mseed_download(mseed_storage=self.mseed_storage)
+            station.prepare_mseed_download(mseed_storage=self.mseed_storage,
+                                           manifest=self.manifest)
 
     def filter_stations_based_on_minimum_distance(
             self, existing_client_dl_helpers):
@@ -617,7 +660,8 @@ class ClientDownloadHelper(object):
         # stations.
         for station in rejected_stations:
             station.remove_files(logger=self.logger,
-                                 reason="Minimum distance filtering.")
+                                 reason="Minimum distance filtering.",
+                                 manifest=self.manifest)
         self.stations = {}
         for station in remaining_stations:
             self.stations[(station.network, station.station)] = station
@@ -635,7 +679,7 @@ class ClientDownloadHelper(object):
         for station in self.stations.values():
             station.prepare_stationxml_download(
                 stationxml_storage=self.stationxml_storage,
-                logger=self.logger)
+                logger=self.logger, manifest=self.manifest)
 
     def download_stationxml(self, threads=3):
         """
@@ -699,7 +743,11 @@ class ClientDownloadHelper(object):
 
             # Extract information about that file.
             try:
-                info = utils.get_stationxml_contents(filename)
+                if self.manifest is not None:
+                    info = self.manifest.get_stationxml_contents(
+                        filename, refresh=True)
+                else:
+                    info = utils.get_stationxml_contents(filename)
             # Sometimes some services choose to not return XML files - guard
             # against it and just delete the file. At subsequent runs the
             # mass downloader will attempt to download it again.
@@ -708,6 +756,8 @@ class ClientDownloadHelper(object):
                     "Client '%s' - File %s is not an XML file - it will be "
                     "deleted." % (self.client_name, filename))
                 utils.safe_delete(filename)
+                if self.manifest is not None:
+                    self.manifest.remove_files([filename])
                 continue
 
             still_missing = {}
@@ -759,14 +809,24 @@ class ClientDownloadHelper(object):
                              e_time - s_time,
                              (download_size / 1024.0) / (e_time - s_time)))
 
-    def download_mseed(self, chunk_size_in_mb=25, threads_per_client=3):
+    def download_mseed(self, chunk_size_in_mb=25, threads_per_client=3,
+                       max_retries=3):
         """
         Actually download MiniSEED data.
 
-        :param chunk_size_in_mb: Attempt to download data in chunks of this
-            size.
-        :param threads_per_client: Threads to launch per client. 3 seems to
-            be a value in agreement with some data centers.
+        The requests are scheduled by an
+        :class:`~obspy.clients.fdsn.mass_downloader.utils.AdaptiveChunkScheduler`
+        which reduces the size and number of parallel requests if the data
+        center is slow or asks to back off.
+
+        :param chunk_size_in_mb: Attempt to download data in chunks of at
+            most this size.
+        :param threads_per_client: Maximum number of threads to launch per
+            client. 3 seems to be a value in agreement with some data
+            centers.
+        :param max_retries: How often time intervals of requests that timed
+            out, were too large or were throttled by the data center are
+            requested again.
         """
         # Estimate the download size to have equally sized chunks.
         channel_sampling_rate = {
@@ -775,13 +835,8 @@ class ClientDownloadHelper(object):
             "R": 0.001, "P": 0.0001, "T": 0.00001, "Q": 0.000001, "A": 5000,
             "O": 5000}
 
-        # Split into chunks of about equal size in terms of filesize.
-        chunks = []
-        chunks_curr = []
-        curr_chunks_mb = 0
-
-        # Don't request more than 50 chunks at once to not choke the servers.
-        max_chunk_length = 50
+        items = []
+        sizes_in_mb = []
 
         counter = collections.Counter()
 
@@ -803,22 +858,15 @@ class ClientDownloadHelper(object):
                     # some downloading.
                     if interval.status != STATUS.NEEDS_DOWNLOADING:
                         continue
-                    chunks_curr.append((
+                    items.append((
                         sta.network, sta.station, cha.location, cha.channel,
                         interval.start, interval.end, interval.filename))
                     # Assume that each sample needs 4 byte, STEIM
                     # compression reduces size to about a third.
                     # chunk size is in MB
                     duration = interval.end - interval.start
-                    curr_chunks_mb += \
-                        sr * duration * 4.0 / 3.0 / 1024.0 / 1024.0
-                    if curr_chunks_mb >= chunk_size_in_mb or \
-                            len(chunks_curr) >= max_chunk_length:
-                        chunks.append(chunks_curr)
-                        chunks_curr = []
-                        curr_chunks_mb = 0
-        if chunks_curr:
-            chunks.append(chunks_curr)
+                    sizes_in_mb.append(
+                        sr * duration * 4.0 / 3.0 / 1024.0 / 1024.0)
 
         keys = sorted(counter.keys())
         for key in keys:
@@ -827,35 +875,88 @@ class ClientDownloadHelper(object):
                 "downloading: %s" % (self.client_name, counter[key],
                                      key.upper()))
 
-        if not chunks:
+        if not items:
             return
 
-        def star_download_mseed(args):
-            """
-            Star maps the arguments to the
-            utils.download_and_split_mseed_bulk() function.
+        # Don't request more than 50 chunks at once to not choke the servers.
+        scheduler = utils.AdaptiveChunkScheduler(
+            items, sizes_in_mb, max_chunk_size_in_mb=chunk_size_in_mb,
+            max_threads=threads_per_client, max_chunk_length=50,
+            max_retries=max_retries)
 
-            :param args: The arguments to be passed.
+        # Unexpected errors of the download threads, the first one is raised
+        # again once all threads are done.
+        errors = []
+
+        def download_chunks():
             """
-            try:
-                ret_val = utils.download_and_split_mseed_bulk(
-                    *args, logger=self.logger)
-            except utils.ERRORS as e:
-                msg = ("Client '%s' - " % args[1]) + str(e)
-                if "no data available" in msg.lower():
-                    self.logger.info(msg.split("Detailed response")[0].strip())
+            Downloads chunks with utils.download_and_split_mseed_bulk()
+            until the scheduler runs out of them or any thread failed
+            unexpectedly.
+            """
+            while True:
+                chunk = scheduler.next_chunk()
+                if chunk is None:
+                    return
+                if errors:
+                    # Every chunk has to be reported to the scheduler, other
+                    # threads wait for it.
+                    scheduler.failed(chunk)
+                    return
+                c_start = timeit.default_timer()
+                try:
+                    filenames = utils.download_and_split_mseed_bulk(
+                        self.client, self.client_name, chunk,
+                        logger=self.logger)
+                    downloaded_bytes = sum(
+                        os.path.getsize(_i) for _i in filenames
+                        if os.path.exists(_i))
+                except utils.THROTTLING_ERRORS as e:
+                    dropped = scheduler.throttled(chunk)
+                    self.logger.warning(
+                        "Client '%s' - Throttled by the data center, will "
+                        "use at most %i threads and back off: %s" % (
+                            self.client_name, scheduler.threads,
+                            str(e).split("\n")[0]))
+                except utils.ERRORS as e:
+                    msg = ("Client '%s' - " % self.client_name) + str(e)
+                    if "no data available" in msg.lower():
+                        self.logger.info(
+                            msg.split("Detailed response")[0].strip())
+                        scheduler.failed(chunk)
+                        continue
+                    if not isinstance(e, utils.RETRYABLE_ERRORS):
+                        self.logger.error(msg)
+                        scheduler.failed(chunk)
+                        continue
+                    dropped = scheduler.failed(chunk, retry=True)
+                    self.logger.warning(
+                        msg + " - Retrying with smaller requests.")
+                except Exception as e:
+                    errors.append(e)
+                    scheduler.failed(chunk)
+                    return
                 else:
-                    self.logger.error(msg)
-                return []
-            return ret_val
+                    scheduler.succeeded(
+                        chunk, timeit.default_timer() - c_start,
+                        downloaded_bytes)
+                    continue
+                if dropped:
+                    self.logger.error(
+                        "Client '%s' - Giving up on %i time intervals/"
+                        "channels after %i retries." % (
+                            self.client_name, len(dropped), max_retries))
 
-        pool = ThreadPool(min(threads_per_client, len(chunks)))
+        threads = [threading.Thread(target=download_chunks)
+                   for _ in range(min(threads_per_client, len(items)))]
 
         d_start = timeit.default_timer()
-        pool.map(
-            star_download_mseed,
-            [(self.client, self.client_name, chunk) for chunk in chunks])
-        pool.close()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
         d_end = timeit.default_timer()
 
         self.logger.info("Client '%s' - Launching basic QC checks..." %
@@ -904,7 +1005,8 @@ class ClientDownloadHelper(object):
         StationXML file.
         """
         for station in self.stations.values():
-            station.sanitize_downloads(logger=self.logger)
+            station.sanitize_downloads(logger=self.logger,
+                                       manifest=self.manifest)
 
     def _check_downloaded_data(self):
         """
@@ -916,6 +1018,7 @@ class ClientDownloadHelper(object):
         """
         downloaded_bytes = 0
         discarded_bytes = 0
+        accepted = []
         for sta in self.stations.values():
             for cha in sta.channels:
                 for interval in cha.intervals:
@@ -991,6 +1094,11 @@ class ClientDownloadHelper(object):
 
                     downloaded_bytes += size
                     interval.status = STATUS.DOWNLOADED
+                    accepted.append((
+                        sta.network, sta.station, cha.location, cha.channel,
+                        interval.start, interval.end, interval.filename))
+        if self.manifest is not None:
+            self.manifest.add_mseed_files(accepted)
         return downloaded_bytes, discarded_bytes
 
     def _parse_miniseed_filenames(self, filenames, restrictions):
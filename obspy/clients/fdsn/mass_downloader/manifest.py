@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Persistent manifest of the files managed by the mass downloader.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import native_str
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+import obspy
+
+from . import utils
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mseed_files (
+    filename TEXT PRIMARY KEY,
+    network TEXT, station TEXT, location TEXT, channel TEXT,
+    starttime REAL, endtime REAL,
+    size INTEGER, mtime REAL, sha1 TEXT);
+CREATE TABLE IF NOT EXISTS stationxml_files (
+    filename TEXT PRIMARY KEY,
+    size INTEGER, mtime REAL, sha1 TEXT);
+CREATE TABLE IF NOT EXISTS stationxml_channels (
+    filename TEXT,
+    network TEXT, station TEXT, location TEXT, channel TEXT,
+    starttime REAL, endtime REAL);
+CREATE INDEX IF NOT EXISTS stationxml_channels_filename
+    ON stationxml_channels (filename);
+"""
+
+
+def _sha1(filename, blocksize=1024 ** 2):
+    """
+    SHA1 checksum of a file.
+    """
+    sha1 = hashlib.sha1()
+    with open(filename, "rb") as fh:
+        while True:
+            block = fh.read(blocksize)
+            if not block:
+                break
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+class Manifest(object):
+    """
+    SQLite database recording the MiniSEED and StationXML files of a mass
+    downloader storage.
+
+    MiniSEED files are recorded with their time interval, size, modification
+    time and SHA1 checksum once they passed the quality checks. Later runs
+    consider recorded time intervals to exist without looking at the
+    storage. StationXML files are recorded with the channels they contain,
+    so they only have to be parsed again if their size or modification time
+    changed.
+
+    Files that are removed or changed by other means than the mass
+    downloader can be dropped from the manifest with :meth:`verify`.
+
+    >>> from obspy.clients.fdsn.mass_downloader import MassDownloader
+    >>> mdl = MassDownloader()  # doctest: +SKIP
+    >>> mdl.download(domain, restrictions, mseed_storage="waveforms",
+    ...              stationxml_storage="stations",
+    ...              manifest="manifest.sqlite")  # doctest: +SKIP
+
+    :type filename: str
+    :param filename: The SQLite database file. Will be created if it does
+        not exist.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(native_str(filename),
+                                     check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def __str__(self):
+        with self._lock:
+            mseed = self._conn.execute(
+                "SELECT COUNT(*) FROM mseed_files").fetchone()[0]
+            stationxml = self._conn.execute(
+                "SELECT COUNT(*) FROM stationxml_files").fetchone()[0]
+        return "Manifest '%s': %i MiniSEED and %i StationXML files" % (
+            self.filename, mseed, stationxml)
+
+    def close(self):
+        """
+        Close the database.
+        """
+        with self._lock:
+            self._conn.close()
+
+    def has_mseed(self, filename):
+        """
+        Check if a MiniSEED file is recorded.
+
+        :type filename: str
+        :param filename: The path of the file.
+        :rtype: bool
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM mseed_files WHERE filename = ?",
+                (filename,)).fetchone()
+        return row is not None
+
+    def get_mseed(self, filename):
+        """
+        Get the record of a MiniSEED file.
+
+        :type filename: str
+        :param filename: The path of the file.
+        :returns: A :class:`~.utils.ChannelAvailability` object or ``None``
+            if the file is not recorded.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT network, station, location, channel, starttime, "
+                "endtime FROM mseed_files WHERE filename = ?",
+                (filename,)).fetchone()
+        if row is None:
+            return None
+        return utils.ChannelAvailability(
+            row[0], row[1], row[2], row[3], obspy.UTCDateTime(row[4]),
+            obspy.UTCDateTime(row[5]), filename)
+
+    def add_mseed_files(self, files, checksum=True):
+        """
+        Record MiniSEED files, replacing existing records.
+
+        :param files: The files to record, each one a
+            :class:`~.utils.ChannelAvailability` object or a tuple of
+            network, station, location, channel, starttime, endtime, and
+            filename.
+        :type checksum: bool
+        :param checksum: Calculate the checksums of the files. Otherwise
+            they can be calculated later with :meth:`verify`.
+        """
+        rows = []
+        for net, sta, loc, cha, starttime, endtime, filename in files:
+            stat = os.stat(filename)
+            rows.append((
+                filename, net, sta, loc, cha, float(starttime.timestamp),
+                float(endtime.timestamp), stat.st_size, stat.st_mtime,
+                _sha1(filename) if checksum else None))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO mseed_files VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def remove_files(self, filenames):
+        """
+        Remove MiniSEED or StationXML files from the manifest. Does not
+        delete the files.
+
+        :type filenames: list of str
+        :param filenames: The paths of the files.
+        """
+        rows = [(_i,) for _i in filenames]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            for table in ("mseed_files", "stationxml_files",
+                          "stationxml_channels"):
+                self._conn.executemany(
+                    "DELETE FROM %s WHERE filename = ?" % table, rows)
+
+    def get_stationxml_contents(self, filename, refresh=False):
+        """
+        Get all channels with a response in a StationXML file, see
+        :func:`~.utils.get_stationxml_contents`.
+
+        The file is only parsed if it is not yet recorded, its size or
+        modification time changed, or ``refresh`` is set.
+
+        :type filename: str
+        :param filename: The path of the file.
+        :type refresh: bool
+        :param refresh: Always parse the file, e.g. because it has just been
+            downloaded.
+        :returns: list of :class:`~.utils.ChannelAvailability` objects.
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            self.remove_files([filename])
+            return utils.get_stationxml_contents(filename)
+
+        if not refresh:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT size, mtime FROM stationxml_files "
+                    "WHERE filename = ?", (filename,)).fetchone()
+                if row is not None and \
+                        tuple(row) == (stat.st_size, stat.st_mtime):
+                    channels = self._conn.execute(
+                        "SELECT network, station, location, channel, "
+                        "starttime, endtime FROM stationxml_channels "
+                        "WHERE filename = ? ORDER BY rowid",
+                        (filename,)).fetchall()
+                    return [utils.ChannelAvailability(
+                        _i[0], _i[1], _i[2], _i[3],
+                        obspy.UTCDateTime(_i[4]), obspy.UTCDateTime(_i[5]),
+                        filename) for _i in channels]
+
+        channels = utils.get_stationxml_contents(filename)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM stationxml_channels WHERE filename = ?",
+                (filename,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO stationxml_files VALUES "
+                "(?, ?, ?, ?)",
+                (filename, stat.st_size, stat.st_mtime, _sha1(filename)))
+            self._conn.executemany(
+                "INSERT INTO stationxml_channels VALUES "
+                "(?, ?, ?, ?, ?, ?, ?)",
+                [(filename, _i.network, _i.station, _i.location, _i.channel,
+                  float(_i.starttime.timestamp), float(_i.endtime.timestamp))
+                 for _i in channels])
+        return channels
+
+    def verify(self, checksums=False):
+        """
+        Remove the records of all files that no longer exist or have been
+        changed since they were recorded.
+
+        :type checksums: bool
+        :param checksums: Also compare the checksums of the files. Reads all
+            files, missing checksums are calculated and recorded.
+        :returns: The filenames of the removed records.
+        """
+        removed = []
+        new_checksums = []
+        for table in ("mseed_files", "stationxml_files"):
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT filename, size, mtime, sha1 FROM %s" %
+                    table).fetchall()
+            for filename, size, mtime, sha1 in rows:
+                try:
+                    stat = os.stat(filename)
+                except OSError:
+                    removed.append(filename)
+                    continue
+                if (stat.st_size, stat.st_mtime) != (size, mtime):
+                    removed.append(filename)
+                    continue
+                if not checksums:
+                    continue
+                if sha1 is None:
+                    new_checksums.append((table, _sha1(filename), filename))
+                elif _sha1(filename) != sha1:
+                    removed.append(filename)
+        self.remove_files(removed)
+        with self._lock, self._conn:
+            for table, sha1, filename in new_checksums:
+                self._conn.execute(
+                    "UPDATE %s SET sha1 = ? WHERE filename = ?" % table,
+                    (sha1, filename))
+        return removed
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
@@ -13,6 +13,7 @@ services in an automated fashion.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import native_str
 
 import collections
 import logging
@@ -25,6 +26,7 @@ from obspy.clients.fdsn.client import Client
 
 from . import utils
 from .download_helpers import ClientDownloadHelper, STATUS
+from .manifest import Manifest
 
 
 # Setup the logger.
@@ -106,7 +108,7 @@ class MassDownloader(object):
 
     def download(self, domain, restrictions, mseed_storage,
                  stationxml_storage, download_chunk_size_in_mb=20,
-                 threads_per_client=3, print_report=True):
+                 threads_per_client=3, print_report=True, manifest=None):
         """
         Launch the actual data download.
 
@@ -125,12 +127,37 @@ class MassDownloader(object):
         :param download_chunk_size_in_mb: MiniSEED data will be downloaded
             in bulk chunks. This settings limits the chunk size. A higher
             number means that less total download requests will be sent,
-            but each individual download request will be larger.
+            but each individual download request will be larger. Smaller
+            chunks are used for slow data centers.
         :type download_chunk_size_in_mb: float
-        :param threads_per_client: The number of download threads launched
-            per client.
+        :param threads_per_client: The maximum number of download threads
+            launched per client. Fewer are used while a data center asks
+            clients to slow down.
         :type threads_per_client: int
+        :param manifest: SQLite database recording the downloaded files.
+            Time intervals recorded in it are considered to exist without
+            checking the storage and StationXML files are only parsed again
+            if they changed, which speeds up downloads into large existing
+            archives. Either a filename or a
+            :class:`~obspy.clients.fdsn.mass_downloader.manifest.Manifest`
+            object.
+        :type manifest: str or
+            :class:`~obspy.clients.fdsn.mass_downloader.manifest.Manifest`
         """
+        if isinstance(manifest, (str, native_str)):
+            # A manifest opened here is also closed here.
+            manifest = Manifest(manifest)
+            try:
+                return self.download(
+                    domain=domain, restrictions=restrictions,
+                    mseed_storage=mseed_storage,
+                    stationxml_storage=stationxml_storage,
+                    download_chunk_size_in_mb=download_chunk_size_in_mb,
+                    threads_per_client=threads_per_client,
+                    print_report=print_report, manifest=manifest)
+            finally:
+                manifest.close()
+
         # The downloads from each client will be handled separately.
         # Nonetheless collect all in this dictionary.
         client_download_helpers = {}
@@ -155,7 +182,8 @@ class MassDownloader(object):
                 client=client, client_name=client_name,
                 restrictions=restrictions, domain=domain,
                 mseed_storage=mseed_storage,
-                stationxml_storage=stationxml_storage, logger=logger)
+                stationxml_storage=stationxml_storage, logger=logger,
+                manifest=manifest)
             existing_client_dl_helpers = list(
                 client_download_helpers.values())
             client_download_helpers[client_name] = helper
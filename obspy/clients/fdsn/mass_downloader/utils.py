@@ -18,6 +18,8 @@ import fnmatch
 import itertools
 import os
 import sys
+import threading
+import timeit
 from lxml import etree
 import numpy as np
 from scipy.spatial import cKDTree
@@ -31,6 +33,9 @@ else:
 import obspy
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.clients.fdsn.client import FDSNException
+from obspy.clients.fdsn.header import (
+    FDSNRequestTooLargeException, FDSNServiceUnavailableException,
+    FDSNTimeoutException, FDSNTooManyRequestsException)
 from obspy.io.mseed.util import get_record_information
 
 
@@ -38,6 +43,14 @@ from obspy.io.mseed.util import get_record_information
 # FDSN clients.
 ERRORS = (FDSNException, HTTPError, URLError, socket_timeout)
 
+# Errors signaling that the data center wants clients to slow down.
+THROTTLING_ERRORS = (FDSNTooManyRequestsException,
+                     FDSNServiceUnavailableException)
+
+# Errors that might not happen again with smaller requests.
+RETRYABLE_ERRORS = (FDSNRequestTooLargeException, FDSNTimeoutException,
+                    socket_timeout)
+
 
 # mean earth radius in meter as defined by the International Union of
 # Geodesy and Geophysics. Used for the spherical kd-tree.
@@ -261,6 +274,200 @@ def download_and_split_mseed_bulk(client, client_name, chunks, logger):
     return sorted(open_files.keys())
 
 
+class AdaptiveChunkScheduler(object):
+    """
+    Hands out bulk MiniSEED requests to the download threads of a single
+    data center and adapts the request size and the number of parallel
+    requests to the behaviour of the data center.
+
+    * The size of each request is chosen so that it takes about
+      ``target_duration`` seconds at the throughput measured for the
+      previous requests, bounded by ``min_chunk_size_in_mb`` and
+      ``max_chunk_size_in_mb``.
+    * The number of parallel requests grows by one with each successful
+      request up to ``max_threads`` and is halved if the data center asks to
+      slow down (HTTP 429 and 503). No new requests are started for an
+      exponentially growing backoff time after each of these responses.
+    * The time intervals of failed requests are not requested again as a
+      whole. They are put back at the front of the queue and are downloaded
+      with the next, smaller requests, unless they have already been tried
+      ``max_retries`` times.
+
+    Thread-safe, all threads should call :meth:`next_chunk` until it returns
+    ``None`` and report the outcome of each chunk with either
+    :meth:`succeeded`, :meth:`throttled` or :meth:`failed`.
+
+    :param items: The time intervals to download. Each one is a tuple of
+        network, station, location, channel, starttime, endtime, and the
+        desired filename.
+    :type items: list of tuples
+    :param sizes_in_mb: The estimated download size of each item.
+    :type sizes_in_mb: list of float
+    :param max_chunk_size_in_mb: Maximum size of a single request. Also
+        the size of the first requests.
+    :type max_chunk_size_in_mb: float
+    :param max_threads: Maximum number of parallel requests.
+    :type max_threads: int
+    :param min_chunk_size_in_mb: Minimum size of a single request.
+    :type min_chunk_size_in_mb: float
+    :param max_chunk_length: Maximum number of time intervals in a single
+        request.
+    :type max_chunk_length: int
+    :param target_duration: Desired duration of a single request in
+        seconds.
+    :type target_duration: float
+    :param max_retries: How often time intervals of failed requests are
+        requested again.
+    :type max_retries: int
+    :param initial_backoff: Backoff time in seconds after the first
+        throttled request, doubled for each consecutive one.
+    :type initial_backoff: float
+    :param max_backoff: Maximum backoff time in seconds.
+    :type max_backoff: float
+    """
+    def __init__(self, items, sizes_in_mb, max_chunk_size_in_mb=25,
+                 max_threads=3, min_chunk_size_in_mb=1.0,
+                 max_chunk_length=50, target_duration=30.0, max_retries=3,
+                 initial_backoff=5.0, max_backoff=300.0):
+        self._items = list(items)
+        self._sizes = list(sizes_in_mb)
+        self._attempts = [0] * len(self._items)
+        # Indices of the items that still have to be downloaded.
+        self._queue = collections.deque(range(len(self._items)))
+        # Indices of the items of the chunks currently being downloaded.
+        self._chunks = {}
+        self.max_chunk_size_in_mb = max_chunk_size_in_mb
+        self.min_chunk_size_in_mb = min(min_chunk_size_in_mb,
+                                        max_chunk_size_in_mb)
+        self.chunk_size_in_mb = max_chunk_size_in_mb
+        self.max_threads = max(1, max_threads)
+        self.threads = self.max_threads
+        self.max_chunk_length = max_chunk_length
+        self.target_duration = target_duration
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        # Smoothed throughput of a single request in bytes per second.
+        self.throughput = None
+        self._active = 0
+        self._backoff_count = 0
+        self._backoff_until = 0.0
+        self._condition = threading.Condition()
+
+    def next_chunk(self):
+        """
+        Get the next chunk to download.
+
+        Blocks while the data center is backed off from or the current
+        number of parallel requests is reached.
+
+        :returns: A list of items or ``None`` once everything has been
+            downloaded. Has to be passed to the methods reporting the
+            outcome of the download.
+        """
+        with self._condition:
+            while True:
+                if not self._queue and not self._active:
+                    return None
+                wait = self._backoff_until - timeit.default_timer()
+                if self._queue and wait <= 0 and \
+                        self._active < self.threads:
+                    break
+                # Running requests might still put items back into the
+                # queue or increase the allowed number of parallel
+                # requests, they notify the condition once they are done.
+                self._condition.wait(wait if wait > 0 else None)
+            indices = []
+            size = 0.0
+            while self._queue and len(indices) < self.max_chunk_length and \
+                    size < self.chunk_size_in_mb:
+                index = self._queue.popleft()
+                self._attempts[index] += 1
+                indices.append(index)
+                size += self._sizes[index]
+            chunk = [self._items[_i] for _i in indices]
+            self._chunks[id(chunk)] = indices
+            self._active += 1
+            return chunk
+
+    def succeeded(self, chunk, duration, downloaded_bytes):
+        """
+        Report a successful request and adapt the request size to its
+        throughput.
+
+        :param chunk: The chunk as returned by :meth:`next_chunk`.
+        :param duration: The duration of the request in seconds.
+        :param downloaded_bytes: The number of downloaded bytes.
+        """
+        with self._condition:
+            self._finish(chunk)
+            self._backoff_count = 0
+            if downloaded_bytes and duration > 0:
+                throughput = downloaded_bytes / duration
+                if self.throughput is None:
+                    self.throughput = throughput
+                else:
+                    self.throughput = \
+                        0.5 * self.throughput + 0.5 * throughput
+                chunk_size = \
+                    self.throughput * self.target_duration / 1024.0 ** 2
+                self.chunk_size_in_mb = min(
+                    max(chunk_size, self.min_chunk_size_in_mb),
+                    self.max_chunk_size_in_mb)
+            self.threads = min(self.threads + 1, self.max_threads)
+            self._condition.notify_all()
+
+    def throttled(self, chunk):
+        """
+        Report a request the data center refused to serve at the moment.
+        Backs off from the data center and queues the items again.
+
+        :param chunk: The chunk as returned by :meth:`next_chunk`.
+        :returns: The items that will not be tried again.
+        """
+        with self._condition:
+            self.threads = max(1, self.threads // 2)
+            backoff = min(self.initial_backoff * 2 ** self._backoff_count,
+                          self.max_backoff)
+            self._backoff_count += 1
+            self._backoff_until = max(self._backoff_until,
+                                      timeit.default_timer() + backoff)
+            return self._retry(chunk)
+
+    def failed(self, chunk, retry=False):
+        """
+        Report a failed request.
+
+        :param chunk: The chunk as returned by :meth:`next_chunk`.
+        :param retry: Queue the items again to download them with smaller
+            requests.
+        :returns: The items that will not be tried again.
+        """
+        with self._condition:
+            if retry:
+                return self._retry(chunk)
+            self._finish(chunk)
+            self._condition.notify_all()
+            return list(chunk)
+
+    def _retry(self, chunk):
+        self.chunk_size_in_mb = max(self.chunk_size_in_mb / 2.0,
+                                    self.min_chunk_size_in_mb)
+        indices = self._finish(chunk)
+        retried = [_i for _i in indices
+                   if self._attempts[_i] <= self.max_retries]
+        # Keep the original order so adjacent time intervals end up in the
+        # same request again.
+        self._queue.extendleft(reversed(retried))
+        self._condition.notify_all()
+        return [self._items[_i] for _i in indices
+                if self._attempts[_i] > self.max_retries]
+
+    def _finish(self, chunk):
+        self._active -= 1
+        return self._chunks.pop(id(chunk))
+
+
 class SphericalNearestNeighbour(object):
     """
     Spherical nearest neighbour queries using scipy's fast kd-tree
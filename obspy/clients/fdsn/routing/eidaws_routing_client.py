@@ -72,6 +72,10 @@ class EIDAWSRoutingClient(BaseRoutingClient):
         <http://www.orfeus-eu.org/data/eida/webservices/routing/>`_
         for details.
         """
+        split = self._get_waveforms_split(bulk, **kwargs)
+        return self._download_waveforms(split, **kwargs)
+
+    def _get_waveforms_split(self, bulk, **kwargs):
         # Multi-step procedure - first get the stations to be able to use
         # more query parameters - and then construct the waveform string
         # from it.
@@ -114,10 +118,8 @@ class EIDAWSRoutingClient(BaseRoutingClient):
         arguments["format"] = "post"
 
         bulk_str = get_bulk_string(new_bulk, arguments)
-        r = self._download(self._url + "/query", data=bulk_str)
-        split = self._split_routing_response(
-            r.content.decode() if hasattr(r.content, "decode") else r.content)
-        return self._download_waveforms(split, **kwargs)
+        return self._split_routing_response(
+            self._download_routing_response(self._url + "/query", bulk_str))
 
     @_assert_filename_not_in_kwargs
     def get_stations(self, **kwargs):
@@ -164,15 +166,17 @@ class EIDAWSRoutingClient(BaseRoutingClient):
         <http://www.orfeus-eu.org/data/eida/webservices/routing/>`_
         for details.
         """
+        split = self._get_stations_split(bulk, **kwargs)
+        return self._download_stations(split, **kwargs)
+
+    def _get_stations_split(self, bulk, **kwargs):
         arguments = collections.OrderedDict()
         arguments["service"] = "station"
         arguments["format"] = "post"
         arguments["alternative"] = "false"
         bulk_str = get_bulk_string(bulk, arguments)
-        r = self._download(self._url + "/query", data=bulk_str)
-        split = self._split_routing_response(
-            r.content.decode() if hasattr(r.content, "decode") else r.content)
-        return self._download_stations(split, **kwargs)
+        return self._split_routing_response(
+            self._download_routing_response(self._url + "/query", bulk_str))
 
     @staticmethod
     def _split_routing_response(data):
@@ -72,6 +72,10 @@ class FederatorRoutingClient(BaseRoutingClient):
         `IRIS Federator  <https://service.iris.edu/irisws/fedcatalog/1/>`_
         for details.
         """
+        split = self._get_waveforms_split(bulk, **kwargs)
+        return self._download_waveforms(split, **kwargs)
+
+    def _get_waveforms_split(self, bulk, **kwargs):
         bulk_params = ["network", "station", "location", "channel",
                        "starttime", "endtime"]
         for _i in bulk_params:
@@ -84,11 +88,9 @@ class FederatorRoutingClient(BaseRoutingClient):
         params["format"] = "request"
 
         bulk_str = get_bulk_string(bulk, params)
-        r = self._download(self._url + "/query", data=bulk_str)
-        split = self._split_routing_response(
-            r.content.decode() if hasattr(r.content, "decode") else r.content,
+        return self._split_routing_response(
+            self._download_routing_response(self._url + "/query", bulk_str),
             service="dataselect")
-        return self._download_waveforms(split, **kwargs)
 
     @_assert_filename_not_in_kwargs
     def get_stations(self, **kwargs):
@@ -126,6 +128,10 @@ class FederatorRoutingClient(BaseRoutingClient):
         `IRIS Federator  <https://service.iris.edu/irisws/fedcatalog/1/>`_
         for details.
         """
+        split = self._get_stations_split(bulk, **kwargs)
+        return self._download_stations(split, **kwargs)
+
+    def _get_stations_split(self, bulk, **kwargs):
         bulk_params = ["network", "station", "location", "channel",
                        "starttime", "endtime"]
         for _i in bulk_params:
@@ -140,11 +146,9 @@ class FederatorRoutingClient(BaseRoutingClient):
         params["format"] = "request"
 
         bulk_str = get_bulk_string(bulk, params)
-        r = self._download(self._url + "/query", data=bulk_str)
-        split = self._split_routing_response(
-            r.content.decode() if hasattr(r.content, "decode") else r.content,
+        return self._split_routing_response(
+            self._download_routing_response(self._url + "/query", bulk_str),
             service="station")
-        return self._download_stations(split, **kwargs)
 
     @staticmethod
     def _split_routing_response(data, service):
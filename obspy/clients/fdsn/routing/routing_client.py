@@ -14,8 +14,12 @@ Base class for all FDSN routers.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import PY2
 
-from multiprocessing.dummy import Pool as ThreadPool
+import collections
+import os
+import threading
+import time
 
 import decorator
 import warnings
@@ -29,6 +33,15 @@ from .. import client
 from ..client import raise_on_error
 from ..header import FDSNException, URL_MAPPINGS, FDSNNoDataException
 
+if PY2:
+    import Queue as queue
+else:
+    import queue
+
+
+# Maximum number of routing responses cached per routing client.
+ROUTING_CACHE_SIZE = 128
+
 
 def RoutingClient(routing_type, *args, **kwargs):  # NOQA
     """
@@ -120,11 +133,66 @@ def _download_bulk(r):
     for key, value in kwargs.items():
         bulk_str += "%s=%s\n" % (key, str(value))
     try:
+        if r.get("filename"):
+            fct(bulk_str + r["bulk_str"], filename=r["filename"])
+            return r["filename"]
         return fct(bulk_str + r["bulk_str"])
     except FDSNException:
         return None
 
 
+def _imap_unordered(func, items, max_threads, max_pending=1):
+    """
+    Apply a function to all items with a pool of threads, yielding the
+    ``(item, result)`` tuples in the order in which they are completed.
+
+    At most ``max_pending`` results wait for the consumer, threads block
+    until the consumer caught up, so the number of results held in memory
+    is bounded by ``max_threads + max_pending``.
+
+    :param max_threads: Number of threads.
+    :param max_pending: Maximum number of results not yet consumed.
+    """
+    tasks = queue.Queue()
+    for item in items:
+        tasks.put(item)
+    results = queue.Queue(maxsize=max_pending)
+    stop = threading.Event()
+
+    def worker():
+        while not stop.is_set():
+            try:
+                item = tasks.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                result = (item, func(item), None)
+            except Exception as e:
+                result = (item, None, e)
+            # Do not block forever if the consumer went away.
+            while not stop.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    threads = [threading.Thread(target=worker)
+               for _ in range(min(max_threads, len(items)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    try:
+        for _ in range(len(items)):
+            item, result, exception = results.get()
+            if exception is not None:
+                raise exception
+            yield item, result
+    finally:
+        stop.set()
+
+
 def _strip_protocol(url):
     url = urlparse(url)
     return url.netloc + url.path
@@ -135,7 +203,8 @@ def _strip_protocol(url):
 # get_events() but also others).
 class BaseRoutingClient(HTTPClient):
     def __init__(self, debug=False, timeout=120, include_providers=None,
-                 exclude_providers=None, credentials=None):
+                 exclude_providers=None, credentials=None,
+                 routing_cache_max_age=3600.0):
         """
         :type routing_type: str
         :param routing_type: The type of
@@ -160,10 +229,17 @@ class BaseRoutingClient(HTTPClient):
             center specific credentials.
             You can also use a URL mapping as for the normal FDSN client
             instead of the URL.
+        :type routing_cache_max_age: float
+        :param routing_cache_max_age: Responses of the routing service are
+            reused for identical requests for this many seconds. Set to
+            ``0`` to always ask the routing service.
         """
         HTTPClient.__init__(self, debug=debug, timeout=timeout)
         self.include_providers = include_providers
         self.exclude_providers = exclude_providers
+        self.routing_cache_max_age = routing_cache_max_age
+        self._routing_cache = collections.OrderedDict()
+        self._routing_cache_lock = threading.Lock()
 
         # Parse credentials.
         self.credentials = {}
@@ -221,6 +297,52 @@ class BaseRoutingClient(HTTPClient):
 
         return {key_map[k]: split[key_map[k]] for k in f_keys}
 
+    def _download_routing_response(self, url, data):
+        """
+        Send a request to the routing service and return the decoded
+        response. Responses are cached for ``routing_cache_max_age``
+        seconds.
+
+        :param url: The URL of the routing service query.
+        :param data: The payload of the POST request.
+        """
+        key = (url, data)
+        now = time.time()
+        with self._routing_cache_lock:
+            if key in self._routing_cache:
+                stored, content = self._routing_cache.pop(key)
+                if now - stored < self.routing_cache_max_age:
+                    # Reinsert to mark it as recently used.
+                    self._routing_cache[key] = (stored, content)
+                    return content
+
+        r = self._download(url, data=data)
+        content = r.content.decode() if hasattr(r.content, "decode") \
+            else r.content
+
+        if self.routing_cache_max_age > 0:
+            with self._routing_cache_lock:
+                self._routing_cache[key] = (now, content)
+                while len(self._routing_cache) > ROUTING_CACHE_SIZE:
+                    self._routing_cache.popitem(last=False)
+        return content
+
+    def _get_waveforms_split(self, bulk, **kwargs):  # pragma: no cover
+        """
+        Route a bulk waveform request. Returns a dictionary with the root
+        URLs of the fdsnws endpoints as keys and the bulk request strings
+        for them as values.
+        """
+        raise NotImplementedError
+
+    def _get_stations_split(self, bulk, **kwargs):  # pragma: no cover
+        """
+        Route a bulk station request. Returns a dictionary with the root
+        URLs of the fdsnws endpoints as keys and the bulk request strings
+        for them as values.
+        """
+        raise NotImplementedError
+
     def _download_waveforms(self, split, **kwargs):
         return self._download_parallel(split, data_type="waveform", **kwargs)
 
@@ -228,6 +350,36 @@ class BaseRoutingClient(HTTPClient):
         return self._download_parallel(split, data_type="station", **kwargs)
 
     def _download_parallel(self, split, data_type, **kwargs):
+        # Merge all results into a single object.
+        if data_type == "waveform":
+            collection = obspy.Stream()
+        elif data_type == "station":
+            collection = obspy.Inventory(
+                networks=[],
+                source="ObsPy FDSN Routing %s" % obspy.__version__)
+        else:  # pragma: no cover
+            raise ValueError("Invalid data type.")
+
+        for _, result in self._iter_download(split, data_type, **kwargs):
+            collection += result
+
+        return collection
+
+    def _iter_download(self, split, data_type, directory=None,
+                       max_threads=None, **kwargs):
+        """
+        Download from all data centers in parallel and yield ``(url,
+        result)`` tuples for all data centers that returned data, in the
+        order in which the downloads finish.
+
+        :param split: The routed requests, see :meth:`_filter_requests`.
+        :param data_type: ``"waveform"`` or ``"station"``.
+        :param directory: Write the data of each data center to a file in
+            this directory and yield the filenames instead of the parsed
+            data.
+        :param max_threads: Maximum number of parallel downloads. Defaults
+            to one per data center.
+        """
         # Apply the provider filter.
         split = self._filter_requests(split)
 
@@ -239,9 +391,23 @@ class BaseRoutingClient(HTTPClient):
         if data_type not in ["waveform", "station"]:  # pragma: no cover
             raise ValueError("Invalid data type.")
 
-        # One thread per data center.
+        if directory is not None and not os.path.exists(directory):
+            os.makedirs(directory)
+
         dl_requests = []
-        for k, v in split.items():
+        for k, v in sorted(split.items()):
+            if directory is not None:
+                if data_type == "waveform":
+                    extension = "mseed"
+                elif kwargs.get("format") == "text":
+                    extension = "txt"
+                else:
+                    extension = "xml"
+                filename = os.path.join(directory, "%s.%s" % (
+                    _strip_protocol(k).strip("/").replace("/", "_")
+                    .replace(":", "_"), extension))
+            else:
+                filename = None
             dl_requests.append({
                 "debug": self._debug,
                 "timeout": self._timeout,
@@ -249,26 +415,16 @@ class BaseRoutingClient(HTTPClient):
                 "bulk_str": v,
                 "data_type": data_type,
                 "kwargs": kwargs,
-                "credentials": self.credentials})
-        pool = ThreadPool(processes=len(dl_requests))
-        results = pool.map(_download_bulk, dl_requests)
+                "credentials": self.credentials,
+                "filename": filename})
 
-        # Merge all results into a single object.
-        if data_type == "waveform":
-            collection = obspy.Stream()
-        elif data_type == "station":
-            collection = obspy.Inventory(
-                networks=[],
-                source="ObsPy FDSN Routing %s" % obspy.__version__)
-        else:  # pragma: no cover
-            raise ValueError
-
-        for _i in results:
-            if not _i:
-                continue
-            collection += _i
-
-        return collection
+        def _iter():
+            for r, result in _imap_unordered(
+                    _download_bulk, dl_requests,
+                    max_threads=max_threads or len(dl_requests)):
+                if result:
+                    yield r["endpoint"], result
+        return _iter()
 
     def _handle_requests_http_error(self, r):
         """
@@ -310,6 +466,68 @@ class BaseRoutingClient(HTTPClient):
         bulk.extend([starttime, endtime])
         return self.get_waveforms_bulk([bulk], **kwargs)
 
+    @_assert_filename_not_in_kwargs
+    @_assert_attach_response_not_in_kwargs
+    def iter_waveforms_bulk(self, bulk, directory=None, max_threads=None,
+                            **kwargs):
+        """
+        Get waveforms from multiple data centers, yielding the data of each
+        data center as soon as it has been downloaded.
+
+        Unlike :meth:`get_waveforms_bulk` the data of all data centers is
+        not merged into a single :class:`~obspy.core.stream.Stream` so only
+        the data of a few data centers has to be kept in memory at any time
+        and a slow data center does not delay the data of the others.
+
+        >>> from obspy import UTCDateTime
+        >>> client = RoutingClient("iris-federator")
+        >>> t = UTCDateTime(2017, 1, 1)
+        >>> for url, st in client.iter_waveforms_bulk(
+        ...         [("IU", "ANMO", "00", "LHZ", t, t + 60),
+        ...          ("GR", "FUR", "", "LHZ", t, t + 60)]):
+        ...     print(url, len(st))  # doctest: +SKIP
+        http://service.iris.edu 1
+        http://eida.bgr.de 1
+
+        Arguments are the same as for :meth:`get_waveforms_bulk`.
+
+        :type directory: str
+        :param directory: Write the data of each data center to a file in
+            this directory (named after the data center) instead of parsing
+            it. The filenames will be yielded instead of the streams.
+        :type max_threads: int
+        :param max_threads: Maximum number of data centers to download from
+            at the same time. Defaults to all of them.
+        :rtype: generator
+        :returns: ``(url, stream)`` or ``(url, filename)`` tuples for all
+            data centers that returned data, in the order the downloads
+            finish.
+        """
+        split = self._get_waveforms_split(bulk, **kwargs)
+        return self._iter_download(split, data_type="waveform",
+                                   directory=directory,
+                                   max_threads=max_threads, **kwargs)
+
+    @_assert_filename_not_in_kwargs
+    def iter_stations_bulk(self, bulk, directory=None, max_threads=None,
+                           **kwargs):
+        """
+        Get stations from multiple data centers, yielding the data of each
+        data center as soon as it has been downloaded.
+
+        Arguments are the same as for :meth:`get_stations_bulk`, see
+        :meth:`iter_waveforms_bulk` for the additional arguments.
+
+        :rtype: generator
+        :returns: ``(url, inventory)`` or ``(url, filename)`` tuples for all
+            data centers that returned data, in the order the downloads
+            finish.
+        """
+        split = self._get_stations_split(bulk, **kwargs)
+        return self._iter_download(split, data_type="station",
+                                   directory=directory,
+                                   max_threads=max_threads, **kwargs)
+
     def get_service_version(self):
         """
         Return a semantic version number of the remote service as a string.
@@ -12,6 +12,11 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import collections
+import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 
 import obspy
@@ -203,6 +208,95 @@ class BaseRoutingClientTestCase(unittest.TestCase):
         for _i in wf_bulk.call_args_list:
             self.assertEqual(_i[1], {})
 
+    def test_iter_waveforms_bulk(self):
+        """
+        Results are yielded as soon as each data center finished.
+        """
+        split = {
+            "http://slow.com": "1234",
+            "http://fast.com": "1234",
+            "http://medium.com": "1234"}
+        delays = {"http://slow.com": 0.3, "http://fast.com": 0.0,
+                  "http://medium.com": 0.1}
+        active = [0, 0]
+        lock = threading.Lock()
+        # The downloads wait until the expected number of them is running,
+        # so the number of parallel downloads does not depend on timing.
+        expected = [3]
+        all_started = threading.Event()
+
+        def get_client(url, **kwargs):
+            def get_waveforms_bulk(bulk, filename=None):
+                with lock:
+                    active[0] += 1
+                    active[1] = max(active)
+                    if active[0] >= expected[0]:
+                        all_started.set()
+                all_started.wait(5)
+                time.sleep(delays[url])
+                with lock:
+                    active[0] -= 1
+                if filename:
+                    with open(filename, "wb") as fh:
+                        fh.write(url.encode())
+                    return
+                st = obspy.read()
+                st[0].stats.network = url
+                return st[:1]
+            c = mock.MagicMock()
+            c.services = {"dataselect": {}}
+            c.get_waveforms_bulk.side_effect = get_waveforms_bulk
+            return c
+
+        c = self._cls_object()
+        c._get_waveforms_split = lambda bulk, **kwargs: split
+        with mock.patch("obspy.clients.fdsn.client.Client") as p:
+            p.side_effect = get_client
+            results = list(c.iter_waveforms_bulk([]))
+            self.assertEqual(
+                [(_i[0], _i[1][0].stats.network) for _i in results],
+                [("http://fast.com", "http://fast.com"),
+                 ("http://medium.com", "http://medium.com"),
+                 ("http://slow.com", "http://slow.com")])
+            self.assertEqual(active[1], 3)
+
+            # Limit the number of parallel downloads and write to files.
+            active[1] = 0
+            expected[0] = 1
+            directory = tempfile.mkdtemp()
+            try:
+                results = dict(c.iter_waveforms_bulk(
+                    [], directory=directory, max_threads=1))
+                self.assertEqual(active[1], 1)
+                self.assertEqual(results, {
+                    url: os.path.join(directory, url[7:] + ".mseed")
+                    for url in split})
+                for url, filename in results.items():
+                    with open(filename, "rb") as fh:
+                        self.assertEqual(fh.read(), url.encode())
+            finally:
+                shutil.rmtree(directory)
+
+    def test_routing_responses_are_cached(self):
+        c = self._cls_object()
+        with mock.patch(self._cls + "._download") as p:
+            p.return_value = _DummyResponse(content=b"response")
+            for _ in range(3):
+                self.assertEqual(c._download_routing_response(
+                    "http://example.com/query", b"bulk"), "response")
+            self.assertEqual(p.call_count, 1)
+            c._download_routing_response("http://example.com/query",
+                                         b"other bulk")
+            self.assertEqual(p.call_count, 2)
+
+        c = self._cls_object(routing_cache_max_age=0)
+        with mock.patch(self._cls + "._download") as p:
+            p.return_value = _DummyResponse(content=b"response")
+            for _ in range(3):
+                c._download_routing_response("http://example.com/query",
+                                             b"bulk")
+            self.assertEqual(p.call_count, 3)
+
 
 def suite():  # pragma: no cover
     return unittest.makeSuite(BaseRoutingClientTestCase, 'test')
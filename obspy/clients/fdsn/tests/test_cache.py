@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+The obspy.clients.fdsn.cache test suite.
+
+Uses a local HTTP server, so it does not require network access.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import PY2
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from obspy.clients.fdsn import Client
+from obspy.clients.fdsn.cache import HTTPCache
+from obspy.clients.fdsn.client import FDSNSession, download_url
+from obspy.clients.fdsn.header import FDSNException
+
+if PY2:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+else:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Serves the responses in ``server.responses``, a dictionary of paths
+    (without query) to ``(headers, body)`` tuples.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args, **kwargs):
+        pass
+
+    def do_GET(self):  # NOQA
+        self.server.requests.append(
+            (self.path, self.headers.get("If-None-Match")))
+        path = self.path.split("?")[0]
+        if path not in self.server.responses:
+            code, headers, body = 404, {}, b"Not found"
+        else:
+            headers, body = self.server.responses[path]
+            code = 200
+            if headers.get("ETag") and \
+                    headers["ETag"] == self.headers.get("If-None-Match"):
+                code, body = 304, b""
+        self.send_response(code)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class HTTPCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        self.server.requests = []
+        self.server.responses = {}
+        self.url = "http://localhost:%d" % self.server.server_address[1]
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.session = FDSNSession()
+        self.datapath = os.path.join(os.path.dirname(__file__), "data")
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def _get(self, path, cache, **kwargs):
+        return download_url(self.url + path, self.session, cache=cache,
+                            **kwargs)
+
+    def test_normalized_key(self):
+        cache = HTTPCache(self.directory)
+        self.server.responses["/query"] = ({}, b"response")
+        self.assertEqual(self._get("/query?b=1&a=2", cache),
+                         (200, b"response"))
+        self.assertEqual(self._get("/query?a=2&b=1", cache),
+                         (200, b"response"))
+        self.assertEqual(len(self.server.requests), 1)
+        # POST payloads are part of the key
+        self.assertIsNone(cache.lookup(self.url + "/query?a=2&b=1",
+                                       data=b"payload"))
+        self.assertTrue(cache.lookup(self.url + "/query?a=2&b=1")["fresh"])
+
+    def test_cache_headers(self):
+        cache = HTTPCache(self.directory)
+        self.server.responses["/no-store"] = (
+            {"Cache-Control": "no-store"}, b"1")
+        self.server.responses["/max-age"] = (
+            {"Cache-Control": "max-age=0"}, b"2")
+        self.server.responses["/expires"] = (
+            {"Expires": "Thu, 01 Dec 1994 16:00:00 GMT"}, b"3")
+        self.server.responses["/etag"] = (
+            {"Cache-Control": "no-cache", "ETag": '"abc"'}, b"4")
+        for path in ("/no-store", "/max-age", "/expires", "/etag"):
+            for _ in range(2):
+                code, _ = self._get(path, cache)
+                self.assertEqual(code, 200)
+        self.assertIsNone(cache.lookup(self.url + "/no-store"))
+        self.assertFalse(cache.lookup(self.url + "/max-age")["fresh"])
+        self.assertFalse(cache.lookup(self.url + "/expires")["fresh"])
+        # stale responses with an ETag are revalidated
+        self.assertEqual(self.server.requests[-2:],
+                         [("/etag", None), ("/etag", '"abc"')])
+        self.assertEqual(self._get("/etag", cache), (200, b"4"))
+        self.assertEqual(len(self.server.requests), 9)
+
+    def test_eviction(self):
+        cache = HTTPCache(self.directory, max_size_in_mb=3.5 / 1024)
+        now = time.time()
+        for i in range(4):
+            self.server.responses["/%d" % i] = ({}, b"x" * 1024)
+        for i in range(3):
+            self._get("/%d" % i, cache)
+            _, body_file = cache._paths(cache._key(self.url + "/%d" % i))
+            os.utime(body_file, (now - 100 + i, now - 100 + i))
+        # using the oldest response makes it the most recently used one
+        self._get("/0", cache)
+        self._get("/3", cache)
+        self.assertEqual(
+            [i for i in range(4)
+             if cache.lookup(self.url + "/%d" % i) is not None],
+            [0, 2, 3])
+        cache.clear()
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_offline(self):
+        cache = HTTPCache(self.directory, default_max_age=0)
+        self.server.responses["/query"] = ({}, b"response")
+        self._get("/query", cache)
+        offline = HTTPCache(self.directory, offline=True)
+        self.assertEqual(self._get("/query", offline), (200, b"response"))
+        code, data = self._get("/other", offline)
+        self.assertEqual(code, None)
+        self.assertIsInstance(data, FDSNException)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_client(self):
+        """
+        Service discovery and station queries of the client are cached and
+        can be used offline.
+        """
+        with open(os.path.join(self.datapath, "station.wadl"), "rb") as fh:
+            self.server.responses["/fdsnws/station/1/application.wadl"] = \
+                ({}, fh.read())
+        with open(os.path.join(self.datapath, "AU.MEEK.xml"), "rb") as fh:
+            self.server.responses["/fdsnws/station/1/query"] = \
+                ({}, fh.read())
+        client = Client(self.url, cache=self.directory,
+                        service_mappings={"event": None, "dataselect": None})
+        inv = client.get_stations(network="AU", station="MEEK")
+        num_requests = len(self.server.requests)
+        self.server.shutdown()
+
+        # Discovered services are also kept in memory, use a different
+        # mapping to force a new discovery.
+        client = Client(
+            self.url, cache=HTTPCache(self.directory, offline=True),
+            service_mappings={"event": None, "dataselect": None,
+                              "station": self.url + "/fdsnws/station/1"})
+        self.assertEqual(list(client.services), ["station"])
+        self.assertEqual(
+            client.get_stations(station="MEEK", network="AU"), inv)
+        self.assertEqual(len(self.server.requests), num_requests)
+        self.assertRaises(FDSNException, client.get_stations, network="XX")
+
+
+def suite():
+    return unittest.makeSuite(HTTPCacheTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -12,7 +12,6 @@ The obspy.clients.fdsn.client test suite.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
-from future.utils import PY2
 
 import io
 import os
@@ -22,11 +21,6 @@ import unittest
 import warnings
 from difflib import Differ
 
-if PY2:
-    import urllib2 as urllib_request
-else:
-    import urllib.request as urllib_request
-
 import lxml
 import numpy as np
 import requests
@@ -1223,7 +1217,7 @@ class ClientTestCase(unittest.TestCase):
     def test_eida_token_resolution(self):
         """
         Tests that EIDA tokens are resolved correctly and new credentials get
-        installed with the opener of the Client.
+        installed with the session of the Client.
         """
         token = os.path.join(self.datapath, 'eida_token.txt')
         with open(token, 'rb') as fh:
@@ -1239,18 +1233,13 @@ class ClientTestCase(unittest.TestCase):
                 re.match('^[a-zA-Z0-9]{10,}$', value)
 
         def _get_http_digest_auth_handler(client):
-            handlers = [h for h in client._url_opener.handlers
-                        if isinstance(h, urllib_request.HTTPDigestAuthHandler)]
-            self.assertLessEqual(len(handlers), 1)
-            return handlers and handlers[0] or None
+            return client._session.digest_auth
 
         def _assert_credentials(client, user, password):
             handler = _get_http_digest_auth_handler(client)
-            self.assertIsInstance(handler,
-                                  urllib_request.HTTPDigestAuthHandler)
-            for user_, password_ in handler.passwd.passwd[None].values():
-                self.assertEqual(user, user_)
-                self.assertEqual(password, password_)
+            self.assertIsInstance(handler, requests.auth.HTTPDigestAuth)
+            self.assertEqual(user, handler.username)
+            self.assertEqual(password, handler.password)
 
         client = Client('GFZ')
         # this is a plain client, so it should not have http digest auth
@@ -1308,8 +1297,8 @@ class ClientTestCase(unittest.TestCase):
                 # appropriate user/password
                 handler = _get_http_digest_auth_handler(self_)
                 if should_have_credentials:
-                    for user, password in handler.passwd.passwd[None].values():
-                        _assert_eida_user_and_password(user, password)
+                    _assert_eida_user_and_password(handler.username,
+                                                   handler.password)
                 else:
                     self.assertEqual(handler, None)
                 # just always return some dummy stream, we're not
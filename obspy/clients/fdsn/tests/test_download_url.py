@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+The obspy.clients.fdsn.client.download_url test suite.
+
+Uses a local HTTP server, so it does not require network access.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import PY2
+
+import gzip
+import io
+import threading
+import unittest
+
+from obspy.core.util.base import NamedTemporaryFile
+from obspy.clients.fdsn.client import (FDSNSession, download_url,
+                                       raise_on_error)
+from obspy.clients.fdsn.header import (FDSNException, FDSNNoDataException,
+                                       FDSNRedirectException)
+
+if PY2:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+else:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+
+PAYLOAD = "".join("%06d some payload\n" % i for i in range(20000)).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive by default.
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args, **kwargs):
+        pass
+
+    def _send(self, code, body=b"", headers=None):
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, body=None):
+        self.server.requests.append(
+            (self.command, self.path, self.client_address[1], body,
+             self.headers.get("Accept-Encoding"),
+             self.headers.get("Authorization")))
+        if self.path.startswith("/redirect"):
+            self._send(302, headers={"Location": "/data"})
+        elif self.path == "/nodata":
+            self._send(204)
+        elif self.path == "/error":
+            self._send(400, b"Error 400: bad request\n")
+        elif "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            buf = io.BytesIO()
+            with gzip.GzipFile(fileobj=buf, mode="wb") as fh:
+                fh.write(PAYLOAD)
+            self._send(200, buf.getvalue(), {"Content-Encoding": "gzip"})
+        else:
+            self._send(200, PAYLOAD)
+
+    def do_GET(self):  # NOQA
+        self._handle()
+
+    def do_POST(self):  # NOQA
+        length = int(self.headers.get("Content-Length"))
+        self._handle(self.rfile.read(length))
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class DownloadURLTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        self.server.requests = []
+        self.url = "http://127.0.0.1:%d" % self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.session = FDSNSession()
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        for _ in range(5):
+            code, data = download_url(self.url + "/data", self.session,
+                                      use_gzip=False)
+            self.assertEqual(code, 200)
+            self.assertEqual(data, PAYLOAD)
+        ports = set(request[2] for request in self.server.requests)
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(len(ports), 1)
+        self.assertEqual(self.server.requests[0][4], "identity")
+
+    def test_gzip(self):
+        code, data = download_url(self.url + "/data", self.session,
+                                  return_string=False)
+        self.assertEqual(code, 200)
+        self.assertEqual(self.server.requests[0][4], "gzip")
+        self.assertEqual(data.read(), PAYLOAD)
+
+    def test_stream_to_file(self):
+        with NamedTemporaryFile() as tf:
+            code, data = download_url(self.url + "/data", self.session,
+                                      filename=tf.name)
+            self.assertEqual(code, 200)
+            self.assertEqual(data, None)
+            with open(tf.name, "rb") as fh:
+                self.assertEqual(fh.read(), PAYLOAD)
+        buf = io.BytesIO()
+        download_url(self.url + "/data", self.session, filename=buf,
+                     use_gzip=False)
+        self.assertEqual(buf.getvalue(), PAYLOAD)
+
+    def test_errors(self):
+        code, data = download_url(self.url + "/nodata", self.session)
+        self.assertEqual(code, 204)
+        self.assertRaises(FDSNNoDataException, raise_on_error, code, data)
+        # error responses are never written to the file
+        buf = io.BytesIO()
+        code, data = download_url(self.url + "/error", self.session,
+                                  filename=buf)
+        self.assertEqual(code, 400)
+        self.assertEqual(buf.getvalue(), b"")
+        with self.assertRaises(FDSNException) as e:
+            raise_on_error(code, data)
+        self.assertIn("Error 400: bad request", str(e.exception))
+        # connection errors are returned
+        code, data = download_url("http://127.0.0.1:1/data", self.session)
+        self.assertEqual(code, None)
+        self.assertRaises(FDSNException, raise_on_error, code, data)
+
+    def test_redirect(self):
+        """
+        POST requests are redirected including their data.
+        """
+        code, data = download_url(self.url + "/redirect", self.session,
+                                  data=b"bulk request", use_gzip=False)
+        self.assertEqual(code, 200)
+        self.assertEqual(data, PAYLOAD)
+        self.assertEqual(
+            [request[:2] + request[3:4] for request in self.server.requests],
+            [("POST", "/redirect", b"bulk request"),
+             ("POST", "/data", b"bulk request")])
+
+        session = FDSNSession(user="user", password="pw",
+                              follow_redirects=False)
+        code, data = download_url(self.url + "/redirect", session)
+        self.assertEqual(code, None)
+        self.assertIsInstance(data, FDSNRedirectException)
+
+    def test_authentication_is_restricted_to_auth_url(self):
+        session = FDSNSession(user="user", password="pw",
+                              auth_url=self.url + "/data")
+        self.assertIsNotNone(session.get_auth(self.url + "/data"))
+        self.assertIsNone(session.get_auth("http://example.com/data"))
+        self.assertIsNone(FDSNSession().get_auth(self.url + "/data"))
+
+
+def suite():
+    return unittest.makeSuite(DownloadURLTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -16,11 +16,14 @@ from future.utils import native_str
 
 import collections
 import copy
+import functools
 import logging
 import os
 import shutil
 from socket import timeout as socket_timeout
 import tempfile
+import threading
+import time
 import unittest
 
 import numpy as np
@@ -29,15 +32,18 @@ import obspy
 from obspy.core.compatibility import mock
 from obspy.core.util.base import NamedTemporaryFile, SCIPY_VERSION
 from obspy.clients.fdsn import Client
+from obspy.clients.fdsn.header import (FDSNException,
+                                       FDSNTooManyRequestsException)
 from obspy.clients.fdsn.mass_downloader import (domain, Restrictions,
                                                 MassDownloader)
 from obspy.clients.fdsn.mass_downloader.utils import (
     filter_channel_priority, get_stationxml_filename, get_mseed_filename,
     get_stationxml_contents, SphericalNearestNeighbour, safe_delete,
     download_stationxml, download_and_split_mseed_bulk,
-    _get_stationxml_contents_slow)
+    _get_stationxml_contents_slow, AdaptiveChunkScheduler)
 from obspy.clients.fdsn.mass_downloader.download_helpers import (
     Channel, TimeInterval, Station, STATUS, ClientDownloadHelper)
+from obspy.clients.fdsn.mass_downloader.manifest import Manifest
 
 
 class DomainTestCase(unittest.TestCase):
@@ -1035,6 +1041,231 @@ class DownloadHelpersUtilTestCase(unittest.TestCase):
             "status='none')"))
 
 
+class AdaptiveChunkSchedulerTestCase(unittest.TestCase):
+    """
+    Test cases for the scheduler of the MiniSEED downloads.
+    """
+    def _items(self, count):
+        st = obspy.UTCDateTime(2015, 1, 1)
+        return [("A", "A", "", "BHZ", st + _i, st + _i + 1, "file_%i" % _i)
+                for _i in range(count)]
+
+    def test_chunking(self):
+        items = self._items(10)
+        s = AdaptiveChunkScheduler(items, [1.0] * 10,
+                                   max_chunk_size_in_mb=3.0)
+        chunks = [s.next_chunk() for _ in range(3)]
+        self.assertEqual(chunks, [items[:3], items[3:6], items[6:9]])
+        # Only three parallel requests are allowed by default.
+        s.succeeded(chunks[0], 1.0, 0)
+        chunk = s.next_chunk()
+        self.assertEqual(chunk, items[9:])
+        for chunk in chunks[1:] + [chunk]:
+            s.succeeded(chunk, 1.0, 0)
+        self.assertEqual(s.next_chunk(), None)
+
+        # The maximum chunk length is honored.
+        s = AdaptiveChunkScheduler(items, [0.0] * 10, max_chunk_length=4)
+        self.assertEqual(s.next_chunk(), items[:4])
+
+    def test_chunk_size_adapts_to_throughput(self):
+        s = AdaptiveChunkScheduler(self._items(100), [0.5] * 100,
+                                   max_chunk_size_in_mb=20.0,
+                                   min_chunk_size_in_mb=2.0,
+                                   target_duration=10.0)
+        chunk = s.next_chunk()
+        self.assertEqual(len(chunk), 40)
+        # 20 MB in 40 seconds.
+        s.succeeded(chunk, 40.0, 20 * 1024 ** 2)
+        self.assertAlmostEqual(s.chunk_size_in_mb, 5.0)
+        chunk = s.next_chunk()
+        self.assertEqual(len(chunk), 10)
+        s.succeeded(chunk, 1000.0, 1024 ** 2)
+        # Slow requests never go below the minimum size.
+        s.succeeded(s.next_chunk(), 1000.0, 1024 ** 2)
+        self.assertEqual(s.chunk_size_in_mb, 2.0)
+        # Fast ones are capped at the maximum size.
+        s.succeeded(s.next_chunk(), 1.0, 100 * 1024 ** 2)
+        self.assertEqual(s.chunk_size_in_mb, 20.0)
+
+    def test_throttling(self):
+        items = self._items(6)
+        s = AdaptiveChunkScheduler(items, [1.0] * 6, max_chunk_size_in_mb=2,
+                                   max_threads=4, initial_backoff=0.05,
+                                   max_retries=1)
+        chunks = [s.next_chunk() for _ in range(3)]
+        self.assertEqual(s.throttled(chunks[0]), [])
+        self.assertEqual(s.threads, 2)
+        self.assertEqual(s.chunk_size_in_mb, 1.0)
+        self.assertEqual(s.throttled(chunks[1]), [])
+        self.assertEqual(s.threads, 1)
+
+        # The next chunk is only handed out after the backoff time and
+        # once the remaining request finished.
+        timer = threading.Timer(0.01, s.succeeded, (chunks[2], 1.0, 0))
+        timer.start()
+        start = time.time()
+        # Failed time intervals are requested again first, in smaller
+        # chunks.
+        chunk = s.next_chunk()
+        self.assertEqual(chunk, items[2:3])
+        self.assertGreaterEqual(time.time() - start, 0.09)
+        timer.join()
+        self.assertEqual(s.threads, 2)
+
+        # The time intervals are dropped after too many retries.
+        self.assertEqual(s.failed(chunk, retry=True), items[2:3])
+        chunk = s.next_chunk()
+        self.assertEqual(chunk, items[3:4])
+        s.succeeded(chunk, 1.0, 0)
+        self.assertEqual(s.threads, 3)
+        # Other failures are never retried.
+        self.assertEqual(s.failed(s.next_chunk()), items[:1])
+        self.assertEqual(s.next_chunk(), items[1:2])
+
+
+class ManifestTestCase(unittest.TestCase):
+    """
+    Test cases for the SQLite manifest of the mass downloader.
+    """
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.data = os.path.join(os.path.dirname(__file__), "data")
+        self.db = os.path.join(self.tempdir, "manifest.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _write_mseed(self, name):
+        filename = os.path.join(self.tempdir, name)
+        st = obspy.read()
+        st.write(filename, format="MSEED")
+        tr = st[0]
+        return (tr.stats.network, tr.stats.station, tr.stats.location,
+                tr.stats.channel, tr.stats.starttime, tr.stats.endtime,
+                filename)
+
+    def test_mseed_files(self):
+        records = [self._write_mseed("%i.mseed" % _i) for _i in range(3)]
+        manifest = Manifest(self.db)
+        manifest.add_mseed_files(records[:2])
+        manifest.add_mseed_files(records[2:], checksum=False)
+        manifest.close()
+
+        # The records are persistent.
+        manifest = Manifest(self.db)
+        self.assertIn("3 MiniSEED and 0 StationXML files", str(manifest))
+        for record in records:
+            self.assertTrue(manifest.has_mseed(record[-1]))
+            self.assertEqual(tuple(manifest.get_mseed(record[-1])), record)
+        self.assertFalse(manifest.has_mseed("other.mseed"))
+        self.assertIsNone(manifest.get_mseed("other.mseed"))
+
+        self.assertEqual(manifest.verify(checksums=True), [])
+        # Changed and deleted files are dropped.
+        os.remove(records[0][-1])
+        with open(records[1][-1], "ab") as fh:
+            fh.write(b"\x00" * 512)
+        self.assertEqual(manifest.verify(),
+                         [records[0][-1], records[1][-1]])
+        self.assertTrue(manifest.has_mseed(records[2][-1]))
+        self.assertFalse(manifest.has_mseed(records[1][-1]))
+
+        manifest.remove_files([records[2][-1]])
+        self.assertFalse(manifest.has_mseed(records[2][-1]))
+
+    def test_stationxml_contents(self):
+        filename = os.path.join(self.tempdir, "AU.MEEK.xml")
+        shutil.copy(os.path.join(self.data, "AU.MEEK.xml"), filename)
+        manifest = Manifest(self.db)
+        expected = get_stationxml_contents(filename)
+        self.assertEqual(manifest.get_stationxml_contents(filename),
+                         expected)
+        path = "obspy.clients.fdsn.mass_downloader.utils." \
+               "get_stationxml_contents"
+        with mock.patch(path) as p:
+            p.return_value = []
+            # The file is not parsed again.
+            self.assertEqual(manifest.get_stationxml_contents(filename),
+                             expected)
+            self.assertEqual(p.call_count, 0)
+            # Unless requested or changed.
+            self.assertEqual(
+                manifest.get_stationxml_contents(filename, refresh=True), [])
+            self.assertEqual(p.call_count, 1)
+            self.assertEqual(manifest.get_stationxml_contents(filename), [])
+            self.assertEqual(p.call_count, 1)
+            os.utime(filename, (0, 0))
+            manifest.get_stationxml_contents(filename)
+            self.assertEqual(p.call_count, 2)
+
+    def test_prepare_mseed_download(self):
+        """
+        Recorded time intervals exist without checking the storage, existing
+        files are recorded.
+        """
+        record = self._write_mseed("existing.mseed")
+        st = obspy.UTCDateTime(2015, 1, 1)
+        intervals = [TimeInterval(st + _i * 60, st + (_i + 1) * 60)
+                     for _i in range(3)]
+        station = Station(network="TA", station="A001", latitude=1,
+                          longitude=2, channels=[
+                              Channel(location="", channel="BHZ",
+                                      intervals=intervals)])
+        filenames = [os.path.join(self.tempdir, "%i.mseed" % _i)
+                     for _i in range(3)]
+        filenames[1] = record[-1]
+
+        manifest = Manifest(self.db)
+        shutil.copy(record[-1], filenames[0])
+        manifest.add_mseed_files([record[:-1] + (filenames[0],)],
+                                 checksum=False)
+        # The manifest is trusted without looking at the storage.
+        os.remove(filenames[0])
+
+        def mseed_storage(network, station, location, channel, starttime,
+                          endtime):
+            return filenames[intervals.index(
+                [_i for _i in intervals if _i.start == starttime][0])]
+
+        station.prepare_mseed_download(mseed_storage=mseed_storage,
+                                       manifest=manifest)
+        self.assertEqual([_i.status for _i in intervals],
+                         [STATUS.EXISTS, STATUS.EXISTS,
+                          STATUS.NEEDS_DOWNLOADING])
+        record = manifest.get_mseed(filenames[1])
+        self.assertEqual(record.starttime, intervals[1].start)
+        self.assertEqual(record.endtime, intervals[1].end)
+        self.assertFalse(manifest.has_mseed(filenames[2]))
+
+    @mock.patch("logging.Logger.info")
+    def test_download_closes_manifest_opened_from_filename(self, patch_info):
+        """
+        A manifest given as a filename is closed after the download.
+        """
+        dom = domain.RectangularDomain(-10, 10, -20, 20)
+        restrictions = Restrictions(starttime=obspy.UTCDateTime(0),
+                                    endtime=obspy.UTCDateTime(10))
+        # No clients, the manifest is only opened and closed.
+        with mock.patch.object(MassDownloader, "_initialize_clients"):
+            d = MassDownloader(providers=[])
+        with mock.patch.object(Manifest, "close", autospec=True,
+                               side_effect=Manifest.close) as p:
+            d.download(domain=dom, restrictions=restrictions,
+                       mseed_storage="mseed", stationxml_storage="stationxml",
+                       manifest=self.db)
+            self.assertEqual(p.call_count, 1)
+            self.assertEqual(p.call_args[0][0].filename, self.db)
+            # Manifest objects are left open for the caller.
+            manifest = Manifest(self.db)
+            d.download(domain=dom, restrictions=restrictions,
+                       mseed_storage="mseed", stationxml_storage="stationxml",
+                       manifest=manifest)
+            self.assertEqual(p.call_count, 1)
+        self.assertIn("0 MiniSEED and 0 StationXML files", str(manifest))
+        manifest.close()
+
+
 class TimeIntervalTestCase(unittest.TestCase):
     """
     Test cases for the TimeInterval class.
@@ -2142,7 +2373,8 @@ class ClientDownloadHelperTestCase(unittest.TestCase):
 
         c.download_mseed()
         self.assertEqual(patch_check_data.call_count, 1)
-        self.assertEqual(patch_download_mseed.call_count, 1)
+        # Timeouts are retried three times.
+        self.assertEqual(patch_download_mseed.call_count, 4)
         # The error logger should have been called once
         self.assertEqual(c.logger.error.call_count, 1)
 
@@ -2154,6 +2386,22 @@ class ClientDownloadHelperTestCase(unittest.TestCase):
             ("A", "A"): Station("A", "A", 0, 10, copy.deepcopy(channels))
         }
 
+        patch_download_mseed.side_effect = FDSNException("Bad request")
+
+        c.download_mseed()
+        self.assertEqual(patch_check_data.call_count, 1)
+        # Other errors are not retried.
+        self.assertEqual(patch_download_mseed.call_count, 1)
+        self.assertEqual(c.logger.error.call_count, 1)
+
+        patch_check_data.reset_mock()
+        patch_download_mseed.reset_mock()
+        c.logger.reset_mock()
+        c = self._init_client()
+        c.stations = {
+            ("A", "A"): Station("A", "A", 0, 10, copy.deepcopy(channels))
+        }
+
         patch_download_mseed.side_effect = socket_timeout("no data available")
 
         c.download_mseed()
@@ -2163,6 +2411,95 @@ class ClientDownloadHelperTestCase(unittest.TestCase):
         # is just an info message.
         self.assertEqual(c.logger.error.call_count, 0)
 
+    @mock.patch("obspy.clients.fdsn.mass_downloader."
+                "utils.download_and_split_mseed_bulk")
+    @mock.patch("obspy.clients.fdsn.mass_downloader."
+                "download_helpers.ClientDownloadHelper._check_downloaded_data")
+    def test_download_mseed_throttled(self, patch_check_data,
+                                      patch_download_mseed):
+        """
+        Throttled requests are downloaded again after backing off.
+        """
+        patch_check_data.return_value = (20, 5)
+
+        def throttle_once(client, client_name, chunk, logger):
+            if patch_download_mseed.call_count == 1:
+                raise FDSNTooManyRequestsException("Slow down")
+            return []
+        patch_download_mseed.side_effect = throttle_once
+
+        st = obspy.UTCDateTime(2015, 1, 1)
+        intervals = [TimeInterval(st + _i * 1800, st + (_i + 1) * 1800,
+                                  filename="file_%i" % _i,
+                                  status=STATUS.NEEDS_DOWNLOADING)
+                     for _i in range(4)]
+        c = self._init_client()
+        c.stations = {
+            ("A", "A"): Station("A", "A", 0, 10, [
+                Channel(location="", channel="BHZ", intervals=intervals)])}
+
+        with mock.patch("obspy.clients.fdsn.mass_downloader.utils."
+                        "AdaptiveChunkScheduler",
+                        functools.partial(AdaptiveChunkScheduler,
+                                          initial_backoff=0.01)):
+            c.download_mseed()
+        self.assertEqual(patch_download_mseed.call_count, 2)
+        self.assertEqual(
+            patch_download_mseed.call_args_list[0][0][2],
+            patch_download_mseed.call_args_list[1][0][2])
+        self.assertEqual(c.logger.warning.call_count, 1)
+        self.assertEqual(c.logger.error.call_count, 0)
+
+    @mock.patch("obspy.clients.fdsn.mass_downloader."
+                "utils.download_and_split_mseed_bulk")
+    @mock.patch("obspy.clients.fdsn.mass_downloader."
+                "download_helpers.ClientDownloadHelper._check_downloaded_data")
+    def test_download_mseed_unexpected_error(self, patch_check_data,
+                                             patch_download_mseed):
+        """
+        Unexpected errors of a download thread do not leave the other
+        threads waiting and are raised again.
+        """
+        patch_check_data.return_value = (20, 5)
+
+        def fail_once(client, client_name, chunk, logger):
+            if patch_download_mseed.call_count == 1:
+                raise OSError("Disk full")
+            time.sleep(0.01)
+            return []
+        patch_download_mseed.side_effect = fail_once
+
+        st = obspy.UTCDateTime(2015, 1, 1)
+        intervals = [TimeInterval(st + _i * 1800, st + (_i + 1) * 1800,
+                                  filename="file_%i" % _i,
+                                  status=STATUS.NEEDS_DOWNLOADING)
+                     for _i in range(20)]
+        c = self._init_client()
+        c.stations = {
+            ("A", "A"): Station("A", "A", 0, 10, [
+                Channel(location="", channel="BHZ", intervals=intervals)])}
+
+        errors = []
+
+        def download():
+            try:
+                # Tiny chunks, so every time interval is requested alone.
+                c.download_mseed(chunk_size_in_mb=1e-6, threads_per_client=3)
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=download)
+        thread.daemon = True
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], OSError)
+        self.assertEqual(str(errors[0]), "Disk full")
+        # The remaining threads stop instead of downloading everything.
+        self.assertLess(patch_download_mseed.call_count, 20)
+        self.assertEqual(patch_check_data.call_count, 0)
+
     @mock.patch("obspy.clients.fdsn.mass_downloader."
                 "utils.download_stationxml")
     @mock.patch("obspy.clients.fdsn.mass_downloader."
@@ -2754,6 +3091,9 @@ def suite():
     testsuite = unittest.TestSuite()
     testsuite.addTest(unittest.makeSuite(DomainTestCase, 'test'))
     testsuite.addTest(unittest.makeSuite(DownloadHelpersUtilTestCase, 'test'))
+    testsuite.addTest(unittest.makeSuite(AdaptiveChunkSchedulerTestCase,
+                                         'test'))
+    testsuite.addTest(unittest.makeSuite(ManifestTestCase, 'test'))
     testsuite.addTest(unittest.makeSuite(TimeIntervalTestCase, 'test'))
     testsuite.addTest(unittest.makeSuite(ChannelTestCase, 'test'))
     testsuite.addTest(unittest.makeSuite(StationTestCase, 'test'))
@@ -14,6 +14,7 @@ from future.builtins import *  # NOQA
 
 import io
 import socket
+import threading
 import traceback
 from time import sleep
 
@@ -22,6 +23,12 @@ from .util import ascdate, asctime
 from ..httpproxy import get_proxy_tuple, http_proxy_connect
 
 
+# CWB QueryServer responses consist of 512 byte MiniSEED records
+RECORD_LENGTH = 512
+# received records are decoded in batches of this many bytes
+DECODE_SIZE = 2048 * RECORD_LENGTH
+
+
 class Client(object):
     """
     NEIC CWB QueryServer request client for waveform data
@@ -36,6 +43,16 @@ class Client(object):
         (default is ``30``)
     :type debug: bool, optional
     :param debug: if ``True``, print debug information (default is ``False``)
+    :type max_retries: int, optional
+    :param max_retries: Number of times a query is sent again after a
+        connection failure or timeout (default is ``3``).
+    :type retry_delay: float, optional
+    :param retry_delay: Seconds to wait before the first retry of a query,
+        doubled for every further retry (default is ``1.0``).
+
+    Connections to the server are kept open and reused for later queries.
+    Connections closed by the server in the meantime are opened again. Use
+    :meth:`close` or the client as a context manager to close them.
 
     .. rubric:: Example
 
@@ -56,7 +73,7 @@ class Client(object):
     IU.ANMO.00.BH... | 20.0 Hz, 201 samples
     """
     def __init__(self, host="137.227.224.97", port=2061, timeout=30,
-                 debug=False):
+                 debug=False, max_retries=3, retry_delay=1.0):
         """
         Initializes access to a CWB QueryServer
         """
@@ -67,7 +84,54 @@ class Client(object):
         self.port = port
         self.timeout = timeout
         self.debug = debug
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
         self.proxy = get_proxy_tuple()
+        # idle connections
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        Close all idle connections to the server.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for s in connections:
+            s.close()
+
+    def _connect(self):
+        """
+        Open a new connection to the server, routed through the HTTP proxy
+        if one is configured.
+        """
+        if self.proxy:
+            proxy = (self.proxy.hostname, self.proxy.port)
+            auth = ((self.proxy.username, self.proxy.password) if
+                    self.proxy.username else None)
+            s, _, _ = http_proxy_connect((self.host, self.port), proxy, auth)
+            # This socket is already connected to the proxy
+        else:
+            s = socket.create_connection((self.host, self.port),
+                                         self.timeout)
+        s.settimeout(self.timeout)
+        return s
+
+    def _get_connection(self):
+        """
+        Returns an idle or a new connection and whether it has been used
+        before.
+        """
+        with self._lock:
+            if self._connections:
+                return self._connections.pop(), True
+        return self._connect(), False
 
     def get_waveforms(self, network, station, location, channel, starttime,
                       endtime):
@@ -116,6 +180,15 @@ class Client(object):
         IU.ANMO.00.BH... | 20.0 Hz, 201 samples
         IU.ANMO.00.BH... | 20.0 Hz, 201 samples
         """
+        seedname = self._get_seedname(network, station, location, channel)
+        return self.get_waveforms_nscl(seedname, starttime,
+                                       endtime - starttime)
+
+    @staticmethod
+    def _get_seedname(network, station, location, channel):
+        """
+        Builds the 12 character seedname expression of a query.
+        """
         # padding channel with spaces does not make sense
         if len(channel) < 3 and channel != ".*":
             msg = "channel expression matches less than 3 characters " + \
@@ -123,9 +196,7 @@ class Client(object):
             raise Exception(msg)
         seedname = '%-2s%-5s%s%-2s' % (network, station, channel, location)
         # allow UNIX style "?" wildcard
-        seedname = seedname.replace("?", ".")
-        return self.get_waveforms_nscl(seedname, starttime,
-                                       endtime - starttime)
+        return seedname.replace("?", ".")
 
     def get_waveforms_nscl(self, seedname, starttime, duration):
         """
@@ -173,82 +244,156 @@ class Client(object):
         if self.debug:
             print(ascdate() + " " + asctime() + " line=" + line)
 
-        # prepare for routing through http_proxy_connect
-        address = (self.host, self.port)
-        if self.proxy:
-            proxy = (self.proxy.hostname, self.proxy.port)
-            auth = ((self.proxy.username, self.proxy.password) if
-                    self.proxy.username else None)
-
-        success = False
-        while not success:
+        retries = 0
+        while True:
+            s, reused = self._get_connection()
             try:
-                if self.proxy:
-                    s, _, _ = http_proxy_connect(address, proxy, auth)
-                    # This socket is already connected to the proxy
-                else:
-                    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    s.connect((self.host, self.port))
-
-                with io.BytesIO() as tf:
-                    s.setblocking(0)
-                    s.send(line.encode('ascii', 'strict'))
-                    if self.debug:
-                        print(ascdate(), asctime(), "Connected - start reads")
-                    slept = 0
-                    maxslept = self.timeout / 0.05
-                    totlen = 0
-                    while True:
-                        try:
-                            # Recommended bufsize is a small power of 2.
-                            data = s.recv(4096)
-                            if self.debug:
-                                print(ascdate(), asctime(), "read len",
-                                      str(len(data)), " total", str(totlen))
-                            _pos = data.find(b"<EOR>")
-                            # <EOR> can be after every 512 bytes which seems to
-                            # be the record length cwb query uses.
-                            if _pos >= 0 and (_pos + totlen) % 512 == 0:
-                                if self.debug:
-                                    print(ascdate(), asctime(), b"<EOR> seen")
-                                tf.write(data[0:_pos])
-                                totlen += len(data[0:_pos])
-                                tf.seek(0)
-                                try:
-                                    st = read(tf, 'MSEED')
-                                except Exception as e:
-                                    st = Stream()
-                                st.trim(starttime, starttime + duration)
-                                s.close()
-                                success = True
-                                break
-                            else:
-                                totlen += len(data)
-                                tf.write(data)
-                                slept = 0
-                        except socket.error as e:
-                            if slept > maxslept:
-                                print(ascdate(), asctime(),
-                                      "Timeout on connection",
-                                      "- try to reconnect")
-                                slept = 0
-                                s.close()
-                            sleep(0.05)
-                            slept += 1
-            except socket.error as e:
-                print(traceback.format_exc())
-                print("CWB QueryServer at " + self.host + "/" + str(self.port))
+                st = self._query(s, line)
+            except socket.error:
+                s.close()
+                # connections might have been closed by the server while
+                # they were idle, these do not count as retries
+                if reused:
+                    continue
+                if retries >= self.max_retries:
+                    print(traceback.format_exc())
+                    print("CWB QueryServer at " + self.host + "/" +
+                          str(self.port))
+                    raise
+                if self.debug:
+                    print(ascdate(), asctime(), "Connection failed",
+                          "- try to reconnect")
+                sleep(self.retry_delay * 2 ** retries)
+                retries += 1
+                continue
+            except Exception:
+                s.close()
                 raise
-            except Exception as e:
-                print(traceback.format_exc())
-                print("**** exception found=" + str(e))
-                raise
-        if self.debug:
-            print(ascdate() + " " + asctime() + " success?  len=" +
-                  str(totlen))
+            with self._lock:
+                self._connections.append(s)
+            break
+        st.trim(starttime, starttime + duration)
         st.merge(-1)
         return st
 
+    def _query(self, s, line):
+        """
+        Sends a query over an open connection and decodes the MiniSEED
+        records of the response in batches while they are received.
+        """
+        s.sendall(line.encode('ascii', 'strict'))
+        if self.debug:
+            print(ascdate(), asctime(), "Connected - start reads")
+        st = Stream()
+        buf = b""
+        # offset of the first record not checked for the end of the response
+        pos = 0
+        totlen = 0
+        while True:
+            while len(buf) - pos >= 5:
+                # <EOR> can be after every 512 bytes which seems to be the
+                # record length cwb query uses.
+                if buf[pos:pos + 5] == b"<EOR>":
+                    if self.debug:
+                        print(ascdate(), asctime(), "<EOR> seen")
+                    st += self._decode(buf[:pos])
+                    if self.debug:
+                        print(ascdate() + " " + asctime() +
+                              " success?  len=" + str(totlen + pos))
+                    return st
+                if len(buf) - pos < RECORD_LENGTH:
+                    break
+                pos += RECORD_LENGTH
+            if pos >= DECODE_SIZE:
+                st += self._decode(buf[:pos])
+                buf = buf[pos:]
+                totlen += pos
+                pos = 0
+            # Recommended bufsize is a small power of 2.
+            data = s.recv(65536)
+            if not data:
+                raise socket.error("connection closed by CWB QueryServer")
+            if self.debug:
+                print(ascdate(), asctime(), "read len", str(len(data)),
+                      " total", str(totlen + len(buf)))
+            buf += data
+
+    def _decode(self, data):
+        """
+        Decodes complete MiniSEED records, returns an empty Stream if that
+        fails.
+        """
+        if not data:
+            return Stream()
+        try:
+            return read(io.BytesIO(data), 'MSEED')
+        except Exception as e:
+            if self.debug:
+                print(ascdate(), asctime(), "**** exception found=" + str(e))
+            return Stream()
+
+    def get_waveforms_bulk(self, bulk, max_threads=4):
+        """
+        Gets waveforms for many channels and time intervals at once.
+
+        The queries are distributed over up to ``max_threads`` connections
+        to the server that are served in parallel.
+
+        :type bulk: list
+        :param bulk: List of ``(network, station, location, channel,
+            starttime, endtime)`` tuples, see :meth:`get_waveforms`.
+        :type max_threads: int
+        :param max_threads: Maximum number of parallel queries.
+        :rtype: :class:`~obspy.core.stream.Stream`
+        :returns: Stream object with requested data in the order of the
+            queries.
+
+        .. rubric:: Example
+
+        >>> from obspy.clients.neic import Client
+        >>> client = Client()
+        >>> t = UTCDateTime() - 5 * 3600  # 5 hours before now
+        >>> bulk = [("IU", "ANMO", "00", "BH?", t, t + 10),
+        ...         ("IU", "COLA", "00", "BH?", t, t + 10)]
+        >>> st = client.get_waveforms_bulk(bulk)
+        >>> print(st)  # doctest: +SKIP
+        6 Trace(s) in Stream:
+        IU.ANMO.00.BH1 | ... | 20.0 Hz, 201 samples
+        ...
+        """
+        queries = [(self._get_seedname(*args[:4]), args[4],
+                    args[5] - args[4]) for args in bulk]
+        results = [None] * len(queries)
+        errors = []
+        lock = threading.Lock()
+        todo = list(range(len(queries)))[::-1]
+
+        def _worker():
+            while True:
+                with lock:
+                    if errors or not todo:
+                        return
+                    i = todo.pop()
+                try:
+                    results[i] = self.get_waveforms_nscl(*queries[i])
+                except Exception as e:
+                    with lock:
+                        errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=_worker)
+                   for _ in range(max(1, min(max_threads, len(queries))))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        st = Stream()
+        for st_query in results:
+            st += st_query
+        return st
+
 
 if __name__ == '__main__':
     import doctest
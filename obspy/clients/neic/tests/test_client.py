@@ -5,12 +5,25 @@ The obspy.clients.neic.client test suite.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import PY2
 
+import io
+import re
+import threading
 import unittest
 
+import numpy as np
+
+from obspy import Trace
+from obspy.core.compatibility import mock
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.clients.neic import Client
 
+if PY2:
+    from SocketServer import BaseRequestHandler, ThreadingTCPServer
+else:
+    from socketserver import BaseRequestHandler, ThreadingTCPServer
+
 
 class ClientTestCase(unittest.TestCase):
     """
@@ -106,8 +119,133 @@ class ClientTestCase(unittest.TestCase):
             self.assertEqual(st, st2)
 
 
+class _Handler(BaseRequestHandler):
+    """
+    Answers queries with 512 byte MiniSEED records of 20 Hz data of the
+    requested seedname.
+    """
+    def handle(self):
+        self.server.connections.append(self.client_address)
+        buf = b""
+        num_responses = 0
+        while True:
+            if b"\t" not in buf:
+                data = self.request.recv(4096)
+                if not data:
+                    break
+                buf += data
+                continue
+            line, buf = buf.split(b"\t", 1)
+            self.server.queries.append(line)
+            if self.server.failures:
+                self.server.failures -= 1
+                break
+            seedname, start, duration = re.match(
+                r"'-dbg' '-s' '(.*)' '-b' '(.*)' '-d' '(.*)'",
+                line.decode()).groups()
+            start = UTCDateTime(start)
+            tr = Trace(data=np.arange(int(float(duration) * 20) + 40,
+                                      dtype=np.int32))
+            tr.stats.network = seedname[:2].strip()
+            tr.stats.station = seedname[2:7].strip()
+            tr.stats.channel = seedname[7:10]
+            tr.stats.location = seedname[10:12].strip()
+            tr.stats.sampling_rate = 20.0
+            tr.stats.starttime = start - 1
+            records = io.BytesIO()
+            tr.write(records, format="MSEED", reclen=512)
+            self.request.sendall(records.getvalue() + b"<EOR>")
+            num_responses += 1
+            if num_responses == self.server.max_responses:
+                break
+
+
+class _Server(ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class LocalServerTestCase(unittest.TestCase):
+    """
+    Test cases for obspy.clients.neic.client.Client against a local server.
+    """
+    def setUp(self):
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        self.server.connections = []
+        self.server.queries = []
+        self.server.failures = 0
+        self.server.max_responses = None
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.client = Client("127.0.0.1", self.server.server_address[1],
+                             timeout=10, retry_delay=0.01)
+        self.client.proxy = None
+        self.t = UTCDateTime(2018, 1, 1)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _check(self, st, ids, duration):
+        self.assertEqual([tr.id for tr in st], ids)
+        for tr in st:
+            self.assertEqual(tr.stats.starttime, self.t)
+            self.assertEqual(tr.stats.endtime, self.t + duration)
+            np.testing.assert_array_equal(
+                tr.data, np.arange(20, 20 + len(tr)))
+
+    def test_connections_are_reused(self):
+        for _ in range(3):
+            st = self.client.get_waveforms("IU", "ANMO", "00", "BHZ",
+                                           self.t, self.t + 10)
+            self._check(st, ["IU.ANMO.00.BHZ"], 10)
+        # long responses are decoded in several batches
+        with mock.patch("obspy.clients.neic.client.DECODE_SIZE", 1024):
+            st = self.client.get_waveforms_nscl("IUANMO BHZ00", self.t, 1000)
+        self.assertEqual(len(st), 1)
+        self._check(st, ["IU.ANMO.00.BHZ"], 1000)
+        self.assertEqual(len(self.server.queries), 4)
+        self.assertEqual(len(self.server.connections), 1)
+
+    def test_retries(self):
+        # connections closed by the server are opened again
+        self.server.max_responses = 1
+        for _ in range(3):
+            st = self.client.get_waveforms("IU", "ANMO", "00", "BHZ",
+                                           self.t, self.t + 10)
+            self._check(st, ["IU.ANMO.00.BHZ"], 10)
+        self.assertEqual(len(self.server.connections), 3)
+        self.client.close()
+        # transient failures
+        self.server.failures = 2
+        st = self.client.get_waveforms("IU", "ANMO", "00", "BHZ",
+                                       self.t, self.t + 10)
+        self._check(st, ["IU.ANMO.00.BHZ"], 10)
+        self.assertEqual(len(self.server.connections), 6)
+        self.server.failures = 10
+        self.client.close()
+        self.assertRaises(Exception, self.client.get_waveforms, "IU", "ANMO",
+                          "00", "BHZ", self.t, self.t + 10)
+        self.assertEqual(self.server.failures, 6)
+
+    def test_get_waveforms_bulk(self):
+        stations = ["STA%02d" % i for i in range(20)]
+        bulk = [("XX", sta, "", "BHZ", self.t, self.t + 5)
+                for sta in stations]
+        st = self.client.get_waveforms_bulk(bulk, max_threads=5)
+        self._check(st, ["XX.%s..BHZ" % sta for sta in stations], 5)
+        self.assertLessEqual(len(self.server.connections), 5)
+        self.assertEqual(len(self.client._connections),
+                         len(self.server.connections))
+
+
 def suite():
-    return unittest.makeSuite(ClientTestCase, 'test')
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ClientTestCase, 'test'))
+    suite.addTest(unittest.makeSuite(LocalServerTestCase, 'test'))
+    return suite
 
 
 if __name__ == '__main__':
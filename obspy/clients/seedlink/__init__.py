@@ -11,7 +11,9 @@ For simple requests of finite time windows see
 data streams see
 :class:`~obspy.clients.seedlink.easyseedlink.EasySeedLinkClient`, or for
 lower-level packet handling see
-:class:`~obspy.clients.seedlink.slclient.SLClient`.
+:class:`~obspy.clients.seedlink.slclient.SLClient`. To collect data from many
+SeedLink servers in a single thread see
+:class:`~obspy.clients.seedlink.multiplexer.SeedLinkMultiplexer`.
 
 :copyright:
     The ObsPy Development Team (devs@obspy.org) & Anthony Lomax
@@ -864,76 +864,9 @@ class SeedLinkConnection(object):
                not (self.state.state == SLState.SL_DOWN):
 
                 # Process data in buffer
-                while self.state.packet_available():
-                    slpacket = None
-                    sendpacket = True
-
-                    # Check for an INFO packet
-                    if self.state.packet_is_info():
-                        temp = self.state.sendptr + SLPacket.SLHEADSIZE - 1
-                        terminator = chr(self.state.databuf[temp]) != '*'
-                        if not self.state.expect_info:
-                            msg = "unexpected INFO packet received, skipping"
-                            logger.error(msg)
-                        else:
-                            if terminator:
-                                self.state.expect_info = False
-
-                            # Keep alive packets are not returned
-                            if self.state.query_mode == \
-                               SLState.KEEP_ALIVE_QUERY:
-                                sendpacket = False
-                                if not terminator:
-                                    logger.error(
-                                        "non-terminated " +
-                                        "keep-alive packet received!?!")
-                                else:
-                                    logger.debug("keepalive packet received")
-                            else:
-                                slpacket = self.state.get_packet()
-                                # construct info String
-                                packet_type = slpacket.get_type()
-                                # print("DEBUG: slpacket.get_type():",
-                                #       slpacket.get_type())
-                                # print("DEBUG: SLPacket.TYPE_SLINF:",
-                                #       SLPacket.TYPE_SLINF)
-                                # print("DEBUG: SLPacket.TYPE_SLINFT:",
-                                #       SLPacket.TYPE_SLINFT)
-                                data = slpacket.get_string_payload()
-                                self.info_response_buffer.write(data)
-
-                                if (packet_type == SLPacket.TYPE_SLINFT):
-                                    # Terminated INFO response packet
-                                    # -> build complete INFO response string,
-                                    #    strip NULL bytes from the end
-                                    self.info_string = \
-                                        self.info_response_buffer.getvalue().\
-                                        decode('ASCII', errors='ignore').\
-                                        replace("><", ">\n<").rstrip('\x00')
-
-                                    self.info_response_buffer = io.BytesIO()
-                        self.state.query_mode = SLState.NO_QUERY
-                    else:
-                        # Get packet and update the stream chain entry if not
-                        # an INFO packet
-                        try:
-                            slpacket = self.state.get_packet()
-                            self.update_stream(slpacket)
-                            if self.statefile is not None:
-                                self.save_state(self.statefile)
-                        except SeedLinkException as sle:
-                            logger.error("bad packet: %s" % (sle))
-                            sendpacket = False
-
-                    # Increment the send pointer
-                    self.state.increment_send_pointer()
-
-                    # After processing the packet buffer shift the data
-                    self.state.pack_data_buffer()
-
-                    # Return packet
-                    if sendpacket:
-                        return slpacket
+                slpacket = self.get_buffered_packet()
+                if slpacket is not None:
+                    return slpacket
 
                 # A trap door for terminating, all complete data packets from
                 # the buffer have been sent to the caller we are terminating
@@ -1024,6 +957,90 @@ class SeedLinkConnection(object):
                         self.state.netdly_trig = 0
         # End of primary loop
 
+    def get_buffered_packet(self):
+        """
+        Process the packets in the receive buffer until a packet is found
+        that has to be returned to the caller.
+
+        INFO packets are collected into the INFO response string, keepalive
+        responses are consumed and the stream chain (and the state file, if
+        used) is updated for data packets.
+
+        :return: the next SLPacket to return to the caller or None if the
+            buffer does not contain such a packet.
+        """
+        while self.state.packet_available():
+            slpacket = None
+            sendpacket = True
+
+            # Check for an INFO packet
+            if self.state.packet_is_info():
+                temp = self.state.sendptr + SLPacket.SLHEADSIZE - 1
+                terminator = chr(self.state.databuf[temp]) != '*'
+                if not self.state.expect_info:
+                    msg = "unexpected INFO packet received, skipping"
+                    logger.error(msg)
+                else:
+                    if terminator:
+                        self.state.expect_info = False
+
+                    # Keep alive packets are not returned
+                    if self.state.query_mode == \
+                       SLState.KEEP_ALIVE_QUERY:
+                        sendpacket = False
+                        if not terminator:
+                            logger.error(
+                                "non-terminated " +
+                                "keep-alive packet received!?!")
+                        else:
+                            logger.debug("keepalive packet received")
+                    else:
+                        slpacket = self.state.get_packet()
+                        # construct info String
+                        packet_type = slpacket.get_type()
+                        # print("DEBUG: slpacket.get_type():",
+                        #       slpacket.get_type())
+                        # print("DEBUG: SLPacket.TYPE_SLINF:",
+                        #       SLPacket.TYPE_SLINF)
+                        # print("DEBUG: SLPacket.TYPE_SLINFT:",
+                        #       SLPacket.TYPE_SLINFT)
+                        data = slpacket.get_string_payload()
+                        self.info_response_buffer.write(data)
+
+                        if (packet_type == SLPacket.TYPE_SLINFT):
+                            # Terminated INFO response packet
+                            # -> build complete INFO response string,
+                            #    strip NULL bytes from the end
+                            self.info_string = \
+                                self.info_response_buffer.getvalue().\
+                                decode('ASCII', errors='ignore').\
+                                replace("><", ">\n<").rstrip('\x00')
+
+                            self.info_response_buffer = io.BytesIO()
+                self.state.query_mode = SLState.NO_QUERY
+            else:
+                # Get packet and update the stream chain entry if not
+                # an INFO packet
+                try:
+                    slpacket = self.state.get_packet()
+                    self.update_stream(slpacket)
+                    if self.statefile is not None:
+                        self.save_state(self.statefile)
+                except SeedLinkException as sle:
+                    logger.error("bad packet: %s" % (sle))
+                    sendpacket = False
+
+            # Increment the send pointer
+            self.state.increment_send_pointer()
+
+            # After processing the packet buffer shift the data
+            self.state.pack_data_buffer()
+
+            # Return packet
+            if sendpacket:
+                return slpacket
+        return None
+
     def connect(self):
         """
         Open a network socket connection to a SeedLink server. Expects sladdr
@@ -1064,7 +1081,8 @@ class SeedLinkConnection(object):
 
             # socket connected
             logger.info("network socket opened")
-            self.socket.settimeout(self.netto)
+            # a timeout of 0 would make the socket non-blocking
+            self.socket.settimeout(self.netto if self.netto > 0 else None)
 
         except Exception as e:
             msg = "cannot connect to SeedLink server: %s"
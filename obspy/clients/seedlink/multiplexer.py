@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+Module to collect data from many SeedLink servers in a single thread.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import native_str
+
+import logging
+import select
+import time
+
+from obspy.core.utcdatetime import UTCDateTime
+from .client.seedlinkconnection import SeedLinkConnection
+from .client.slstate import SLState
+from .seedlinkexception import SeedLinkException
+
+
+# default logger
+logger = logging.getLogger('obspy.clients.seedlink')
+
+
+class SeedLinkMultiplexer(object):
+    """
+    Collect data packets from many SeedLink servers in a single thread.
+
+    Each server is handled by its own
+    :class:`~obspy.clients.seedlink.client.seedlinkconnection.SeedLinkConnection`
+    which takes care of the protocol negotiation (multi-station selection,
+    resuming from sequence numbers and state files). Instead of polling every
+    connection in a separate :meth:`collect()
+    <obspy.clients.seedlink.client.seedlinkconnection.SeedLinkConnection.collect>`
+    loop, the sockets of all connections in data transfer mode are waited on
+    together with :func:`select.select`, so idle connections do not use any
+    CPU time. Keepalive requests, network timeouts and reconnects are
+    scheduled per connection.
+
+    Packets are handed out by iterating over the multiplexer (or over
+    :meth:`iter_packets`), which yields tuples of the connection the packet
+    was received on and the
+    :class:`~obspy.clients.seedlink.slpacket.SLPacket`.
+
+    .. rubric:: Example
+
+    .. code-block:: python
+
+        from obspy.clients.seedlink.multiplexer import SeedLinkMultiplexer
+
+        multiplexer = SeedLinkMultiplexer()
+        multiplexer.add_server('geofon.gfz-potsdam.de:18000',
+                               [('GE', 'WLF', 'BH?'), ('GE', 'APE', 'BHZ')],
+                               statefile='geofon.state', keepalive=30)
+        multiplexer.add_server('rtserve.iris.washington.edu:18000',
+                               [('IU', 'ANMO', 'BHZ')])
+        for connection, packet in multiplexer:
+            print(connection.get_sl_address(), packet.get_trace())
+
+    .. note::
+
+        Connecting to a server and negotiating the selected streams is still
+        done with the blocking methods of the connection, i.e. while a server
+        is (re)connected the other connections are not serviced. In-stream
+        ``INFO`` requests are not supported.
+
+    :type timeout: float
+    :param timeout: Time in seconds after which iterating over packets is
+        stopped. Default is to run until all connections are finished or
+        :meth:`terminate` is called.
+    :type max_wait: float
+    :param max_wait: Maximum time in seconds to wait for new data before
+        checking timers and the terminate flag again.
+    """
+    DEFAULT_PORT = 18000
+
+    def __init__(self, timeout=None, max_wait=1.0):
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.connections = []
+        self.terminate_flag = False
+        self._timers = {}
+
+    def add_server(self, server_url, streams, statefile=None, keepalive=0,
+                   netto=120, netdly=30, begin_time=None, end_time=None):
+        """
+        Add a SeedLink server to collect data from.
+
+        :type server_url: str
+        :param server_url: The SeedLink server address in ``host[:port]``
+            format. The default port is 18000.
+        :type streams: list of tuple or str
+        :param streams: The streams to select, either as a list of
+            ``(network, station, selectors)`` tuples (selectors can be
+            ``None``) or as a string of the form
+            ``"stream1[:selectors1],stream2[:selectors2],..."``, e.g.
+            ``"IU_KONO:BHE BHN,GE_WLF,MN_AQU:HH?.D"``.
+        :type statefile: str
+        :param statefile: File name to store the state (sequence numbers) of
+            the connection in. If the file exists, data transfer is resumed
+            from the stored state.
+        :type keepalive: int
+        :param keepalive: Interval to send keepalive requests (seconds), 0 to
+            disable.
+        :type netto: int
+        :param netto: Network timeout (seconds) after which the connection is
+            reset if no data was received, 0 to disable.
+        :type netdly: int
+        :param netdly: Delay (seconds) before reconnecting after a network
+            error or timeout.
+        :type begin_time: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param begin_time: Start of the time window to request.
+        :type end_time: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param end_time: End of the time window to request.
+        :rtype: :class:`~.client.seedlinkconnection.SeedLinkConnection`
+        :return: The connection handling the server.
+        """
+        if ':' not in server_url:
+            server_url = '%s:%d' % (server_url, self.DEFAULT_PORT)
+        conn = SeedLinkConnection()
+        conn.set_sl_address(server_url)
+        conn.set_keep_alive(keepalive)
+        conn.set_net_timeout(netto)
+        conn.set_net_delay(netdly)
+        if isinstance(streams, (str, native_str)):
+            conn.parse_stream_list(streams, None)
+        else:
+            for net, station, selectors in streams:
+                conn.add_stream(net, station, selectors, -1, None)
+        if begin_time is not None:
+            conn.begin_time = UTCDateTime(begin_time)
+        if end_time is not None:
+            conn.end_time = UTCDateTime(end_time)
+        if statefile is not None:
+            conn.set_state_file(statefile)
+        self.add_connection(conn)
+        return conn
+
+    def add_connection(self, conn):
+        """
+        Add an already configured connection.
+
+        :type conn: :class:`~.client.seedlinkconnection.SeedLinkConnection`
+        :param conn: The connection to add.
+        """
+        if not conn.check_slcd():
+            msg = "problems with the connection description"
+            raise SeedLinkException(msg)
+        self.connections.append(conn)
+        self._timers[conn] = dict(reconnect=0.0, data=0.0, keepalive=0.0)
+
+    def remove_connection(self, conn):
+        """
+        Close a connection and stop collecting data from it.
+
+        :type conn: :class:`~.client.seedlinkconnection.SeedLinkConnection`
+        :param conn: The connection to remove.
+        """
+        conn.close()
+        self.connections.remove(conn)
+        self._timers.pop(conn)
+
+    def terminate(self):
+        """
+        Stop iterating over packets after the current packet.
+        """
+        self.terminate_flag = True
+
+    def close(self):
+        """
+        Close all connections and save their states.
+        """
+        for conn in self.connections:
+            conn.close()
+
+    def __iter__(self):
+        return self.iter_packets()
+
+    def iter_packets(self):
+        """
+        Collect packets from all connections.
+
+        Connections are established (and re-established after errors) as
+        needed.
+
+        :rtype: generator
+        :return: Yields tuples of the connection and the
+            :class:`~obspy.clients.seedlink.slpacket.SLPacket` received on
+            it.
+        """
+        start = time.time()
+        self.terminate_flag = False
+        while self.connections:
+            now = time.time()
+            for conn in list(self.connections):
+                self._service(conn, now)
+                for slpacket in self._get_packets(conn):
+                    yield conn, slpacket
+                    if self.terminate_flag:
+                        return
+            if self.terminate_flag:
+                return
+            if self.timeout is not None and now - start > self.timeout:
+                return
+
+            # Wait until data arrives or the next timer expires
+            sockets = dict((conn.socket, conn) for conn in self.connections
+                           if conn.state.state == SLState.SL_DATA)
+            wait = max(min(self._next_event(), now + self.max_wait) - now,
+                       0.0)
+            if not sockets:
+                time.sleep(wait)
+                continue
+            readable, _, _ = select.select(list(sockets), [], [], wait)
+            now = time.time()
+            for sock in readable:
+                self._receive(sockets[sock], now)
+
+    def _next_event(self):
+        """
+        Time of the next timer event of all connections, ``inf`` if there
+        is none.
+        """
+        events = []
+        for conn in self.connections:
+            timers = self._timers[conn]
+            if conn.state.state != SLState.SL_DATA:
+                events.append(timers['reconnect'])
+                continue
+            if conn.netto > 0:
+                events.append(timers['data'] + conn.netto)
+            if conn.keepalive > 0 and not conn.state.expect_info:
+                events.append(timers['keepalive'] + conn.keepalive)
+        return min(events) if events else float('inf')
+
+    def _reset(self, conn, now):
+        """
+        Disconnect and schedule a reconnect after the network delay.
+        """
+        conn.disconnect()
+        self._timers[conn]['reconnect'] = now + conn.netdly
+
+    def _service(self, conn, now):
+        """
+        (Re)connect the connection and handle keepalives and timeouts.
+        """
+        timers = self._timers[conn]
+        if conn.state.state != SLState.SL_DATA:
+            if now < timers['reconnect']:
+                return
+            try:
+                conn.connect()
+                conn.config_link()
+            except (SeedLinkException, IOError) as e:
+                msg = "connection to %s failed: %s, reconnecting in %ss"
+                logger.error(msg % (conn.sladdr, e, conn.netdly))
+                self._reset(conn, now)
+                return
+            conn.state.recptr = 0
+            conn.state.sendptr = 0
+            conn.state.state = SLState.SL_DATA
+            timers['data'] = timers['keepalive'] = now
+            return
+
+        if conn.netto > 0 and now - timers['data'] > conn.netto:
+            msg = "network timeout (%s) on %s, reconnecting in %ss"
+            logger.warning(msg % (conn.netto, conn.sladdr, conn.netdly))
+            self._reset(conn, now)
+            return
+
+        if conn.keepalive > 0 and not conn.state.expect_info and \
+                now - timers['keepalive'] > conn.keepalive:
+            logger.debug("sending: keepalive request")
+            try:
+                conn.send_info_request("ID", 3)
+            except IOError as e:
+                msg = "I/O error on %s: %s, reconnecting in %ss"
+                logger.warning(msg % (conn.sladdr, e, conn.netdly))
+                self._reset(conn, now)
+                return
+            conn.state.query_mode = SLState.KEEP_ALIVE_QUERY
+            conn.state.expect_info = True
+            timers['keepalive'] = now
+
+    def _receive(self, conn, now):
+        """
+        Read the available data of a connection into its buffer.
+        """
+        try:
+            bytesread = conn.socket.recv(conn.state.bytes_remaining())
+        except IOError as e:
+            msg = "socket read error on %s: %s, reconnecting in %ss"
+            logger.error(msg % (conn.sladdr, e, conn.netdly))
+            self._reset(conn, now)
+            return
+        if not bytesread:
+            msg = "connection closed by %s, reconnecting in %ss"
+            logger.warning(msg % (conn.sladdr, conn.netdly))
+            self._reset(conn, now)
+            return
+        conn.state.append_bytes(bytesread)
+        timers = self._timers[conn]
+        timers['data'] = timers['keepalive'] = now
+
+    def _get_packets(self, conn):
+        """
+        Yield all complete packets in the buffer of a connection and handle
+        ERROR and END responses of the server.
+        """
+        while conn.state.state == SLState.SL_DATA:
+            slpacket = conn.get_buffered_packet()
+            if slpacket is None:
+                break
+            yield slpacket
+        if conn.state.state != SLState.SL_DATA:
+            return
+        try:
+            if conn.state.is_error():
+                msg = "SeedLink server %s reported an error with the last " + \
+                    "command, reconnecting in %ss"
+                logger.error(msg % (conn.sladdr, conn.netdly))
+                self._reset(conn, time.time())
+                return
+        except SeedLinkException:
+            pass  # not enough bytes to determine packet type
+        try:
+            if conn.state.is_end():
+                msg = "end of buffer or selected time window on %s"
+                logger.info(msg % (conn.sladdr))
+                self.remove_connection(conn)
+        except SeedLinkException:
+            pass
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
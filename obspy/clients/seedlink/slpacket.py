@@ -21,7 +21,7 @@ import numpy as np
 
 from obspy.core.compatibility import from_buffer
 from obspy.core.trace import Trace
-from obspy.io.mseed.headers import clibmseed
+from obspy.io.mseed.headers import ENCODINGS, clibmseed
 from obspy.io.mseed.util import (_convert_msr_to_dict,
                                  _ctypes_array_2_numpy_array,
                                  _convert_mstime_to_datetime)
@@ -110,12 +110,12 @@ class SLPacket(object):
             return -1
         return seqnum
 
-    def get_ms_record(self):
+    def get_ms_record(self, dataflag=1):
         # following from obspy.io.mseed.tests.test_libmseed.py -> test_msrParse
         msr = clibmseed.msr_init(None)
         pyobj = from_buffer(self.msrecord, dtype=np.int8)
-        errcode = \
-            clibmseed.msr_parse(pyobj, len(pyobj), C.pointer(msr), -1, 1, 1)
+        errcode = clibmseed.msr_parse(pyobj, len(pyobj), C.pointer(msr), -1,
+                                      dataflag, 1)
         if errcode != 0:
             msg = "failed to decode mini-seed record: msr_parse errcode: %s"
             raise SeedLinkException(msg % (errcode))
@@ -127,27 +127,12 @@ class SLPacket(object):
     def free_ms_record(self, msr, msrecord_py):
         clibmseed.msr_free(msr)
 
-    def get_trace(self):
-
-        if self.trace is not None:
-            return self.trace
-
-        msr, msrecord_py = self.get_ms_record()
-        try:
-            header = _convert_msr_to_dict(msrecord_py)
-
-            # XXX Workaround: in Python 3 msrecord_py.sampletype is a byte
-            # (e.g. b'i'), while keys of mseed.headers.SAMPLESIZES are
-            # unicode ('i') (see above)
-            sampletype = msrecord_py.sampletype
-            if not isinstance(sampletype, str):
-                sampletype = sampletype.decode()
-
-            data = _ctypes_array_2_numpy_array(msrecord_py.datasamples,
-                                               msrecord_py.numsamples,
-                                               sampletype)
-        finally:
-            self.free_ms_record(msr, msrecord_py)
+    def _get_header(self, msrecord_py):
+        """
+        Convert the header fields of a decoded record to a dictionary that
+        can be used as :class:`~obspy.core.trace.Stats`.
+        """
+        header = _convert_msr_to_dict(msrecord_py)
 
         # XXX Workaround: the fields in the returned struct of type
         # obspy.io.mseed.header.MsrecordS have byte values in Python 3, while
@@ -165,8 +150,85 @@ class SLPacket(object):
         if 'samprate' in header:
             header['sampling_rate'] = header['samprate']
             del header['samprate']
-        # Access data directly as NumPy array.
+        return header
+
+    def get_header(self):
+        """
+        Get the header of the MiniSEED record without decoding the samples.
+
+        :rtype: dict
+        :return: Header fields that can be used as
+            :class:`~obspy.core.trace.Stats`. The number of samples in the
+            record is stored under the ``"samplecnt"`` key, the
+            :class:`numpy.dtype` of the decoded samples (or ``None`` for an
+            unsupported encoding) under the ``"dtype"`` key.
+        """
+        msr, msrecord_py = self.get_ms_record(dataflag=0)
+        try:
+            header = self._get_header(msrecord_py)
+            encoding = ENCODINGS.get(msrecord_py.encoding)
+        finally:
+            self.free_ms_record(msr, msrecord_py)
+        del header['sampletype']
+        header['dtype'] = np.dtype(encoding[2]) if encoding else None
+        del header['numsamples']
+        return header
 
+    def get_data(self, out=None):
+        """
+        Decode the samples of the MiniSEED record.
+
+        :type out: :class:`numpy.ndarray`, optional
+        :param out: Array to decode the samples into, e.g. a view into a
+            preallocated buffer. It has to have the data type of the record
+            and room for at least all samples of the record. If not given, a
+            new array is allocated.
+        :rtype: :class:`numpy.ndarray`
+        :return: The decoded samples. If ``out`` is given, this is a view of
+            its first samples.
+        """
+        if self.trace is not None and out is None:
+            return self.trace.data
+
+        msr, msrecord_py = self.get_ms_record()
+        try:
+            sampletype = msrecord_py.sampletype
+            if not isinstance(sampletype, str):
+                sampletype = sampletype.decode()
+            numsamples = msrecord_py.numsamples
+            if out is None:
+                return _ctypes_array_2_numpy_array(msrecord_py.datasamples,
+                                                   numsamples, sampletype)
+            if out.dtype != np.dtype(sampletype) or \
+                    not out.flags.c_contiguous:
+                msg = "output array has to be C contiguous and of type %s"
+                raise TypeError(msg % np.dtype(sampletype))
+            if len(out) < numsamples:
+                msg = "output array too small for %d samples"
+                raise ValueError(msg % numsamples)
+            # Move the samples straight from the C allocated memory area
+            # into the output array.
+            C.memmove(out.ctypes.data, msrecord_py.datasamples,
+                      numsamples * out.itemsize)
+        finally:
+            self.free_ms_record(msr, msrecord_py)
+        return out[:numsamples]
+
+    def get_trace(self):
+
+        if self.trace is not None:
+            return self.trace
+
+        msr, msrecord_py = self.get_ms_record()
+        try:
+            header = self._get_header(msrecord_py)
+            data = _ctypes_array_2_numpy_array(msrecord_py.datasamples,
+                                               msrecord_py.numsamples,
+                                               header['sampletype'])
+        finally:
+            self.free_ms_record(msr, msrecord_py)
+
+        # Access data directly as NumPy array.
         self.trace = Trace(data, header)
         return self.trace
 
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+The obspy.clients.seedlink.multiplexer test suite.
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import io
+import select
+import socket
+import threading
+import unittest
+
+import numpy as np
+
+from obspy import Trace, UTCDateTime
+from obspy.clients.seedlink.multiplexer import SeedLinkMultiplexer
+from obspy.core.compatibility import mock
+from obspy.core.util import NamedTemporaryFile
+
+
+def _make_packets(network, station, num_packets, seqnum=0):
+    """
+    Create SeedLink data packets with 512 byte MiniSEED records.
+    """
+    packets = []
+    for i in range(num_packets):
+        tr = Trace(data=np.arange(100, dtype=np.int32) + i)
+        tr.stats.network = network
+        tr.stats.station = station
+        tr.stats.channel = 'BHZ'
+        tr.stats.starttime = UTCDateTime(2018, 1, 1) + i
+        buf = io.BytesIO()
+        tr.write(buf, format='MSEED', reclen=512, encoding='STEIM2')
+        record = buf.getvalue()
+        assert len(record) == 512
+        header = ('SL%06X' % (seqnum + i)).encode('ascii')
+        packets.append(header + record)
+    return packets
+
+
+class _FakeSeedLinkServer(threading.Thread):
+    """
+    Minimal SeedLink server answering the negotiation commands and then
+    sending a fixed set of packets.
+    """
+    def __init__(self, packets):
+        super(_FakeSeedLinkServer, self).__init__()
+        self.daemon = True
+        self.packets = packets
+        self.commands = []
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(('127.0.0.1', 0))
+        self.server.listen(1)
+        self.address = '127.0.0.1:%d' % self.server.getsockname()[1]
+
+    def run(self):
+        conn, _ = self.server.accept()
+        buf = b''
+        while True:
+            data = conn.recv(1024)
+            if not data:
+                break
+            buf += data
+            while b'\r' in buf:
+                command, buf = buf.split(b'\r', 1)
+                command = command.strip()
+                self.commands.append(command)
+                if command == b'HELLO':
+                    conn.sendall(b'SeedLink v3.1 (2018.001) :: fake\r\n'
+                                 b'Fake SeedLink server\r\n')
+                elif command == b'END':
+                    conn.sendall(b''.join(self.packets))
+                else:
+                    conn.sendall(b'OK\r\n')
+            if self.commands and self.commands[-1] == b'END':
+                break
+        # keep the connection open until the client goes away
+        while conn.recv(1024):
+            pass
+        conn.close()
+        self.server.close()
+
+
+class SeedLinkMultiplexerTestCase(unittest.TestCase):
+
+    def test_collect_from_multiple_servers(self):
+        servers = [_FakeSeedLinkServer(_make_packets('XX', 'ABC', 3)),
+                   _FakeSeedLinkServer(_make_packets('YY', 'DEF', 4, 10))]
+        for server in servers:
+            server.start()
+
+        multiplexer = SeedLinkMultiplexer(timeout=20)
+        with NamedTemporaryFile() as tf:
+            statefile = tf.name
+            conn_1 = multiplexer.add_server(
+                servers[0].address, [('XX', 'ABC', 'BHZ')],
+                statefile=statefile)
+            conn_2 = multiplexer.add_server(servers[1].address,
+                                            'YY_DEF:BH? HH?')
+
+            received = []
+            for conn, packet in multiplexer:
+                trace = packet.get_trace()
+                received.append((conn, trace.id,
+                                 packet.get_sequence_number()))
+                if len(received) == 7:
+                    multiplexer.terminate()
+            multiplexer.close()
+
+            with open(statefile, 'r') as fh:
+                state = fh.read()
+
+        for server in servers:
+            server.join(5)
+
+        self.assertEqual(len(received), 7)
+        from_1 = [(id_, seq) for conn, id_, seq in received if conn is conn_1]
+        from_2 = [(id_, seq) for conn, id_, seq in received if conn is conn_2]
+        self.assertEqual(from_1, [('XX.ABC..BHZ', i) for i in range(3)])
+        self.assertEqual(from_2, [('YY.DEF..BHZ', i) for i in range(10, 14)])
+
+        # check negotiation
+        self.assertEqual(servers[0].commands,
+                         [b'HELLO', b'STATION  ABC XX', b'SELECT BHZ',
+                          b'DATA', b'END'])
+        self.assertEqual(servers[1].commands,
+                         [b'HELLO', b'STATION  DEF YY', b'SELECT BH?',
+                          b'SELECT HH?', b'DATA', b'END'])
+
+        # the stream chain and the state file are updated
+        self.assertEqual(conn_1.streams[0].seqnum, 2)
+        self.assertEqual(conn_2.streams[0].seqnum, 13)
+        self.assertTrue(state.startswith('XX ABC 2 '))
+
+    def test_wait_without_timers(self):
+        """
+        Without network timeout and keepalive there are no timers, waiting
+        for data is then only limited by max_wait.
+        """
+        server = _FakeSeedLinkServer(_make_packets('XX', 'ABC', 1))
+        server.start()
+        multiplexer = SeedLinkMultiplexer(timeout=0.5, max_wait=0.2)
+        multiplexer.add_server(server.address, [('XX', 'ABC', 'BHZ')],
+                               netto=0, keepalive=0)
+        timeouts = []
+
+        def _select(rlist, wlist, xlist, timeout):
+            timeouts.append(timeout)
+            return select.select(rlist, wlist, xlist, timeout)
+
+        with mock.patch('obspy.clients.seedlink.multiplexer.select') as p:
+            p.select.side_effect = _select
+            packets = list(multiplexer)
+        multiplexer.close()
+        server.join(5)
+
+        self.assertEqual(len(packets), 1)
+        self.assertTrue(timeouts)
+        self.assertLess(len(timeouts), 10)
+        for timeout in timeouts:
+            self.assertAlmostEqual(timeout, 0.2, places=5)
+
+    def test_terminate_without_servers(self):
+        multiplexer = SeedLinkMultiplexer()
+        self.assertEqual(list(multiplexer), [])
+
+
+def suite():
+    return unittest.makeSuite(SeedLinkMultiplexerTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -27,19 +27,30 @@ from future.utils import native_str
 import collections
 import copy
 import inspect
+import itertools
+import math
 import re
 import warnings
 import weakref
 from copy import deepcopy
 from uuid import uuid4
 
-import numpy as np
 
 from obspy.core.event.header import DataUsedWaveType, ATTRIBUTE_HAS_ERRORS
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import AttribDict
 
 
+# Source of the stamps event type objects get on creation and on every change
+# of one of their attributes, used to validate cached views of catalogs (see
+# Catalog.to_arrays()).
+_modification_stamps = itertools.count(1)
+
+_QUAKEML_URI_REGEX = re.compile(
+    r"^(smi|quakeml):[\w\d][\w\d\-\.\*\(\)_~']{2,}/[\w\d\-\." +
+    r"\*\(\)_~'][\w\d\-\.\*\(\)\+\?_~'=,;#/&]*$")
+
+
 class QuantityError(AttribDict):
     """
     Uncertainty information for a physical quantity.
@@ -64,10 +75,15 @@ class QuantityError(AttribDict):
     def __init__(self, uncertainty=None, lower_uncertainty=None,
                  upper_uncertainty=None, confidence_level=None):
         super(QuantityError, self).__init__()
-        self.uncertainty = uncertainty
-        self.lower_uncertainty = lower_uncertainty
-        self.upper_uncertainty = upper_uncertainty
-        self.confidence_level = confidence_level
+        # the defaults are already set, only set given values
+        if uncertainty is not None:
+            self.uncertainty = uncertainty
+        if lower_uncertainty is not None:
+            self.lower_uncertainty = lower_uncertainty
+        if upper_uncertainty is not None:
+            self.upper_uncertainty = upper_uncertainty
+        if confidence_level is not None:
+            self.confidence_level = confidence_level
 
     def __bool__(self):
         """
@@ -201,11 +217,14 @@ def _event_type_class_factory(class_name, class_attributes=[],
         _property_dict = {}
         for key, value in _properties:
             _property_dict[key] = value
+        _error_keys = [_i for _i in _property_keys if _i.endswith("_errors")]
         _containers = class_contains
         warn_on_non_default_key = True
         defaults = dict.fromkeys(class_contains, [])
         defaults.update(dict.fromkeys(_property_keys, None))
         do_not_warn_on = ["extra"]
+        # Not part of the items, so it is neither compared nor copied.
+        __slots__ = (native_str("_modification_stamp"),)
 
         def __init__(self, *args, **kwargs):
             # Make sure the args work as expected. Therefore any specified
@@ -215,23 +234,34 @@ def _event_type_class_factory(class_name, class_attributes=[],
                 # Use the class_attributes list here because it is not yet
                 # polluted be the error quantities.
                 kwargs[class_attributes[_i][0]] = item
-            # Set all property values to None or the kwarg value.
-            for key, _ in self._properties:
+            self._set_modified()
+            # Set all property values to None or the kwarg value. Most of
+            # them are not given, these are stored directly as there is
+            # nothing to convert or bind.
+            __dict__ = self.__dict__
+            for key in self._property_keys:
                 value = kwargs.get(key, None)
                 # special handling for resource id
                 if key == "resource_id":
                     if kwargs.get("force_resource_id", False):
                         if value is None:
                             value = ResourceIdentifier()
-                setattr(self, key, value)
+                if value is None:
+                    __dict__[key] = None
+                else:
+                    setattr(self, key, value)
             # Containers currently are simple lists.
             for name in self._containers:
-                setattr(self, name, list(kwargs.get(name, [])))
+                __dict__[name] = list(kwargs.get(name, []))
             # All errors are QuantityError. If they are not set yet, set them
             # now.
-            for key, _ in self._properties:
-                if key.endswith("_errors") and getattr(self, key) is None:
-                    setattr(self, key, QuantityError())
+            for key in self._error_keys:
+                if __dict__[key] is None:
+                    __dict__[key] = QuantityError()
+
+        def _set_modified(self):
+            object.__setattr__(self, "_modification_stamp",
+                               next(_modification_stamps))
 
         def clear(self):
             super(AbstractEventType, self).clear()
@@ -349,11 +379,24 @@ def _event_type_class_factory(class_name, class_attributes=[],
         def __ne__(self, other):
             return not self.__eq__(other)
 
+        def __setitem__(self, key, value):
+            self._set_modified()
+            super(AbstractEventType, self).__setitem__(key, value)
+
+        def __delitem__(self, name):
+            self._set_modified()
+            super(AbstractEventType, self).__delitem__(name)
+
+        def __setstate__(self, state):
+            self._set_modified()
+            super(AbstractEventType, self).__setstate__(state)
+
         def __setattr__(self, name, value):
             """
             Custom property implementation that works if the class is
             inheriting from AttribDict.
             """
+            self._set_modified()
             # avoid type casting of 'extra' attribute, to make it possible to
             # control ordering of extra tags by using an OrderedDict for
             # 'extra'.
@@ -361,9 +404,13 @@ def _event_type_class_factory(class_name, class_attributes=[],
                 dict.__setattr__(self, name, value)
                 return
             # Pass to the parent method if not a custom property.
-            if name not in self._property_dict.keys():
+            if name not in self._property_dict:
                 AttribDict.__setattr__(self, name, value)
                 return
+            # Unset properties need no conversion or checks.
+            if value is None:
+                self.__dict__[name] = None
+                return
             attrib_type = self._property_dict[name]
             # If the value is None or already the correct type just set it.
             if (value is not None) and (type(value) is not attrib_type):
@@ -383,14 +430,17 @@ def _event_type_class_factory(class_name, class_attributes=[],
             # Make sure all floats are finite - otherwise this is most
             # likely a user error.
             if attrib_type is float and value is not None:
-                if not np.isfinite(value):
+                if math.isinf(value) or math.isnan(value):
                     msg = "On %s object: Value '%s' for '%s' is " \
                           "not a finite floating point value." % (
                               type(self).__name__, str(value), name)
 
                     raise ValueError(msg)
 
-            AttribDict.__setattr__(self, name, value)
+            # After the conversion above the value is None or of the
+            # property type, so there is nothing left for AttribDict to
+            # check or convert.
+            self.__dict__[name] = value
             # if value is a resource id bind or unbind the resource_id
             if isinstance(value, ResourceIdentifier):
                 if name == "resource_id":  # bind the resource_id to self
@@ -631,27 +681,28 @@ class ResourceIdentifier(object):
             self.fixed = True
             self.id = id
         # Append the referred object in case one is given to the class level
-        # reference dictionary.
-        self._object_id = None  # the object specific ID
+        # reference dictionary, otherwise the instance is unbound.
         if referred_object is not None:
+            self.__dict__['_object_id'] = 0
             self.set_referred_object(referred_object)
+        else:
+            self._object_id = None  # the object specific ID
 
         # Increment the counter for the current resource id.
         ResourceIdentifier.__resource_id_tracker[self.id] += 1
 
     def __del__(self):
-        if self.id not in ResourceIdentifier.__resource_id_tracker:
+        rid_id = self.id
+        tracker = ResourceIdentifier.__resource_id_tracker
+        if rid_id not in tracker:
             return
         # Decrement the resource id counter.
-        ResourceIdentifier.__resource_id_tracker[self.id] -= 1
+        tracker[rid_id] -= 1
         # If below or equal to zero, delete it and also delete it from the weak
         # value dictionary.
-        if ResourceIdentifier.__resource_id_tracker[self.id] <= 0:
-            del ResourceIdentifier.__resource_id_tracker[self.id]
-            try:
-                del ResourceIdentifier.__resource_id_weak_dict[self.id]
-            except KeyError:
-                pass
+        if tracker[rid_id] <= 0:
+            del tracker[rid_id]
+            ResourceIdentifier.__resource_id_weak_dict.pop(rid_id, None)
 
     @classmethod
     def bind_resource_ids(cls):
@@ -729,22 +780,25 @@ class ResourceIdentifier(object):
         so everything stays consistent. Warning can be ignored by setting
         the warn parameter to False.
         """
-        self._object_id = id(referred_object)  # identity of object
-        rdic = ResourceIdentifier.__resource_id_weak_dict
+        object_id = id(referred_object)  # identity of object
+        self._object_id = object_id
+        rid_id = self.id
+        objects = ResourceIdentifier.__resource_id_weak_dict.get(rid_id)
         # if the resource_id is in the rid_dict
-        if self.id in rdic and self._object_id not in rdic[self.id]:
-            last_obj = rdic[self.id][next(reversed(rdic[self.id]))]()
+        if objects is not None and object_id not in objects:
+            last_obj = objects[next(reversed(objects))]()
             if warn and last_obj is not None and last_obj != referred_object:
                 msg = ('Warning, binding object to resource ID %s which '
                        'is not equal to the last object bound to this '
-                       'resource_id') % self.id
+                       'resource_id') % rid_id
                 line_number = inspect.currentframe().f_back.f_lineno
                 warnings.warn_explicit(msg, UserWarning, __file__,
                                        line_number)
-            rdic[self.id][self._object_id] = weakref.ref(referred_object)
+            objects[object_id] = weakref.ref(referred_object)
         else:
-            rdic[self.id] = collections.OrderedDict()
-            rdic[self.id][self._object_id] = weakref.ref(referred_object)
+            objects = collections.OrderedDict()
+            objects[object_id] = weakref.ref(referred_object)
+            ResourceIdentifier.__resource_id_weak_dict[rid_id] = objects
 
     def convert_id_to_quakeml_uri(self, authority_id="local"):
         """
@@ -779,15 +833,13 @@ class ResourceIdentifier(object):
         if str(id).strip() == "":
             id = str(uuid4())
 
-        regex = r"^(smi|quakeml):[\w\d][\w\d\-\.\*\(\)_~']{2,}/[\w\d\-\." + \
-                r"\*\(\)_~'][\w\d\-\.\*\(\)\+\?_~'=,;#/&]*$"
-        result = re.match(regex, str(id))
+        result = _QUAKEML_URI_REGEX.match(str(id))
         if result is not None:
             return id
         id = 'smi:%s/%s' % (authority_id, str(id))
         # Check once again just to be sure no weird symbols are stored in the
         # ID.
-        result = re.match(regex, id)
+        result = _QUAKEML_URI_REGEX.match(id)
         if result is None:
             msg = (
                 "The id '%s' is not a valid QuakeML resource "
@@ -821,7 +873,8 @@ class ResourceIdentifier(object):
     def _object_id(self, value):
         if value is None:  # add instance to unbound dict
             self.__class__.__unbound_resource_id[id(self)] = self
-        else:  # binding to object, remove instance from unbound dict
+        elif self.__dict__.get('_object_id', 0) is None:
+            # binding an unbound instance, remove it from unbound dict
             self.__class__.__unbound_resource_id.pop(id(self), None)
         self.__dict__['_object_id'] = value
 
@@ -22,6 +22,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 from future.utils import native_str
 
+import collections
 import glob
 import io
 import copy
@@ -30,10 +31,11 @@ import warnings
 
 import numpy as np
 
+from obspy.core.compatibility import py3_round
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import NamedTemporaryFile, _read_from_plugin
-from obspy.core.util.base import (ENTRY_POINTS, download_to_file,
-                                  sanitize_filename)
+from obspy.core.util.base import (ENTRY_POINTS, _detect_format,
+                                  download_to_file, sanitize_filename)
 from obspy.core.util.decorator import (map_example_filename, rlock,
                                        uncompress_file)
 from obspy.core.util.misc import buffered_load_entry_point
@@ -46,6 +48,159 @@ from .event import Event
 EVENT_ENTRY_POINTS = ENTRY_POINTS['event']
 EVENT_ENTRY_POINTS_WRITE = ENTRY_POINTS['event_write']
 
+# Keys of the filter rules of Catalog.filter() taken from the first origin
+# and its quality.
+_ORIGIN_FILTER_KEYS = ("longitude", "latitude", "depth", "time")
+_ORIGIN_QUALITY_FILTER_KEYS = ("standard_error", "azimuthal_gap",
+                               "used_station_count", "used_phase_count")
+
+
+# Comparisons of the filter rules. Only first argument might be None. Avoid
+# unorderable types by checking first shortcut on positive is None also for
+# the greater stuff (is confusing but correct)
+def _is_smaller(value_1, value_2):
+    if value_1 is None or value_1 < value_2:
+        return True
+    return False
+
+
+def _is_smaller_or_equal(value_1, value_2):
+    if value_1 is None or value_1 <= value_2:
+        return True
+    return False
+
+
+def _is_greater(value_1, value_2):
+    if value_1 is None or value_1 <= value_2:
+        return False
+    return True
+
+
+def _is_greater_or_equal(value_1, value_2):
+    if value_1 is None or value_1 < value_2:
+        return False
+    return True
+
+
+_FILTER_OPERATORS = {"<": _is_smaller,
+                     "<=": _is_smaller_or_equal,
+                     ">": _is_greater,
+                     ">=": _is_greater_or_equal}
+# The same comparisons for arrays of the values of all events, unset values
+# (NaN or NaT) are handled separately.
+_VECTORIZED_FILTER_OPERATORS = {_is_smaller: np.less,
+                                _is_smaller_or_equal: np.less_equal,
+                                _is_greater: np.greater,
+                                _is_greater_or_equal: np.greater_equal}
+
+
+def _compile_filter_rules(rules):
+    """
+    Parses filter rules of :meth:`Catalog.filter` (e.g.
+    ``"magnitude >= 4.0"``) into tuples of key, comparison function and
+    value.
+    """
+    compiled = []
+    for rule in rules:
+        try:
+            key, operator, value = rule.split(" ", 2)
+        except ValueError:
+            msg = "%s is not a valid filter rule." % rule
+            raise ValueError(msg)
+        if key != "magnitude" and key not in _ORIGIN_FILTER_KEYS and \
+                key not in _ORIGIN_QUALITY_FILTER_KEYS:
+            msg = "%s is not a valid filter key" % key
+            raise ValueError(msg)
+        value = UTCDateTime(value) if key == "time" else float(value)
+        compiled.append((key, _FILTER_OPERATORS[operator], value))
+    return compiled
+
+
+def _get_filter_value(event, key):
+    """
+    Returns the value of a filter key for an event, raises a
+    :class:`KeyError` if the event does not have the magnitude, origin or
+    origin quality the key refers to.
+    """
+    if key == "magnitude":
+        if not event.magnitudes or not event.magnitudes[0].mag:
+            raise KeyError(key)
+        return event.magnitudes[0].mag
+    if not event.origins:
+        raise KeyError(key)
+    origin = event.origins[0]
+    if key in _ORIGIN_FILTER_KEYS:
+        if key not in origin:
+            raise KeyError(key)
+        return origin.get(key)
+    if not origin.quality or key not in origin.quality:
+        raise KeyError(key)
+    return origin.quality.get(key)
+
+
+def _match_filter_rules(rules, get_value):
+    """
+    Checks if an event matches all compiled filter rules.
+
+    :param rules: Filter rules as returned by :func:`_compile_filter_rules`.
+    :param get_value: Function returning the value of a filter key for the
+        event, see :func:`_get_filter_value`.
+    """
+    for key, operator, value in rules:
+        try:
+            event_value = get_value(key)
+        except KeyError:
+            return False
+        if not operator(event_value, value):
+            return False
+    return True
+
+
+def _match_filter_rules_vectorized(rules, arrays, has_origin, has_quality):
+    """
+    Checks which events of a catalog match all compiled filter rules, with
+    the same results as :func:`_match_filter_rules`.
+
+    :param rules: Filter rules as returned by :func:`_compile_filter_rules`.
+    :param arrays: Values of the events as returned by
+        :meth:`Catalog.to_arrays`.
+    :param has_origin: Boolean array telling which events have an origin.
+    :param has_quality: Boolean array telling which events have an origin
+        with a quality.
+    :rtype: :class:`numpy.ndarray` of bool
+    """
+    mask = np.ones(len(has_origin), dtype=np.bool_)
+    for key, operator, value in rules:
+        if key == "magnitude":
+            # a magnitude of zero counts as unset, too
+            values = arrays[key]
+            mask &= ~np.isnan(values) & (values != 0)
+            unset = None
+        elif key == "time":
+            # compare microseconds like UTCDateTime with default precision
+            unset = np.isnat(arrays[key])
+            quotient, remainder = np.divmod(arrays[key].view(np.int64), 1000)
+            values = quotient + ((remainder > 500) |
+                                 ((remainder == 500) & (quotient % 2 == 1)))
+            value = py3_round(value._ns, -3) // 1000
+            mask &= has_origin
+        else:
+            values = arrays[key]
+            unset = np.isnan(values)
+            if key in _ORIGIN_FILTER_KEYS:
+                mask &= has_origin
+            else:
+                mask &= has_quality
+        with np.errstate(invalid="ignore"):
+            matches = _VECTORIZED_FILTER_OPERATORS[operator](values, value)
+        if unset is not None:
+            if operator(None, value):
+                matches |= unset
+            else:
+                matches &= ~unset
+        mask &= matches
+    return mask
+
 
 class Catalog(object):
     """
@@ -119,6 +274,7 @@ class Catalog(object):
         """
         Passes on the __delitem__ method to the underlying list of traces.
         """
+        self.__dict__.pop("_arrays", None)
         return self.events.__delitem__(index)
 
     def __eq__(self, other):
@@ -214,6 +370,7 @@ class Catalog(object):
         __setitem__ method of the Catalog object.
         """
         if not isinstance(index, (str, native_str)):
+            self.__dict__.pop("_arrays", None)
             self.events.__setitem__(index, event)
         else:
             super(Catalog, self).__setitem__(index, event)
@@ -245,11 +402,18 @@ class Catalog(object):
     def _repr_pretty_(self, p, cycle):
         p.text(self.__str__(print_all=p.verbose))
 
+    def __getstate__(self):
+        # the cached arrays are rebuilt when needed
+        state = self.__dict__.copy()
+        state.pop("_arrays", None)
+        return state
+
     def append(self, event):
         """
         Appends a single Event object to the current Catalog object.
         """
         if isinstance(event, Event):
+            self.__dict__.pop("_arrays", None)
             self.events.append(event)
         else:
             msg = 'Append only supports a single Event object as an argument.'
@@ -291,6 +455,10 @@ class Catalog(object):
         Use ``inverse=True`` to return the Events that *do not* match the
         specified filter rules.
 
+        The values are taken from the first origin and magnitude of each
+        event. The rules are evaluated for all events at once on the cached
+        arrays of :meth:`to_arrays`.
+
         :rtype: :class:`Catalog`
         :return: Filtered catalog. A new Catalog object with filtered
             Events as references to the original Events.
@@ -321,83 +489,181 @@ class Catalog(object):
         2012-04-04T14:21:42.300000Z | +41.818,  +79.689 | 4.4 mb | manual
         2012-04-04T14:08:46.000000Z | +38.017,  +37.736 | 3.0 ML | manual
         """
-        # Helper functions. Only first argument might be None. Avoid
-        # unorderable types by checking first shortcut on positive is None
-        # also for the greater stuff (is confusing but correct)
-        def _is_smaller(value_1, value_2):
-            if value_1 is None or value_1 < value_2:
-                return True
-            return False
+        rules = _compile_filter_rules(args)
+        arrays, has_origin, has_quality = self._get_arrays()
+        mask = _match_filter_rules_vectorized(rules, arrays, has_origin,
+                                              has_quality)
+        if kwargs.get("inverse", False):
+            mask = ~mask
+        events = [self.events[_i] for _i in np.flatnonzero(mask).tolist()]
+        return Catalog(events=events)
 
-        def _is_smaller_or_equal(value_1, value_2):
-            if value_1 is None or value_1 <= value_2:
-                return True
-            return False
+    def to_arrays(self, refresh=False):
+        """
+        Returns the main parameters of all events as NumPy arrays.
+
+        The values are taken from the first origin and magnitude of each
+        event, like in :meth:`filter`. Unset values are ``NaN`` in float
+        arrays, ``NaT`` in the time array and ``None`` in object arrays:
+
+        ==================  ==================================================
+        Key                 Values
+        ==================  ==================================================
+        resource_id         Resource identifier of the event (object array)
+        event_type          Event type (object array)
+        time                Origin time (``datetime64[ns]``)
+        latitude            Latitude of the origin (float)
+        longitude           Longitude of the origin (float)
+        depth               Depth of the origin in m (float)
+        magnitude           Magnitude (float)
+        magnitude_type      Magnitude type (object array)
+        standard_error      Standard error of the origin quality (float)
+        azimuthal_gap       Azimuthal gap of the origin quality (float)
+        used_station_count  Number of stations of the origin quality (float)
+        used_phase_count    Number of phases of the origin quality (float)
+        ==================  ==================================================
+
+        The arrays are cached and rebuilt once any event, first origin, its
+        quality or first magnitude of the catalog has been changed, replaced
+        or removed. The arrays are read-only.
+
+        :type refresh: bool
+        :param refresh: Rebuild the arrays even if they are cached.
+        :rtype: dict
+        :return: Dictionary of arrays with one value per event.
 
-        def _is_greater(value_1, value_2):
-            if value_1 is None or value_1 <= value_2:
-                return False
-            return True
+        .. rubric:: Example
 
-        def _is_greater_or_equal(value_1, value_2):
-            if value_1 is None or value_1 < value_2:
-                return False
-            return True
+        >>> from obspy.core.event import read_events
+        >>> cat = read_events()
+        >>> arrays = cat.to_arrays()
+        >>> print(arrays["magnitude"].tolist())
+        [4.4, 4.3, 3.0]
+        >>> print(arrays["magnitude_type"].tolist())
+        ['mb', 'ML', 'ML']
+        >>> print(arrays["time"][0])
+        2012-04-04T14:21:42.300000000
+        """
+        return collections.OrderedDict(self._get_arrays(refresh)[0])
 
-        # Map the function to the operators.
-        operator_map = {"<": _is_smaller,
-                        "<=": _is_smaller_or_equal,
-                        ">": _is_greater,
-                        ">=": _is_greater_or_equal}
+    def _get_arrays(self, refresh=False):
+        """
+        Returns the (cached) arrays of :meth:`to_arrays` and boolean arrays
+        telling which events have an origin and which have an origin with
+        a quality.
+        """
+        cache = self.__dict__.get("_arrays")
+        key = self._get_arrays_key()
+        if not refresh and cache is not None and cache[0] == key:
+            return cache[1]
 
-        try:
-            inverse = kwargs["inverse"]
-        except KeyError:
-            inverse = False
-
-        events = list(self.events)
-        for arg in args:
-            try:
-                key, operator, value = arg.split(" ", 2)
-            except ValueError:
-                msg = "%s is not a valid filter rule." % arg
-                raise ValueError(msg)
-            if key == "magnitude":
-                temp_events = []
-                for event in events:
-                    if (event.magnitudes and event.magnitudes[0].mag and
-                        operator_map[operator](
-                            event.magnitudes[0].mag,
-                            float(value))):
-                        temp_events.append(event)
-                events = temp_events
-            elif key in ("longitude", "latitude", "depth", "time"):
-                temp_events = []
-                for event in events:
-                    if (event.origins and key in event.origins[0] and
-                        operator_map[operator](
-                            event.origins[0].get(key),
-                            UTCDateTime(value) if key == 'time' else
-                            float(value))):
-                        temp_events.append(event)
-                events = temp_events
-            elif key in ('standard_error', 'azimuthal_gap',
-                         'used_station_count', 'used_phase_count'):
-                temp_events = []
-                for event in events:
-                    if (event.origins and event.origins[0].quality and
-                        key in event.origins[0].quality and
-                        operator_map[operator](
-                            event.origins[0].quality.get(key),
-                            float(value))):
-                        temp_events.append(event)
-                events = temp_events
+        resource_ids = []
+        event_types = []
+        times = []
+        origin_values = []
+        quality_values = []
+        has_origin = []
+        has_quality = []
+        magnitudes = []
+        magnitude_types = []
+        no_quality = (None, None, None, None)
+        for event in self.events:
+            attributes = event.__dict__
+            resource_id = attributes.get("resource_id")
+            resource_ids.append(None if resource_id is None
+                                else resource_id.id)
+            event_types.append(attributes.get("event_type"))
+            origins = attributes.get("origins")
+            if origins:
+                origin = origins[0].__dict__
+                time = origin.get("time")
+                times.append(None if time is None else time._ns)
+                origin_values.append((origin.get("latitude"),
+                                      origin.get("longitude"),
+                                      origin.get("depth")))
+                has_origin.append(True)
+                quality = origin.get("quality")
+                if quality is not None:
+                    values = quality.__dict__
+                    values = (values.get("standard_error"),
+                              values.get("azimuthal_gap"),
+                              values.get("used_station_count"),
+                              values.get("used_phase_count"))
+                    quality_values.append(values)
+                    # Only check all values of the quality if needed.
+                    has_quality.append(values != no_quality or
+                                       bool(quality))
+                else:
+                    quality_values.append(no_quality)
+                    has_quality.append(False)
             else:
-                msg = "%s is not a valid filter key" % key
-                raise ValueError(msg)
-        if inverse:
-            events = [ev for ev in self.events if ev not in events]
-        return Catalog(events=events)
+                times.append(None)
+                origin_values.append((None, None, None))
+                quality_values.append(no_quality)
+                has_origin.append(False)
+                has_quality.append(False)
+            event_magnitudes = attributes.get("magnitudes")
+            if event_magnitudes:
+                magnitude = event_magnitudes[0].__dict__
+                magnitudes.append(magnitude.get("mag"))
+                magnitude_types.append(magnitude.get("magnitude_type"))
+            else:
+                magnitudes.append(None)
+                magnitude_types.append(None)
+
+        nat = np.iinfo(np.int64).min
+        origin_values = np.array(origin_values,
+                                 dtype=np.float64).reshape(-1, 3)
+        quality_values = np.array(quality_values,
+                                  dtype=np.float64).reshape(-1, 4)
+        arrays = collections.OrderedDict([
+            ("resource_id", np.array(resource_ids, dtype=np.object_)),
+            ("event_type", np.array(event_types, dtype=np.object_)),
+            ("time", np.array([nat if _i is None else _i for _i in times],
+                              dtype=np.int64).view(native_str("M8[ns]"))),
+            ("latitude", origin_values[:, 0].copy()),
+            ("longitude", origin_values[:, 1].copy()),
+            ("depth", origin_values[:, 2].copy()),
+            ("magnitude", np.array(magnitudes, dtype=np.float64)),
+            ("magnitude_type", np.array(magnitude_types, dtype=np.object_)),
+            ("standard_error", quality_values[:, 0].copy()),
+            ("azimuthal_gap", quality_values[:, 1].copy()),
+            ("used_station_count", quality_values[:, 2].copy()),
+            ("used_phase_count", quality_values[:, 3].copy())])
+        for array in arrays.values():
+            array.flags.writeable = False
+        result = (arrays, np.array(has_origin, dtype=np.bool_),
+                  np.array(has_quality, dtype=np.bool_))
+        self.__dict__["_arrays"] = (key, result)
+        return result
+
+    def _get_arrays_key(self):
+        """
+        Returns the modification stamps of all objects the arrays of
+        :meth:`to_arrays` are taken from, one tuple per event.
+
+        Every event type object gets a new stamp when any of its attributes
+        is set, so the key changes with the values and also when one of these
+        objects is replaced or removed from its list.
+        """
+        key = []
+        for event in self.events:
+            attributes = event.__dict__
+            origins = attributes.get("origins")
+            if origins:
+                origin = origins[0]
+                origin_stamp = origin._modification_stamp
+                quality = origin.__dict__.get("quality")
+                quality_stamp = \
+                    None if quality is None else quality._modification_stamp
+            else:
+                origin_stamp = quality_stamp = None
+            magnitudes = attributes.get("magnitudes")
+            magnitude_stamp = \
+                magnitudes[0]._modification_stamp if magnitudes else None
+            key.append((event._modification_stamp, origin_stamp,
+                        quality_stamp, magnitude_stamp))
+        return key
 
     def copy(self):
         """
@@ -446,8 +712,10 @@ class Catalog(object):
                 if not isinstance(_i, Event):
                     msg = 'Extend only accepts a list of Event objects.'
                     raise TypeError(msg)
+            self.__dict__.pop("_arrays", None)
             self.events.extend(event_list)
         elif isinstance(event_list, Catalog):
+            self.__dict__.pop("_arrays", None)
             self.events.extend(event_list.events)
         else:
             msg = 'Extend only supports a list of Event objects as argument.'
@@ -783,8 +1051,21 @@ def read_events(pathname_or_url=None, format=None, **kwargs):
     :type format: str
     :param format: Format of the file to read (e.g. ``"QUAKEML"``). See the
         `Supported Formats`_ section below for a list of supported formats.
+    :type stream: bool
+    :param stream: Return an iterator over the events instead of a catalog.
+        Formats that support it (e.g. QuakeML) are then read incrementally,
+        one event at a time, so that files larger than the available memory
+        can be processed. Other formats are read completely before the
+        first event is returned.
+    :type filters: list of str
+    :param filters: Only return events matching these filter rules (see
+        :meth:`Catalog.filter`), only available with ``stream=True``.
+        Formats reading events incrementally check the rules before creating
+        the events.
     :rtype: :class:`~obspy.core.event.Catalog`
-    :return: An ObsPy :class:`~obspy.core.event.Catalog` object.
+    :return: An ObsPy :class:`~obspy.core.event.Catalog` object, or an
+        iterator over :class:`~obspy.core.event.Event` objects with
+        ``stream=True``.
 
     .. rubric:: _`Supported Formats`
 
@@ -801,7 +1082,18 @@ def read_events(pathname_or_url=None, format=None, **kwargs):
     :meth:`~obspy.core.event.Catalog.write` method of the returned
     :class:`~obspy.core.event.Catalog` object can be used to export the data to
     the file system.
+
+    .. rubric:: Example
+
+    >>> from obspy import read_events
+    >>> for event in read_events("/path/to/neries_events.xml", stream=True,
+    ...                          filters=["magnitude >= 4.0"]):
+    ...     print(event.short_str())  # doctest: +NORMALIZE_WHITESPACE
+    2012-04-04T14:21:42.300000Z | +41.818,  +79.689 | 4.4 mb | manual
+    2012-04-04T14:18:37.000000Z | +39.342,  +41.044 | 4.3 ML | manual
     """
+    if kwargs.pop("stream", False):
+        return _iter_events(pathname_or_url, format, **kwargs)
     if pathname_or_url is None:
         # if no pathname or URL specified, return example catalog
         return _create_example_catalog()
@@ -849,6 +1141,80 @@ def read_events(pathname_or_url=None, format=None, **kwargs):
         return catalog
 
 
+def _iter_events(pathname_or_url=None, format=None, **kwargs):
+    """
+    Returns an iterator over the events of event files, see
+    :func:`read_events`.
+    """
+    if pathname_or_url is None:
+        return iter(_create_example_catalog())
+    elif not isinstance(pathname_or_url, (str, native_str)):
+        # file-like object
+        return _iter_read(pathname_or_url, format, **kwargs)
+    elif isinstance(pathname_or_url, bytes) and \
+            pathname_or_url.strip().startswith(b'<'):
+        # XML string
+        return _iter_read(io.BytesIO(pathname_or_url), format, **kwargs)
+    elif "://" in pathname_or_url[:10]:
+        return _iter_url(pathname_or_url, format, **kwargs)
+    pathname = pathname_or_url
+    pathnames = sorted(glob.glob(pathname))
+    if not pathnames:
+        if glob.has_magic(pathname):
+            raise Exception("No file matching file pattern: %s" % pathname)
+        raise IOError(2, "No such file or directory", pathname)
+    return _iter_files(pathnames, format, **kwargs)
+
+
+def _iter_url(url, format=None, **kwargs):
+    """
+    Downloads an event file to a temporary file and iterates over its
+    events.
+    """
+    suffix = os.path.basename(url).partition('.')[2] or '.tmp'
+    with NamedTemporaryFile(suffix=sanitize_filename(suffix)) as fh:
+        download_to_file(url=url, filename_or_buffer=fh)
+        for event in _iter_read(fh.name, format, **kwargs):
+            yield event
+
+
+def _iter_files(pathnames, format=None, **kwargs):
+    for pathname in pathnames:
+        for event in _iter_read(pathname, format, **kwargs):
+            yield event
+
+
+def _iter_read(filename, format=None, **kwargs):
+    """
+    Iterates over the events of a single event file.
+
+    Uses the optional ``iterFormat`` function of the format plug-in, which
+    has to accept the same arguments as its ``readFormat`` function plus
+    ``filters``, and falls back to reading the whole file.
+    """
+    try:
+        if format:
+            format_ep = EVENT_ENTRY_POINTS[format.upper()]
+        else:
+            format_ep = _detect_format('event', filename)
+        iter_format = buffered_load_entry_point(
+            format_ep.dist.key, 'obspy.plugin.event.%s' % format_ep.name,
+            'iterFormat')
+    except (KeyError, ImportError, TypeError):
+        # format does not support iterating over the events (or is not
+        # known, e.g. for compressed files)
+        filters = kwargs.pop("filters", None)
+        catalog = _read(filename, format, **kwargs)
+        if filters:
+            catalog = catalog.filter(*filters)
+        for event in catalog:
+            yield event
+        return
+    for event in iter_format(filename, **kwargs):
+        event._format = format_ep.name
+        yield event
+
+
 @uncompress_file
 def _read(filename, format=None, **kwargs):
     """
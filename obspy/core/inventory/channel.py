@@ -16,6 +16,7 @@ from future.utils import python_2_unicode_compatible
 
 from obspy.core.util.obspy_types import FloatWithUncertainties
 from . import BaseNode
+from .response import _DeferredResponse
 from .util import Azimuth, ClockDrift, Dip, Distance, Latitude, Longitude
 
 
@@ -198,6 +199,39 @@ class Channel(BaseNode):
     def _repr_pretty_(self, p, cycle):
         p.text(str(self))
 
+    def __setstate__(self, state):
+        # channels pickled before responses could be deferred
+        if "response" in state:
+            state["_response"] = state.pop("response")
+        self.__dict__.update(state)
+
+    def __eq__(self, other):
+        if not isinstance(other, Channel):
+            return False
+        # deferred responses are compared after parsing them
+        if self._response is not other._response:
+            if self.response != other.response:
+                return False
+        return dict(self.__dict__, _response=None) == \
+            dict(other.__dict__, _response=None)
+
+    @property
+    def response(self):
+        """
+        The response of the channel.
+
+        Readers can defer parsing the response until it is accessed for the
+        first time (e.g. the ``defer_responses`` option of the StationXML
+        reader).
+        """
+        if isinstance(self._response, _DeferredResponse):
+            self._response = self._response.load()
+        return self._response
+
+    @response.setter
+    def response(self, value):
+        self._response = value
+
     @property
     def location_code(self):
         return self._location_code
@@ -20,6 +20,8 @@ import os
 import textwrap
 import warnings
 
+import numpy as np
+
 import obspy
 from obspy.core.util.base import (ENTRY_POINTS, ComparingObject,
                                   _read_from_plugin, NamedTemporaryFile,
@@ -29,7 +31,8 @@ from obspy.core.util.misc import buffered_load_entry_point
 from obspy.core.util.obspy_types import ObsPyException, ZeroSamplingRate
 
 from .network import Network
-from .util import _unified_content_strings, _textwrap
+from .util import (_ChannelIndex, _StaleIndexError, _get_channel_metadata,
+                   _to_ns, _unified_content_strings, _textwrap)
 
 # Make sure this is consistent with obspy.io.stationxml! Importing it
 # from there results in hard to resolve cyclic imports.
@@ -104,7 +107,17 @@ class Inventory(ComparingObject):
     The root object of the Inventory->Network->Station->Channel hierarchy.
 
     In essence just a container for one or more networks.
+
+    Lookups of channels by SEED ID (e.g. :meth:`get_response` and
+    :meth:`get_coordinates`) use an index of all channel epochs that is
+    built on first use. It is rebuilt when networks are set or added, and
+    when a lookup of a SEED ID finds that one of its channels has been
+    changed, moved or removed since. Channels added to stations or renamed
+    in place might only be found after that.
     """
+    # index of the channel epochs, see _get_channels()
+    _index = None
+
     def __init__(self, networks, source, sender=None, created=None,
                  module=SOFTWARE_MODULE, module_uri=SOFTWARE_URI):
         """
@@ -143,6 +156,17 @@ class Inventory(ComparingObject):
         else:
             self.created = created
 
+    def __eq__(self, other):
+        if not isinstance(other, Inventory):
+            return False
+        return dict(self.__dict__, _index=None) == \
+            dict(other.__dict__, _index=None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_index", None)
+        return state
+
     def __add__(self, other):
         new = copy.deepcopy(self)
         new += other
@@ -159,6 +183,7 @@ class Inventory(ComparingObject):
             msg = ("Only Inventory and Network objects can be added to "
                    "an Inventory.")
             raise TypeError(msg)
+        self._index = None
         return self
 
     def __len__(self):
@@ -332,6 +357,27 @@ class Inventory(ComparingObject):
             msg = "networks can only contain Network objects."
             raise ValueError(msg)
         self._networks = value
+        self._index = None
+
+    def _lookup(self, method, *args):
+        """
+        Call a lookup method of the index of channel epochs, (re)building
+        the index if the networks changed.
+        """
+        if self._index is None or self._index.networks is not self._networks:
+            self._index = _ChannelIndex(self._networks)
+        try:
+            return getattr(self._index, method)(*args)
+        except _StaleIndexError:
+            self._index = _ChannelIndex(self._networks)
+            return getattr(self._index, method)(*args)
+
+    def _get_channels(self, seed_id, datetime=None):
+        """
+        Networks, stations and channels of all epochs of a SEED ID containing
+        the given time (all epochs if it is ``None``).
+        """
+        return self._lookup("get", seed_id, datetime)
 
     def get_response(self, seed_id, datetime):
         """
@@ -359,14 +405,12 @@ class Inventory(ComparingObject):
         """
         network, _, _, _ = seed_id.split(".")
 
-        responses = []
-        for net in self.networks:
-            if net.code != network:
-                continue
-            try:
-                responses.append(net.get_response(seed_id, datetime))
-            except Exception:
-                pass
+        responses = [cha.response
+                     for _, _, cha in self._get_channels(seed_id, datetime)
+                     if (cha.start_date is None or
+                         cha.start_date <= datetime) and
+                     (cha.end_date is None or cha.end_date >= datetime)]
+        responses = [_i for _i in responses if _i is not None]
         if len(responses) > 1:
             msg = "Found more than one matching response. Returning first."
             warnings.warn(msg)
@@ -390,13 +434,11 @@ class Inventory(ComparingObject):
         network, _, _, _ = seed_id.split(".")
 
         metadata = []
-        for net in self.networks:
-            if net.code != network:
+        for net, sta, cha in self._get_channels(seed_id, datetime):
+            if datetime is not None and \
+                    not all(_i.is_active(time=datetime) for _i in (net, sta)):
                 continue
-            try:
-                metadata.append(net.get_channel_metadata(seed_id, datetime))
-            except Exception:
-                pass
+            metadata.append(_get_channel_metadata(sta, cha))
         if len(metadata) > 1:
             msg = ("Found more than one matching channel metadata. "
                    "Returning first.")
@@ -433,6 +475,68 @@ class Inventory(ComparingObject):
             coordinates[key] = metadata[key]
         return coordinates
 
+    def get_coordinates_many(self, seed_ids, datetimes=None):
+        """
+        Return coordinates for many channels at once.
+
+        >>> from obspy import read_inventory, UTCDateTime
+        >>> inv = read_inventory()
+        >>> t = UTCDateTime("2015-01-01")
+        >>> coordinates = inv.get_coordinates_many(
+        ...     ["GR.FUR..LHE", "GR.WET..LHZ", "XX.XXX..XXX"], t)
+        >>> print(coordinates["latitude"])  # doctest: +NORMALIZE_WHITESPACE
+        [ 48.162899  49.144001        nan]
+
+        :type seed_ids: list of str
+        :param seed_ids: SEED ID strings of the channels to get coordinates
+            for.
+        :type datetimes: :class:`~obspy.core.utcdatetime.UTCDateTime` or list
+            of :class:`~obspy.core.utcdatetime.UTCDateTime`, optional
+        :param datetimes: Time to get coordinates for, either one time for all
+            channels or one for each channel.
+        :rtype: dict of :class:`numpy.ndarray`
+        :return: Dictionary containing arrays of coordinates (latitude,
+            longitude, elevation, local_depth) with one value for each
+            channel, NaN for channels without matching channel metadata.
+        """
+        seed_ids = list(seed_ids)
+        times = None
+        if datetimes is not None:
+            if isinstance(datetimes, obspy.UTCDateTime):
+                datetimes = [datetimes] * len(seed_ids)
+            else:
+                datetimes = list(datetimes)
+            if len(datetimes) != len(seed_ids):
+                msg = "Number of datetimes and SEED IDs differ."
+                raise ValueError(msg)
+            times = np.array([_to_ns(_i) for _i in datetimes],
+                             dtype=np.int64)
+
+        epochs, channels = self._lookup("get_many", seed_ids, times)
+
+        keys = ['latitude', 'longitude', 'elevation', 'local_depth']
+        coordinates = dict((key, np.empty(len(seed_ids))) for key in keys)
+        for key in keys:
+            coordinates[key].fill(np.nan)
+        values = {}
+        for n in np.unique(epochs[epochs >= 0]):
+            _, sta, cha = channels[n]
+            values[n] = _get_channel_metadata(sta, cha)
+        for i in np.nonzero(epochs != -1)[0]:
+            if epochs[i] >= 0:
+                metadata = values[epochs[i]]
+            else:
+                try:
+                    metadata = self.get_channel_metadata(
+                        seed_ids[i],
+                        None if datetimes is None else datetimes[i])
+                except Exception:
+                    continue
+            for key in keys:
+                if metadata[key] is not None:
+                    coordinates[key][i] = metadata[key]
+        return coordinates
+
     def get_orientation(self, seed_id, datetime=None):
         """
         Return orientation for a given channel.
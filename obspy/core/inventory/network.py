@@ -21,7 +21,8 @@ import warnings
 from obspy.core.util.obspy_types import ObsPyException, ZeroSamplingRate
 
 from .station import Station
-from .util import BaseNode, _unified_content_strings, _textwrap
+from .util import (BaseNode, _get_channel_metadata,
+                   _unified_content_strings, _textwrap)
 
 
 @python_2_unicode_compatible
@@ -270,19 +271,7 @@ class Network(BaseNode):
                         # skip if end date before given datetime
                         if cha.end_date and cha.end_date < datetime:
                             continue
-                    # prepare coordinates
-                    data = {}
-                    for key in ('latitude', 'longitude', 'elevation'):
-                        value = getattr(cha, key, None)
-                        # if channel latitude/longitude/elevation is not given
-                        # use station information
-                        if value is None:
-                            value = getattr(sta, key, None)
-                        data[key] = value
-                    data['local_depth'] = cha.depth
-                    data['azimuth'] = cha.azimuth
-                    data['dip'] = cha.dip
-                    metadata.append(data)
+                    metadata.append(_get_channel_metadata(sta, cha))
         if len(metadata) > 1:
             msg = ("Found more than one matching channel metadata. "
                    "Returning first.")
@@ -1664,6 +1664,44 @@ class Response(ComparingObject):
         return paz_to_sacpz_string(paz, self.instrument_sensitivity)
 
 
+class _DeferredResponse(object):
+    """
+    Placeholder for a response that is only parsed when it is accessed.
+
+    Readers store it as the response of a
+    :class:`~obspy.core.inventory.channel.Channel`, which replaces it with
+    the parsed response when the response is accessed for the first time.
+    Copying or pickling the placeholder parses the response.
+
+    :type loader: callable
+    :param loader: Function parsing the response from ``args``.
+    :param args: The raw response, e.g. a serialized XML element.
+    """
+    __slots__ = ("loader", "args")
+
+    def __init__(self, loader, *args):
+        self.loader = loader
+        self.args = args
+
+    def __reduce__(self):
+        return (_get_response, (self.load(),))
+
+    def load(self):
+        """
+        Returns the parsed response.
+
+        :rtype: :class:`Response`
+        """
+        return self.loader(*self.args)
+
+
+def _get_response(response):
+    """
+    Restores copied or unpickled deferred responses as parsed responses.
+    """
+    return response
+
+
 def paz_to_sacpz_string(paz, instrument_sensitivity):
     """
     Returns SACPZ ASCII text representation of Response.
@@ -13,10 +13,13 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import bisect
 import copy
 import re
 from textwrap import TextWrapper
 
+import numpy as np
+
 from obspy import UTCDateTime
 from obspy.core.util.base import ComparingObject
 from obspy.core.util.obspy_types import (FloatWithUncertaintiesAndUnit,
@@ -859,6 +862,223 @@ def _seed_id_keyfunction(x):
     return x
 
 
+def _get_channel_metadata(station, channel):
+    """
+    Coordinates and orientation of a channel. The coordinates of the station
+    are used if they are not given for the channel.
+    """
+    data = {}
+    for key in ('latitude', 'longitude', 'elevation'):
+        value = getattr(channel, key, None)
+        # if channel latitude/longitude/elevation is not given
+        # use station information
+        if value is None:
+            value = getattr(station, key, None)
+        data[key] = value
+    data['local_depth'] = channel.depth
+    data['azimuth'] = channel.azimuth
+    data['dip'] = channel.dip
+    return data
+
+
+# Open start and end dates of the channel index. Times are clipped to this
+# range (years 1677 to 2262) to fit into 64 bit integers.
+_MIN_NS = -2 ** 63
+_MAX_NS = 2 ** 63 - 1
+
+
+def _to_ns(time, default=None):
+    """
+    Time as integer nanoseconds, ``default`` if it is ``None``.
+    """
+    if time is None:
+        return default
+    if not isinstance(time, UTCDateTime):
+        time = UTCDateTime(time)
+    return min(max(time._ns, _MIN_NS), _MAX_NS)
+
+
+class _StaleIndexError(Exception):
+    pass
+
+
+class _ChannelIndex(object):
+    """
+    Channel epochs of a list of networks by SEED ID, sorted by start time.
+
+    Lookups check that all epochs of the SEED IDs they look up are still at
+    the same place in the networks with the same codes and times and, before
+    reporting that nothing was found, that no stations or channels were added
+    or removed. They raise a :class:`_StaleIndexError` if not.
+    """
+    def __init__(self, networks):
+        self.networks = networks
+        self.num_networks = len(networks)
+        rows = []
+        for i, net in enumerate(networks):
+            for j, sta in enumerate(net.stations):
+                for k, cha in enumerate(sta.channels):
+                    rows.append(self._get_row(net, sta, cha) +
+                                (len(rows), (i, j, k)))
+        # sort by SEED ID, start time and position in the inventory
+        rows.sort(key=lambda row: (row[0], row[1], row[5]))
+        (self.seed_ids, self.starts, self.ends, self.meta_starts,
+         self.meta_ends, self.order, self.positions) = \
+            [list(_i) for _i in zip(*rows)] or [[]] * 7
+        # The maximum end time of all epochs up to the current one of a SEED
+        # ID limits how far back a lookup has to search for epochs containing
+        # a given time.
+        self.max_ends = []
+        self.slices = {}
+        for n, (seed_id, end) in enumerate(zip(self.seed_ids, self.ends)):
+            if seed_id in self.slices:
+                self.slices[seed_id][1] = n + 1
+                end = max(end, self.max_ends[-1])
+            else:
+                self.slices[seed_id] = [n, n + 1]
+            self.max_ends.append(end)
+        self._arrays = None
+        self.structure = self._get_structure(networks)
+
+    @staticmethod
+    def _get_structure(networks):
+        """
+        The station and channel lists of the networks with their lengths,
+        to notice added, removed and replaced stations and channels.
+        """
+        return [(id(net.stations), len(net.stations),
+                 [(id(sta.channels), len(sta.channels))
+                  for sta in net.stations])
+                for net in networks]
+
+    def check_structure(self):
+        """
+        Raises a :class:`_StaleIndexError` if stations or channels were
+        added to or removed from the networks since the index was built.
+
+        Lookups call this before reporting that no epoch was found, found
+        epochs are checked by :meth:`get_channel`.
+        """
+        if len(self.networks) != self.num_networks or \
+                self._get_structure(self.networks) != self.structure:
+            raise _StaleIndexError()
+
+    @staticmethod
+    def _get_row(net, sta, cha):
+        seed_id = "%s.%s.%s.%s" % (net.code, sta.code, cha.location_code,
+                                   cha.code)
+        start = _to_ns(cha.start_date, _MIN_NS)
+        end = _to_ns(cha.end_date, _MAX_NS)
+        meta_start = max(start, _to_ns(sta.start_date, _MIN_NS),
+                         _to_ns(net.start_date, _MIN_NS))
+        meta_end = min(end, _to_ns(sta.end_date, _MAX_NS),
+                       _to_ns(net.end_date, _MAX_NS))
+        return seed_id, start, end, meta_start, meta_end
+
+    def get_channel(self, n):
+        """
+        Network, station and channel of an epoch.
+        """
+        i, j, k = self.positions[n]
+        try:
+            net = self.networks[i]
+            sta = net.stations[j]
+            cha = sta.channels[k]
+        except IndexError:
+            raise _StaleIndexError()
+        row = (self.seed_ids[n], self.starts[n], self.ends[n],
+               self.meta_starts[n], self.meta_ends[n])
+        if len(self.networks) != self.num_networks or \
+                self._get_row(net, sta, cha) != row:
+            raise _StaleIndexError()
+        return net, sta, cha
+
+    def get(self, seed_id, time=None):
+        """
+        Networks, stations and channels of all epochs of a SEED ID containing
+        the given time (all epochs if it is ``None``), in the order of the
+        networks.
+        """
+        if seed_id not in self.slices:
+            self.check_structure()
+            return []
+        first, last = self.slices[seed_id]
+        channels = [self.get_channel(n) for n in range(first, last)]
+        if time is None:
+            epochs = list(range(first, last))
+        else:
+            time = _to_ns(time)
+            epochs = []
+            n = bisect.bisect_right(self.starts, time, first, last) - 1
+            while n >= first and self.max_ends[n] >= time:
+                if self.ends[n] >= time:
+                    epochs.append(n)
+                n -= 1
+        if not epochs:
+            self.check_structure()
+        epochs.sort(key=self.order.__getitem__)
+        return [channels[n - first] for n in epochs]
+
+    def get_many(self, seed_ids, times=None):
+        """
+        Epochs of many SEED IDs at once.
+
+        Returns the indices of the epochs containing the given times for
+        which the network and station are active as well, ``-1`` if there is
+        none and ``-2`` if several epochs contain the time (these have to be
+        looked up with :meth:`get`), and a dictionary with the networks,
+        stations and channels of all epochs of the SEED IDs.
+        """
+        if len(self.networks) != self.num_networks:
+            raise _StaleIndexError()
+        if self._arrays is None:
+            self._arrays = [
+                np.array(values, dtype=np.int64)
+                for values in (self.starts, self.ends, self.max_ends,
+                               self.meta_starts, self.meta_ends)]
+        starts, ends, max_ends, meta_starts, meta_ends = self._arrays
+        # slices of the epochs of each SEED ID, empty for unknown ones
+        slices = {}
+        channels = {}
+        for seed_id in set(seed_ids):
+            if seed_id in self.slices:
+                slices[seed_id] = self.slices[seed_id]
+                for n in range(*slices[seed_id]):
+                    channels[n] = self.get_channel(n)
+            else:
+                slices[seed_id] = (0, 0)
+        if not channels:
+            self.check_structure()
+            return -np.ones(len(seed_ids), dtype=np.int64), channels
+        bounds = np.array([slices[_i] for _i in seed_ids],
+                          dtype=np.int64).reshape((-1, 2))
+        first, last = bounds[:, 0], bounds[:, 1]
+        if times is None:
+            epochs = np.where(last - first == 1, first, -2)
+            epochs[last == first] = -1
+            if np.any(epochs == -1):
+                self.check_structure()
+            return epochs, channels
+        # binary search for the last epoch starting before each time
+        low, high = first.copy(), last.copy()
+        while np.any(low < high):
+            middle = (low + high) // 2
+            before = (low < high) & \
+                (starts[np.minimum(middle, len(starts) - 1)] <= times)
+            low = np.where(before, middle + 1, low)
+            high = np.where(before | (low >= high), high, middle)
+        n = low - 1
+        n_ = np.maximum(n, 0)
+        found = (n >= first) & (ends[n_] >= times) & \
+            (meta_starts[n_] <= times) & (meta_ends[n_] >= times)
+        # an earlier epoch might contain the time as well
+        ambiguous = (n > first) & (max_ends[np.maximum(n - 1, 0)] >= times)
+        epochs = np.where(ambiguous, -2, np.where(found, n, -1))
+        if np.any(epochs == -1):
+            self.check_structure()
+        return epochs, channels
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -13,8 +13,10 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import copy
 import inspect
 import os
+import pickle
 import unittest
 import warnings
 
@@ -24,7 +26,8 @@ from matplotlib import rcParams
 from obspy.core.util import MATPLOTLIB_VERSION
 from obspy.core.util.testing import ImageComparison
 from obspy import read_inventory
-from obspy.core.inventory import Channel, Equipment
+from obspy.core.inventory import Channel, Equipment, Response
+from obspy.core.inventory.response import _DeferredResponse
 
 
 class ChannelTestCase(unittest.TestCase):
@@ -171,6 +174,62 @@ class ChannelTestCase(unittest.TestCase):
             "\tResponse information available"
         )
 
+    def test_deferred_response(self):
+        """
+        Deferred responses are parsed when they are accessed for the first
+        time and then kept by the channel.
+        """
+        inv = read_inventory()
+        responses = [cha.response for net in inv for sta in net
+                     for cha in sta]
+        calls = []
+
+        def _load(i):
+            calls.append(i)
+            return copy.deepcopy(responses[i])
+
+        channels = [cha for net in inv for sta in net for cha in sta]
+        for i, cha in enumerate(channels):
+            cha.response = _DeferredResponse(_load, i)
+        self.assertEqual(calls, [])
+        self.assertIn("Response information available", str(channels[0]))
+        self.assertEqual(calls, [0])
+        self.assertEqual(inv, read_inventory())
+        self.assertEqual(calls, list(range(len(channels))))
+        # the parsed responses are kept, changes to them as well
+        del calls[:]
+        channels[1].response.instrument_sensitivity.value = 1.0
+        self.assertEqual(channels[1].response.instrument_sensitivity.value,
+                         1.0)
+        self.assertIs(channels[1].response, channels[1].response)
+        self.assertEqual(calls, [])
+        # copies hold the parsed response
+        channels[2].response = _DeferredResponse(_load, 2)
+        cha = copy.deepcopy(channels[2])
+        self.assertEqual(calls, [2])
+        self.assertIsInstance(cha._response, Response)
+        channels[2].response = _DeferredResponse(_load, 2)
+        self.assertEqual(pickle.loads(pickle.dumps(channels[2])),
+                         channels[2])
+        # deferred responses that turn out to be missing
+        channels[3].response = _DeferredResponse(lambda: None)
+        self.assertNotIn("Response information available", str(channels[3]))
+        self.assertIsNone(channels[3].response)
+
+    def test_unpickle_channel_without_deferred_response(self):
+        """
+        Channels pickled before responses could be deferred stored the
+        response as ``response`` attribute.
+        """
+        channel = read_inventory()[0][0][0]
+        old_channel = copy.copy(channel)
+        old_channel.__dict__["response"] = \
+            old_channel.__dict__.pop("_response")
+        restored = pickle.loads(pickle.dumps(old_channel))
+        self.assertNotIn("response", restored.__dict__)
+        self.assertEqual(restored, channel)
+        self.assertEqual(restored.response, channel.response)
+
 
 def suite():
     return unittest.makeSuite(ChannelTestCase, 'test')
@@ -17,7 +17,8 @@ import numpy as np
 
 from obspy.core.event import (Catalog, Comment, CreationInfo, Event, Origin,
                               Pick, ResourceIdentifier, WaveformStreamID,
-                              read_events, Magnitude, FocalMechanism, Arrival)
+                              read_events, Magnitude, FocalMechanism, Arrival,
+                              OriginQuality)
 from obspy.core.event.source import farfield
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import BASEMAP_VERSION, CARTOPY_VERSION
@@ -336,6 +337,36 @@ class CatalogTestCase(unittest.TestCase):
         got = read_events(os.path.join(self.path, "*_events.xml"))
         self.assertEqual(expected, got)
 
+    def test_read_events_stream(self):
+        """
+        Tests iterating over the events of files with read_events().
+        """
+        events = read_events(os.path.join(self.path, "*_events.xml"),
+                             stream=True)
+        self.assertFalse(isinstance(events, Catalog))
+        events = list(events)
+        self.assertEqual(events, read_events(
+            os.path.join(self.path, "*_events.xml")).events)
+        self.assertEqual([event._format for event in events],
+                         ['QUAKEML'] * 5)
+        # filters are applied while reading
+        expected = read_events(self.neries_xml).filter(
+            "magnitude >= 4.0", "depth < 20000")
+        got = read_events(self.neries_xml, stream=True,
+                          filters=["magnitude >= 4.0", "depth < 20000"])
+        self.assertEqual(list(got), expected.events)
+        # formats without support for iterating are read completely
+        filename = os.path.join(self.path, "events_longitude_wrap.zmap")
+        events = list(read_events(filename, stream=True,
+                                  filters=["longitude > 0"]))
+        expected = read_events(filename).filter("longitude > 0")
+        self.assertEqual([event.origins[0].time for event in events],
+                         [event.origins[0].time for event in expected])
+        self.assertEqual(events[0]._format, 'ZMAP')
+        # example catalog
+        self.assertEqual(list(read_events(stream=True)),
+                         read_events().events)
+
     def test_append(self):
         """
         Tests the append method of the Catalog object.
@@ -515,6 +546,108 @@ class CatalogTestCase(unittest.TestCase):
             self.assertTrue(all(event in cat_smaller
                                 for event in cat_bigger_inverse))
 
+    def test_filter_unset_values(self):
+        """
+        Events without the origin, quality or magnitude a rule refers to never
+        match, unset values only match upper bounds.
+        """
+        t = UTCDateTime(2012, 1, 1)
+        cat = Catalog([
+            Event(),
+            Event(origins=[Origin()], magnitudes=[Magnitude(mag=0.0)]),
+            Event(origins=[Origin(time=t, latitude=10.0)],
+                  magnitudes=[Magnitude(mag=3.0)]),
+            Event(origins=[Origin(time=t + 1e-7, quality=OriginQuality(
+                used_phase_count=5))])])
+        for rules, expected in (
+                (["magnitude < 4"], [2]),
+                (["magnitude >= 0"], [2]),
+                (["latitude < 20"], [1, 2, 3]),
+                (["latitude > 0"], [2]),
+                (["used_phase_count < 10"], [3]),
+                (["used_station_count < 10"], [3]),
+                (["used_station_count > 0"], []),
+                (["time <= 2012-01-01"], [1, 2, 3]),
+                (["time > 2012-01-01"], []),
+                (["time < 2012-01-01T00:00:00.000001", "latitude > 5"],
+                 [2])):
+            self.assertEqual(
+                [cat.events.index(ev) for ev in cat.filter(*rules)],
+                expected)
+            self.assertEqual(
+                [cat.events.index(ev)
+                 for ev in cat.filter(*rules, inverse=True)],
+                [i for i in range(4) if i not in expected])
+
+    def test_to_arrays(self):
+        cat = read_events()
+        arrays = cat.to_arrays()
+        self.assertEqual(
+            list(arrays),
+            ["resource_id", "event_type", "time", "latitude", "longitude",
+             "depth", "magnitude", "magnitude_type", "standard_error",
+             "azimuthal_gap", "used_station_count", "used_phase_count"])
+        self.assertEqual(arrays["resource_id"][1], str(cat[1].resource_id))
+        self.assertEqual(arrays["time"][2],
+                         np.datetime64("2012-04-04T14:08:46", "ns"))
+        np.testing.assert_array_equal(arrays["depth"],
+                                      [1000.0, 14400.0, 7000.0])
+        np.testing.assert_array_equal(arrays["used_station_count"],
+                                      [16, 46, 22])
+        self.assertFalse(arrays["latitude"].flags.writeable)
+
+        # the arrays are cached until the catalog or an event changes
+        self.assertIs(cat.to_arrays()["latitude"], arrays["latitude"])
+        cat[0].origins[0].latitude = 1.0
+        self.assertEqual(cat.to_arrays()["latitude"][0], 1.0)
+        cat[1].magnitudes = []
+        self.assertTrue(np.isnan(cat.to_arrays()["magnitude"][1]))
+        cat.append(Event(event_type="quarry blast"))
+        self.assertEqual(cat.to_arrays()["event_type"].tolist(),
+                         ["not reported"] * 3 + ["quarry blast"])
+        self.assertTrue(np.isnat(cat.to_arrays()["time"][3]))
+        del cat[0]
+        self.assertEqual(len(cat.to_arrays()["time"]), 3)
+        cat[0] = cat[1]
+        self.assertEqual(cat.to_arrays()["latitude"][0], 38.017)
+        # changes of the lists themselves are noticed as well
+        cat.events.reverse()
+        arrays = cat.to_arrays()
+        self.assertTrue(np.isnan(arrays["latitude"][0]))
+        self.assertIsNot(cat.to_arrays(refresh=True)["latitude"],
+                         arrays["latitude"])
+        self.assertEqual(len(cat.filter("latitude < 40")), 2)
+        # copies are not affected
+        cat2 = cat.copy()
+        self.assertNotIn("_arrays", cat2.__dict__)
+        cat2[1].origins[0].latitude = 50.0
+        self.assertEqual(len(cat.filter("latitude < 40")), 2)
+        self.assertEqual(len(cat2.filter("latitude < 40")), 0)
+        # values set as items are noticed as well
+        cat[1].origins[0]["latitude"] = 60.0
+        self.assertEqual(cat.to_arrays()["latitude"][1], 60.0)
+
+    def test_filter_after_changing_lists_in_place(self):
+        """
+        Filtering must notice origins and magnitudes that are removed or
+        replaced in place.
+        """
+        cat = read_events()
+        self.assertEqual(len(cat.filter("magnitude >= 4.0")), 2)
+        del cat[0].magnitudes[0]
+        self.assertEqual(len(cat.filter("magnitude >= 4.0")), 1)
+        cat = read_events()
+        self.assertEqual(len(cat.filter("magnitude >= 4.0")), 2)
+        cat[1].magnitudes[0] = cat[2].magnitudes[0]
+        self.assertEqual(len(cat.filter("magnitude >= 4.0")), 1)
+        cat[2].origins.insert(0, Origin(latitude=10.0))
+        self.assertEqual(len(cat.filter("latitude <= 10.0")), 1)
+        # changes of other events or catalogs do not rebuild the arrays
+        arrays = cat.to_arrays()
+        read_events()[0].magnitudes[0].mag = 1.0
+        cat[0].magnitudes.append(Magnitude(mag=1.0))
+        self.assertIs(cat.to_arrays()["magnitude"], arrays["magnitude"])
+
     def test_catalog_resource_id(self):
         """
         See #662
@@ -1039,6 +1172,28 @@ class ResourceIdentifierTestCase(unittest.TestCase):
             "specified in the QuakeML manual section 3.1 and in particular "
             "exclude colons for the final part.")
 
+    def test_unbound_resource_ids(self):
+        """
+        Only resource identifiers without a referred object are registered
+        for binding them later.
+        """
+        unbound = ResourceIdentifier._ResourceIdentifier__unbound_resource_id
+        pick = Pick()
+        self.assertNotIn(id(pick.resource_id), unbound)
+        arrival = Arrival(pick_id=pick.resource_id)
+        self.assertIn(id(arrival.pick_id), unbound)
+        rid = ResourceIdentifier(referred_object=pick)
+        self.assertNotIn(id(rid), unbound)
+        ResourceIdentifier.bind_resource_ids()
+        self.assertNotIn(id(arrival.pick_id), unbound)
+        self.assertIs(arrival.pick_id.get_referred_object(), pick)
+        # the registry entries are removed with the last instance of an id
+        rid_id = rid.id
+        del pick, arrival, rid
+        self.assertNotIn(
+            rid_id,
+            ResourceIdentifier._ResourceIdentifier__resource_id_weak_dict)
+
 
 class ResourceIDEventScopeTestCase(unittest.TestCase):
     """
@@ -15,7 +15,9 @@ from future.builtins import *  # NOQA
 from future.utils import PY2, native_str
 
 import builtins
+import copy
 import os
+import pickle
 import unittest
 import warnings
 
@@ -175,6 +177,155 @@ class InventoryTestCase(unittest.TestCase):
         # 3 - unknown SEED ID should raise exception
         self.assertRaises(Exception, inv.get_orientation, 'BW.RJOB..XXX')
 
+    def _get_inventory_with_epochs(self):
+        """
+        Inventory with several adjacent and overlapping channel epochs.
+        """
+        def _channel(code, start, end, latitude):
+            return Channel(
+                code=code, location_code='', latitude=latitude,
+                longitude=10.0, elevation=100.0, depth=0.0,
+                start_date=start and UTCDateTime(start),
+                end_date=end and UTCDateTime(end),
+                response=Response(resource_id='%s%s' % (code, latitude)))
+
+        channels_a = [_channel('BHZ', '2005-01-01', '2010-01-01', 2.0),
+                      _channel('BHZ', '2000-01-01', '2005-01-01', 1.0),
+                      _channel('BHZ', '2010-01-01', None, 3.0),
+                      _channel('HHZ', '2000-01-01', '2010-01-01', 4.0),
+                      _channel('HHZ', '2005-01-01', '2015-01-01', 5.0)]
+        channels_b = [_channel('BHZ', None, None, 6.0)]
+        stations = [Station('A', latitude=0.0, longitude=0.0, elevation=0.0,
+                            channels=channels_a),
+                    Station('B', latitude=6.0, longitude=0.0, elevation=0.0,
+                            channels=channels_b,
+                            start_date=UTCDateTime('2003-01-01'))]
+        return Inventory([Network('XX', stations=stations)], source='TEST',
+                         created=UTCDateTime(2018, 1, 1))
+
+    def test_channel_index(self):
+        """
+        Lookups with the index of channel epochs give the same results as
+        the lookups of the networks.
+        """
+        inv = self._get_inventory_with_epochs()
+        times = [UTCDateTime(_i, 1, 1) for _i in range(1998, 2017)] + \
+            [UTCDateTime(2004, 12, 31, 23, 59, 59, 999999), None]
+        for seed_id in ('XX.A..BHZ', 'XX.A..HHZ', 'XX.B..BHZ', 'XX.C..BHZ',
+                        'YY.A..BHZ'):
+            for t in times:
+                for method in ('get_response', 'get_channel_metadata'):
+                    if method == 'get_response' and t is None:
+                        continue
+                    with warnings.catch_warnings(record=True) as w:
+                        warnings.simplefilter('always')
+                        try:
+                            expected = getattr(inv[0], method)(seed_id, t)
+                        except Exception:
+                            self.assertRaises(
+                                Exception, getattr(inv, method), seed_id, t)
+                            continue
+                        self.assertEqual(getattr(inv, method)(seed_id, t),
+                                         expected)
+                    self.assertEqual(len(w), 2 if w else 0)
+        self.assertIsNotNone(inv._index)
+
+    def test_channel_index_is_rebuilt(self):
+        """
+        The index of channel epochs is rebuilt when the networks change.
+        """
+        inv = self._get_inventory_with_epochs()
+        t = UTCDateTime(2006, 1, 1)
+        self.assertEqual(inv.get_coordinates('XX.A..BHZ', t)['latitude'], 2.0)
+        # the index is not copied, pickled or compared
+        self.assertEqual(inv, self._get_inventory_with_epochs())
+        self.assertIsNone(copy.deepcopy(inv)._index)
+        self.assertIsNone(pickle.loads(pickle.dumps(inv))._index)
+        # changed channels
+        inv[0][0][0].start_date = UTCDateTime(2007, 1, 1)
+        self.assertRaises(Exception, inv.get_response, 'XX.A..BHZ', t)
+        inv[0][0][0].start_date = UTCDateTime(2005, 1, 1)
+        self.assertEqual(inv.get_coordinates('XX.A..BHZ', t)['latitude'], 2.0)
+        inv[0][0][0].code = 'BHN'
+        self.assertRaises(Exception, inv.get_response, 'XX.A..BHZ', t)
+        self.assertEqual(inv.get_coordinates('XX.A..BHN', t)['latitude'], 2.0)
+        # removed channels
+        inv[0][0].channels.pop(0)
+        self.assertRaises(Exception, inv.get_response, 'XX.A..BHN', t)
+        self.assertEqual(inv.get_coordinates('XX.A..BHZ')['latitude'], 1.0)
+        # added and replaced networks
+        inv += Network('YY', stations=[inv[0][1].copy()])
+        self.assertEqual(inv.get_coordinates('YY.B..BHZ', t)['latitude'], 6.0)
+        inv.networks.append(Network('ZZ', stations=[inv[0][1].copy()]))
+        self.assertEqual(inv.get_coordinates('ZZ.B..BHZ', t)['latitude'], 6.0)
+        inv = inv.select(network='ZZ')
+        self.assertRaises(Exception, inv.get_response, 'XX.B..BHZ', t)
+
+    def test_channel_index_added_and_removed_channels(self):
+        """
+        Channels added to or removed from a station after a lookup are
+        found by the next lookups.
+        """
+        inv = self._get_inventory_with_epochs()
+        t = UTCDateTime(2006, 1, 1)
+        self.assertEqual(inv.get_coordinates('XX.A..BHZ', t)['latitude'], 2.0)
+        # a new SEED ID
+        new_channel = inv[0][0][0].copy()
+        new_channel.code = 'XYZ'
+        new_channel.latitude = 7.0
+        inv[0][0].channels.append(new_channel)
+        self.assertEqual(inv.get_coordinates('XX.A..XYZ', t)['latitude'], 7.0)
+        coordinates = inv.get_coordinates_many(['XX.A..XYZ'], [t])
+        self.assertEqual(coordinates['latitude'].tolist(), [7.0])
+        # a new epoch of a known SEED ID
+        t2 = UTCDateTime(2021, 1, 1)
+        self.assertRaises(Exception, inv.get_coordinates, 'XX.A..HHZ', t2)
+        channel = inv[0][0][3].copy()
+        channel.start_date = UTCDateTime(2020, 1, 1)
+        channel.end_date = None
+        channel.latitude = 8.0
+        inv[0][0].channels.append(channel)
+        self.assertEqual(inv.get_coordinates('XX.A..HHZ', t2)['latitude'],
+                         8.0)
+        # removed channels
+        inv[0][0].channels.remove(new_channel)
+        self.assertRaises(Exception, inv.get_coordinates, 'XX.A..XYZ', t)
+        coordinates = inv.get_coordinates_many(['XX.A..XYZ'], [t])
+        self.assertTrue(np.isnan(coordinates['latitude'][0]))
+
+    def test_get_coordinates_many(self):
+        inv = self._get_inventory_with_epochs()
+        seed_ids = ['XX.A..BHZ', 'XX.A..HHZ', 'XX.B..BHZ', 'XX.C..BHZ'] * 20
+        times = [UTCDateTime(1996 + _i // 4, 1, 1) for _i in range(80)]
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            coordinates = inv.get_coordinates_many(seed_ids, times)
+        # channel epochs overlap at eight of the times
+        self.assertEqual(len(w), 8)
+        for i, (seed_id, t) in enumerate(zip(seed_ids, times)):
+            try:
+                expected = inv.get_coordinates(seed_id, t)
+            except Exception:
+                expected = dict.fromkeys(coordinates, np.nan)
+            for key, value in expected.items():
+                np.testing.assert_equal(coordinates[key][i], value)
+        # one time for all channels or no time
+        coordinates = inv.get_coordinates_many(seed_ids[:4],
+                                               UTCDateTime(2003, 1, 1))
+        np.testing.assert_equal(coordinates['latitude'],
+                                [1.0, 4.0, 6.0, np.nan])
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('always')
+            coordinates = inv.get_coordinates_many(seed_ids[:4])
+        np.testing.assert_equal(coordinates['latitude'],
+                                [2.0, 4.0, 6.0, np.nan])
+        self.assertEqual(inv.get_coordinates_many([])['latitude'].shape, (0,))
+        coordinates = Inventory([], source='TEST').get_coordinates_many(
+            seed_ids[:1], times[:1])
+        np.testing.assert_equal(coordinates['latitude'], [np.nan])
+        self.assertRaises(ValueError, inv.get_coordinates_many, seed_ids,
+                          times[:2])
+
     def test_response_plot(self):
         """
         Tests the response plot.
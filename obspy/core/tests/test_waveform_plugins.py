@@ -5,6 +5,7 @@ from future.builtins import *  # NOQA
 from future.utils import PY2, native_str
 
 import builtins
+import importlib
 import io
 import os
 import threading
@@ -20,7 +21,8 @@ from obspy.core.compatibility import mock
 from obspy.io.mseed.core import _write_mseed
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util.base import (NamedTemporaryFile, _get_entry_points,
-                                  DEFAULT_MODULES, WAVEFORM_ACCEPT_BYTEORDER)
+                                  DEFAULT_MODULES, SNIFF_SIZE,
+                                  WAVEFORM_ACCEPT_BYTEORDER, _detect_format)
 from obspy.core.util.misc import buffered_load_entry_point, _ENTRY_POINT_CACHE
 
 
@@ -240,6 +242,65 @@ class WaveformPluginsTestCase(unittest.TestCase):
                               false_positives])
             raise Exception(msg)
 
+    def test_sniff_format(self):
+        """
+        Tests that all sniffFormat functions agree with the isFormat
+        functions of their plug-in for all data test files whenever they
+        make a decision.
+        """
+        sniffers = _get_default_eps('obspy.plugin.waveform', 'sniffFormat')
+        self.assertIn('MSEED', sniffers)
+        filelist = []
+        for f in _get_default_eps('obspy.plugin.waveform',
+                                  'isFormat').values():
+            path = os.path.dirname(
+                importlib.import_module(f.module_name).__file__)
+            for directory, _, files in os.walk(
+                    os.path.join(path, 'tests', 'data')):
+                filelist.extend([os.path.join(directory, _i) for _i in
+                                 files])
+        filelist = sorted(set(filelist))
+        self.assertTrue(filelist)
+        headers = {}
+        for file in filelist:
+            with open(file, 'rb') as fh:
+                headers[file] = fh.read(SNIFF_SIZE)
+        disagreements = []
+        for format in sniffers.values():
+            group = 'obspy.plugin.waveform.' + format.name
+            sniff_format = buffered_load_entry_point(
+                format.dist.key, group, 'sniffFormat')
+            is_format = buffered_load_entry_point(
+                format.dist.key, group, 'isFormat')
+            for file in filelist:
+                sniffed = sniff_format(headers[file])
+                if sniffed is None:
+                    continue
+                if sniffed != bool(is_format(file)):  # pragma: no cover
+                    disagreements.append((format.name, file, sniffed))
+        msg = '\n'.join('\tFormat %s: %s (sniffed %s)' % _i
+                        for _i in disagreements)
+        self.assertEqual(len(disagreements), 0, msg)
+
+    def test_detect_format_is_cached(self):
+        """
+        The detected format of a file is remembered until the file changes.
+        """
+        st = read()
+        with NamedTemporaryFile() as tf:
+            st.write(tf.name, format='MSEED')
+            self.assertEqual(_detect_format('waveform', tf.name).name,
+                             'MSEED')
+            with mock.patch('io.open') as p:
+                self.assertEqual(_detect_format('waveform', tf.name).name,
+                                 'MSEED')
+                self.assertEqual(len(read(tf.name)), 3)
+            self.assertEqual(p.call_count, 0)
+            # overwritten with a different format and size
+            st.write(tf.name, format='SLIST')
+            self.assertEqual(_detect_format('waveform', tf.name).name,
+                             'SLIST')
+
     def test_read_thread_safe(self):
         """
         Tests for race conditions. Reading n_threads (currently 30) times
@@ -21,6 +21,7 @@ import os
 import re
 import sys
 import tempfile
+import threading
 import unicodedata
 from collections import OrderedDict
 
@@ -36,8 +37,8 @@ from obspy.core.util.misc import to_int_or_zero, buffered_load_entry_point
 # defining ObsPy modules currently used by runtests and the path function
 DEFAULT_MODULES = ['clients.filesystem', 'core', 'db', 'geodetics', 'imaging',
                    'io.ah', 'io.arclink', 'io.ascii', 'io.cmtsolution',
-                   'io.cnv', 'io.css', 'io.iaspei', 'io.win', 'io.gcf',
-                   'io.gse2', 'io.json', 'io.kinemetrics', 'io.kml',
+                   'io.cnv', 'io.columnar', 'io.css', 'io.iaspei', 'io.win',
+                   'io.gcf', 'io.gse2', 'io.json', 'io.kinemetrics', 'io.kml',
                    'io.mseed', 'io.ndk', 'io.nied', 'io.nlloc', 'io.nordic',
                    'io.pdas', 'io.pde', 'io.quakeml', 'io.reftek', 'io.rg16',
                    'io.sac', 'io.scardec', 'io.seg2', 'io.segy', 'io.seisan',
@@ -281,6 +282,136 @@ ENTRY_POINTS = {
 }
 
 
+# number of bytes read from the start of a file for the sniffFormat functions
+# of the plug-ins
+SNIFF_SIZE = 4096
+# maximum number of files whose detected format is remembered
+FORMAT_CACHE_SIZE = 10000
+_FORMAT_CACHE = OrderedDict()
+_FORMAT_CACHE_LOCK = threading.Lock()
+_SNIFFERS = {}
+
+# prefixes of XML documents that are not (yet) UTF-8 decoded: UTF-16/32 byte
+# order marks and BOM-less encodings, EBCDIC and gzip compressed files
+_XML_UNDECIDABLE_PREFIXES = (
+    b'\xff\xfe', b'\xfe\xff', b'\x00\x00', b'\x00<', b'<\x00',
+    b'\x4c\x6f\xa7\x94', b'\x1f\x8b')
+_XML_ROOT_PATTERN = re.compile(
+    br'(?:<\?.*?\?>\s*|<!--.*?-->\s*|<!DOCTYPE[^\[>]*>\s*)*'
+    br'<(?:[A-Za-z_][\w.\-]*:)?([A-Za-z_][\w.\-]*)', re.S)
+
+
+def _sniff_xml_root_tag(header):
+    """
+    Returns the local name of the root element of an XML document from the
+    first bytes of a file, ``False`` if the bytes can not be the start of an
+    XML document or ``None`` if the root element can not be determined.
+
+    >>> print(_sniff_xml_root_tag(
+    ...     b'<?xml version="1.0"?> <!-- comment --> '
+    ...     b'<q:quakeml xmlns:q="http://quakeml.org/xmlns/quakeml/1.2">'))
+    quakeml
+    >>> _sniff_xml_root_tag(b'TIMESERIES BW_MANZ1__EHE_D, 12 samples')
+    False
+    """
+    if header.startswith(_XML_UNDECIDABLE_PREFIXES):
+        return None
+    if header.startswith(b'\xef\xbb\xbf'):
+        header = header[3:]
+    header = header.lstrip()
+    if not header.startswith(b'<'):
+        return False
+    match = _XML_ROOT_PATTERN.match(header)
+    if match is None:
+        return None
+    return match.group(1).decode('ascii')
+
+
+def _get_sniffer(plugin_type, format_ep):
+    """
+    Returns the optional sniffFormat function of a plug-in or ``None``.
+    """
+    key = (plugin_type, format_ep.name)
+    if key not in _SNIFFERS:
+        group = 'obspy.plugin.%s.%s' % (plugin_type, format_ep.name)
+        try:
+            _SNIFFERS[key] = buffered_load_entry_point(
+                format_ep.dist.key, group, 'sniffFormat')
+        except ImportError:
+            _SNIFFERS[key] = None
+    return _SNIFFERS[key]
+
+
+def _detect_format(plugin_type, filename):
+    """
+    Detects the format of a file by going through all plug-ins of a plug-in
+    type in the default order.
+
+    For files given by their path, the first :const:`SNIFF_SIZE` bytes are
+    read once and handed to the ``sniffFormat`` functions of all plug-ins
+    that provide one. These return ``True`` or ``False`` if the header is
+    enough to tell whether the file is in their format, or ``None`` if not,
+    only then the ``isFormat`` function of the plug-in is called. The
+    detected format of a file is remembered until its size or modification
+    time changes.
+
+    :returns: The entry point of the format.
+    """
+    eps = ENTRY_POINTS[plugin_type]
+    header = None
+    cache_key = None
+    if isinstance(filename, (str, native_str)):
+        stat = os.stat(filename)
+        cache_key = (plugin_type, os.path.abspath(filename))
+        signature = (stat.st_size, stat.st_mtime)
+        with _FORMAT_CACHE_LOCK:
+            cached = _FORMAT_CACHE.get(cache_key)
+            if cached is not None and cached[0] == signature and \
+                    cached[1] in eps:
+                _FORMAT_CACHE[cache_key] = _FORMAT_CACHE.pop(cache_key)
+                return eps[cached[1]]
+        with io.open(filename, 'rb') as fh:
+            header = fh.read(SNIFF_SIZE)
+
+    # go through all known formats in given sort order
+    for format_ep in eps.values():
+        if header is not None:
+            sniffer = _get_sniffer(plugin_type, format_ep)
+            is_format = sniffer(header) if sniffer is not None else None
+            if is_format is not None:
+                if is_format:
+                    break
+                continue
+        # search isFormat for given entry point
+        is_format = buffered_load_entry_point(
+            format_ep.dist.key,
+            'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
+            'isFormat')
+        # If it is a file-like object, store the position and restore it
+        # later to avoid that the isFormat() functions move the file
+        # pointer.
+        if hasattr(filename, "tell") and hasattr(filename, "seek"):
+            position = filename.tell()
+        else:
+            position = None
+        # check format
+        is_format = is_format(filename)
+        if position is not None:
+            filename.seek(0, 0)
+        if is_format:
+            break
+    else:
+        raise TypeError('Unknown format for file %s' % filename)
+
+    if cache_key is not None:
+        with _FORMAT_CACHE_LOCK:
+            _FORMAT_CACHE.pop(cache_key, None)
+            _FORMAT_CACHE[cache_key] = (signature, format_ep.name)
+            while len(_FORMAT_CACHE) > FORMAT_CACHE_SIZE:
+                _FORMAT_CACHE.popitem(last=False)
+    return format_ep
+
+
 def _get_function_from_entry_point(group, type):
     """
     A "automagic" function searching a given dict of entry points for a valid
@@ -376,28 +507,8 @@ def _read_from_plugin(plugin_type, filename, format=None, **kwargs):
     # get format entry point
     format_ep = None
     if not format:
-        # auto detect format - go through all known formats in given sort order
-        for format_ep in eps.values():
-            # search isFormat for given entry point
-            is_format = buffered_load_entry_point(
-                format_ep.dist.key,
-                'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
-                'isFormat')
-            # If it is a file-like object, store the position and restore it
-            # later to avoid that the isFormat() functions move the file
-            # pointer.
-            if hasattr(filename, "tell") and hasattr(filename, "seek"):
-                position = filename.tell()
-            else:
-                position = None
-            # check format
-            is_format = is_format(filename)
-            if position is not None:
-                filename.seek(0, 0)
-            if is_format:
-                break
-        else:
-            raise TypeError('Unknown format for file %s' % filename)
+        # auto detect format
+        format_ep = _detect_format(plugin_type, filename)
     else:
         # format given via argument
         format = format.upper()
@@ -443,6 +554,7 @@ def make_format_plugin_table(group="waveform", method="read", numspaces=4,
     ======... ===========... ========================================...
     CMTSOLUTION  :mod:`...io.cmtsolution` :func:`..._write_cmtsolution`
     CNV       :mod:`...io.cnv`   :func:`obspy.io.cnv.core._write_cnv`
+    COLUMNAR  :mod:`...io.columnar` :func:`..._write_columnar`
     JSON      :mod:`...io.json`  :func:`obspy.io.json.core._write_json`
     KML       :mod:`obspy.io.kml` :func:`obspy.io.kml.core._write_kml`
     NLLOC_OBS :mod:`...io.nlloc` :func:`obspy.io.nlloc.core.write_nlloc_obs`
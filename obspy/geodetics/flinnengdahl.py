@@ -8,12 +8,20 @@ from future.utils import native_str
 import csv
 import os
 
+import numpy as np
+
 
 class FlinnEngdahl(object):
     """
     Load data from asc files and allow to resolve coordinates or region numbers
     to Flinn Engdahl region names.
 
+    The regionalization is defined on a grid of one by one degree cells. On
+    initialization the region numbers of all cells are rasterized into a
+    lookup table, so that resolving coordinates is a simple array indexing
+    operation which can also be done for many coordinates at once with
+    :meth:`get_regions`.
+
     >>> fe = FlinnEngdahl()
     >>> print(fe.get_region(12, 48))
     GERMANY
@@ -95,6 +103,54 @@ class FlinnEngdahl(object):
             self.by_number = \
                 {int(row[0]): row[1] for row in fe_csv if len(row) > 1}
 
+        self._build_lookup_table()
+
+    def _build_lookup_table(self):
+        """
+        Rasterize the region numbers of all quadrants into a lookup table.
+
+        The table is indexed by quadrant (in the order of ``quads_order``),
+        integer absolute latitude (0-90) and integer absolute longitude
+        (0-180).
+        """
+        abs_longitudes = np.arange(181)
+        table = np.empty((len(self.quads_order), 91, 181), dtype=np.int16)
+        for i, quad in enumerate(self.quads_order):
+            lons = np.array(self.lons[quad])
+            fenums = np.array(self.fenums[quad])
+            for abs_latitude in range(91):
+                begin = self.lat_begins[quad][abs_latitude]
+                num = int(self.lons_per_lat[quad][abs_latitude])
+                # Each region extends from its start longitude up to the
+                # start longitude of the next region in the same row.
+                index = np.searchsorted(lons[begin:begin + num],
+                                        abs_longitudes, side='right') - 1
+                table[i, abs_latitude] = fenums[begin:begin + num][index]
+        self._lookup_table = table
+        self._names_array = np.array(self.names)
+
+    def _get_region_numbers(self, longitudes, latitudes):
+        """
+        Return Flinn Engdahl region numbers for arrays of coordinates.
+        """
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes, latitudes = np.broadcast_arrays(longitudes, latitudes)
+
+        # Also catches NaN values.
+        if not np.all((longitudes >= -180) & (longitudes <= 180)):
+            raise ValueError
+        if not np.all((latitudes >= -90) & (latitudes <= 90)):
+            raise ValueError
+
+        longitudes = np.where(longitudes == -180, 180, longitudes)
+        # Quadrant index in the order ne, nw, se, sw.
+        quads = (longitudes < 0).astype(np.intp) + \
+            2 * (latitudes < 0).astype(np.intp)
+        abs_longitudes = np.abs(longitudes).astype(np.intp)
+        abs_latitudes = np.abs(latitudes).astype(np.intp)
+        return self._lookup_table[quads, abs_latitudes, abs_longitudes]
+
     def get_quadrant(self, longitude, latitude):
         """
         Return quadrant from given coordinate
@@ -133,36 +189,28 @@ class FlinnEngdahl(object):
         :return: Flinn Engdahl region name
         """
 
-        if longitude < -180 or longitude > 180:
-            raise ValueError
-        if latitude < -90 or latitude > 90:
-            raise ValueError
-
-        if longitude == -180:
-            longitude = 180
-
-        quad = self.get_quadrant(longitude, latitude)
-
-        abs_longitude = int(abs(longitude))
-        abs_latitude = int(abs(latitude))
+        fe_num = self._get_region_numbers(longitude, latitude)
+        return self.names[int(fe_num) - 1]
 
-        begin = self.lat_begins[quad][abs_latitude]
-        num = int(self.lons_per_lat[quad][abs_latitude])
-
-        my_lons = self.lons[quad][begin:begin + num]
-        my_fenums = self.fenums[quad][begin:begin + num]
-
-        n = 0
-        for longitude in my_lons:
-            if longitude > abs_longitude:
-                break
-            n += 1
-
-        fe_index = n - 1
-        fe_num = my_fenums[fe_index]
-        fe_name = self.names[fe_num - 1]
+    def get_regions(self, longitudes, latitudes):
+        """
+        Return regions for many coordinates at once
 
-        return fe_name
+        >>> fe = FlinnEngdahl()
+        >>> regions = fe.get_regions([12, -60, 12.5], [48, -30, 48.2])
+        >>> print(regions[0], regions[1], regions[2], sep=" / ")
+        GERMANY / NORTHEASTERN ARGENTINA / GERMANY
+
+        :param longitudes: WGS84 longitudes
+        :type longitudes: list or :class:`numpy.ndarray`
+        :param latitudes: WGS84 latitudes
+        :type latitudes: list or :class:`numpy.ndarray`
+        :rtype: :class:`numpy.ndarray`
+        :return: Flinn Engdahl region names, with the same shape as the
+            (broadcast) input coordinates
+        """
+        fe_nums = self._get_region_numbers(longitudes, latitudes)
+        return self._names_array[fe_nums - 1]
 
     def get_region_by_number(self, number):
         """
@@ -7,11 +7,41 @@ from future.builtins import *  # NOQA
 import os
 import unittest
 
+import numpy as np
+
 from obspy.scripts.flinnengdahl import main as obspy_flinnengdahl
 from obspy.geodetics import FlinnEngdahl
 from obspy.core.util.misc import CatchOutput
 
 
+def _get_region_reference(fe, longitude, latitude):
+    """
+    Resolve a single coordinate by scanning the longitude lists, like
+    :meth:`FlinnEngdahl.get_region` did before it used a lookup table.
+    """
+    if longitude == -180:
+        longitude = 180
+
+    quad = fe.get_quadrant(longitude, latitude)
+
+    abs_longitude = int(abs(longitude))
+    abs_latitude = int(abs(latitude))
+
+    begin = fe.lat_begins[quad][abs_latitude]
+    num = int(fe.lons_per_lat[quad][abs_latitude])
+
+    my_lons = fe.lons[quad][begin:begin + num]
+    my_fenums = fe.fenums[quad][begin:begin + num]
+
+    n = 0
+    for longitude in my_lons:
+        if longitude > abs_longitude:
+            break
+        n += 1
+
+    return fe.names[my_fenums[n - 1] - 1]
+
+
 class UtilFlinnEngdahlTestCase(unittest.TestCase):
     def setUp(self):
         self.flinnengdahl = FlinnEngdahl()
@@ -40,6 +70,57 @@ class UtilFlinnEngdahlTestCase(unittest.TestCase):
                     )
                 )
 
+    def test_get_regions(self):
+        longitudes = []
+        latitudes = []
+        checked_regions = []
+        with open(self.samples_file, 'r') as fh:
+            for line in fh:
+                longitude, latitude, checked_region = line.strip().split('\t')
+                longitudes.append(float(longitude))
+                latitudes.append(float(latitude))
+                checked_regions.append(checked_region)
+
+        regions = self.flinnengdahl.get_regions(longitudes, latitudes)
+        self.assertEqual(regions.shape, (len(checked_regions), ))
+        self.assertEqual(list(regions), checked_regions)
+
+        # multi-dimensional input keeps its shape
+        regions = self.flinnengdahl.get_regions(
+            np.reshape(longitudes[:4], (2, 2)),
+            np.reshape(latitudes[:4], (2, 2)))
+        self.assertEqual(regions.shape, (2, 2))
+        self.assertEqual(list(regions.ravel()), checked_regions[:4])
+
+    def test_get_regions_against_reference(self):
+        """
+        Compare the lookup table against scanning the longitude lists on a
+        grid including the edges of the map, the cell boundaries and points
+        inside all cells.
+        """
+        fe = self.flinnengdahl
+        longitudes = np.concatenate((
+            np.arange(-180, 180.5, 0.5), [-179.999, -1e-9, 1e-9, 179.999]))
+        latitudes = np.concatenate((
+            np.arange(-90, 90.5, 0.5), [-89.999, -1e-9, 1e-9, 89.999]))
+        longitudes, latitudes = np.meshgrid(longitudes, latitudes)
+        regions = fe.get_regions(longitudes, latitudes)
+        for longitude, latitude, region in zip(
+                longitudes.ravel(), latitudes.ravel(), regions.ravel()):
+            expected = _get_region_reference(fe, longitude, latitude)
+            if region != expected:
+                self.fail("(%f, %f) got %s instead of %s" % (
+                    longitude, latitude, region, expected))
+            if longitude % 10 == 0 and latitude % 10 == 0:
+                self.assertEqual(fe.get_region(longitude, latitude),
+                                 expected)
+
+    def test_get_regions_invalid_coordinates(self):
+        for longitudes, latitudes in (([0, 181], [0, 0]), ([0, 0], [0, -91]),
+                                      ([np.nan], [0])):
+            with self.assertRaises(ValueError):
+                self.flinnengdahl.get_regions(longitudes, latitudes)
+
     def test_script(self):
         with open(self.samples_file, 'r') as fh:
             # Testing once is sufficient.
@@ -27,11 +27,13 @@ import warnings
 from lxml import etree
 
 import obspy
+from obspy.core.util.base import _sniff_xml_root_tag
 from obspy.core.util.obspy_types import (ComplexWithUncertainties,
                                          FloatWithUncertaintiesAndUnit)
 from obspy.core.inventory import (Azimuth, ClockDrift, Dip,
                                   Distance, Frequency, Latitude,
                                   Longitude, SampleRate)
+from obspy.core.inventory.response import _DeferredResponse
 from obspy.core.inventory import (CoefficientsTypeResponseStage,
                                   FilterCoefficient, FIRResponseStage,
                                   PolesZerosResponseStage,
@@ -86,6 +88,22 @@ def _is_inventory_xml(path_or_file_object):
             pass
 
 
+def _sniff_inventory_xml(header):
+    """
+    Checks whether the first bytes of a file can be the start of an arclink
+    XML file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    :return: ``False`` or ``None`` if the file has to be checked with
+        :func:`_is_inventory_xml`.
+    """
+    if _sniff_xml_root_tag(header) is False:
+        return False
+    return None
+
+
 def validate_arclink_xml(path_or_object):
     """
     Checks if the given path is a valid arclink_xml file.
@@ -129,11 +147,14 @@ def _ns(tagname):
     return "{%s}%s" % (SCHEMA_NAMESPACE, tagname)
 
 
-def _read_inventory_xml(path_or_file_object):
+def _read_inventory_xml(path_or_file_object, defer_responses=False):
     """
     Function for reading an Arclink inventory file.
 
     :param path_or_file_object: File name or file like object.
+    :type defer_responses: bool
+    :param defer_responses: Only read the responses of the channels when
+        they are accessed. The parsed document is kept in memory for that.
     """
     root = etree.parse(path_or_file_object).getroot()
 
@@ -148,7 +169,7 @@ def _read_inventory_xml(path_or_file_object):
     # Collect all networks from the arcllink inventory
     networks = []
     for net_element in root.findall(_ns("network")):
-        networks.append(_read_network(root, net_element))
+        networks.append(_read_network(root, net_element, defer_responses))
 
     return obspy.core.inventory.Inventory(networks=networks, source=source,
                                           sender=sender, created=created,
@@ -189,7 +210,7 @@ def _tag2obj(element, tag, convert):
         None
 
 
-def _read_network(inventory_root, net_element):
+def _read_network(inventory_root, net_element, defer_responses=False):
     """
     Reads the network structure
 
@@ -214,7 +235,8 @@ def _read_network(inventory_root, net_element):
     # Collect the stations
     stations = []
     for sta_element in net_element.findall(_ns("station")):
-        stations.append(_read_station(inventory_root, sta_element))
+        stations.append(_read_station(inventory_root, sta_element,
+                                      defer_responses))
     network.stations = stations
 
     return network
@@ -235,7 +257,7 @@ def _get_restricted_status(element):
         return 'closed'
 
 
-def _read_station(inventory_root, sta_element):
+def _read_station(inventory_root, sta_element, defer_responses=False):
     """
     Reads the station structure
 
@@ -269,7 +291,8 @@ def _read_station(inventory_root, sta_element):
     channels = []
     for sen_loc_element in sta_element.findall(_ns("sensorLocation")):
         for channel in sen_loc_element.findall(_ns("stream")):
-            channels.append(_read_channel(inventory_root, channel))
+            channels.append(_read_channel(inventory_root, channel,
+                                          defer_responses))
 
     station.channels = channels
 
@@ -346,7 +369,7 @@ def _read_sensor(equip_element):
         removal_date=None, calibration_dates=None)
 
 
-def _read_channel(inventory_root, cha_element):
+def _read_channel(inventory_root, cha_element, defer_responses=False):
     """
     reads channel element from arclinkXML format
 
@@ -456,11 +479,13 @@ def _read_channel(inventory_root, cha_element):
         if digital_filter_chain is not None:
             response_fir_id = digital_filter_chain.split(" ")
 
-    channel.response = _read_response(inventory_root, sensor_element,
-                                      response_element, cha_element,
-                                      data_log_element,
-                                      channel.sample_rate,
-                                      response_fir_id, response_paz_id)
+    args = (inventory_root, sensor_element, response_element, cha_element,
+            data_log_element, channel.sample_rate, response_fir_id,
+            response_paz_id)
+    if defer_responses:
+        channel.response = _DeferredResponse(_read_response, *args)
+    else:
+        channel.response = _read_response(*args)
 
     return channel
 
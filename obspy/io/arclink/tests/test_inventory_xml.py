@@ -78,6 +78,12 @@ class ArclinkInventoryTestCase(unittest.TestCase):
         self.assertEqual(e.exception.args[0], "responsePolynomial not"
                          "implemented. Contact the ObsPy developers")
 
+    def test_read_with_deferred_responses(self):
+        arclink_inv = read_inventory(self.arclink_xml_path,
+                                     defer_responses=True)
+        self.assertEqual(arclink_inv.networks,
+                         read_inventory(self.arclink_xml_path).networks)
+
     def test_auto_read_arclink_xml(self):
         arclink_inv = read_inventory(self.arclink_xml_path)
         self.assertIsNotNone(arclink_inv)
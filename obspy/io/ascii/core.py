@@ -113,6 +113,22 @@ def _is_tspair(filename):
     return True
 
 
+def _sniff_ascii(header):
+    """
+    Checks whether the first bytes of a file can be the start of an ASCII
+    SLIST or TSPAIR file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    :return: ``False`` or ``None`` if the first line has to be checked with
+        :func:`_is_slist` or :func:`_is_tspair`.
+    """
+    if not header.startswith(b'TIMESERIES'):
+        return False
+    return None
+
+
 def _read_slist(filename, headonly=False, **kwargs):  # @UnusedVariable
     """
     Reads a ASCII SLIST file and returns an ObsPy Stream object.
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+obspy.io.columnar - Binary columnar catalog format for ObsPy
+============================================================
+
+This module provides read and write support for a compact binary format
+storing event catalogs as typed column blocks. It is meant for fast
+round-trips of large catalogs, e.g. to repeatedly build analysis tables from
+a long catalog, and not as an exchange format (use QuakeML for that).
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+
+
+Usage Example
+-------------
+
+The COLUMNAR reader and writer hook into the standard ObsPy event handling
+mechanisms including format autodetection.
+
+>>> from obspy import read_events
+>>> cat = read_events('/path/to/qml-example-1.2-RC3.xml')
+>>> cat.write('catalog.col', format='COLUMNAR')  # doctest: +SKIP
+>>> cat = read_events('catalog.col')  # doctest: +SKIP
+
+Only some of the tables and columns can be read, all other attributes are
+left unset:
+
+>>> cat = read_events('catalog.col', tables=['origins', 'magnitudes'],
+...                   columns=['time', 'latitude', 'longitude', 'depth',
+...                            'mag', 'magnitude_type'])  # doctest: +SKIP
+
+The columns can also be read as numpy arrays without creating any event
+objects, optionally memory-mapped, see
+:func:`~obspy.io.columnar.core.read_columns`:
+
+>>> from obspy.io.columnar.core import read_columns
+>>> origins = read_columns('catalog.col', 'origins',
+...                        ['parent', 'time', 'latitude', 'longitude'],
+...                        mmap=True)  # doctest: +SKIP
+
+
+The COLUMNAR Format
+-------------------
+
+A file consists of
+
+* the 8 bytes ``OBSPYCOL``, the format version and the length of the header
+  (little endian ``uint16``, ``uint16`` (reserved) and ``uint32``),
+* a JSON header describing the tables, their columns and the location of
+  their data blocks,
+* the data blocks, each starting at a multiple of 8 bytes after the header.
+
+The catalog itself and each type of event object are stored in a table
+with one row per object. The tables in the order of the file are
+
+=================================   =========================================
+Table                               Parent table (list of the parent object)
+=================================   =========================================
+catalog                             (one row)
+events
+event_descriptions                  events
+origins                             events
+arrivals                            origins
+magnitudes                          events
+station_magnitude_contributions     magnitudes
+station_magnitudes                  events
+picks                               events
+amplitudes                          events
+focal_mechanisms                    events
+focal_mechanism_waveform_ids        focal_mechanisms (``waveform_id``)
+data_used                           focal_mechanisms
+                                    (``moment_tensor.data_used``)
+composite_times                     origins
+catalog_comments                    catalog
+event_comments                      events
+origin_comments                     origins
+arrival_comments                    arrivals
+magnitude_comments                  magnitudes
+station_magnitude_comments          station_magnitudes
+pick_comments                       picks
+amplitude_comments                  amplitudes
+focal_mechanism_comments            focal_mechanisms
+moment_tensor_comments              focal_mechanisms
+                                    (``moment_tensor.comments``)
+=================================   =========================================
+
+All tables but the first two have a ``parent`` column with the row number
+of the object in the parent table they belong to. The other columns are
+named after the attributes of the objects, with nested objects flattened
+(e.g. ``time_errors.uncertainty`` or ``waveform_id.station_code``). Nested
+objects and quantity errors have an additional boolean column telling
+whether they are set.
+
+Custom tags (``extra``) of the objects of a row, including their nested
+objects, are stored JSON encoded in an ``extra`` column with the dotted
+path of each object as key (``""`` for the object of the row itself). The
+catalog table also stores the namespaces of the catalog (``nsmap``). Values
+of custom tags that are not strings, numbers, booleans, lists or mappings
+are stored as strings, like when writing them to QuakeML.
+
+Columns are stored with the following types:
+
+=================================   =========================================
+Attribute                           Column
+=================================   =========================================
+float                               ``float64``, ``NaN`` if not set
+int                                 ``int64``, ``-2**63`` if not set
+bool                                ``int8``, ``-1`` if not set
+UTCDateTime                         ``int64`` nanoseconds since 1970,
+                                    ``-2**63`` (``NaT``) if not set
+str, enumerations, resource ids,    ``int32`` codes (``-1`` if not set)
+custom tags                         indexing the unique values, stored as
+                                    ``int64`` offsets and UTF-8 characters
+=================================   =========================================
+
+References between objects (e.g. the pick of an arrival or the preferred
+origin of an event) are stored as resource identifier columns and are
+restored when reading.
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
@@ -0,0 +1,790 @@
+# -*- coding: utf-8 -*-
+"""
+COLUMNAR read and write support.
+
+Binary format storing the contents of a
+:class:`~obspy.core.event.Catalog` as typed column blocks, see
+:mod:`obspy.io.columnar`.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+from future.utils import native_str
+
+import collections
+import json
+import struct
+
+import numpy as np
+
+from obspy.core.event import (Amplitude, Arrival, Catalog, Comment,
+                              CompositeTime, CreationInfo, DataUsed, Event,
+                              EventDescription, FocalMechanism, Magnitude,
+                              Origin, Pick, ResourceIdentifier,
+                              StationMagnitude, StationMagnitudeContribution,
+                              WaveformStreamID)
+from obspy.core.event.base import QuantityError
+from obspy.core.util import AttribDict
+from obspy.core.utcdatetime import UTCDateTime
+
+
+_MAGIC = b"OBSPYCOL"
+_VERSION = 1
+# magic, format version, reserved, length of the JSON header
+_PREAMBLE = struct.Struct(native_str("<8sHHI"))
+# all data blocks start at multiples of this many bytes
+_ALIGNMENT = 8
+
+# missing values of integer and boolean columns, missing floats are NaN and
+# missing times are NaT
+_INT_MISSING = np.iinfo(np.int64).min
+_BOOL_MISSING = -1
+
+# (table, class, parent table, container of the parent object), containers
+# of nested objects are given by their dotted path
+_TABLES = [
+    ("events", Event, None, None),
+    ("event_descriptions", EventDescription, "events",
+     "event_descriptions"),
+    ("origins", Origin, "events", "origins"),
+    ("arrivals", Arrival, "origins", "arrivals"),
+    ("magnitudes", Magnitude, "events", "magnitudes"),
+    ("station_magnitude_contributions", StationMagnitudeContribution,
+     "magnitudes", "station_magnitude_contributions"),
+    ("station_magnitudes", StationMagnitude, "events", "station_magnitudes"),
+    ("picks", Pick, "events", "picks"),
+    ("amplitudes", Amplitude, "events", "amplitudes"),
+    ("focal_mechanisms", FocalMechanism, "events", "focal_mechanisms"),
+    ("focal_mechanism_waveform_ids", WaveformStreamID, "focal_mechanisms",
+     "waveform_id"),
+    ("data_used", DataUsed, "focal_mechanisms", "moment_tensor.data_used"),
+    ("composite_times", CompositeTime, "origins", "composite_times"),
+    ("catalog_comments", Comment, "catalog", "comments"),
+    ("event_comments", Comment, "events", "comments"),
+    ("origin_comments", Comment, "origins", "comments"),
+    ("arrival_comments", Comment, "arrivals", "comments"),
+    ("magnitude_comments", Comment, "magnitudes", "comments"),
+    ("station_magnitude_comments", Comment, "station_magnitudes",
+     "comments"),
+    ("pick_comments", Comment, "picks", "comments"),
+    ("amplitude_comments", Comment, "amplitudes", "comments"),
+    ("focal_mechanism_comments", Comment, "focal_mechanisms", "comments"),
+    ("moment_tensor_comments", Comment, "focal_mechanisms",
+     "moment_tensor.comments"),
+]
+
+_CATALOG_PROPERTIES = [("resource_id", ResourceIdentifier),
+                       ("description", str),
+                       ("creation_info", CreationInfo)]
+
+_QUANTITY_ERROR_KEYS = ("uncertainty", "lower_uncertainty",
+                        "upper_uncertainty", "confidence_level")
+
+
+class _Column(object):
+    """
+    A single column of a table, i.e. one (possibly nested) attribute.
+    """
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind
+        self.values = []
+
+
+def _get_spec(properties, columns, prefix=""):
+    """
+    Columns of the attributes of an event type class.
+
+    Returns a list of ``(key, class, column, children)`` tuples, with
+    ``column`` a :class:`_Column` and ``children`` the spec of nested objects
+    (``None`` for simple attributes). Nested objects have a boolean column
+    telling if they are set, to keep empty objects apart from unset ones.
+    The created columns are appended to ``columns``.
+    """
+    spec = []
+    for key, type_ in properties:
+        name = prefix + key
+        if type_ is QuantityError:
+            column = _Column(name, "bool")
+            columns.append(column)
+            children = _get_spec([(_i, float) for _i in _QUANTITY_ERROR_KEYS],
+                                 columns, name + ".")
+            spec.append((key, type_, column, children))
+        elif hasattr(type_, "_properties"):
+            column = _Column(name, "bool")
+            columns.append(column)
+            children = _get_spec(type_._properties, columns, name + ".")
+            spec.append((key, type_, column, children))
+        else:
+            if type_ is float:
+                kind = "float"
+            elif type_ is bool:
+                kind = "bool"
+            elif type_ is int:
+                kind = "int"
+            elif type_ is UTCDateTime:
+                kind = "time"
+            elif type_ is ResourceIdentifier:
+                kind = "resource_id"
+            else:
+                kind = "str"
+            column = _Column(name, kind)
+            columns.append(column)
+            spec.append((key, type_, column, None))
+    return spec
+
+
+def _get_leaves(spec):
+    """
+    All columns of a spec.
+    """
+    leaves = []
+    for _, _, column, children in spec:
+        if column is not None:
+            leaves.append(column)
+        if children is not None:
+            leaves.extend(_get_leaves(children))
+    return leaves
+
+
+def _flatten(obj, spec, extras, prefix=""):
+    """
+    Appends the attribute values of an object to the columns of its spec.
+
+    The custom tags of the object and its nested objects are added to
+    ``extras`` with the dotted path of the object as key.
+    """
+    attributes = obj.__dict__
+    extra = attributes.get("extra")
+    if extra:
+        extras[prefix[:-1]] = extra
+    for key, type_, column, children in spec:
+        value = attributes.get(key)
+        if children is None:
+            column.values.append(value)
+            continue
+        column.values.append(value is not None)
+        if value is None:
+            for leaf in _get_leaves(children):
+                leaf.values.append(None)
+        elif type_ is QuantityError:
+            _flatten(value, children, {})
+        else:
+            _flatten(value, children, extras, prefix + key + ".")
+
+
+def _to_json(value):
+    """
+    Converts custom tags to JSON compatible values. Mappings and lists are
+    kept, other values than strings, numbers and booleans are converted to
+    strings like when writing them to QuakeML.
+    """
+    if hasattr(value, "items"):
+        return collections.OrderedDict(
+            (str(_k), _to_json(_v)) for _k, _v in value.items())
+    elif isinstance(value, (list, tuple)):
+        return [_to_json(_i) for _i in value]
+    elif value is None or isinstance(value, (bool, int, float, str,
+                                             native_str)):
+        return value
+    return str(value)
+
+
+def _get_container(obj, path):
+    """
+    The list of objects in a (nested) container of an object, ``None`` if a
+    nested object on the path is not set.
+    """
+    for name in path.split("."):
+        if obj is None:
+            return None
+        obj = getattr(obj, name)
+    return obj
+
+
+def _to_blocks(column):
+    """
+    Converts the values of a column to arrays.
+
+    Floats are stored as ``float64`` with ``NaN`` for missing values, times as
+    ``int64`` nanoseconds since 1970 with ``NaT``, integers as ``int64`` and
+    booleans as ``int8`` with sentinel values. Strings, resource
+    identifiers and JSON encoded custom tags are dictionary encoded, i.e. an
+    ``int32`` code per row (``-1`` for missing values) indexing the UTF-8
+    encoded unique values.
+    """
+    values = column.values
+    if column.kind == "float":
+        return {"data": np.array(values, dtype=np.float64)}
+    elif column.kind == "int":
+        return {"data": np.array(
+            [_INT_MISSING if _i is None else _i for _i in values],
+            dtype=np.int64)}
+    elif column.kind == "bool":
+        return {"data": np.array(
+            [_BOOL_MISSING if _i is None else _i for _i in values],
+            dtype=np.int8)}
+    elif column.kind == "time":
+        return {"data": np.array(
+            [_INT_MISSING if _i is None else _i._ns for _i in values],
+            dtype=np.int64)}
+    lookup = {}
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(-1)
+            continue
+        value = str(value)
+        try:
+            codes.append(lookup[value])
+        except KeyError:
+            codes.append(lookup.setdefault(value, len(lookup)))
+    strings = [_i.encode("utf-8") for _i in sorted(lookup, key=lookup.get)]
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum([len(_i) for _i in strings], out=offsets[1:])
+    return {"codes": np.array(codes, dtype=np.int32),
+            "offsets": offsets,
+            "chars": np.frombuffer(b"".join(strings), dtype=np.uint8)}
+
+
+def _is_columnar(filename):
+    """
+    Checks whether a file is a COLUMNAR file.
+
+    :type filename: str
+    :param filename: Name of the file to be checked.
+    :rtype: bool
+    :return: ``True`` if a COLUMNAR file.
+    """
+    try:
+        with open(filename, "rb") as fh:
+            return _sniff_columnar(fh.read(len(_MAGIC)))
+    except Exception:
+        return False
+
+
+def _sniff_columnar(header):
+    """
+    Checks whether the first bytes of a file are the start of a COLUMNAR
+    file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    """
+    return header[:len(_MAGIC)] == _MAGIC
+
+
+def _write_columnar(catalog, filename, **kwargs):  # @UnusedVariable
+    """
+    Writes a :class:`~obspy.core.event.Catalog` object to a COLUMNAR file.
+
+    .. warning::
+        This function should NOT be called directly, it registers via the
+        the :meth:`~obspy.core.event.Catalog.write` method of an
+        ObsPy :class:`~obspy.core.event.Catalog` object, call this instead.
+
+    :type catalog: :class:`~obspy.core.event.Catalog`
+    :param catalog: The ObsPy Catalog object to write.
+    :type filename: str or file
+    :param filename: Filename to write or open file-like object.
+    """
+    tables = collections.OrderedDict()
+    columns = []
+    catalog_spec = _get_spec(_CATALOG_PROPERTIES, columns)
+    extras = {}
+    _flatten(catalog, catalog_spec, extras)
+    nsmap = getattr(catalog, "nsmap", None)
+    for name, value in (("extra", extras),
+                        # JSON objects can't have the None key of the
+                        # default namespace
+                        ("nsmap", nsmap and list(nsmap.items()))):
+        column = _Column(name, "json")
+        column.values = [json.dumps(_to_json(value)) if value else None]
+        columns.append(column)
+    tables["catalog"] = (1, columns)
+
+    rows = {"catalog": [catalog]}
+    for table, cls, parent, container in _TABLES:
+        columns = []
+        spec = _get_spec(cls._properties, columns)
+        if parent is None:
+            objects = catalog.events
+            parent_indices = None
+        else:
+            objects = []
+            parent_indices = []
+            for i, parent_obj in enumerate(rows[parent]):
+                children = _get_container(parent_obj, container) or []
+                objects.extend(children)
+                parent_indices.extend([i] * len(children))
+        extra_column = _Column("extra", "json")
+        for obj in objects:
+            extras = {}
+            _flatten(obj, spec, extras)
+            extra_column.values.append(
+                json.dumps(_to_json(extras)) if extras else None)
+        columns.append(extra_column)
+        if parent_indices is not None:
+            column = _Column("parent", "index")
+            column.values = parent_indices
+            columns.insert(0, column)
+        rows[table] = objects
+        tables[table] = (len(objects), columns)
+
+    # convert the columns and lay out the blocks
+    header = {"version": _VERSION, "tables": collections.OrderedDict()}
+    blocks = []
+    position = 0
+    for table, (length, columns) in tables.items():
+        table_header = collections.OrderedDict()
+        for column in columns:
+            if column.kind == "index":
+                arrays = {"data": np.array(column.values, dtype=np.int64)}
+            else:
+                arrays = _to_blocks(column)
+            block_headers = collections.OrderedDict()
+            for key in ("data", "codes", "offsets", "chars"):
+                if key not in arrays:
+                    continue
+                data = np.require(arrays[key],
+                                  dtype=arrays[key].dtype.newbyteorder("<"))
+                block_headers[key] = [position, data.dtype.str, len(data)]
+                blocks.append((position, data))
+                position += data.nbytes
+                position += -position % _ALIGNMENT
+            table_header[column.name] = {"kind": column.kind,
+                                         "blocks": block_headers}
+        header["tables"][table] = {"length": length,
+                                   "columns": table_header}
+    header = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    if not hasattr(filename, "write"):
+        with open(filename, "wb") as fh:
+            _write_blocks(fh, header, blocks)
+    else:
+        _write_blocks(filename, header, blocks)
+
+
+def _write_blocks(fh, header, blocks):
+    """
+    Writes the preamble, the JSON header and the data blocks.
+    """
+    preamble = _PREAMBLE.pack(_MAGIC, _VERSION, 0, len(header))
+    fh.write(preamble)
+    fh.write(header)
+    written = len(preamble) + len(header)
+    fh.write(b"\x00" * (-written % _ALIGNMENT))
+    written = 0
+    for position, data in blocks:
+        fh.write(b"\x00" * (position - written))
+        fh.write(data.tobytes())
+        written = position + data.nbytes
+
+
+class _ColumnarFile(object):
+    """
+    Reads the header of a COLUMNAR file and single blocks from it.
+    """
+    def __init__(self, filename, mmap=False):
+        if hasattr(filename, "read"):
+            if mmap:
+                msg = "Memory mapping needs a filename."
+                raise ValueError(msg)
+            self._fh = filename
+            self._close = False
+            self._start = filename.tell()
+        else:
+            self._fh = open(filename, "rb")
+            self._close = True
+            self._start = 0
+        self.filename = filename
+        self.mmap = mmap
+        try:
+            preamble = self._fh.read(_PREAMBLE.size)
+            if len(preamble) != _PREAMBLE.size or \
+                    not _sniff_columnar(preamble):
+                msg = "Not a COLUMNAR file."
+                raise ValueError(msg)
+            _, version, _, header_length = _PREAMBLE.unpack(preamble)
+            if version > _VERSION:
+                msg = ("COLUMNAR format version %i is not supported, please "
+                       "update ObsPy.") % version
+                raise ValueError(msg)
+            header = self._fh.read(header_length)
+            self.header = json.loads(header.decode("utf-8"),
+                                     object_pairs_hook=collections.OrderedDict)
+        except Exception:
+            self.close()
+            raise
+        position = _PREAMBLE.size + header_length
+        self._data_start = self._start + position + -position % _ALIGNMENT
+
+    def close(self):
+        if self._close:
+            self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_tables(self):
+        """
+        Returns the column names of all tables.
+        """
+        return collections.OrderedDict(
+            (table, list(table_header["columns"]))
+            for table, table_header in self.header["tables"].items())
+
+    def _read_block(self, block):
+        offset, dtype, length = block
+        dtype = np.dtype(native_str(dtype))
+        if self.mmap and length:
+            return np.memmap(self.filename, dtype=dtype, mode="r",
+                             offset=self._data_start + offset,
+                             shape=(length,))
+        self._fh.seek(self._data_start + offset)
+        data = bytearray(length * dtype.itemsize)
+        if self._fh.readinto(data) != len(data):
+            msg = "COLUMNAR file is truncated."
+            raise ValueError(msg)
+        return np.frombuffer(data, dtype=dtype)
+
+    def read_column(self, table, name):
+        """
+        Reads a column as numpy array, see :func:`read_columns`.
+        """
+        column = self.header["tables"][table]["columns"][name]
+        blocks = column["blocks"]
+        kind = column["kind"]
+        if kind not in ("str", "resource_id", "json"):
+            data = self._read_block(blocks["data"])
+            if kind == "time":
+                return data.view(native_str("M8[ns]"))
+            elif kind == "int":
+                return np.ma.masked_equal(data, _INT_MISSING, copy=False)
+            elif kind == "bool":
+                return np.ma.masked_equal(data, _BOOL_MISSING,
+                                          copy=False).astype(np.bool_)
+            return data
+        codes = self._read_block(blocks["codes"])
+        values = self._read_strings(blocks)
+        values.append(None)
+        return np.array(values, dtype=np.object_)[codes]
+
+    def read_codes(self, table, name):
+        """
+        Reads the codes and the unique values of a dictionary encoded
+        column.
+        """
+        blocks = self.header["tables"][table]["columns"][name]["blocks"]
+        return self._read_block(blocks["codes"]), self._read_strings(blocks)
+
+    def _read_strings(self, blocks):
+        offsets = self._read_block(blocks["offsets"]).tolist()
+        chars = self._read_block(blocks["chars"]).tobytes()
+        return [chars[offsets[_i]:offsets[_i + 1]].decode("utf-8")
+                for _i in range(len(offsets) - 1)]
+
+    def read_values(self, table, name):
+        """
+        Reads a column as list of values as stored in the event objects.
+        """
+        column = self.header["tables"][table]["columns"][name]
+        kind = column["kind"]
+        if kind in ("str", "resource_id", "json"):
+            codes, values = self.read_codes(table, name)
+            if kind == "resource_id":
+                # one object per row, like when reading other formats
+                return [None if _i < 0 else ResourceIdentifier(values[_i])
+                        for _i in codes.tolist()]
+            elif kind == "json":
+                values = [json.loads(_i,
+                                     object_pairs_hook=collections.OrderedDict)
+                          for _i in values]
+            values.append(None)
+            return [values[_i] for _i in codes.tolist()]
+        data = self._read_block(column["blocks"]["data"]).tolist()
+        if kind == "float":
+            return [None if _i != _i else _i for _i in data]
+        elif kind == "int":
+            return [None if _i == _INT_MISSING else _i for _i in data]
+        elif kind == "bool":
+            return [None if _i == _BOOL_MISSING else bool(_i) for _i in data]
+        elif kind == "time":
+            return [None if _i == _INT_MISSING else UTCDateTime(ns=_i)
+                    for _i in data]
+        return data
+
+
+def _read_spec(fh, table, spec, values):
+    """
+    Reads the columns of a spec (with column names, see
+    :func:`_select_spec`) that exist in the file into ``values``.
+
+    Returns the spec of the read columns with a list telling in which rows
+    they are set added to nested objects. Without the column telling if a
+    nested object is set, it is set if any of its attributes is set.
+    """
+    file_columns = fh.header["tables"][table]["columns"]
+    selected = []
+    for key, type_, column, children in spec:
+        if column not in file_columns:
+            column = None
+        elif column not in values:
+            values[column] = fh.read_values(table, column)
+        if children is None:
+            if column is not None:
+                selected.append((key, type_, column, None, None))
+            continue
+        children = _read_spec(fh, table, children, values)
+        if column is not None:
+            is_set = values[column]
+        elif children:
+            is_set = np.zeros(fh.header["tables"][table]["length"],
+                              dtype=np.bool_)
+            for _, _, child_column, _, child_is_set in children:
+                if child_is_set is None:
+                    child_is_set = [_i is not None
+                                    for _i in values[child_column]]
+                is_set |= np.array(child_is_set, dtype=np.bool_)
+            is_set = is_set.tolist()
+        else:
+            continue
+        selected.append((key, type_, column, children, is_set))
+    return selected
+
+
+def _build(cls, spec, values, i, **kwargs):
+    """
+    Creates an object with the values of row ``i``, unset nested objects are
+    skipped. Quantity errors stored as unset are set to ``None``.
+    """
+    unset = []
+    for key, type_, column, children, is_set in spec:
+        if children is None:
+            value = values[column][i]
+            if value is not None:
+                kwargs[key] = value
+        elif is_set[i]:
+            kwargs[key] = _build(type_, children, values, i)
+        elif type_ is QuantityError and column is not None:
+            unset.append(key)
+    obj = cls(**kwargs)
+    for key in unset:
+        setattr(obj, key, None)
+    return obj
+
+
+def _set_extras(obj, extras):
+    """
+    Sets the custom tags of an object and its nested objects.
+    """
+    for path, extra in extras.items():
+        target = obj
+        for name in path.split(".") if path else []:
+            target = getattr(target, name, None)
+        if target is not None:
+            target.extra = AttribDict(extra)
+
+
+def _select_spec(spec, names, prefix=""):
+    """
+    The part of a spec with the given columns. Columns are selected by their
+    full name or the name of a nested object.
+    """
+    selected = []
+    for key, type_, column, children in spec:
+        name = prefix + key
+        if children is None:
+            if names is None or name in names:
+                selected.append((key, type_, column.name, None))
+        elif names is None or name in names:
+            selected.append((key, type_, column and column.name,
+                             _select_spec(children, None, name + ".")))
+        else:
+            children = _select_spec(children, names, name + ".")
+            if children:
+                selected.append((key, type_, None, children))
+    return selected
+
+
+def _read_columnar(filename, tables=None, columns=None,
+                   **kwargs):  # @UnusedVariable
+    """
+    Reads a COLUMNAR file and returns an ObsPy Catalog object.
+
+    .. warning::
+        This function should NOT be called directly, it registers via the
+        ObsPy :func:`~obspy.core.event.read_events` function, call this
+        instead.
+
+    :type filename: str or file
+    :param filename: Filename or open file-like object of the file to read.
+    :type tables: list of str
+    :param tables: Names of the tables to read in addition to the events,
+        e.g. ``["origins", "magnitudes"]``. Defaults to all tables, tables
+        whose parent table is not read are skipped.
+    :type columns: list of str
+    :param columns: Names of the columns to read, e.g.
+        ``["time", "latitude", "longitude", "mag", "waveform_id"]``. Names of
+        nested objects select all of their columns. Defaults to all columns.
+        The resource identifiers of the objects are always read.
+    :rtype: :class:`~obspy.core.event.Catalog`
+    """
+    with _ColumnarFile(filename) as fh:
+        file_tables = fh.header["tables"]
+        values = {}
+        catalog_spec = _select_spec(_get_spec(_CATALOG_PROPERTIES, []), None)
+        catalog_spec = _read_spec(fh, "catalog", catalog_spec, values)
+        catalog = _build(Catalog, catalog_spec, values, 0)
+        catalog.description = values.get("description", [None])[0]
+        catalog_columns = file_tables["catalog"]["columns"]
+        if "extra" in catalog_columns:
+            extras = fh.read_values("catalog", "extra")[0]
+            if extras:
+                _set_extras(catalog, extras)
+        if "nsmap" in catalog_columns:
+            nsmap = fh.read_values("catalog", "nsmap")[0]
+            if nsmap:
+                catalog.nsmap = dict(nsmap)
+
+        objects = {"catalog": [catalog]}
+        for table, cls, parent, container in _TABLES:
+            if table not in file_tables:
+                continue
+            if parent is not None and (
+                    parent not in objects or
+                    (tables is not None and table not in tables)):
+                continue
+            values.clear()
+            spec = _get_spec(cls._properties, [])
+            if columns is not None:
+                spec = _select_spec(spec, ["resource_id"] + list(columns))
+            else:
+                spec = _select_spec(spec, None)
+            spec = _read_spec(fh, table, spec, values)
+            length = file_tables[table]["length"]
+            kwargs = {}
+            if "resource_id" in cls._property_keys:
+                kwargs["force_resource_id"] = False
+            objects[table] = [_build(cls, spec, values, i, **kwargs)
+                              for i in range(length)]
+            table_columns = file_tables[table]["columns"]
+            if "extra" in table_columns and (
+                    columns is None or "extra" in columns):
+                for obj, extras in zip(objects[table],
+                                       fh.read_values(table, "extra")):
+                    if extras:
+                        _set_extras(obj, extras)
+            if parent is not None:
+                parent_indices = fh._read_block(
+                    table_columns["parent"]["blocks"]["data"])
+                parents = objects[parent]
+                for obj, i in zip(objects[table], parent_indices.tolist()):
+                    children = _get_container(parents[i], container)
+                    # the nested object holding the container might not
+                    # have been read
+                    if children is not None:
+                        children.append(obj)
+        catalog.events = objects["events"]
+    return catalog
+
+
+def get_tables(filename):
+    """
+    Returns the names of the tables and their columns in a COLUMNAR file.
+
+    :type filename: str or file
+    :param filename: Filename or open file-like object of the file to read.
+    :rtype: :class:`~collections.OrderedDict`
+    :returns: Dictionary with the column names of each table.
+
+    .. rubric:: Example
+
+    >>> import io
+    >>> from obspy import read_events
+    >>> buf = io.BytesIO()
+    >>> read_events().write(buf, format="COLUMNAR")
+    >>> tables = get_tables(io.BytesIO(buf.getvalue()))
+    >>> print(list(tables)[:5])
+    ['catalog', 'events', 'event_descriptions', 'origins', 'arrivals']
+    >>> print(tables['origins'][:5])
+    ['parent', 'resource_id', 'time', 'time_errors', \
+'time_errors.uncertainty']
+    """
+    with _ColumnarFile(filename) as fh:
+        return fh.get_tables()
+
+
+def read_columns(filename, table="events", columns=None, mmap=False):
+    """
+    Reads columns of a table of a COLUMNAR file as numpy arrays, without
+    creating any event objects.
+
+    Depending on the type of the attribute, columns are returned as
+
+    * ``float64`` arrays with ``NaN`` for missing values,
+    * ``datetime64[ns]`` arrays with ``NaT`` for missing times,
+    * masked ``int64`` or ``bool`` arrays for integers and booleans,
+    * object arrays of strings or ``None`` for strings, enumerations and
+      resource identifiers.
+
+    All tables except the events have a ``parent`` column with the row
+    number of the object they belong to in the parent table, e.g. the
+    origin of an arrival.
+
+    :type filename: str or file
+    :param filename: Filename or open file-like object of the file to read.
+    :type table: str
+    :param table: Name of the table, see :func:`get_tables`.
+    :type columns: list of str
+    :param columns: Names of the columns to read. Defaults to all columns.
+    :type mmap: bool
+    :param mmap: Memory map the numeric columns instead of reading them,
+        only supported for filenames. The arrays are read-only then.
+    :rtype: :class:`~collections.OrderedDict`
+    :returns: Dictionary with the column names and arrays.
+
+    .. rubric:: Example
+
+    >>> import io
+    >>> from obspy import read_events
+    >>> buf = io.BytesIO()
+    >>> read_events().write(buf, format="COLUMNAR")
+    >>> buf.seek(0)
+    0
+    >>> origins = read_columns(buf, "origins", ["time", "latitude", "depth"])
+    >>> print(origins["time"])  # doctest: +NORMALIZE_WHITESPACE
+    ['2012-04-04T14:21:42.300000000' '2012-04-04T14:18:37.000000000'
+     '2012-04-04T14:08:46.000000000']
+    >>> print(origins["latitude"].tolist())
+    [41.818, 39.342, 38.017]
+    """
+    with _ColumnarFile(filename, mmap=mmap) as fh:
+        try:
+            names = fh.get_tables()[table]
+        except KeyError:
+            msg = "No table '%s' in COLUMNAR file." % table
+            raise ValueError(msg)
+        if columns is not None:
+            for name in columns:
+                if name not in names:
+                    msg = "No column '%s' in table '%s'." % (name, table)
+                    raise ValueError(msg)
+            names = columns
+        return collections.OrderedDict(
+            (name, fh.read_column(table, name)) for name in names)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import glob
+import io
+import os
+import unittest
+import warnings
+
+import numpy as np
+
+from obspy import UTCDateTime, read_events
+from obspy.core.event import (Amplitude, Arrival, Comment, CompositeTime,
+                              ConfidenceEllipsoid, CreationInfo, DataUsed,
+                              EventDescription, FocalMechanism, Magnitude,
+                              MomentTensor, Origin, OriginQuality,
+                              OriginUncertainty, Pick, ResourceIdentifier,
+                              StationMagnitude, StationMagnitudeContribution,
+                              WaveformStreamID)
+from obspy.core.util import NamedTemporaryFile
+from obspy.io.columnar.core import (_is_columnar, _read_columnar,
+                                    _write_columnar, get_tables, read_columns)
+
+
+class ColumnarTestCase(unittest.TestCase):
+    """
+    Test suite for obspy.io.columnar.core
+    """
+    def setUp(self):
+        self.catalog = read_events()
+        self.catalog.description = "Example catalog"
+        self.catalog.creation_info.author = "ObsPy"
+        t = UTCDateTime(2012, 4, 4, 14, 21, 42, 123456)
+        event = self.catalog[0]
+        event.event_descriptions.append(
+            EventDescription(text="Xinjiang-Kasachstan Grenzgebiet ü",
+                             type="region name"))
+        origin = event.origins[0]
+        origin.time_errors.uncertainty = 0.25
+        origin.epicenter_fixed = False
+        origin.quality = OriginQuality(used_phase_count=2,
+                                       standard_error=0.5)
+        origin.origin_uncertainty = OriginUncertainty(
+            horizontal_uncertainty=1200.0,
+            confidence_ellipsoid=ConfidenceEllipsoid())
+        for i, station in enumerate(("ABC", "DEF")):
+            pick = Pick(time=t + i, phase_hint="P", onset="impulsive",
+                        waveform_id=WaveformStreamID("XX", station, "",
+                                                     "HHZ"))
+            event.picks.append(pick)
+            origin.arrivals.append(Arrival(pick_id=pick.resource_id,
+                                           phase="P", time_residual=-0.1 * i,
+                                           time_weight=1.0))
+            amplitude = Amplitude(generic_amplitude=1e-6 * (i + 1),
+                                  pick_id=pick.resource_id, unit="m",
+                                  waveform_id=pick.waveform_id)
+            event.amplitudes.append(amplitude)
+            station_magnitude = StationMagnitude(
+                mag=4.3 + i * 0.2, amplitude_id=amplitude.resource_id,
+                origin_id=origin.resource_id)
+            event.station_magnitudes.append(station_magnitude)
+            event.magnitudes[0].station_magnitude_contributions.append(
+                StationMagnitudeContribution(
+                    station_magnitude_id=station_magnitude.resource_id,
+                    weight=0.5))
+        event.magnitudes.append(Magnitude(mag=4.2, magnitude_type="ML",
+                                          station_count=0))
+        event.preferred_origin_id = origin.resource_id
+        # an origin without arrivals in between ones with arrivals
+        self.catalog[1].origins.append(Origin(time=t, latitude=10))
+        self.catalog[1].origins[-1].arrivals.append(
+            Arrival(pick_id="smi:local/some_pick", phase="S"))
+
+    def _write(self, catalog=None):
+        buf = io.BytesIO()
+        _write_columnar(
+            self.catalog if catalog is None else catalog, buf)
+        buf.seek(0)
+        return buf
+
+    def test_read_write(self):
+        """
+        Write and read back a catalog, with format detection.
+        """
+        with NamedTemporaryFile() as tf:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                self.catalog.write(tf.name, format="COLUMNAR")
+            self.assertEqual(w, [])
+            self.assertTrue(_is_columnar(tf.name))
+            catalog = read_events(tf.name)
+        self.assertEqual(catalog, self.catalog)
+        self.assertEqual(catalog.resource_id, self.catalog.resource_id)
+        self.assertEqual(catalog.description, "Example catalog")
+        self.assertEqual(catalog.creation_info, self.catalog.creation_info)
+        self.assertEqual(catalog[0]._format, "COLUMNAR")
+        # references between the objects are restored
+        event = catalog[0]
+        self.assertIs(event.preferred_origin(), event.origins[0])
+        arrival = event.origins[0].arrivals[1]
+        self.assertIs(arrival.pick_id.get_referred_object(), event.picks[1])
+        self.assertEqual(arrival.time_residual, -0.1)
+        # unset and empty nested objects stay apart
+        self.assertIsNone(event.picks[0].creation_info)
+        self.assertEqual(
+            event.origins[0].origin_uncertainty.confidence_ellipsoid,
+            ConfidenceEllipsoid())
+        self.assertIsNone(catalog[1].origins[1].origin_uncertainty)
+        self.assertEqual(event.magnitudes[1].station_count, 0)
+        self.assertIs(event.origins[0].epicenter_fixed, False)
+        self.assertEqual(
+            [len(origin.arrivals) for origin in catalog[1].origins], [0, 1])
+
+        # other files are not detected as COLUMNAR files
+        with NamedTemporaryFile() as tf:
+            self.catalog.write(tf.name, format="QUAKEML")
+            self.assertFalse(_is_columnar(tf.name))
+
+    def test_empty_catalog(self):
+        catalog = _read_columnar(self._write(read_events()[:0]))
+        self.assertEqual(len(catalog), 0)
+
+    def test_comments_focal_mechanisms_and_custom_tags(self):
+        """
+        Comments, composite times, focal mechanisms, unset quantity errors
+        and custom tags are stored as well.
+        """
+        self.catalog.comments.append(Comment(text="catalog comment"))
+        self.catalog.extra = {"a": {"value": "1", "namespace": "http://a"}}
+        self.catalog.nsmap = {None: "http://quakeml.org/xmlns/bed/1.2",
+                              "a": "http://a"}
+        event = self.catalog[0]
+        event.comments.append(Comment(
+            text="event comment", creation_info=CreationInfo(author="me")))
+        origin = event.origins[0]
+        origin.comments.append(Comment(text="origin comment"))
+        origin.arrivals[0].comments.append(Comment(text="arrival comment"))
+        origin.composite_times.append(CompositeTime(year=2012, month=4))
+        origin.depth_errors = None
+        origin.extra = {"b": {"value": {"c": {"value": "2",
+                                              "namespace": "http://a"}},
+                              "namespace": "http://a"}}
+        origin.creation_info = CreationInfo(author="me")
+        origin.creation_info.extra = {
+            "d": {"value": "3", "namespace": "http://a",
+                  "type": "attribute"}}
+        event.picks[0].comments.append(Comment(text="pick comment"))
+        event.magnitudes[0].comments.append(Comment(text="mag comment"))
+        fm = FocalMechanism(
+            moment_tensor=MomentTensor(scalar_moment=1e20),
+            waveform_id=[WaveformStreamID("XX", "ABC"),
+                         WaveformStreamID("XX", "DEF")])
+        fm.moment_tensor.data_used.append(DataUsed(wave_type="P waves"))
+        fm.moment_tensor.comments.append(Comment(text="mt comment"))
+        fm.comments.append(Comment(text="fm comment"))
+        self.catalog[2].focal_mechanisms.extend([fm, FocalMechanism()])
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            catalog = _read_columnar(self._write())
+        self.assertEqual(w, [])
+        self.assertEqual(catalog, self.catalog)
+        self.assertEqual(catalog.comments, self.catalog.comments)
+        self.assertEqual(catalog.extra, self.catalog.extra)
+        self.assertEqual(catalog.nsmap, self.catalog.nsmap)
+        origin = catalog[0].origins[0]
+        self.assertIsNone(origin.depth_errors)
+        self.assertEqual(origin.extra.b.value.c.value, "2")
+        self.assertEqual(origin.creation_info.extra.d.type, "attribute")
+        self.assertNotIn("extra", catalog[0].__dict__)
+        self.assertEqual(catalog[2].focal_mechanisms[0].moment_tensor,
+                         fm.moment_tensor)
+        self.assertIsNone(catalog[2].focal_mechanisms[1].moment_tensor)
+
+        # the moment tensors are skipped when reading the focal mechanisms
+        # without them, and so are their contents
+        catalog = _read_columnar(self._write(),
+                                 columns=["waveform_id", "text"])
+        fm = catalog[2].focal_mechanisms[0]
+        self.assertIsNone(fm.moment_tensor)
+        self.assertEqual(len(fm.waveform_id), 2)
+        self.assertEqual(fm.comments[0].text, "fm comment")
+        self.assertNotIn("extra", catalog[0].origins[0].__dict__)
+
+    def test_quakeml_round_trip(self):
+        """
+        All QuakeML test files survive a round-trip through the COLUMNAR
+        format.
+        """
+        path = os.path.join(os.path.dirname(__file__), "..", "..",
+                            "quakeml", "tests", "data")
+        filenames = sorted(glob.glob(os.path.join(path, "*.xml")))
+        self.assertEqual(len(filenames), 16)
+        for filename in filenames:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                expected = read_events(filename, format="QUAKEML")
+                catalog = _read_columnar(self._write(expected))
+            self.assertEqual(catalog, expected, filename)
+            self.assertEqual(catalog.resource_id, expected.resource_id)
+            self.assertEqual(catalog.comments, expected.comments)
+            expected_qml = io.BytesIO()
+            expected.write(expected_qml, format="QUAKEML")
+            qml = io.BytesIO()
+            catalog.write(qml, format="QUAKEML")
+            expected_qml = expected_qml.getvalue()
+            if os.path.basename(filename) == "quakeml_1.2_origin.xml":
+                # The only accepted difference: integer uncertainties are
+                # read back as floats of the same value.
+                for value in (b"2", b"2028", b"2030"):
+                    expected_qml = expected_qml.replace(
+                        b">" + value + b"</", b">" + value + b".0</")
+            self.assertEqual(qml.getvalue(), expected_qml, filename)
+
+    def test_partial_read(self):
+        buf = self._write()
+        catalog = _read_columnar(buf, tables=["origins", "magnitudes"],
+                                 columns=["time", "latitude", "mag",
+                                          "quality"])
+        self.assertEqual(len(catalog), 3)
+        event = catalog[0]
+        self.assertEqual(event.resource_id, self.catalog[0].resource_id)
+        self.assertIsNone(event.preferred_origin_id)
+        self.assertEqual(event.picks, [])
+        self.assertEqual(event.amplitudes, [])
+        self.assertEqual(len(event.magnitudes), 2)
+        self.assertEqual(event.magnitudes[0].station_magnitude_contributions,
+                         [])
+        origin = event.origins[0]
+        self.assertEqual(origin.resource_id,
+                         self.catalog[0].origins[0].resource_id)
+        self.assertEqual(origin.time, self.catalog[0].origins[0].time)
+        self.assertEqual(origin.latitude, 41.818)
+        self.assertIsNone(origin.longitude)
+        self.assertEqual(origin.quality, self.catalog[0].origins[0].quality)
+        self.assertEqual(origin.arrivals, [])
+        # children of tables that are not read are skipped
+        buf.seek(0)
+        catalog = _read_columnar(buf, tables=["arrivals"])
+        self.assertEqual(catalog[0].origins, [])
+
+    def test_read_columns(self):
+        buf = self._write()
+        tables = get_tables(buf)
+        self.assertEqual(list(tables)[:4],
+                         ["catalog", "events", "event_descriptions",
+                          "origins"])
+        self.assertIn("waveform_id.station_code", tables["picks"])
+        self.assertEqual(tables["arrivals"][:2], ["parent", "resource_id"])
+
+        buf.seek(0)
+        origins = read_columns(buf, "origins")
+        np.testing.assert_array_equal(origins["parent"], [0, 1, 1, 2])
+        self.assertEqual(origins["time"].dtype, np.dtype("M8[ns]"))
+        self.assertEqual(origins["time"][0],
+                         np.datetime64("2012-04-04T14:21:42.300000000"))
+        np.testing.assert_array_equal(
+            origins["time_errors.uncertainty"], [0.25, 0.0, np.nan, 0.0])
+        self.assertEqual(origins["resource_id"][0],
+                         str(self.catalog[0].origins[0].resource_id))
+        self.assertEqual(origins["quality.used_phase_count"].tolist(),
+                         [2, None, None, None])
+        self.assertEqual(origins["epicenter_fixed"].tolist(),
+                         [False, None, None, None])
+        self.assertEqual(origins["origin_uncertainty"].tolist(),
+                         [True, True, False, True])
+        self.assertEqual(origins["depth_type"].tolist(),
+                         ["from location", "from location", None,
+                          "from location"])
+
+        buf.seek(0)
+        arrivals = read_columns(buf, "arrivals", ["parent", "pick_id"])
+        self.assertEqual(list(arrivals), ["parent", "pick_id"])
+        np.testing.assert_array_equal(arrivals["parent"], [0, 0, 2])
+        self.assertEqual(arrivals["pick_id"][2], "smi:local/some_pick")
+
+        buf.seek(0)
+        self.assertRaises(ValueError, read_columns, buf, "spam")
+        buf.seek(0)
+        self.assertRaises(ValueError, read_columns, buf, "picks", ["spam"])
+        self.assertRaises(ValueError, read_columns, io.BytesIO(b"spam"))
+
+    def test_read_columns_mmap(self):
+        with NamedTemporaryFile() as tf:
+            _write_columnar(self.catalog, tf.name)
+            picks = read_columns(tf.name, "picks", mmap=True)
+            expected = read_columns(tf.name, "picks")
+            self.assertIsInstance(picks["time"].base, np.memmap)
+            self.assertFalse(picks["time"].flags.writeable)
+            self.assertTrue(expected["time"].flags.writeable)
+            self.assertEqual(list(picks), list(expected))
+            for key, value in expected.items():
+                np.testing.assert_array_equal(picks[key], value)
+            del picks
+        self.assertRaises(ValueError, read_columns, self._write(), "picks",
+                          mmap=True)
+
+    def test_resource_ids_are_restored(self):
+        """
+        Resource identifiers are kept when the objects they refer to have
+        been deleted before reading.
+        """
+        buf = self._write()
+        expected = [str(pick.resource_id) for pick in self.catalog[0].picks]
+        del self.catalog
+        catalog = _read_columnar(buf)
+        self.assertEqual([str(pick.resource_id) for pick in catalog[0].picks],
+                         expected)
+        self.assertIsInstance(catalog[0].origins[0].arrivals[0].pick_id,
+                              ResourceIdentifier)
+
+
+def suite():
+    return unittest.makeSuite(ColumnarTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
@@ -63,6 +63,10 @@ def _read_gcf(filename, headonly=False, **kwargs):  # @UnusedVariable
 
     only GCF files containing data records are supported.
 
+    All block headers are decoded at once and the samples of all blocks
+    are decoded with NumPy, see :func:`~obspy.io.gcf.libgcf.read_file`.
+    Directly adjacent blocks of a stream are joined into one trace.
+
     .. warning::
         This function should NOT be called directly, it registers via the
         ObsPy :func:`~obspy.core.stream.read` function, call this instead.
@@ -81,20 +85,10 @@ def _read_gcf(filename, headonly=False, **kwargs):  # @UnusedVariable
     >>> from obspy import read
     >>> st = read("/path/to/20160603_1955n.gcf", format="GCF")
     """
-    traces = []
-    with open(filename, 'rb') as f:
-        while True:
-            try:
-                if headonly:
-                    header = libgcf.read_header(f, **kwargs)
-                    if header:
-                        traces.append(Trace(header=header))
-                else:
-                    hd = libgcf.read(f, **kwargs)
-                    if hd:
-                        traces.append(Trace(header=hd[0], data=hd[1]))
-            except EOFError:
-                break
+    traces = [Trace(header=header, data=data) if data is not None
+              else Trace(header=header)
+              for header, data in libgcf.read_file(filename, headonly,
+                                                   **kwargs)]
     st = Stream(traces=traces)
     if headonly:
         st = merge_gcf_stream(st)
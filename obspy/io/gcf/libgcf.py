@@ -8,6 +8,11 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import native_str
+
+import io
+import os
+import warnings
 
 import numpy as np
 
@@ -34,6 +39,12 @@ COMPRESSION_D = {  # Table 3.2: format field to data type
     1: '>i4',
     2: '>i2',
     4: '>i1'}
+# size of a GCF block in bytes
+BLOCK_SIZE = 1024
+# maximum number of blocks gathered at once when decoding the samples
+DECODE_BLOCKS = 4096
+# GCF times count from 1989-11-17, in nanoseconds since 1970-01-01
+EPOCH_NS = 627264000 * 10 ** 9
 
 
 def is_gcf(f):
@@ -89,15 +100,15 @@ def read_data_block(f, headonly=False, channel_prefix="HH", **kwargs):
     sysid = f.read(4)
     if not sysid:
         raise EOFError  # got to EOF
-    sysid = np.frombuffer(sysid, count=1, dtype='>u4')
+    sysid = int(np.frombuffer(sysid, count=1, dtype='>u4')[0])
     if sysid >> 31 & 0b1 > 0:
-        sysid = (sysid << 6) >> 6
+        sysid &= 0x03FFFFFF
     sysid = decode36(sysid)
     # get Stream ID
-    stid = np.frombuffer(f.read(4), count=1, dtype='>u4')
+    stid = int(np.frombuffer(f.read(4), count=1, dtype='>u4')[0])
     stid = decode36(stid)
     # get Date & Time
-    data = np.frombuffer(f.read(4), count=1, dtype='>u4')
+    data = int(np.frombuffer(f.read(4), count=1, dtype='>u4')[0])
     starttime = decode_date_time(data)
     # get data format
     # get reserved, SPS, data type compression,
@@ -160,3 +171,222 @@ def read(f, **kwargs):
     Reads header and data from GCF file.
     """
     return read_data_block(f, headonly=False, **kwargs)
+
+
+def _get_block_index(blocks):
+    """
+    Decodes the headers of all blocks at once.
+
+    :type blocks: :class:`numpy.ndarray`
+    :param blocks: 2-D unsigned byte array with one row per block.
+    :returns: Dictionary of arrays with the block numbers, stream ids,
+        start times (in nanoseconds since 1970), sampling rates,
+        compression codes and number of samples of all data blocks, in the
+        order of the file.
+    """
+    stream_ids = blocks[:, 4:8].view(native_str('>u4'))[:, 0]
+    date = blocks[:, 8:12].view(native_str('>u4'))[:, 0].astype(np.int64)
+    sps = blocks[:, 13].astype(np.int64)
+    compression = blocks[:, 14] & 0b00001111
+    t_offset = (blocks[:, 14] >> 4).astype(np.int64)
+    num_records = blocks[:, 15].astype(np.int64)
+    # lookup tables for the special sample rates and time offsets
+    sampling_rates = np.arange(256, dtype=np.float64)
+    denominators = np.zeros(256, dtype=np.int64)
+    for key, value in SPS_D.items():
+        sampling_rates[key] = value
+    for key, value in TIME_OFFSETS_D.items():
+        denominators[key] = value
+    # skip blocks that are not data blocks (SPS=0)
+    is_data = sps > 0
+    if np.any(is_data & (t_offset > 0) & (denominators[sps] == 0)):
+        raise ValueError("Fractional start time offset for a sampling "
+                         "rate without offset denominator.")
+    if np.any(is_data & ~np.in1d(compression, list(COMPRESSION_D))):
+        raise ValueError("Unsupported compression code.")
+    if np.any(is_data & (num_records * 4 > BLOCK_SIZE - 24)):
+        raise ValueError("Number of records exceeds block size.")
+    block = np.nonzero(is_data)[0]
+    sps = sps[block]
+    starttime = EPOCH_NS + ((date[block] >> 17) * 86400 +
+                            (date[block] & 0x1FFFF)) * 10 ** 9
+    offset = t_offset[block] > 0
+    starttime[offset] += t_offset[block][offset] * 10 ** 9 // \
+        denominators[sps[offset]]
+    return {
+        'block': block,
+        'stream_id': stream_ids[block],
+        'starttime': starttime,
+        'sampling_rate': sampling_rates[sps],
+        'compression': compression[block].astype(np.int64),
+        'npts': num_records[block] * compression[block]}
+
+
+def _get_segments(index):
+    """
+    Sorts the data blocks by stream and start time and groups directly
+    adjacent blocks of a stream into segments.
+
+    Blocks are adjacent if the start time of a block is off by less than
+    1 % of the sampling interval from the end of the previous block (the
+    threshold of :meth:`~obspy.core.stream.Stream.merge` with
+    ``method=-1``).
+
+    :returns: The order of the blocks, the index of the first (sorted)
+        block and the number of blocks of each segment.
+    """
+    if not len(index['block']):
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    order = np.lexsort((index['starttime'], index['sampling_rate'],
+                        index['stream_id']))
+    stream_ids = index['stream_id'][order]
+    sampling_rates = index['sampling_rate'][order]
+    starttimes = index['starttime'][order]
+    npts = index['npts'][order]
+    delta = 1e9 / sampling_rates
+    gap = np.diff(starttimes) - npts[:-1] * delta[:-1]
+    adjacent = (stream_ids[1:] == stream_ids[:-1]) & \
+        (sampling_rates[1:] == sampling_rates[:-1]) & \
+        (np.abs(gap) < 1e-2 * delta[1:])
+    first = np.concatenate([[0], np.nonzero(~adjacent)[0] + 1])
+    count = np.diff(np.concatenate([first, [len(order)]]))
+    return order, first, count
+
+
+def _decode_blocks(blocks, index, block_ids):
+    """
+    Decodes data blocks of equal compression.
+
+    :param block_ids: Positions of the blocks in the index.
+    :returns: The samples as 2-D int32 array with one row per block, only
+        the first ``npts`` samples of each row are valid.
+    """
+    compression = index['compression'][block_ids[0]]
+    dtype = np.dtype(native_str(COMPRESSION_D[compression]))
+    npts = index['npts'][block_ids]
+    rows = index['block'][block_ids]
+    fic = blocks[rows, 16:20].view(native_str('>i4'))[:, 0]
+    ric_offset = 20 + 4 * (npts // compression)
+    ric = blocks[rows[:, np.newaxis], ric_offset[:, np.newaxis] +
+                 np.arange(4)].view(native_str('>i4'))[:, 0]
+    diffs = blocks[rows, 20:BLOCK_SIZE - 4].view(dtype)
+    data = np.cumsum(diffs, axis=1, dtype=np.int32)
+    data += fic[:, np.newaxis].astype(np.int32)
+    # verify last data sample matches RIC
+    filled = npts > 0
+    if np.any(data[filled, npts[filled] - 1] != ric[filled]):
+        raise ValueError("Last sample mismatch with RIC")
+    return data
+
+
+def _decode_sorted_blocks(blocks, index, order, samples):
+    """
+    Decodes the data blocks in the given order into ``samples``.
+
+    The blocks are decoded in chunks, all blocks of a chunk with the same
+    compression at once. A chunk of completely filled blocks with equal
+    compression (the usual case) is copied into ``samples`` in one go.
+    """
+    npts = index['npts']
+    compressions = index['compression']
+    position = 0
+    for i in range(0, len(order), DECODE_BLOCKS):
+        chunk = order[i:i + DECODE_BLOCKS]
+        chunk_npts = npts[chunk]
+        out = samples[position:position + chunk_npts.sum()]
+        position += len(out)
+        for compression in np.unique(compressions[chunk]):
+            group = compressions[chunk] == compression
+            data = _decode_blocks(blocks, index, chunk[group])
+            if np.all(group) and np.all(chunk_npts == data.shape[1]):
+                out[:] = data.ravel()
+                continue
+            starts = np.cumsum(chunk_npts) - chunk_npts
+            valid = np.arange(data.shape[1]) < \
+                chunk_npts[group][:, np.newaxis]
+            out[(starts[group][:, np.newaxis] +
+                 np.arange(data.shape[1]))[valid]] = data[valid]
+
+
+def _read_blocks(blocks, headonly, channel_prefix):
+    """
+    Reads the segments of the given blocks, see :func:`read_file`.
+    """
+    index = _get_block_index(blocks)
+    order, first, count = _get_segments(index)
+    npts = index['npts'][order]
+    positions = np.cumsum(npts) - npts
+    samples = None
+    if not headonly:
+        samples = np.empty(npts.sum(), dtype=np.int32)
+        _decode_sorted_blocks(blocks, index, order, samples)
+    # station and channel codes of the streams
+    codes = {}
+    for stream_id in np.unique(index['stream_id']):
+        stid = decode36(int(stream_id))
+        codes[stream_id] = (stid[:4],
+                            (channel_prefix[:2] + stid[4]).upper())
+    segments = []
+    for i, n in zip(first, count):
+        block = order[i]
+        station, channel = codes[index['stream_id'][block]]
+        start = positions[i]
+        length = int(npts[i:i + n].sum())
+        header = {
+            'starttime': UTCDateTime(ns=int(index['starttime'][block])),
+            'station': station,
+            'channel': channel,
+            'sampling_rate': float(index['sampling_rate'][block]),
+            'npts': length}
+        if headonly:
+            segments.append((header, None))
+        else:
+            segments.append((header, samples[start:start + length]))
+    return segments
+
+
+def read_file(filename, headonly=False, channel_prefix="HH", **kwargs):
+    """
+    Reads all data blocks of a GCF file at once.
+
+    The headers of all blocks are decoded in one pass over the memory
+    mapped file, the blocks of all streams are then decoded with NumPy, all
+    blocks with the same compression at once, and directly adjacent blocks
+    of a stream are joined.
+
+    :type filename: str
+    :param filename: GCF file to be read.
+    :type headonly: bool
+    :param headonly: If ``True``, the samples are not decoded.
+    :type channel_prefix: str
+    :param channel_prefix: Channel band and instrument codes.
+    :returns: List of ``(header, data)`` tuples, one for each segment of
+        adjacent blocks of a stream, sorted by stream and start time.
+        ``data`` is ``None`` if ``headonly`` is ``True``.
+    """
+    size = os.path.getsize(filename)
+    nblocks = size // BLOCK_SIZE
+    segments = []
+    if nblocks:
+        blocks = np.memmap(filename, dtype=np.uint8, mode='r',
+                           shape=(nblocks, BLOCK_SIZE))
+        try:
+            segments = _read_blocks(blocks, headonly, channel_prefix)
+        finally:
+            del blocks
+    if size % BLOCK_SIZE:
+        # a last block without the padding at its end
+        with open(filename, 'rb') as f:
+            f.seek(nblocks * BLOCK_SIZE)
+            tail = f.read()
+        if len(tail) < 16:
+            warnings.warn("Ignoring %d trailing bytes." % len(tail))
+        else:
+            block = read_data_block(io.BytesIO(tail), headonly=headonly,
+                                    channel_prefix=channel_prefix)
+            if headonly and block:
+                segments.append((block, None))
+            elif block:
+                segments.append(block)
+    return segments
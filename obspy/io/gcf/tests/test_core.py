@@ -7,13 +7,17 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import io
 import os
 import unittest
+import warnings
 
 import numpy as np
 
-from obspy import read
+from obspy import Stream, Trace, read
+from obspy.core.util import NamedTemporaryFile
 from obspy.core.utcdatetime import UTCDateTime
+from obspy.io.gcf import libgcf
 from obspy.io.gcf.core import _read_gcf, merge_gcf_stream
 
 
@@ -23,6 +27,29 @@ EXPECTED = np.array([-49378, -49213, -49273, -49277, -49341, -49415, -49289,
                     dtype=np.int32)
 
 
+def _make_block(stream_id, starttime, data, sps=100, compression=4,
+                t_offset=0, ric=None):
+    """
+    Returns a GCF data block with the given samples.
+    """
+    days, secs = divmod(int(starttime - UTCDateTime(1989, 11, 17)), 86400)
+    data = np.asarray(data, dtype=np.int64)
+    diffs = np.diff(np.concatenate([[data[0]], data]))
+    num_records = -(-len(data) // compression)
+    diffs = np.concatenate([diffs, np.zeros(num_records * compression -
+                                            len(data), dtype=np.int64)])
+    block = io.BytesIO()
+    block.write(np.array([int('TEST', 36), int(stream_id, 36),
+                          days << 17 | secs], dtype='>u4').tobytes())
+    block.write(np.array([0, sps, t_offset << 4 | compression, num_records],
+                         dtype='u1').tobytes())
+    block.write(np.array([data[0]], dtype='>i4').tobytes())
+    block.write(diffs.astype(libgcf.COMPRESSION_D[compression]).tobytes())
+    block.write(np.array([data[-1] if ric is None else ric],
+                         dtype='>i4').tobytes())
+    return block.getvalue().ljust(libgcf.BLOCK_SIZE, b'\0')
+
+
 class CoreTestCase(unittest.TestCase):
     """
     Test cases for gcf core interface
@@ -162,6 +189,90 @@ class CoreTestCase(unittest.TestCase):
         self.assertEqual(st[0].stats.channel, 'HNN')
         self.assertEqual(st[0].stats.station, '6018')
 
+    def _write_blocks(self, blocks):
+        tf = NamedTemporaryFile()
+        with open(tf.name, 'wb') as fh:
+            fh.write(b''.join(blocks))
+        return tf
+
+    def test_read_multiple_blocks(self):
+        """
+        Read a file with interleaved blocks of several streams, with
+        different compressions, a gap and a status block.
+        """
+        t = UTCDateTime(2016, 6, 3, 19, 55)
+        np.random.seed(815)
+        data_z = np.cumsum(np.random.randint(-100, 100, 1000))
+        data_n = np.cumsum(np.random.randint(-20000, 20000, 500))
+        status = bytearray(_make_block('6018Z2', t, [0]))
+        status[13] = 0
+        blocks = [
+            _make_block('6018Z2', t, data_z[:400]),
+            _make_block('6018N2', t + 3, data_n[250:], compression=2,
+                        sps=174),
+            bytes(status),
+            _make_block('6018Z2', t + 4, data_z[400:750], compression=2),
+            # blocks do not have to be in order, start times are offset by
+            # 1/2 s
+            _make_block('6018N2', t + 2, data_n[:250], compression=1,
+                        sps=174, t_offset=1),
+            # gap of 1.5 seconds
+            _make_block('6018Z2', t + 9, data_z[750:], compression=1)]
+        with self._write_blocks(blocks) as tf:
+            st = read(tf.name, format='GCF')
+            st_head = read(tf.name, format='GCF', headonly=True)
+            # same as reading block by block
+            with open(tf.name, 'rb') as fh:
+                expected = Stream()
+                while True:
+                    try:
+                        block = libgcf.read(fh)
+                    except EOFError:
+                        break
+                    if block:
+                        expected += Trace(header=block[0], data=block[1])
+            expected.merge(-1)
+        for tr in expected:
+            tr.stats._format = 'GCF'
+        self.assertEqual(st, expected)
+        self.assertEqual([tr.id for tr in st],
+                         ['.6018..HHN', '.6018..HHZ', '.6018..HHZ'])
+        self.assertEqual(st[0].stats.starttime, t + 2.5)
+        self.assertEqual(st[0].stats.sampling_rate, 500.0)
+        np.testing.assert_array_equal(st[0].data, data_n)
+        self.assertEqual(st[1].stats.starttime, t)
+        np.testing.assert_array_equal(st[1].data, data_z[:750])
+        self.assertEqual(st[2].stats.starttime, t + 9)
+        np.testing.assert_array_equal(st[2].data, data_z[750:])
+        self.assertEqual([tr.stats.npts for tr in st_head],
+                         [tr.stats.npts for tr in st])
+        self.assertEqual([tr.stats.starttime for tr in st_head],
+                         [tr.stats.starttime for tr in st])
+
+    def test_read_last_block_without_padding(self):
+        t = UTCDateTime(2016, 6, 3, 19, 55)
+        blocks = [_make_block('6018Z2', t, np.arange(100)),
+                  _make_block('6018Z2', t + 1, np.arange(52))[:240]]
+        with self._write_blocks(blocks) as tf:
+            st = _read_gcf(tf.name)
+        self.assertEqual(len(st), 1)
+        self.assertEqual(st[0].stats.npts, 152)
+        with self._write_blocks(blocks[:1] + [b'GCF']) as tf:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                st = _read_gcf(tf.name)
+        self.assertEqual(len(w), 1)
+        self.assertEqual(st[0].stats.npts, 100)
+
+    def test_ric_mismatch(self):
+        t = UTCDateTime(2016, 6, 3, 19, 55)
+        blocks = [_make_block('6018Z2', t, np.arange(100)),
+                  _make_block('6018Z2', t + 1, np.arange(100), ric=5)]
+        with self._write_blocks(blocks) as tf:
+            self.assertRaises(ValueError, _read_gcf, tf.name)
+            st = _read_gcf(tf.name, headonly=True)
+        self.assertEqual(st[0].stats.npts, 200)
+
 
 def suite():
     return unittest.makeSuite(CoreTestCase, 'test')
@@ -30,6 +30,17 @@ def _is_gse2(filename):
     return True
 
 
+def _sniff_gse2(header):
+    """
+    Checks whether the first bytes of a file are the start of a GSE2 file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    """
+    return header[:4] == b'WID2'
+
+
 def _read_gse2(filename, headonly=False, verify_chksum=True,
                **kwargs):  # @UnusedVariable
     """
@@ -131,6 +142,17 @@ def _is_gse1(filename):
     return False
 
 
+def _sniff_gse1(header):
+    """
+    Checks whether the first bytes of a file are the start of a GSE1 file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    """
+    return header.startswith(b'WID1') or header.startswith(b'XW01')
+
+
 def _read_gse1(filename, headonly=False, verify_chksum=True,
                **kwargs):  # @UnusedVariable
     """
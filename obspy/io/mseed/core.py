@@ -18,6 +18,7 @@ import numpy as np
 from obspy import Stream, Trace, UTCDateTime
 from obspy.core.compatibility import from_buffer
 from obspy.core.util import NATIVE_BYTEORDER
+from obspy.core.util.base import SNIFF_SIZE
 from . import (util, InternalMSEEDError, ObsPyMSEEDFilesizeTooSmallError,
                ObsPyMSEEDFilesizeTooLargeError)
 from .headers import (DATATYPES, ENCODINGS, HPTERROR, HPTMODULUS, SAMPLETYPE,
@@ -143,6 +144,48 @@ def __is_mseed(fp, file_size):  # NOQA
     return False
 
 
+def _sniff_mseed(header):
+    """
+    Checks whether the first bytes of a file are the start of a Mini-SEED
+    or full SEED file, see :func:`_is_mseed`.
+
+    :type header: bytes
+    :param header: The first :const:`~obspy.core.util.base.SNIFF_SIZE`
+        bytes of the file (or the complete file, if it is smaller).
+    :rtype: bool
+    :return: ``None`` if the header is not sufficient to decide, e.g. for
+        full SEED files.
+    """
+    complete = len(header) < SNIFF_SIZE
+    p = 0
+    while True:
+        if len(header) < p + 128 and not complete:
+            return None
+        seqnr = header[p:p + 6].replace(b'\x00', b' ').strip()
+        if len(header[p:p + 7]) != 7:
+            return False
+        indicator = header[p + 6:p + 7]
+        if not seqnr.isdigit() and seqnr != b'':
+            # completely empty record
+            rest = header[p:p + 128]
+        elif indicator in [b'D', b'R', b'Q', b'M']:
+            return True
+        elif indicator == b' ':
+            # noise record
+            rest = header[p + 7:p + 128]
+        elif indicator == b'V':
+            # full SEED, all records have to be checked
+            return None
+        else:
+            return False
+        try:
+            if rest.decode().strip():
+                return False
+        except Exception:
+            return False
+        p += 128
+
+
 def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
                 sourcename=None, reclen=None, details=False,
                 header_byteorder=None, verbose=None, **kwargs):
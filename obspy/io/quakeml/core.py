@@ -23,15 +23,20 @@ by a distributed team in a transparent collaborative manner.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import native_str
 
 import inspect
 import io
 import os
+import re
 import warnings
 
 from collections import Mapping
 from lxml import etree
 
+from obspy.core.event.catalog import (_ORIGIN_FILTER_KEYS,
+                                      _compile_filter_rules,
+                                      _match_filter_rules)
 from obspy.core.event import (Amplitude, Arrival, Axis, Catalog, Comment,
                               CompositeTime, ConfidenceEllipsoid, CreationInfo,
                               DataUsed, Event, EventDescription,
@@ -44,11 +49,21 @@ from obspy.core.event import (Amplitude, Arrival, Axis, Catalog, Comment,
                               WaveformStreamID)
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import AttribDict, Enum
+from obspy.core.util.base import _sniff_xml_root_tag
 
 
 NSMAP_QUAKEML = {None: "http://quakeml.org/xmlns/bed/1.2",
                  'q': "http://quakeml.org/xmlns/quakeml/1.2"}
 
+# XPath expressions only selecting child elements by name
+_CHILD_TAG_REGEX = re.compile(r"^[A-Za-z_][\w.\-]*$")
+
+# QuakeML elements of the origin quality filter keys of Catalog.filter()
+_ORIGIN_QUALITY_TAGS = {"standard_error": ("standardError", float),
+                        "azimuthal_gap": ("azimuthalGap", float),
+                        "used_station_count": ("usedStationCount", int),
+                        "used_phase_count": ("usedPhaseCount", int)}
+
 
 def _get_first_child_namespace(element):
     """
@@ -103,13 +118,21 @@ def _is_quakeml(filename):
     else:
         file_like_object = False
 
+    # Files are only parsed up to the eventParameters element.
+    if file_like_object or (isinstance(filename, (str, native_str)) and
+                            os.path.isfile(filename)):
+        try:
+            return _has_event_parameters(filename)
+        except Exception:
+            return False
+        finally:
+            if file_like_object:
+                filename.seek(position, 0)
+
     try:
         xml_doc = _xml_doc_from_anything(filename)
     except Exception:
         return False
-    finally:
-        if file_like_object:
-            filename.seek(position, 0)
 
     # check if node "*/eventParameters/event" for the global namespace exists
     try:
@@ -123,6 +146,51 @@ def _is_quakeml(filename):
     return True
 
 
+def _has_event_parameters(source):
+    """
+    Checks whether the root element of an XML file has an eventParameters
+    child element in the namespace of its first child element. Children of
+    the root element before it are parsed and discarded.
+    """
+    if not hasattr(source, "read"):
+        with open(source, "rb") as fh:
+            return _has_event_parameters(fh)
+    depth = 0
+    namespace = None
+    for action, element in etree.iterparse(source, events=("start", "end")):
+        if action == "end":
+            depth -= 1
+            if depth == 1:
+                element.clear()
+            continue
+        depth += 1
+        if depth != 2:
+            continue
+        qname = etree.QName(element.tag)
+        if namespace is None:
+            namespace = qname.namespace
+        if qname.localname == "eventParameters" and \
+                qname.namespace == namespace:
+            return True
+    return False
+
+
+def _sniff_quakeml(header):
+    """
+    Checks whether the first bytes of a file can be the start of a QuakeML
+    file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    :return: ``False`` or ``None`` if the file has to be checked with
+        :func:`_is_quakeml`.
+    """
+    if _sniff_xml_root_tag(header) is False:
+        return False
+    return None
+
+
 class Unpickler(object):
     """
     De-serializes a QuakeML string into an ObsPy Catalog object.
@@ -137,17 +205,20 @@ class Unpickler(object):
         except AttributeError:
             return self.xml_doc
 
-    def load(self, file):
+    def load(self, file, filters=None):
         """
         Reads QuakeML file into ObsPy catalog object.
 
         :type file: str
         :param file: File name to read.
+        :type filters: list of str
+        :param filters: Only read events matching these filter rules, see
+            :meth:`~obspy.core.event.Catalog.filter`.
         :rtype: :class:`~obspy.core.event.Catalog`
         :returns: ObsPy Catalog object.
         """
         self.xml_doc = _xml_doc_from_anything(file)
-        return self._deserialize()
+        return self._deserialize(filters=filters)
 
     def loads(self, string):
         """
@@ -197,18 +268,22 @@ class Unpickler(object):
         if element is None:
             element = self.xml_root
 
-        namespaces = None
+        if not namespace:
+            nsmap = getattr(element, "nsmap", None)
+            if nsmap and None in nsmap:
+                namespace = nsmap[None]
+            elif hasattr(self, "nsmap") and None in self.nsmap:
+                namespace = self.nsmap[None]
+
+        if _CHILD_TAG_REGEX.match(xpath):
+            # iterating the child elements is much faster than evaluating
+            # the XPath expression
+            if namespace:
+                xpath = "{%s}%s" % (namespace, xpath)
+            return list(element.iterchildren(xpath))
         if namespace:
-            xpath = "b:%s" % xpath
-            namespaces = {"b": namespace}
-        elif hasattr(element, "nsmap") and None in element.nsmap:
-            xpath = "b:%s" % xpath
-            namespaces = {"b": element.nsmap[None]}
-        elif hasattr(self, "nsmap") and None in self.nsmap:
-            xpath = "b:%s" % xpath
-            namespaces = {"b": self.nsmap[None]}
-
-        return element.xpath(xpath, namespaces=namespaces)
+            return element.xpath("b:%s" % xpath, namespaces={"b": namespace})
+        return element.xpath(xpath)
 
     def _comments(self, parent):
         obj = []
@@ -895,7 +970,185 @@ class Unpickler(object):
         self._extra(element, obj)
         return obj
 
-    def _deserialize(self):
+    def _event(self, event_el):
+        """
+        Converts an etree.Element into an Event object.
+
+        Returns ``None`` if the event type does not comply with the QuakeML
+        standard.
+        """
+        # create new Event object
+        event = Event(force_resource_id=False)
+        # optional event attributes
+        event.preferred_origin_id = \
+            self._xpath2obj('preferredOriginID', event_el)
+        event.preferred_magnitude_id = \
+            self._xpath2obj('preferredMagnitudeID', event_el)
+        event.preferred_focal_mechanism_id = \
+            self._xpath2obj('preferredFocalMechanismID', event_el)
+        event_type = self._xpath2obj('type', event_el)
+        # Change for QuakeML 1.2RC4. 'null' is no longer acceptable as an
+        # event type. Will be replaced with 'not reported'.
+        if event_type == "null":
+            event_type = "not reported"
+        # USGS event types contain '_' which is not compliant with
+        # the QuakeML standard
+        if isinstance(event_type, str):
+            event_type = event_type.replace("_", " ")
+        try:
+            event.event_type = event_type
+        except ValueError:
+            msg = "Event type '%s' does not comply " % event_type
+            msg += "with QuakeML standard -- event will be ignored."
+            warnings.warn(msg, UserWarning)
+            return None
+        self._set_enum('typeCertainty', event_el,
+                       event, 'event_type_certainty')
+        event.creation_info = self._creation_info(event_el)
+        event.event_descriptions = self._event_description(event_el)
+        event.comments = self._comments(event_el)
+        # origins
+        event.origins = []
+        for origin_el in self._xpath('origin', event_el):
+            # Have to be created before the origin is created to avoid a
+            # rare issue where a warning is read when the same event is
+            # read twice - the warnings does not occur if two referred
+            # to objects compare equal - for this the arrivals have to
+            # be bound to the event before the resource id is assigned.
+            arrivals = []
+            for arrival_el in self._xpath('arrival', origin_el):
+                arrival = self._arrival(arrival_el)
+                arrivals.append(arrival)
+
+            origin = self._origin(origin_el, arrivals=arrivals)
+
+            # append origin with arrivals
+            event.origins.append(origin)
+        # magnitudes
+        event.magnitudes = []
+        for magnitude_el in self._xpath('magnitude', event_el):
+            magnitude = self._magnitude(magnitude_el)
+            event.magnitudes.append(magnitude)
+        # station magnitudes
+        event.station_magnitudes = []
+        for magnitude_el in self._xpath('stationMagnitude', event_el):
+            magnitude = self._station_magnitude(magnitude_el)
+            event.station_magnitudes.append(magnitude)
+        # picks
+        event.picks = []
+        for pick_el in self._xpath('pick', event_el):
+            pick = self._pick(pick_el)
+            event.picks.append(pick)
+        # amplitudes
+        event.amplitudes = []
+        for el in self._xpath('amplitude', event_el):
+            amp = self._amplitude(el)
+            event.amplitudes.append(amp)
+        # focal mechanisms
+        event.focal_mechanisms = []
+        for fm_el in self._xpath('focalMechanism', event_el):
+            fm = self._focal_mechanism(fm_el)
+            event.focal_mechanisms.append(fm)
+        event.resource_id = event_el.get('publicID')
+        self._extra(event_el, event)
+        return event
+
+    def _filter_value(self, event_el, key):
+        """
+        Returns the value of a filter key of
+        :meth:`~obspy.core.event.Catalog.filter` for an event element without
+        creating the event, raises a :class:`KeyError` if the event does not
+        have the magnitude, origin or origin quality the key refers to.
+        """
+        if key == "magnitude":
+            elements = self._xpath('magnitude', event_el)
+            mag = elements and self._float_value(elements[0], 'mag')[0]
+            if not mag:
+                raise KeyError(key)
+            return mag
+        elements = self._xpath('origin', event_el)
+        if not elements:
+            raise KeyError(key)
+        if key == "time":
+            return self._time_value(elements[0], 'time')[0]
+        if key in _ORIGIN_FILTER_KEYS:
+            return self._float_value(elements[0], key)[0]
+        quality = self._xpath('quality', elements[0])
+        if not quality:
+            raise KeyError(key)
+        tag, convert_to = _ORIGIN_QUALITY_TAGS[key]
+        return self._xpath2obj(tag, quality[0], convert_to)
+
+    def _match_filters(self, event_el, filters):
+        """
+        Checks if an event element matches compiled filter rules, see
+        :func:`~obspy.core.event.catalog._compile_filter_rules`.
+        """
+        return _match_filter_rules(
+            filters, lambda key: self._filter_value(event_el, key))
+
+    def iter_events(self, file, filters=None):
+        """
+        Iterates over the events of a QuakeML file.
+
+        The file is parsed incrementally and the XML elements of an event are
+        discarded after the event is created, so the memory needed does not
+        grow with the size of the file. Catalog attributes are not read.
+
+        :type file: str or file-like object
+        :param file: File name or file-like object to read.
+        :type filters: list of str
+        :param filters: Only return events matching these filter rules, see
+            :meth:`~obspy.core.event.Catalog.filter`. Events not matching
+            them are skipped without being created.
+        :rtype: iterator of :class:`~obspy.core.event.Event`
+        """
+        if not hasattr(file, "read"):
+            with open(file, "rb") as fh:
+                for event in self.iter_events(fh, filters=filters):
+                    yield event
+            return
+        filters = _compile_filter_rules(filters or [])
+        self.xml_doc = None
+        depth = 0
+        namespace = None
+        catalog_found = False
+        for action, element in etree.iterparse(file, events=("start", "end")):
+            if action == "start":
+                depth += 1
+                if depth == 1:
+                    self.xml_doc = element
+                    self._quakeml_namespaces = [
+                        ns for ns in element.nsmap.values()
+                        if ns.startswith(r"http://quakeml.org/xmlns/")]
+                elif depth == 2:
+                    if namespace is None:
+                        namespace = etree.QName(element).namespace
+                    catalog_found = catalog_found or \
+                        element.tag == "{%s}eventParameters" % namespace
+                continue
+            depth -= 1
+            if depth != 2 or not catalog_found or \
+                    element.getparent().tag != \
+                    "{%s}eventParameters" % namespace:
+                continue
+            if element.tag == "{%s}event" % namespace and \
+                    (not filters or self._match_filters(element, filters)):
+                event = self._event(element)
+            else:
+                event = None
+            # free the memory of all processed elements
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+            if event is not None:
+                ResourceIdentifier.bind_resource_ids()
+                yield event
+        if not catalog_found:
+            raise Exception("Not a QuakeML compatible file or string")
+
+    def _deserialize(self, filters=None):
+        filters = _compile_filter_rules(filters or [])
         # check node "quakeml/eventParameters" for global namespace
         try:
             namespace = _get_first_child_namespace(self.xml_root)
@@ -915,82 +1168,11 @@ class Unpickler(object):
         catalog.creation_info = self._creation_info(catalog_el)
         # loop over all events
         for event_el in self._xpath('event', catalog_el):
-            # create new Event object
-            event = Event(force_resource_id=False)
-            # optional event attributes
-            event.preferred_origin_id = \
-                self._xpath2obj('preferredOriginID', event_el)
-            event.preferred_magnitude_id = \
-                self._xpath2obj('preferredMagnitudeID', event_el)
-            event.preferred_focal_mechanism_id = \
-                self._xpath2obj('preferredFocalMechanismID', event_el)
-            event_type = self._xpath2obj('type', event_el)
-            # Change for QuakeML 1.2RC4. 'null' is no longer acceptable as an
-            # event type. Will be replaced with 'not reported'.
-            if event_type == "null":
-                event_type = "not reported"
-            # USGS event types contain '_' which is not compliant with
-            # the QuakeML standard
-            if isinstance(event_type, str):
-                event_type = event_type.replace("_", " ")
-            try:
-                event.event_type = event_type
-            except ValueError:
-                msg = "Event type '%s' does not comply " % event_type
-                msg += "with QuakeML standard -- event will be ignored."
-                warnings.warn(msg, UserWarning)
+            if filters and not self._match_filters(event_el, filters):
                 continue
-            self._set_enum('typeCertainty', event_el,
-                           event, 'event_type_certainty')
-            event.creation_info = self._creation_info(event_el)
-            event.event_descriptions = self._event_description(event_el)
-            event.comments = self._comments(event_el)
-            # origins
-            event.origins = []
-            for origin_el in self._xpath('origin', event_el):
-                # Have to be created before the origin is created to avoid a
-                # rare issue where a warning is read when the same event is
-                # read twice - the warnings does not occur if two referred
-                # to objects compare equal - for this the arrivals have to
-                # be bound to the event before the resource id is assigned.
-                arrivals = []
-                for arrival_el in self._xpath('arrival', origin_el):
-                    arrival = self._arrival(arrival_el)
-                    arrivals.append(arrival)
-
-                origin = self._origin(origin_el, arrivals=arrivals)
-
-                # append origin with arrivals
-                event.origins.append(origin)
-            # magnitudes
-            event.magnitudes = []
-            for magnitude_el in self._xpath('magnitude', event_el):
-                magnitude = self._magnitude(magnitude_el)
-                event.magnitudes.append(magnitude)
-            # station magnitudes
-            event.station_magnitudes = []
-            for magnitude_el in self._xpath('stationMagnitude', event_el):
-                magnitude = self._station_magnitude(magnitude_el)
-                event.station_magnitudes.append(magnitude)
-            # picks
-            event.picks = []
-            for pick_el in self._xpath('pick', event_el):
-                pick = self._pick(pick_el)
-                event.picks.append(pick)
-            # amplitudes
-            event.amplitudes = []
-            for el in self._xpath('amplitude', event_el):
-                amp = self._amplitude(el)
-                event.amplitudes.append(amp)
-            # focal mechanisms
-            event.focal_mechanisms = []
-            for fm_el in self._xpath('focalMechanism', event_el):
-                fm = self._focal_mechanism(fm_el)
-                event.focal_mechanisms.append(fm)
-            # finally append newly created event to catalog
-            event.resource_id = event_el.get('publicID')
-            self._extra(event_el, event)
-            catalog.append(event)
+            event = self._event(event_el)
+            if event is not None:
+                catalog.append(event)
         catalog.resource_id = catalog_el.get('publicID')
         self._extra(catalog_el, catalog)
         return catalog
@@ -1067,18 +1249,21 @@ class Pickler(object):
             self.ns_dict = {}
         self.ns_dict.update(NSMAP_QUAKEML.copy())
 
-    def dump(self, catalog, file):
+    def dump(self, catalog, file, pretty_print=True):
         """
         Writes ObsPy Catalog into given file.
 
+        The events are converted and written one at a time, see
+        :meth:`_serialize_to`.
+
         :type catalog: :class:`~obspy.core.event.Catalog`
         :param catalog: ObsPy Catalog object.
-        :type file: str
-        :param file: File name.
+        :type file: str or file-like object
+        :param file: File name or open binary file-like object.
+        :type pretty_print: bool
+        :param pretty_print: Indent the XML elements.
         """
-        fh = open(file, 'wt')
-        fh.write(self._serialize(catalog))
-        fh.close()
+        self._serialize_to(catalog, file, pretty_print=pretty_print)
 
     def dumps(self, catalog):
         """
@@ -1102,10 +1287,12 @@ class Pickler(object):
             return obj.id
 
     def _str(self, value, root, tag, always_create=False, attrib=None):
-        if isinstance(value, ResourceIdentifier):
+        # most optional values are not set
+        if value is None:
+            if always_create is False:
+                return
+        elif isinstance(value, ResourceIdentifier):
             value = self._id(value)
-        if always_create is False and value is None:
-            return
         etree.SubElement(root, tag, attrib=attrib).text = "%s" % value
 
     def _bool(self, value, root, tag, always_create=False, attrib=None):
@@ -1722,9 +1909,71 @@ class Pickler(object):
         self._extra(focal_mechanism, element)
         return element
 
-    def _serialize(self, catalog, pretty_print=True):
+    def _event(self, event):
         """
-        Converts a Catalog object into XML string.
+        Converts an Event into etree.Element object.
+
+        :type event: :class:`~obspy.core.event.Event`
+        :rtype: etree.Element
+        """
+        event_el = etree.Element(
+            'event', attrib={'publicID': self._id(event.resource_id)})
+        # optional event attributes
+        if hasattr(event, "preferred_origin_id"):
+            self._str(event.preferred_origin_id, event_el,
+                      'preferredOriginID')
+        if hasattr(event, "preferred_magnitude_id"):
+            self._str(event.preferred_magnitude_id, event_el,
+                      'preferredMagnitudeID')
+        if hasattr(event, "preferred_focal_mechanism_id"):
+            self._str(event.preferred_focal_mechanism_id, event_el,
+                      'preferredFocalMechanismID')
+        # event type and event type certainty also are optional attributes.
+        if hasattr(event, "event_type"):
+            self._str(event.event_type, event_el, 'type')
+        if hasattr(event, "event_type_certainty"):
+            self._str(event.event_type_certainty, event_el,
+                      'typeCertainty')
+        # event descriptions
+        for description in event.event_descriptions:
+            el = etree.Element('description')
+            self._str(description.text, el, 'text', True)
+            self._str(description.type, el, 'type')
+            self._extra(description, el)
+            event_el.append(el)
+        self._comments(event.comments, event_el)
+        self._creation_info(event.creation_info, event_el)
+        # origins
+        for origin in event.origins:
+            event_el.append(self._origin(origin))
+        # magnitudes
+        for magnitude in event.magnitudes:
+            event_el.append(self._magnitude(magnitude))
+        # station magnitudes
+        for magnitude in event.station_magnitudes:
+            event_el.append(self._station_magnitude(magnitude))
+        # picks
+        for pick in event.picks:
+            event_el.append(self._pick(pick))
+        # amplitudes
+        for amp in event.amplitudes:
+            event_el.append(self._amplitude(amp))
+        # focal mechanisms
+        for focal_mechanism in event.focal_mechanisms:
+            event_el.append(self._focal_mechanism(focal_mechanism))
+        self._extra(event, event_el)
+        return event_el
+
+    def _catalog(self, catalog):
+        """
+        Converts the attributes of a Catalog into an etree.Element object
+        without its events.
+
+        :type catalog: :class:`~obspy.core.event.Catalog`
+        :rtype: tuple
+        :returns: The element and the number of child elements which have to
+            be written before the events, the others (custom tags) follow
+            the events.
         """
         catalog_el = etree.Element('eventParameters', attrib={'publicID':
                                    self._id(catalog.resource_id)})
@@ -1733,57 +1982,18 @@ class Pickler(object):
             self._str(catalog.description, catalog_el, 'description')
         self._comments(catalog.comments, catalog_el)
         self._creation_info(catalog.creation_info, catalog_el)
-        for event in catalog:
-            # create event node
-            event_el = etree.Element(
-                'event', attrib={'publicID': self._id(event.resource_id)})
-            # optional event attributes
-            if hasattr(event, "preferred_origin_id"):
-                self._str(event.preferred_origin_id, event_el,
-                          'preferredOriginID')
-            if hasattr(event, "preferred_magnitude_id"):
-                self._str(event.preferred_magnitude_id, event_el,
-                          'preferredMagnitudeID')
-            if hasattr(event, "preferred_focal_mechanism_id"):
-                self._str(event.preferred_focal_mechanism_id, event_el,
-                          'preferredFocalMechanismID')
-            # event type and event type certainty also are optional attributes.
-            if hasattr(event, "event_type"):
-                self._str(event.event_type, event_el, 'type')
-            if hasattr(event, "event_type_certainty"):
-                self._str(event.event_type_certainty, event_el,
-                          'typeCertainty')
-            # event descriptions
-            for description in event.event_descriptions:
-                el = etree.Element('description')
-                self._str(description.text, el, 'text', True)
-                self._str(description.type, el, 'type')
-                self._extra(description, el)
-                event_el.append(el)
-            self._comments(event.comments, event_el)
-            self._creation_info(event.creation_info, event_el)
-            # origins
-            for origin in event.origins:
-                event_el.append(self._origin(origin))
-            # magnitudes
-            for magnitude in event.magnitudes:
-                event_el.append(self._magnitude(magnitude))
-            # station magnitudes
-            for magnitude in event.station_magnitudes:
-                event_el.append(self._station_magnitude(magnitude))
-            # picks
-            for pick in event.picks:
-                event_el.append(self._pick(pick))
-            # amplitudes
-            for amp in event.amplitudes:
-                event_el.append(self._amplitude(amp))
-            # focal mechanisms
-            for focal_mechanism in event.focal_mechanisms:
-                event_el.append(self._focal_mechanism(focal_mechanism))
-            self._extra(event, event_el)
-            # add event node to catalog
-            catalog_el.append(event_el)
+        num_header_elements = len(catalog_el)
         self._extra(catalog, catalog_el)
+        return catalog_el, num_header_elements
+
+    def _serialize(self, catalog, pretty_print=True):
+        """
+        Converts a Catalog object into XML string.
+        """
+        catalog_el, num_header_elements = self._catalog(catalog)
+        for i, event in enumerate(catalog):
+            # add event node to catalog
+            catalog_el.insert(num_header_elements + i, self._event(event))
         nsmap = self._get_namespace_map()
         root_el = etree.Element('{%s}quakeml' % NSMAP_QUAKEML['q'],
                                 nsmap=nsmap)
@@ -1791,8 +2001,70 @@ class Pickler(object):
         return etree.tostring(root_el, pretty_print=pretty_print,
                               encoding="utf-8", xml_declaration=True)
 
+    def _serialize_to(self, catalog, file, pretty_print=True):
+        """
+        Writes a Catalog object as XML to a file, one event at a time.
 
-def _read_quakeml(filename):
+        Only the element of the event currently written is kept in memory.
+        As the namespaces are declared before the events are converted,
+        namespaces of custom tags of events and their child objects that are
+        not given in the namespace map of the Pickler (or the ``nsmap`` of
+        the catalog) are declared at the elements using them.
+        """
+        if not hasattr(file, "write"):
+            with open(file, "wb") as fh:
+                self._serialize_to(catalog, fh, pretty_print=pretty_print)
+            return
+        catalog_el, num_header_elements = self._catalog(catalog)
+        children = list(catalog_el)
+        for child in children:
+            catalog_el.remove(child)
+            if pretty_print:
+                _indent(child, level=2)
+        nsmap = self._get_namespace_map()
+        # the elements are written without a tail
+        newline = "\n    " if pretty_print else ""
+        with etree.xmlfile(file, encoding="utf-8") as xf:
+            xf.write_declaration()
+            with xf.element('{%s}quakeml' % NSMAP_QUAKEML['q'],
+                            nsmap=nsmap):
+                if pretty_print:
+                    xf.write("\n  ")
+                with xf.element(catalog_el.tag, attrib=catalog_el.attrib):
+                    for child in children[:num_header_elements]:
+                        xf.write(newline, child)
+                    for event in catalog:
+                        event_el = self._event(event)
+                        if pretty_print:
+                            _indent(event_el, level=2)
+                        xf.write(newline, event_el)
+                    for child in children[num_header_elements:]:
+                        xf.write(newline, child)
+                    if pretty_print:
+                        xf.write("\n  ")
+                if pretty_print:
+                    xf.write("\n")
+        if pretty_print:
+            file.write(b"\n")
+
+
+def _indent(element, level=0, space="  "):
+    """
+    Indents the child elements of an element like ``pretty_print`` of
+    :func:`lxml.etree.tostring` does for an element at the given depth.
+    Elements with text content are not changed.
+    """
+    if len(element) == 0 or (element.text and element.text.strip()):
+        return
+    indent = "\n" + space * (level + 1)
+    element.text = indent
+    for child in element:
+        _indent(child, level + 1, space)
+        child.tail = indent
+    child.tail = indent[:-len(space)]
+
+
+def _read_quakeml(filename, filters=None):
     """
     Reads a QuakeML file and returns an ObsPy Catalog object.
 
@@ -1803,6 +2075,9 @@ def _read_quakeml(filename):
 
     :type filename: str
     :param filename: QuakeML file to be read.
+    :type filters: list of str
+    :param filters: Only read events matching these filter rules, see
+        :meth:`~obspy.core.event.Catalog.filter`.
     :rtype: :class:`~obspy.core.event.Catalog`
     :return: An ObsPy Catalog object.
 
@@ -1815,11 +2090,36 @@ def _read_quakeml(filename):
     2011-03-11T05:46:24.120000Z | +38.297, +142.373 | 9.1 MW
     2006-09-10T04:26:33.610000Z |  +9.614, +121.961 | 9.8 MS
     """
-    return Unpickler().load(filename)
+    return Unpickler().load(filename, filters=filters)
+
+
+def iter_events(filename, filters=None):
+    """
+    Iterates over the events of a QuakeML file without reading the whole
+    file into memory, see :meth:`Unpickler.iter_events`.
+
+    Used by :func:`~obspy.core.event.read_events` with ``stream=True``.
+
+    :type filename: str or file-like object
+    :param filename: QuakeML file to be read.
+    :type filters: list of str
+    :param filters: Only return events matching these filter rules, see
+        :meth:`~obspy.core.event.Catalog.filter`.
+    :rtype: iterator of :class:`~obspy.core.event.Event`
+
+    .. rubric:: Example
+
+    >>> from obspy.io.quakeml.core import iter_events
+    >>> for event in iter_events('/path/to/iris_events.xml',
+    ...                          filters=["magnitude > 9.5"]):
+    ...     print(event.short_str())
+    2006-09-10T04:26:33.610000Z |  +9.614, +121.961 | 9.8 MS
+    """
+    return Unpickler().iter_events(filename, filters=filters)
 
 
 def _write_quakeml(catalog, filename, validate=False, nsmap=None,
-                   **kwargs):  # @UnusedVariable
+                   stream=False, **kwargs):  # @UnusedVariable
     """
     Writes a QuakeML file.
 
@@ -1839,10 +2139,22 @@ def _write_quakeml(catalog, filename, validate=False, nsmap=None,
     :type nsmap: dict, optional
     :param nsmap: Additional custom namespace abbreviation mappings
         (e.g. `{"edb": "http://erdbeben-in-bayern.de/xmlns/0.1"}`).
+    :type stream: bool, optional
+    :param stream: Convert and write one event at a time instead of building
+        the XML document of the whole catalog in memory first. Namespaces of
+        custom tags of the events which are not given in ``nsmap`` are then
+        declared at the elements using them instead of the root element.
+        Can not be combined with ``validate``.
     """
     nsmap_ = getattr(catalog, "nsmap", {})
     if nsmap:
         nsmap_.update(nsmap)
+    if stream:
+        if validate is True:
+            msg = "Validation is not supported when streaming QuakeML."
+            raise ValueError(msg)
+        Pickler(nsmap=nsmap_).dump(catalog, filename)
+        return
     xml_doc = Pickler(nsmap=nsmap_).dumps(catalog)
 
     if validate is True and not _validate(io.BytesIO(xml_doc)):
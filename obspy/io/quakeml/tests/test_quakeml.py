@@ -18,7 +18,8 @@ from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import AttribDict
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.core.util.testing import compare_xml_strings
-from obspy.io.quakeml.core import Pickler, _read_quakeml, _write_quakeml
+from obspy.io.quakeml.core import (Pickler, _is_quakeml, _read_quakeml,
+                                   _write_quakeml, iter_events)
 
 
 # lxml < 2.3 seems not to ship with RelaxNG schema parser and namespace support
@@ -1107,6 +1108,85 @@ class QuakeMLTestCase(unittest.TestCase):
         # It should of course not be set.
         self.assertIsNone(cat[0].origins[0].depth_type)
 
+    def test_iter_events(self):
+        """
+        Iterating over the events gives the same events as reading the file.
+        """
+        for filename in ('neries_events.xml', 'quakeml_1.2_origin.xml',
+                         'qml-example-1.2-RC3.xml'):
+            filename = os.path.join(self.path, filename)
+            expected = _read_quakeml(filename)
+            self.assertEqual(list(iter_events(filename)), expected.events)
+            with open(filename, 'rb') as fh:
+                self.assertEqual(list(iter_events(fh)), expected.events)
+        # resource identifiers point to the newly created objects
+        event = next(iter_events(self.neries_filename))
+        self.assertIs(event.origins[0].resource_id.get_referred_object(),
+                      event.origins[0])
+        self.assertIs(event.preferred_origin(), event.origins[0])
+        with self.assertRaises(Exception) as e:
+            list(iter_events(io.BytesIO(b'<?xml version="1.0"?><a><b/></a>')))
+        self.assertEqual(str(e.exception),
+                         "Not a QuakeML compatible file or string")
+
+    def test_read_with_filters(self):
+        """
+        Events not matching the filters are not created at all.
+        """
+        rules = (["magnitude >= 4.0"], ["latitude > 40", "time > 2012-04-04"],
+                 ["azimuthal_gap < 100"], ["used_phase_count > 1"],
+                 ["depth <= 10000"])
+        for filters in rules:
+            expected = self.neries_catalog.filter(*filters)
+            self.assertEqual(
+                _read_quakeml(self.neries_filename, filters=filters), expected)
+            self.assertEqual(
+                list(iter_events(self.neries_filename, filters=filters)),
+                expected.events)
+        self.assertRaises(ValueError, _read_quakeml, self.neries_filename,
+                          filters=["magnitude"])
+        self.assertRaises(ValueError, list, iter_events(
+            self.neries_filename, filters=["mag > 2"]))
+
+    def test_write_stream(self):
+        """
+        Writing one event at a time gives the same document as building it
+        completely, apart from where namespaces of custom tags in events are
+        declared.
+        """
+        for filename in ('neries_events.xml', 'quakeml_1.2_origin.xml',
+                         'qml-example-1.2-RC3.xml', 'usgs_event.xml'):
+            cat = _read_quakeml(os.path.join(self.path, filename))
+            for pretty_print in (True, False):
+                buf = io.BytesIO()
+                Pickler().dump(cat, buf, pretty_print=pretty_print)
+                expected = Pickler()._serialize(cat, pretty_print)
+                if filename != 'usgs_event.xml':
+                    self.assertEqual(buf.getvalue(), expected)
+                buf.seek(0)
+                self.assertEqual(_read_quakeml(buf), cat)
+            with NamedTemporaryFile() as tf:
+                _write_quakeml(cat, tf.name, stream=True)
+                self.assertEqual(_read_quakeml(tf.name), cat)
+            self.assertRaises(ValueError, _write_quakeml, cat, io.BytesIO(),
+                              stream=True, validate=True)
+
+    def test_is_quakeml_incremental(self):
+        """
+        File-like objects and files are checked without parsing them
+        completely and file-like objects are not moved.
+        """
+        with open(self.neries_filename, 'rb') as fh:
+            data = fh.read()
+        # a file that is broken after the first event is still detected
+        broken = data[:data.index(b'</event>') + 8] + b'<<<'
+        for buf in (io.BytesIO(data), io.BytesIO(broken)):
+            self.assertTrue(_is_quakeml(buf))
+            self.assertEqual(buf.tell(), 0)
+        self.assertTrue(_is_quakeml(self.neries_filename))
+        self.assertFalse(_is_quakeml(io.BytesIO(
+            b'<?xml version="1.0"?><quakeml><a/></quakeml>')))
+
 
 def suite():
     return unittest.makeSuite(QuakeMLTestCase, 'test')
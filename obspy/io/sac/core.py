@@ -13,6 +13,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 from future.utils import native_str
 
+import io
 import os
 import struct
 
@@ -115,6 +116,17 @@ def _internal_is_sac(buf):
     return True
 
 
+def _sniff_sac(header):
+    """
+    Checks whether the first bytes of a file are the header of a SAC file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    """
+    return _internal_is_sac(io.BytesIO(header))
+
+
 def _is_sac_xy(filename):
     """
     Checks whether a file is alphanumeric SAC file or not.
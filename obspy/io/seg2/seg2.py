@@ -339,6 +339,25 @@ def _is_seg2(filename):
     return True
 
 
+def _sniff_seg2(header):
+    """
+    Checks whether the first bytes of a file are the start of a SEG-2 file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    """
+    if header[0:2] == b'\x55\x3a':
+        endian = b'<'
+    elif header[0:2] == b'\x3a\x55':
+        endian = b'>'
+    else:
+        return False
+    if len(header) < 4:
+        return False
+    return unpack(endian + b'H', header[2:4])[0] == 1
+
+
 def _read_seg2(filename, **kwargs):  # @UnusedVariable
     seg2 = SEG2()
     st = seg2.read_file(filename)
@@ -29,7 +29,7 @@ file formats usually used in observatories (GSE2, MiniSEED, ...). The
 of ObsPy are therefore not fully suited to handle them. Nonetheless they work
 well enough if some potential problems are kept in mind.
 
-SEG Y files can be read in four different ways that have different
+SEG Y files can be read in six different ways that have different
 advantages/disadvantages. Most of the following also applies to SU files with
 some changes (keep in mind that SU files have no file wide headers).
 
@@ -40,6 +40,10 @@ some changes (keep in mind that SU files have no file wide headers).
 4. Some SEG-Y files are too large to be read into memory. The
    :func:`obspy.io.segy.segy.iread_segy` function reads a large file trace
    by trace circumventing this problem.
+5. Files in which all traces have the same number of samples can be memory
+   mapped with :func:`obspy.io.segy.segy.read_trace_matrix`.
+6. :func:`obspy.io.segy.segy.read_trace_index` reads all trace headers at
+   once to select traces and read them by random access.
 
 Reading using methods 1 and 2
 ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
@@ -143,6 +147,55 @@ methods do), read the file trace by trace using the
 -5
 
 
+Memory mapping a file using method 5
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+If all traces of a file have the same number of samples (which is checked),
+:func:`obspy.io.segy.segy.read_trace_matrix` memory maps the file and
+returns a :class:`~obspy.io.segy.segy.SEGYTraceMatrix` object. It gives
+access to all trace headers as a NumPy structured array and to the samples
+as 2-D array with one row per trace. Only the accessed parts are read from
+disk, IBM floating points are converted to IEEE floating points when they
+are sliced.
+
+>>> from obspy.io.segy.segy import read_trace_matrix
+>>> matrix = read_trace_matrix(filename)
+>>> print(matrix.headers['number_of_samples_in_this_trace'])
+[2001]
+>>> matrix.data[:, :100].shape
+(1, 100)
+
+:meth:`~obspy.io.segy.segy.SEGYTraceMatrix.to_obspy_stream` converts all
+traces to a :class:`~obspy.core.stream.Stream` object, the data of the
+traces being views of the memory mapped samples. Methods 1 and 2 use this to
+read such files (with the samples copied to memory).
+
+Reading trace headers and selected traces using method 6
+^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
+
+:func:`obspy.io.segy.segy.read_trace_headers` reads the trace headers of all
+traces (which may have different numbers of samples) into a NumPy structured
+array in native byte order, without creating an object per trace.
+
+>>> from obspy.io.segy.segy import read_trace_headers
+>>> headers = read_trace_headers(filename)
+>>> print(headers['original_field_record_number'])
+[1034]
+
+:func:`obspy.io.segy.segy.read_trace_index` returns a
+:class:`~obspy.io.segy.segy.SEGYTraceIndex` object with these headers and the
+file positions of the traces. It selects, sorts and groups traces by their
+trace header values (with the short names ``'ffid'``, ``'cdp'`` and
+``'offset'`` for the most common ones) and reads only the chosen traces from
+the file, e.g. CDP gathers with traces sorted by offset:
+
+>>> from obspy.io.segy.segy import read_trace_index
+>>> index = read_trace_index(filename)
+>>> gathers = index.get_gathers('cdp')
+>>> for cdp, indices in gathers.items():  # doctest: +SKIP
+...     st = index.read(index.sort('offset', indices))
+
+
 Writing
 -------
 
@@ -25,7 +25,7 @@ from .header import (BINARY_FILE_HEADER_FORMAT, DATA_SAMPLE_FORMAT_CODE_DTYPE,
 from .segy import _read_segy as _read_segyrev1
 from .segy import _read_su as _read_su_file
 from .segy import (SEGYBinaryFileHeader, SEGYError, SEGYFile, SEGYTrace,
-                   SEGYTraceHeader, SUFile,
+                   SEGYTraceHeader, SUFile, _internal_read_trace_matrix,
                    autodetect_endian_and_sanity_check_su)
 from .util import unpack_header_value
 
@@ -136,6 +136,10 @@ def _read_segy(filename, headonly=False, byteorder=None,
         This function should NOT be called directly, it registers via the
         ObsPy :func:`~obspy.core.stream.read` function, call this instead.
 
+    If all traces have the same number of samples, the traces are memory
+    mapped and their samples converted to one array at once, see
+    :func:`~obspy.io.segy.segy.read_trace_matrix`.
+
     :type filename: str
     :param filename: SEG Y rev1 file to be read.
     :type headonly: bool, optional
@@ -169,6 +173,12 @@ def _read_segy(filename, headonly=False, byteorder=None,
     1 Trace(s) in Stream:
     Seq. No. in line:    1 | 2009-06-22T14:47:37.000000Z - ... 2001 samples
     """
+    stream = _read_trace_matrix(
+        filename, format='SEGY', endian=byteorder,
+        textual_header_encoding=textual_header_encoding, headonly=headonly,
+        unpack_trace_headers=unpack_trace_headers)
+    if stream is not None:
+        return stream
     # Read file to the internal segy representation.
     segy_object = _read_segyrev1(
         filename, endian=byteorder,
@@ -208,6 +218,34 @@ def _read_segy(filename, headonly=False, byteorder=None,
     return stream
 
 
+def _read_trace_matrix(filename, format, endian=None,
+                       textual_header_encoding=None, headonly=False,
+                       unpack_trace_headers=False):
+    """
+    Reads a SEG Y or SU file in which all traces have the same number of
+    samples via :func:`~obspy.io.segy.segy.read_trace_matrix`.
+
+    :returns: A :class:`~obspy.core.stream.Stream` with the samples of all
+        traces in one array in native byte order or ``None`` if the traces
+        can not be memory mapped.
+    """
+    if not hasattr(filename, 'read') or not hasattr(filename, 'tell') or \
+            not hasattr(filename, 'seek'):
+        with open(filename, 'rb') as fh:
+            return _read_trace_matrix(
+                fh, format, endian=endian,
+                textual_header_encoding=textual_header_encoding,
+                headonly=headonly, unpack_trace_headers=unpack_trace_headers)
+    matrix = _internal_read_trace_matrix(
+        filename, format=format, endian=endian,
+        textual_header_encoding=textual_header_encoding)
+    if matrix is None:
+        return None
+    return matrix.to_obspy_stream(headonly=headonly,
+                                  unpack_trace_headers=unpack_trace_headers,
+                                  copy=True)
+
+
 def _write_segy(stream, filename, data_encoding=None, byteorder=None,
                 textual_header_encoding=None, **kwargs):  # @UnusedVariable
     """
@@ -424,6 +462,10 @@ def _read_su(filename, headonly=False, byteorder=None,
         This function should NOT be called directly, it registers via the
         ObsPy :func:`~obspy.core.stream.read` function, call this instead.
 
+    If all traces have the same number of samples, the traces are memory
+    mapped and their samples converted to one array at once, see
+    :func:`~obspy.io.segy.segy.read_trace_matrix`.
+
     :type filename: str
     :param filename: SU file to be read.
     :type headonly: bool, optional
@@ -453,6 +495,11 @@ def _read_su(filename, headonly=False, byteorder=None,
     1 Trace(s) in Stream:
     ... | 2005-12-19T15:07:54.000000Z - ... | 4000.0 Hz, 8000 samples
     """
+    stream = _read_trace_matrix(filename, format='SU', endian=byteorder,
+                                headonly=headonly,
+                                unpack_trace_headers=unpack_trace_headers)
+    if stream is not None:
+        return stream
     # Read file to the internal segy representation.
     su_object = _read_su_file(filename, endian=byteorder,
                               unpack_headers=unpack_trace_headers)
@@ -6,6 +6,7 @@ and write support.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import native_str
 
 import numpy as np
 
@@ -166,6 +167,25 @@ TRACE_HEADER_FORMAT = [
 
 TRACE_HEADER_KEYS = [_i[1] for _i in TRACE_HEADER_FORMAT]
 
+# NumPy dtype of the big endian trace header, use
+# TRACE_HEADER_DTYPE.newbyteorder('<') for little endian headers. The
+# unassigned field is kept as raw bytes.
+TRACE_HEADER_DTYPE = np.dtype({
+    'names': [native_str(_i[1]) for _i in TRACE_HEADER_FORMAT],
+    'formats': [native_str('>' + (_i[2] or {2: 'h', 4: 'i'}[_i[0]]))
+                if _i[0] != 8 else native_str('V8')
+                for _i in TRACE_HEADER_FORMAT],
+    'offsets': [_i[3] for _i in TRACE_HEADER_FORMAT],
+    'itemsize': 240})
+
+# Short names of the trace header values traces are usually sorted and
+# selected by.
+TRACE_HEADER_ALIASES = {
+    'ffid': 'original_field_record_number',
+    'cdp': 'ensemble_number',
+    'offset': 'distance_from_center_of_the_source_point_to_the_center_of_'
+              'the_receiver_group'}
+
 
 # Functions that unpack the chosen data format. The keys correspond to the
 # number given for each format by the SEG Y format reference.
@@ -13,10 +13,12 @@ Routines to read and write SEG Y rev 1 encoded seismic data files.
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
+from future.utils import native_str
 
 import io
 import os
-from struct import pack, unpack
+from collections import OrderedDict
+from struct import pack, unpack, unpack_from
 import warnings
 
 import numpy as np
@@ -25,11 +27,13 @@ from obspy import Trace, UTCDateTime
 from obspy.core import AttribDict
 
 from .header import (BINARY_FILE_HEADER_FORMAT,
+                     DATA_SAMPLE_FORMAT_CODE_DTYPE,
                      DATA_SAMPLE_FORMAT_PACK_FUNCTIONS,
                      DATA_SAMPLE_FORMAT_SAMPLE_SIZE,
                      DATA_SAMPLE_FORMAT_UNPACK_FUNCTIONS, ENDIAN,
+                     TRACE_HEADER_ALIASES, TRACE_HEADER_DTYPE,
                      TRACE_HEADER_FORMAT, TRACE_HEADER_KEYS)
-from .unpack import OnTheFlyDataUnpacker
+from .unpack import OnTheFlyDataUnpacker, ibm_to_ieee
 from .util import unpack_header_value
 
 
@@ -918,6 +922,574 @@ class SEGYTraceHeader(object):
             setattr(self, field[1], 0)
 
 
+class IBMFloatMatrix(object):
+    """
+    Array like access to IBM floating point samples.
+
+    The samples are converted to IEEE floating points when they are sliced,
+    e.g. ``matrix[10:20]`` converts only the samples of ten traces and
+    ``matrix[:, :100]`` only the first 100 samples of every trace.
+
+    :type data: :class:`numpy.ndarray`
+    :param data: The raw samples as 4 byte unsigned integers in the byte
+        order of the file.
+    """
+    dtype = np.dtype(np.float32)
+
+    def __init__(self, data):
+        self.raw = data
+
+    @property
+    def shape(self):
+        return self.raw.shape
+
+    @property
+    def ndim(self):
+        return self.raw.ndim
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __getitem__(self, index):
+        data = ibm_to_ieee(self.raw[index])
+        if not data.ndim:
+            return data[()]
+        return data
+
+    def __array__(self, dtype=None):
+        data = self[...]
+        if dtype is not None:
+            data = data.astype(dtype)
+        return data
+
+
+class SEGYTraceMatrix(object):
+    """
+    Memory mapped traces of a SEG Y or SU file in which all traces have the
+    same number of samples.
+
+    Nothing but the first trace header is read when the object is created.
+
+    :ivar headers: Structured array with all trace headers, one field per
+        trace header value (see
+        :const:`~obspy.io.segy.header.TRACE_HEADER_DTYPE`), in the byte
+        order of the file.
+    :ivar data: 2-D array with one row of samples per trace, in the byte
+        order of the file. IBM floating points are an
+        :class:`IBMFloatMatrix` converting them when they are sliced.
+    :ivar records: Structured array with the raw ``header`` (240 bytes)
+        and the ``data`` of each trace.
+
+    Changes to the arrays are not written to the file.
+
+    .. rubric:: Example
+
+    >>> from obspy.core.util import get_example_file
+    >>> from obspy.io.segy.segy import read_trace_matrix
+    >>> filename = get_example_file("00001034.sgy_first_trace")
+    >>> matrix = read_trace_matrix(filename)
+    >>> print(matrix)
+    1 traces with 2001 samples in the SEG Y trace matrix.
+    >>> print(matrix.headers['trace_sequence_number_within_line'])
+    [1]
+    >>> print(matrix.data.shape)
+    (1, 2001)
+    >>> st = matrix.to_obspy_stream()
+    >>> print(st)  # doctest: +ELLIPSIS
+    1 Trace(s) in Stream:
+    Seq. No. in line:    1 | 2009-06-22T14:47:37.000000Z - ... 2001 samples
+    """
+    def __init__(self, records, data_encoding, endian, format='SEGY',
+                 textual_file_header=None, binary_file_header=None,
+                 textual_header_encoding=None):
+        """
+        :type records: :class:`numpy.ndarray`
+        :param records: Structured array with the raw ``header`` and the
+            ``data`` field of each trace.
+        :param data_encoding: The data sample format code.
+        :param endian: The endianness of the file.
+        :param format: ``'SEGY'`` or ``'SU'``.
+        """
+        self.records = records
+        self.headers = records['header'].view(
+            TRACE_HEADER_DTYPE.newbyteorder(endian))
+        if data_encoding == 1:
+            self.data = IBMFloatMatrix(records['data'])
+        else:
+            self.data = records['data']
+        self.data_encoding = data_encoding
+        self.endian = endian
+        self.format = format
+        self.textual_file_header = textual_file_header
+        self.binary_file_header = binary_file_header
+        self.textual_header_encoding = textual_header_encoding
+
+    @property
+    def npts(self):
+        return self.data.shape[1]
+
+    def __len__(self):
+        return len(self.records)
+
+    def __str__(self):
+        return '%i traces with %i samples in the %s trace matrix.' % (
+            len(self), self.npts, 'SEG Y' if self.format == 'SEGY' else 'SU')
+
+    def _repr_pretty_(self, p, cycle):
+        p.text(str(self))
+
+    def get_samples(self, copy=True):
+        """
+        Returns all samples as 2-D array.
+
+        :type copy: bool
+        :param copy: If ``True``, the samples are returned as a new array in
+            native byte order, otherwise the memory mapped samples are
+            returned (IBM floating points are always converted to a new
+            array).
+        """
+        if self.data_encoding == 1:
+            return self.data[...]
+        if copy:
+            return np.array(self.data, dtype=self.data.dtype.newbyteorder(
+                native_str('=')))
+        return self.data
+
+    def to_obspy_stream(self, headonly=False, unpack_trace_headers=False,
+                        copy=False):
+        """
+        Converts the traces to an ObsPy Stream object.
+
+        The data of each trace is a view of one row of
+        :meth:`get_samples`.
+
+        :type headonly: bool
+        :param headonly: If set to True, the samples are omitted.
+        :type unpack_trace_headers: bool
+        :param unpack_trace_headers: Determines whether or not all trace
+            header values are unpacked.
+        :type copy: bool
+        :param copy: Passed on to :meth:`get_samples`. If ``False`` (the
+            default), the data of the traces shares the memory mapped
+            samples in the byte order of the file.
+        """
+        data = None if headonly else self.get_samples(copy=copy)
+        return _to_obspy_stream(self, self.headers,
+                                self.records['header'].tolist(), data=data,
+                                unpack_trace_headers=unpack_trace_headers)
+
+
+class SEGYTraceIndex(object):
+    """
+    Trace headers of all traces of a SEG Y or SU file to sort and select
+    traces and to read them by random access.
+
+    Trace header values are given by their name or by one of the short names
+    in :const:`~obspy.io.segy.header.TRACE_HEADER_ALIASES` (``'ffid'``,
+    ``'cdp'`` and ``'offset'``).
+
+    :ivar headers: Structured array with all trace headers, one field per
+        trace header value (see
+        :const:`~obspy.io.segy.header.TRACE_HEADER_DTYPE`), in native byte
+        order.
+    :ivar positions: The file positions of the trace headers.
+    :ivar file: The filename or open file object the traces are read from.
+
+    .. rubric:: Example
+
+    >>> from obspy.core.util import get_example_file
+    >>> from obspy.io.segy.segy import read_trace_index
+    >>> filename = get_example_file("00001034.sgy_first_trace")
+    >>> index = read_trace_index(filename)
+    >>> print(index)
+    1 traces in the SEG Y trace index.
+    >>> print(index.get_values('ffid'))
+    [1034]
+    >>> indices = index.select(ffid=1034, offset=(0, None))
+    >>> print(indices)
+    [0]
+    >>> st = index.read(index.sort(['ffid', 'offset'], indices))
+    >>> print(st)  # doctest: +ELLIPSIS
+    1 Trace(s) in Stream:
+    Seq. No. in line:    1 | 2009-06-22T14:47:37.000000Z - ... 2001 samples
+    """
+    def __init__(self, file, headers, positions, data_encoding, endian,
+                 format='SEGY', textual_file_header=None,
+                 binary_file_header=None, textual_header_encoding=None):
+        """
+        :param file: The filename or open file object.
+        :type headers: :class:`numpy.ndarray`
+        :param headers: Structured array with the trace headers.
+        :type positions: :class:`numpy.ndarray`
+        :param positions: The file positions of the trace headers.
+        :param data_encoding: The data sample format code.
+        :param endian: The endianness of the file.
+        :param format: ``'SEGY'`` or ``'SU'``.
+        """
+        self.file = file
+        self.headers = headers
+        self.positions = positions
+        self.data_encoding = data_encoding
+        self.endian = endian
+        self.format = format
+        self.textual_file_header = textual_file_header
+        self.binary_file_header = binary_file_header
+        self.textual_header_encoding = textual_header_encoding
+
+    def __len__(self):
+        return len(self.headers)
+
+    def __str__(self):
+        return '%i traces in the %s trace index.' % (
+            len(self), 'SEG Y' if self.format == 'SEGY' else 'SU')
+
+    def _repr_pretty_(self, p, cycle):
+        p.text(str(self))
+
+    def _get_indices(self, indices=None):
+        """
+        Returns the trace indices selected by an index, slice or boolean
+        mask as array.
+        """
+        if indices is None:
+            return np.arange(len(self))
+        return np.atleast_1d(np.arange(len(self))[indices])
+
+    def get_values(self, key):
+        """
+        Returns the values of a trace header value of all traces.
+
+        :type key: str
+        :param key: The name or short name of the trace header value.
+        """
+        name = TRACE_HEADER_ALIASES.get(key, key)
+        if name not in self.headers.dtype.names:
+            raise ValueError('Unknown trace header value: %s' % key)
+        return self.headers[native_str(name)]
+
+    def select(self, **kwargs):
+        """
+        Returns the indices of all traces with the given trace header values.
+
+        Each keyword argument is the name or short name of a trace header
+        value with either a single value, a list of values or a tuple
+        ``(min, max)`` of an inclusive range (``None`` for no limit).
+
+        >>> index.select(ffid=[1, 2], offset=(0, 1000))  # doctest: +SKIP
+
+        :rtype: :class:`numpy.ndarray`
+        """
+        mask = np.ones(len(self), dtype=np.bool_)
+        for key, value in kwargs.items():
+            values = self.get_values(key)
+            if isinstance(value, tuple):
+                minimum, maximum = value
+                if minimum is not None:
+                    mask &= values >= minimum
+                if maximum is not None:
+                    mask &= values <= maximum
+            elif isinstance(value, (list, set, np.ndarray)):
+                mask &= np.in1d(values, list(value))
+            else:
+                mask &= values == value
+        return np.flatnonzero(mask)
+
+    def sort(self, keys, indices=None):
+        """
+        Returns the trace indices sorted by trace header values.
+
+        Traces with equal values keep their order.
+
+        :type keys: str or list of str
+        :param keys: The name or short name of the trace header value to sort
+            by or a list of them with the primary one first, e.g.
+            ``['cdp', 'offset']``.
+        :param indices: The indices of the traces to sort, e.g. as returned
+            by :meth:`select`. Defaults to all traces.
+        :rtype: :class:`numpy.ndarray`
+        """
+        if isinstance(keys, (str, native_str)):
+            keys = [keys]
+        indices = self._get_indices(indices)
+        order = np.lexsort([self.get_values(key)[indices]
+                            for key in reversed(keys)])
+        return indices[order]
+
+    def get_gathers(self, key, indices=None):
+        """
+        Groups traces by a trace header value, e.g. to get shot gathers
+        (``'ffid'``) or CDP gathers (``'cdp'``).
+
+        :type key: str
+        :param key: The name or short name of the trace header value.
+        :param indices: The indices of the traces to group. Defaults to all
+            traces.
+        :rtype: :class:`collections.OrderedDict`
+        :returns: The trace indices of each value, sorted by value.
+        """
+        indices = self.sort(key, indices)
+        values = self.get_values(key)[indices]
+        unique, starts = np.unique(values, return_index=True)
+        return OrderedDict(zip(unique.tolist(),
+                               np.split(indices, starts[1:])))
+
+    def read(self, indices=None, headonly=False, unpack_trace_headers=False):
+        """
+        Reads traces from the file into an ObsPy Stream object.
+
+        Only the selected traces are read, in the given order.
+
+        :param indices: The index, slice, boolean mask or list of indices of
+            the traces to read, e.g. as returned by :meth:`select` or
+            :meth:`sort`. Defaults to all traces.
+        :type headonly: bool
+        :param headonly: If set to True, the samples are not read.
+        :type unpack_trace_headers: bool
+        :param unpack_trace_headers: Determines whether or not all trace
+            header values are unpacked.
+        """
+        indices = self._get_indices(indices)
+        headers = self.headers[indices]
+        raw_headers = headers.astype(
+            TRACE_HEADER_DTYPE.newbyteorder(self.endian)).view(
+                native_str('V240')).tolist()
+        data = None
+        if not headonly:
+            data = self._read_samples(
+                self.positions[indices],
+                headers['number_of_samples_in_this_trace'])
+        return _to_obspy_stream(self, headers, raw_headers, data=data,
+                                unpack_trace_headers=unpack_trace_headers)
+
+    def _read_samples(self, positions, npts):
+        """
+        Reads the samples of the traces at the given file positions.
+        """
+        if hasattr(self.file, 'read'):
+            file = self.file
+            pos = file.tell()
+        else:
+            file = open(self.file, 'rb')
+        unpack_data = DATA_SAMPLE_FORMAT_UNPACK_FUNCTIONS[self.data_encoding]
+        data = [None] * len(positions)
+        try:
+            # Read in the order of the file.
+            for i in np.argsort(positions, kind='mergesort').tolist():
+                file.seek(int(positions[i]) + 240, 0)
+                data[i] = unpack_data(file, int(npts[i]), endian=self.endian)
+        finally:
+            if file is self.file:
+                file.seek(pos, 0)
+            else:
+                file.close()
+        return data
+
+
+def _to_obspy_stream(source, headers, raw_headers, data=None,
+                     unpack_trace_headers=False):
+    """
+    Creates an ObsPy Stream object from trace headers read in bulk.
+
+    :param source: The :class:`SEGYTraceMatrix` or :class:`SEGYTraceIndex`
+        the traces belong to.
+    :type headers: :class:`numpy.ndarray`
+    :param headers: Structured array with the trace headers.
+    :param raw_headers: List with the raw 240 bytes of each trace header.
+    :param data: The samples of each trace or ``None`` to only set the
+        number of samples.
+    """
+    # Import here to avoid circular imports.
+    from obspy import Stream
+    from .core import LazyTraceHeaderAttribDict  # NOQA
+
+    key = source.format.lower()
+    if unpack_trace_headers:
+        values = headers.tolist()
+    names = headers.dtype.names
+    npts = headers['number_of_samples_in_this_trace'].tolist()
+    intervals = headers['sample_interval_in_ms_for_this_trace'].tolist()
+    time_keys = ('year_data_recorded', 'day_of_year', 'hour_of_day',
+                 'minute_of_hour', 'second_of_minute')
+    times = list(zip(*[headers[_i].tolist() for _i in time_keys]))
+    starttimes = {}
+    traces = []
+    for i in range(len(headers)):
+        trace = Trace()
+        if data is None:
+            trace.stats.npts = npts[i]
+        else:
+            trace.data = data[i]
+        trace.stats[key] = AttribDict()
+        if unpack_trace_headers:
+            header = AttribDict(dict(zip(names, values[i])))
+            header.endian = source.endian
+            header.unpacked_header = None
+        else:
+            header = LazyTraceHeaderAttribDict(raw_headers[i], source.endian)
+            # Same values as unpacked when reading trace by trace.
+            header.sample_interval_in_ms_for_this_trace = intervals[i]
+            header.update(dict(zip(
+                time_keys[:1 + 4 * (times[i][0] > 0)], times[i])))
+        trace.stats[key].trace_header = header
+        if intervals[i] > 0:
+            trace.stats.delta = float(intervals[i]) / 1E6
+        if times[i][0] > 0:
+            if times[i] not in starttimes:
+                starttimes[times[i]] = _get_starttime(
+                    *times[i], fix_julday=(source.format == 'SEGY'))
+            trace.stats.starttime = starttimes[times[i]]
+        if source.format == 'SU':
+            trace.stats.su.endian = source.endian
+        trace.stats._format = source.format
+        traces.append(trace)
+    stream = Stream(traces=traces)
+    if source.format == 'SEGY':
+        stream.stats = AttribDict()
+        stream.stats.textual_file_header = source.textual_file_header
+        binary_file_header = AttribDict()
+        for name, value in source.binary_file_header.__dict__.items():
+            setattr(binary_file_header, name, value)
+        stream.stats.binary_file_header = binary_file_header
+        stream.stats.data_encoding = source.data_encoding
+        stream.stats.endian = source.endian
+        stream.stats.textual_file_header_encoding = \
+            source.textual_header_encoding.upper()
+    return stream
+
+
+def _get_starttime(year, julday, hour, minute, second, fix_julday=True):
+    """
+    Returns the start time of a trace from its trace header values.
+    """
+    # The SEG Y rev 0 standard specifies the year to be a 4 digit
+    # number.  Before that it was unclear if it should be a 2 or 4
+    # digit number. Old or wrong software might still write 2 digit
+    # years. Every number <30 will be mapped to 2000-2029 and every
+    # number between 30 and 99 will be mapped to 1930-1999.
+    if year < 100:
+        if year < 30:
+            year += 2000
+        else:
+            year += 1900
+    # work around some strange SEGY files that don't store proper
+    # start date/time but only a year (see #1722)
+    if fix_julday and julday == 0 and hour == 0 and minute == 0 and \
+            second == 0:
+        msg = ('Trace starttime does not store a proper date (day '
+               'of year is zero). Using January 1st 00:00 as '
+               'trace start time.')
+        warnings.warn(msg)
+        julday = 1
+    return UTCDateTime(year=year, julday=julday, hour=hour, minute=minute,
+                       second=second)
+
+
+def _get_trace_matrix(file, data_encoding, endian):
+    """
+    Memory maps the traces of an open file starting at the current file
+    position if all of them have the same number of samples.
+
+    :returns: The records of the traces as structured array with a raw
+        ``header`` and a ``data`` field or ``None`` if the traces can not
+        be memory mapped (traces of different lengths, a data encoding
+        without NumPy dtype or a file like object without file
+        descriptor).
+    """
+    if data_encoding not in DATA_SAMPLE_FORMAT_CODE_DTYPE:
+        return None
+    try:
+        size = os.fstat(file.fileno())[6]
+    except Exception:
+        return None
+    offset = file.tell()
+    header = file.read(240)
+    file.seek(offset, 0)
+    if len(header) != 240:
+        return None
+    npts = unpack(native_str('%sH' % endian), header[114:116])[0]
+    if data_encoding == 1:
+        dtype = endian + 'u4'
+    else:
+        dtype = np.dtype(DATA_SAMPLE_FORMAT_CODE_DTYPE[data_encoding])
+        dtype = dtype.newbyteorder(endian).str
+    record = np.dtype([(native_str('header'), native_str('V240')),
+                       (native_str('data'), native_str(dtype), (npts,))])
+    count, remainder = divmod(size - offset, record.itemsize)
+    # A trailing incomplete trace header is ignored when reading trace by
+    # trace.
+    if npts < 1 or remainder >= 240:
+        return None
+    records = np.memmap(file, dtype=record, mode='c', offset=offset,
+                        shape=(count,))
+    headers = records['header'].view(TRACE_HEADER_DTYPE.newbyteorder(endian))
+    if np.any(headers['number_of_samples_in_this_trace'] != npts):
+        return None
+    return records
+
+
+def _get_trace_headers(file, data_encoding, endian):
+    """
+    Reads the trace headers of an open file starting at the current file
+    position up to the end of the file.
+
+    :returns: The trace headers as structured array in native byte order
+        and the file positions of the trace headers.
+    """
+    offset = file.tell()
+    try:
+        size = os.fstat(file.fileno())[6] - offset
+    except Exception:
+        buf = np.frombuffer(file.read(), dtype=np.uint8)
+    else:
+        if size > 0:
+            buf = np.memmap(file, dtype=np.uint8, mode='r', offset=offset,
+                            shape=(size,)).view(np.ndarray)
+        else:
+            buf = np.empty(0, dtype=np.uint8)
+    size = len(buf)
+    sample_size = DATA_SAMPLE_FORMAT_SAMPLE_SIZE[data_encoding]
+    dtype = TRACE_HEADER_DTYPE.newbyteorder(endian)
+    native_dtype = TRACE_HEADER_DTYPE.newbyteorder(native_str('='))
+    npts_dtype = np.dtype(native_str(endian + 'u2'))
+    # Try traces with the number of samples of the first trace first.
+    if size >= 240:
+        npts = int(buf[114:116].view(npts_dtype)[0])
+        length = 240 + sample_size * npts
+        count, remainder = divmod(size, length)
+        # A trailing incomplete trace header is ignored when reading trace
+        # by trace.
+        if npts > 0 and remainder < 240:
+            headers = np.ndarray(shape=(count,), dtype=dtype, buffer=buf,
+                                 strides=(length,))
+            if np.all(headers['number_of_samples_in_this_trace'] == npts):
+                positions = offset + np.arange(count, dtype=np.int64) * \
+                    length
+                return headers.astype(native_dtype), positions
+    # Otherwise walk through the file trace by trace.
+    positions = []
+    fmt = native_str(endian + 'H')
+    view = memoryview(buf)
+    pos = 0
+    while size - pos >= 240:
+        npts = unpack_from(fmt, view, pos + 114)[0]
+        positions.append(pos)
+        pos += 240 + sample_size * npts
+        if npts < 1 or pos > size:
+            msg = """
+                  Too little data left in the file to unpack it according to
+                  its trace header. This is most likely either due to a wrong
+                  byte order or a corrupt file.
+                  """.strip()
+            raise SEGYTraceReadingError(msg)
+    positions = np.array(positions, dtype=np.int64)
+    if not len(positions):
+        return np.empty(0, dtype=native_dtype), positions
+    # A trace header starts at every byte of this view.
+    headers = np.ndarray(shape=(size - 239,), dtype=native_str('V240'),
+                         buffer=buf, strides=(1,))[positions].view(dtype)
+    return headers.astype(native_dtype), positions + offset
+
+
 def _read_segy(file, endian=None, textual_header_encoding=None,
                unpack_headers=False, headonly=False):
     """
@@ -987,6 +1559,169 @@ def _internal_read_segy(file, endian=None, textual_header_encoding=None,
                     unpack_headers=unpack_headers, headonly=headonly)
 
 
+def read_trace_matrix(file, format='SEGY', endian=None,
+                      textual_header_encoding=None):
+    """
+    Memory maps the traces of a SEG Y or SU file in which all traces have
+    the same number of samples.
+
+    The trace headers and samples are read from the file only when they are
+    accessed, see :class:`SEGYTraceMatrix`.
+
+    :param file: Open file like object with a file descriptor or a string
+        which will be assumed to be a filename.
+    :type format: str
+    :param format: ``'SEGY'`` or ``'SU'``.
+    :type endian: str
+    :param endian: String that determines the endianness of the file. Either
+        '>' for big endian or '<' for little endian. If it is None,
+        obspy.io.segy will try to autodetect the endianness.
+    :param textual_header_encoding: The encoding of the textual header of a
+        SEG Y file. Either 'EBCDIC', 'ASCII' or None. If it is None,
+        autodetection will be attempted.
+    :rtype: :class:`SEGYTraceMatrix`
+    """
+    # Open the file if it is not a file like object.
+    if not hasattr(file, 'read') or not hasattr(file, 'tell') or not \
+            hasattr(file, 'seek'):
+        with open(file, 'rb') as open_file:
+            return read_trace_matrix(
+                open_file, format=format, endian=endian,
+                textual_header_encoding=textual_header_encoding)
+    matrix = _internal_read_trace_matrix(
+        file, format=format, endian=endian,
+        textual_header_encoding=textual_header_encoding)
+    if matrix is None:
+        msg = 'The traces can not be memory mapped. All traces need to ' + \
+              'have the same number of samples with a data encoding of ' + \
+              '1, 2, 3 or 5 and the file has to be an actual file.'
+        raise SEGYError(msg)
+    return matrix
+
+
+def _internal_read_trace_matrix(file, format='SEGY', endian=None,
+                                textual_header_encoding=None):
+    """
+    Memory maps the traces of an open SEG Y or SU file.
+
+    Returns ``None`` and restores the file position if the traces can not
+    be memory mapped.
+    """
+    pos = file.tell()
+    data_encoding, endian, kwargs = _read_file_headers(
+        file, format=format, endian=endian,
+        textual_header_encoding=textual_header_encoding)
+    records = _get_trace_matrix(file, data_encoding, endian)
+    if records is None:
+        file.seek(pos, 0)
+        return None
+    return SEGYTraceMatrix(records, data_encoding, endian, format=format,
+                           **kwargs)
+
+
+def _read_file_headers(file, format='SEGY', endian=None,
+                       textual_header_encoding=None):
+    """
+    Reads the file headers of an open SEG Y or SU file and leaves the file
+    position at the first trace.
+
+    :returns: The data encoding, the endianness and a dictionary with the
+        file headers of SEG Y files.
+    """
+    if format == 'SEGY':
+        segy_file = SEGYFile(file, endian=endian,
+                             textual_header_encoding=textual_header_encoding,
+                             read_traces=False)
+        data_encoding = segy_file.data_encoding
+        kwargs = {
+            'textual_file_header': segy_file.textual_file_header,
+            'binary_file_header': segy_file.binary_file_header,
+            'textual_header_encoding': segy_file.textual_header_encoding}
+    elif format == 'SU':
+        segy_file = SUFile(file, endian=endian, read_traces=False)
+        # SU files are always IEEE floating points.
+        data_encoding = 5
+        kwargs = {}
+    else:
+        raise ValueError("format has to be 'SEGY' or 'SU'.")
+    return data_encoding, segy_file.endian, kwargs
+
+
+def read_trace_headers(file, format='SEGY', endian=None,
+                       textual_header_encoding=None):
+    """
+    Reads the trace headers of all traces of a SEG Y or SU file into a
+    structured array.
+
+    The traces may have different numbers of samples. Only the trace
+    headers are read, in a single pass over the file.
+
+    :param file: Open file like object or a string which will be assumed to
+        be a filename.
+    :type format: str
+    :param format: ``'SEGY'`` or ``'SU'``.
+    :type endian: str
+    :param endian: String that determines the endianness of the file. Either
+        '>' for big endian or '<' for little endian. If it is None,
+        obspy.io.segy will try to autodetect the endianness.
+    :param textual_header_encoding: The encoding of the textual header of a
+        SEG Y file. Either 'EBCDIC', 'ASCII' or None. If it is None,
+        autodetection will be attempted.
+    :rtype: :class:`numpy.ndarray`
+    :returns: Structured array with one field per trace header value (see
+        :const:`~obspy.io.segy.header.TRACE_HEADER_DTYPE`) in native byte
+        order.
+
+    .. rubric:: Example
+
+    >>> from obspy.core.util import get_example_file
+    >>> from obspy.io.segy.segy import read_trace_headers
+    >>> filename = get_example_file("1.su_first_trace")
+    >>> headers = read_trace_headers(filename, format='SU')
+    >>> print(headers['number_of_samples_in_this_trace'])
+    [8000]
+    """
+    return read_trace_index(
+        file, format=format, endian=endian,
+        textual_header_encoding=textual_header_encoding).headers
+
+
+def read_trace_index(file, format='SEGY', endian=None,
+                     textual_header_encoding=None):
+    """
+    Reads the trace headers of all traces of a SEG Y or SU file to sort,
+    select and read traces, see :class:`SEGYTraceIndex`.
+
+    :param file: Open file like object or a string which will be assumed to
+        be a filename. Traces are read from the same file object later on.
+    :type format: str
+    :param format: ``'SEGY'`` or ``'SU'``.
+    :type endian: str
+    :param endian: String that determines the endianness of the file. Either
+        '>' for big endian or '<' for little endian. If it is None,
+        obspy.io.segy will try to autodetect the endianness.
+    :param textual_header_encoding: The encoding of the textual header of a
+        SEG Y file. Either 'EBCDIC', 'ASCII' or None. If it is None,
+        autodetection will be attempted.
+    :rtype: :class:`SEGYTraceIndex`
+    """
+    # Open the file if it is not a file like object.
+    if not hasattr(file, 'read') or not hasattr(file, 'tell') or not \
+            hasattr(file, 'seek'):
+        with open(file, 'rb') as open_file:
+            index = read_trace_index(
+                open_file, format=format, endian=endian,
+                textual_header_encoding=textual_header_encoding)
+        index.file = file
+        return index
+    data_encoding, endian, kwargs = _read_file_headers(
+        file, format=format, endian=endian,
+        textual_header_encoding=textual_header_encoding)
+    headers, positions = _get_trace_headers(file, data_encoding, endian)
+    return SEGYTraceIndex(file, headers, positions, data_encoding, endian,
+                          format=format, **kwargs)
+
+
 def iread_segy(file, endian=None, textual_header_encoding=None,
                unpack_headers=False, headonly=False):
     """
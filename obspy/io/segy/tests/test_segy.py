@@ -18,9 +18,11 @@ from obspy.core.compatibility import from_buffer
 from obspy.core.util import NamedTemporaryFile, AttribDict
 from obspy.io.segy.header import (DATA_SAMPLE_FORMAT_PACK_FUNCTIONS,
                                   DATA_SAMPLE_FORMAT_UNPACK_FUNCTIONS)
-from obspy.io.segy.segy import (SEGYBinaryFileHeader, SEGYFile,
+from obspy.io.segy.segy import (SEGYBinaryFileHeader, SEGYError, SEGYFile,
                                 SEGYTraceHeader, _read_segy, iread_segy,
-                                SEGYInvalidTextualHeaderWarning)
+                                SEGYInvalidTextualHeaderWarning,
+                                SEGYTraceReadingError, read_trace_headers,
+                                read_trace_index, read_trace_matrix)
 from obspy.io.segy.tests.header import DTYPES, FILES
 
 from . import _patch_header
@@ -762,6 +764,200 @@ class SEGYTestCase(unittest.TestCase):
         self.assertEqual(revision_number, "C39 SEG Y REV1")
         self.assertEqual(end_header_mark, "ABCDEFGHIJKLMNOPQRSTUV")
 
+    def _write_traces(self, filename, lengths, **kwargs):
+        """
+        Writes traces with the given numbers of samples.
+        """
+        st = obspy.Stream()
+        for i, npts in enumerate(lengths):
+            data = np.arange(npts, dtype=np.float32) * (i + 1) - 0.5
+            st.append(obspy.Trace(data=data, header={
+                'delta': 0.004,
+                'starttime': obspy.UTCDateTime(2017, 1, 2, 3, 4, 5 + i)}))
+        st.write(filename, **kwargs)
+        return st
+
+    def test_read_trace_matrix(self):
+        """
+        Tests memory mapping the traces of a file with a constant number of
+        samples per trace.
+        """
+        for data_encoding, endian in ((1, '>'), (1, '<'), (5, '>'),
+                                      (5, '<')):
+            with NamedTemporaryFile() as tf:
+                st = self._write_traces(tf.name, [100] * 4, format='SEGY',
+                                        data_encoding=data_encoding,
+                                        byteorder=endian)
+                matrix = read_trace_matrix(tf.name)
+                self.assertEqual(len(matrix), 4)
+                self.assertEqual(matrix.npts, 100)
+                self.assertEqual(matrix.endian, endian)
+                self.assertEqual(matrix.data.shape, (4, 100))
+                self.assertEqual(
+                    matrix.headers['number_of_samples_in_this_trace'].tolist(),
+                    [100] * 4)
+                self.assertEqual(
+                    matrix.headers['second_of_minute'].tolist(),
+                    [5, 6, 7, 8])
+                # slices of samples
+                expected = np.array([tr.data for tr in st])
+                np.testing.assert_allclose(matrix.data[1:3, :10],
+                                           expected[1:3, :10], rtol=1e-6)
+                np.testing.assert_allclose(matrix.data[2, 5],
+                                           expected[2, 5], rtol=1e-6)
+                np.testing.assert_allclose(matrix.get_samples(), expected,
+                                           rtol=1e-6)
+                # traces are views of the memory mapped samples (only
+                # possible for IEEE floats)
+                st2 = matrix.to_obspy_stream()
+                st3 = obspy.read(tf.name, format='SEGY')
+                for tr2, tr3 in zip(st2, st3):
+                    self.assertEqual(tr2.stats, tr3.stats)
+                    np.testing.assert_array_equal(tr2.data, tr3.data)
+                    self.assertEqual(tr3.data.dtype, np.float32)
+                    self.assertEqual(tr2.data.dtype.byteorder != '=',
+                                     data_encoding == 5 and
+                                     np.dtype(endian + 'f4').byteorder != '=')
+                self.assertEqual(np.may_share_memory(st2[0].data,
+                                                     matrix.records),
+                                 data_encoding == 5)
+                # changes are not written to the file
+                st2[0].data[:] = 1
+                del matrix, st2
+                st4 = obspy.read(tf.name, format='SEGY')
+                np.testing.assert_array_equal(st4[0].data, st3[0].data)
+
+    def test_read_trace_matrix_different_lengths(self):
+        """
+        Traces with different numbers of samples can not be memory mapped
+        but are still read trace by trace.
+        """
+        with NamedTemporaryFile() as tf:
+            self._write_traces(tf.name, [100, 100, 50], format='SEGY')
+            self.assertRaises(SEGYError, read_trace_matrix, tf.name)
+            st = obspy.read(tf.name, format='SEGY')
+            self.assertEqual([tr.stats.npts for tr in st], [100, 100, 50])
+        with NamedTemporaryFile() as tf:
+            self._write_traces(tf.name, [100, 100], format='SU')
+            matrix = read_trace_matrix(tf.name, format='SU')
+            self.assertEqual(matrix.data.shape, (2, 100))
+            st = matrix.to_obspy_stream(headonly=True)
+            self.assertEqual(st[1].stats.npts, 100)
+            self.assertEqual(st[1].stats.su.trace_header.second_of_minute, 6)
+            self.assertEqual(len(st[1].data), 0)
+
+    def test_read_trace_headers(self):
+        """
+        Tests reading all trace headers of files with different numbers of
+        samples per trace into a structured array.
+        """
+        for data_encoding, endian in ((1, '>'), (1, '<'), (5, '>'),
+                                      (5, '<')):
+            with NamedTemporaryFile() as tf:
+                self._write_traces(tf.name, [100, 50, 100, 80],
+                                   format='SEGY', data_encoding=data_encoding,
+                                   byteorder=endian)
+                headers = read_trace_headers(tf.name)
+                segy_file = _read_segy(tf.name, unpack_headers=True)
+                with open(tf.name, 'rb') as fh:
+                    data = fh.read()
+            self.assertEqual(len(headers), 4)
+            self.assertTrue(headers.dtype.isnative)
+            self.assertEqual(
+                headers['number_of_samples_in_this_trace'].tolist(),
+                [100, 50, 100, 80])
+            for header, trace in zip(headers, segy_file.traces):
+                for name in headers.dtype.names:
+                    if name != 'unassigned':
+                        self.assertEqual(header[name],
+                                         getattr(trace.header, name))
+            # file like objects and trailing bytes
+            headers2 = read_trace_headers(io.BytesIO(data + b'x' * 239))
+            np.testing.assert_array_equal(headers2, headers)
+            self.assertRaises(SEGYTraceReadingError, read_trace_headers,
+                              io.BytesIO(data[:-1]))
+        # SU files and files without traces
+        with NamedTemporaryFile() as tf:
+            self._write_traces(tf.name, [20, 30], format='SU',
+                               byteorder='<')
+            headers = read_trace_headers(tf.name, format='SU', endian='<')
+            self.assertEqual(
+                headers['number_of_samples_in_this_trace'].tolist(), [20, 30])
+        with NamedTemporaryFile() as tf:
+            self._write_traces(tf.name, [100], format='SEGY')
+            with open(tf.name, 'rb') as fh:
+                data = fh.read()
+            with open(tf.name, 'wb') as fh:
+                fh.write(data[:3600])
+            self.assertEqual(len(read_trace_headers(tf.name)), 0)
+
+    def test_read_trace_index(self):
+        """
+        Tests sorting, selecting and reading traces with a trace index.
+        """
+        st = obspy.Stream()
+        values = [(1, 10, 200), (1, 11, 100), (2, 10, 100), (2, 11, 300),
+                  (2, 10, 50)]
+        for i, (ffid, cdp, offset) in enumerate(values):
+            tr = obspy.Trace(data=np.arange(10 + i, dtype=np.float32),
+                             header={'delta': 0.004})
+            tr.stats.segy = AttribDict()
+            tr.stats.segy.trace_header = AttribDict()
+            tr.stats.segy.trace_header.original_field_record_number = ffid
+            tr.stats.segy.trace_header.ensemble_number = cdp
+            tr.stats.segy.trace_header[
+                'distance_from_center_of_the_source_point_to_the_center_'
+                'of_the_receiver_group'] = offset
+            st.append(tr)
+        with NamedTemporaryFile() as tf:
+            st.write(tf.name, format='SEGY', data_encoding=5)
+            index = read_trace_index(tf.name)
+            self.assertEqual(len(index), 5)
+            self.assertEqual(index.file, tf.name)
+            self.assertEqual(index.get_values('ffid').tolist(),
+                             [1, 1, 2, 2, 2])
+            self.assertRaises(ValueError, index.get_values, 'spam')
+            # selection by single values, lists and ranges
+            self.assertEqual(index.select(ffid=2).tolist(), [2, 3, 4])
+            self.assertEqual(index.select(cdp=[11, 12]).tolist(), [1, 3])
+            self.assertEqual(
+                index.select(ffid=2, offset=(None, 100)).tolist(), [2, 4])
+            self.assertEqual(index.select(offset=(100, 200)).tolist(),
+                             [0, 1, 2])
+            # sorting is stable
+            self.assertEqual(index.sort('offset').tolist(), [4, 1, 2, 0, 3])
+            self.assertEqual(index.sort(['cdp', 'offset']).tolist(),
+                             [4, 2, 0, 1, 3])
+            self.assertEqual(index.sort('offset', [0, 1, 2]).tolist(),
+                             [1, 2, 0])
+            gathers = index.get_gathers('cdp')
+            self.assertEqual(list(gathers), [10, 11])
+            self.assertEqual(gathers[10].tolist(), [0, 2, 4])
+            # random access reads
+            expected = obspy.read(tf.name, format='SEGY')
+            for indices in ([3, 0], gathers[11], slice(1, 3), -1):
+                st2 = index.read(indices)
+                selected = np.arange(5)[indices].reshape(-1).tolist()
+                self.assertEqual(len(st2), len(selected))
+                for tr, i in zip(st2, selected):
+                    self.assertEqual(tr.stats, expected[i].stats)
+                    np.testing.assert_array_equal(tr.data, expected[i].data)
+            st2 = index.read(headonly=True)
+            self.assertEqual([tr.stats.npts for tr in st2],
+                             list(range(10, 15)))
+            self.assertEqual(st2.stats.data_encoding, 5)
+            self.assertEqual(
+                st2.stats.binary_file_header.data_sample_format_code, 5)
+            # open files are read from at their current position
+            with open(tf.name, 'rb') as fh:
+                index = read_trace_index(fh)
+                fh.seek(10, 0)
+                st2 = index.read([4], unpack_trace_headers=True)
+                self.assertEqual(fh.tell(), 10)
+            self.assertEqual(st2[0].stats.segy.trace_header.ensemble_number,
+                             10)
+            np.testing.assert_array_equal(st2[0].data, expected[4].data)
+
 
 def rms(x, y):
     """
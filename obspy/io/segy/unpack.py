@@ -57,6 +57,22 @@ def unpack_4byte_ibm(file, count, endian='>'):
     return data
 
 
+def ibm_to_ieee(data):
+    """
+    Converts 4 byte IBM floating points to IEEE floating points.
+
+    :type data: :class:`numpy.ndarray`
+    :param data: The IBM floating points as 4 byte unsigned integers of any
+        byte order and shape.
+    :returns: New float32 array of the same shape in native byte order.
+    """
+    # The integer conversion swaps the bytes if necessary without touching
+    # any bit pattern.
+    data = np.array(data, dtype=np.uint32, order='C').view(np.float32)
+    clibsegy.ibm2ieee(data.reshape(-1), data.size)
+    return data
+
+
 # Old pure Python/NumPy code
 #
 # def unpack_4byte_ibm(file, count, endian='>'):
@@ -46,6 +46,17 @@ def _is_seisan(filename):
     return False
 
 
+def _sniff_seisan(header):
+    """
+    Checks whether the first bytes of a file are the start of a SEISAN file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    """
+    return bool(_get_version(header[:12 * 80]))
+
+
 def _get_version(data):
     """
     Extracts SEISAN version from given data chunk.
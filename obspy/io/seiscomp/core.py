@@ -20,6 +20,7 @@ import re
 
 from lxml import etree
 
+from obspy.core.util.base import _sniff_xml_root_tag
 from obspy.io.quakeml.core import _xml_doc_from_anything
 
 
@@ -73,6 +74,23 @@ def _is_sc3ml(path_or_file_object):
     return match is not None
 
 
+def _sniff_sc3ml(header):
+    """
+    Checks whether the first bytes of a file can be the start of a SC3ML
+    file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    :return: ``False`` or ``None`` if the file has to be checked with
+        :func:`_is_sc3ml`.
+    """
+    tag = _sniff_xml_root_tag(header)
+    if tag is None or tag == 'seiscomp':
+        return None
+    return False
+
+
 def validate(path_or_object, version='0.9', verbose=False):
     """
     Check if the given file is a valid SC3ML file.
@@ -27,6 +27,7 @@ from obspy.core.util.obspy_types import (ComplexWithUncertainties,
 from obspy.core.inventory import (Azimuth, ClockDrift, Dip,
                                   Distance, Frequency, Latitude,
                                   Longitude, SampleRate)
+from obspy.core.inventory.response import _DeferredResponse
 from obspy.core.inventory import (CoefficientsTypeResponseStage,
                                   FilterCoefficient, FIRResponseStage,
                                   PolesZerosResponseStage,
@@ -39,11 +40,14 @@ SOFTWARE_URI = "http://www.obspy.org"
 SCHEMA_VERSION = ['0.5', '0.6', '0.7', '0.8', '0.9']
 
 
-def _read_sc3ml(path_or_file_object):
+def _read_sc3ml(path_or_file_object, defer_responses=False):
     """
     Function for reading a stationXML file.
 
     :param path_or_file_object: File name or file like object.
+    :type defer_responses: bool
+    :param defer_responses: Only read the responses of the channels when
+        they are accessed. The parsed document is kept in memory for that.
     """
     root = etree.parse(path_or_file_object).getroot()
 
@@ -80,7 +84,8 @@ def _read_sc3ml(path_or_file_object):
     networks = []
     inv_element = root.find(_ns("Inventory"))
     for net_element in inv_element.findall(_ns("network")):
-        networks.append(_read_network(inv_element, net_element, _ns))
+        networks.append(_read_network(inv_element, net_element, _ns,
+                                      defer_responses))
 
     return obspy.core.inventory.Inventory(networks=networks, source=source,
                                           sender=sender, created=created,
@@ -106,7 +111,7 @@ def _tag2obj(element, tag, convert):
         None
 
 
-def _read_network(inventory_root, net_element, _ns):
+def _read_network(inventory_root, net_element, _ns, defer_responses=False):
 
     """
     Reads the network structure
@@ -133,7 +138,8 @@ def _read_network(inventory_root, net_element, _ns):
     # Collect the stations
     stations = []
     for sta_element in net_element.findall(_ns("station")):
-        stations.append(_read_station(inventory_root, sta_element, _ns))
+        stations.append(_read_station(inventory_root, sta_element, _ns,
+                                      defer_responses))
     network.stations = stations
 
     return network
@@ -154,7 +160,7 @@ def _get_restricted_status(element, _ns):
         return 'closed'
 
 
-def _read_station(inventory_root, sta_element, _ns):
+def _read_station(inventory_root, sta_element, _ns, defer_responses=False):
 
     """
     Reads the station structure
@@ -196,7 +202,8 @@ def _read_station(inventory_root, sta_element, _ns):
     channels = []
     for sen_loc_element in sta_element.findall(_ns("sensorLocation")):
         for channel in sen_loc_element.findall(_ns("stream")):
-            channels.append(_read_channel(inventory_root, channel, _ns))
+            channels.append(_read_channel(inventory_root, channel, _ns,
+                                          defer_responses))
 
     station.channels = channels
 
@@ -279,7 +286,7 @@ def _read_sensor(equip_element, _ns):
         removal_date=None, calibration_dates=None)
 
 
-def _read_channel(inventory_root, cha_element, _ns):
+def _read_channel(inventory_root, cha_element, _ns, defer_responses=False):
 
     """
     reads channel element from sc3ml format
@@ -421,11 +428,13 @@ def _read_channel(inventory_root, cha_element, _ns):
         if digital_filter_chain is not None:
             response_fir_id = digital_filter_chain.split(" ")
 
-    channel.response = _read_response(inventory_root, sensor_element,
-                                      response_element, cha_element,
-                                      data_log_element, _ns,
-                                      channel.sample_rate,
-                                      response_fir_id, response_paz_id)
+    args = (inventory_root, sensor_element, response_element, cha_element,
+            data_log_element, _ns, channel.sample_rate, response_fir_id,
+            response_paz_id)
+    if defer_responses:
+        channel.response = _DeferredResponse(_read_response, *args)
+    else:
+        channel.response = _read_response(*args)
 
     return channel
 
@@ -263,6 +263,11 @@ class SC3MLTestCase(unittest.TestCase):
                                                  stationxml_paz.zeros):
                         self.assertEqual(sc3ml, stationxml)
 
+    def test_read_with_deferred_responses(self):
+        inv = read_inventory(os.path.join(self.data_dir, "EB_response_sc3ml"),
+                             format="SC3ML", defer_responses=True)
+        self.assertEqual(inv.networks, self.sc3ml_inventory.networks)
+
 
 def suite():
     return unittest.makeSuite(SC3MLTestCase, "test")
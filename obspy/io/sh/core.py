@@ -93,6 +93,18 @@ def _is_asc(filename):
     return True
 
 
+def _sniff_asc(header):
+    """
+    Checks whether the first bytes of a file are the start of a Seismic
+    Handler ASCII file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    """
+    return header[:6] == b'DELTA:'
+
+
 def _read_asc(filename, headonly=False, skip=0, delta=None, length=None,
               **kwargs):  # @UnusedVariable
     """
@@ -323,6 +335,18 @@ def _is_q(filename):
     return True
 
 
+def _sniff_q(header):
+    """
+    Checks whether the first bytes of a file are the start of a Seismic
+    Handler Q header file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    """
+    return header[:5] == b'43981'
+
+
 def _read_q(filename, headonly=False, data_directory=None, byteorder='=',
             **kwargs):  # @UnusedVariable
     """
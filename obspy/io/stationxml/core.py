@@ -14,6 +14,8 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import copy
+import fnmatch
+import gzip
 import inspect
 import io
 import math
@@ -26,6 +28,7 @@ from lxml import etree
 
 import obspy
 from obspy.core.util import AttribDict
+from obspy.core.util.base import _sniff_xml_root_tag
 from obspy.core.util.obspy_types import (ComplexWithUncertainties,
                                          FloatWithUncertaintiesAndUnit)
 from obspy.core.inventory import (CoefficientsTypeResponseStage,
@@ -34,6 +37,7 @@ from obspy.core.inventory import (CoefficientsTypeResponseStage,
                                   PolesZerosResponseStage,
                                   PolynomialResponseStage,
                                   ResponseListResponseStage, ResponseStage)
+from obspy.core.inventory.response import _DeferredResponse
 from obspy.core.inventory import (Angle, Azimuth, ClockDrift, Dip, Distance,
                                   Frequency, Latitude, Longitude, SampleRate)
 
@@ -42,6 +46,7 @@ from obspy.core.inventory import (Angle, Azimuth, ClockDrift, Dip, Distance,
 SOFTWARE_MODULE = "ObsPy %s" % obspy.__version__
 SOFTWARE_URI = "https://www.obspy.org"
 SCHEMA_VERSION = "1.0"
+NAMESPACE = "http://www.fdsn.org/xml/station/1"
 
 
 def _is_stationxml(path_or_file_object):
@@ -91,6 +96,23 @@ def _is_stationxml(path_or_file_object):
             pass
 
 
+def _sniff_stationxml(header):
+    """
+    Checks whether the first bytes of a file can be the start of a
+    StationXML file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    :return: ``False`` or ``None`` if the file has to be checked with
+        :func:`_is_stationxml`.
+    """
+    tag = _sniff_xml_root_tag(header)
+    if tag is None or tag == 'FDSNStationXML':
+        return None
+    return False
+
+
 def validate_stationxml(path_or_object):
     """
     Checks if the given path is a valid StationXML file.
@@ -125,20 +147,136 @@ def validate_stationxml(path_or_object):
     return (True, ())
 
 
-def _read_stationxml(path_or_file_object):
+def _ns(tagname):
+    # Fix the namespace as its not always the default namespace. Will need
+    # to be adjusted if the StationXML format gets another revision!
+    return "{%s}%s" % (NAMESPACE, tagname)
+
+
+def _read_stationxml(path_or_file_object, network=None, station=None,
+                     location=None, channel=None, time=None, starttime=None,
+                     endtime=None, level="response", defer_responses=False):
     """
     Function reading a StationXML file.
 
-    :param path_or_file_object: File name or file like object.
-    """
-    root = etree.parse(path_or_file_object).getroot()
+    The file is parsed incrementally. Networks, stations and channels not
+    matching the selection criteria are discarded right after they have been
+    parsed, without creating any objects for them, so large files can be
+    read with little memory if only a part of them is needed. The result is
+    the same as that of
+    :meth:`~obspy.core.inventory.inventory.Inventory.select` applied to the
+    full inventory.
 
-    # Fix the namespace as its not always the default namespace. Will need
-    # to be adjusted if the StationXML format gets another revision!
-    namespace = "http://www.fdsn.org/xml/station/1"
+    >>> from obspy import read_inventory
+    >>> inv = read_inventory("/path/to/IU_ANMO_BH.xml", channel="BHZ",
+    ...                      level="channel")  # doctest: +SKIP
 
-    def _ns(tagname):
-        return "{%s}%s" % (namespace, tagname)
+    :param path_or_file_object: File name or file like object.
+    :type network: str
+    :param network: Potentially wildcarded network code.
+    :type station: str
+    :param station: Potentially wildcarded station code.
+    :type location: str
+    :param location: Potentially wildcarded location code.
+    :type channel: str
+    :param channel: Potentially wildcarded channel code.
+    :type time: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param time: Only read networks/stations/channels active at given point
+        in time.
+    :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param starttime: Only read networks/stations/channels active at or after
+        given point in time.
+    :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param endtime: Only read networks/stations/channels active before or at
+        given point in time.
+    :type level: str
+    :param level: Level of detail to read, one of ``"network"``,
+        ``"station"``, ``"channel"`` or ``"response"``. Stations and channels
+        below the level are still used to decide whether their parents match
+        the selection.
+    :type defer_responses: bool
+    :param defer_responses: Keep the responses of the channels as raw XML
+        and only parse them when they are accessed.
+    """
+    levels = ("network", "station", "channel", "response")
+    if level not in levels:
+        msg = "level must be one of %s." % ", ".join(levels)
+        raise ValueError(msg)
+    level = levels.index(level)
+    select = dict(time=time, starttime=starttime, endtime=endtime)
+    # Selected stations/networks with children are only kept if at least
+    # one child is selected, if there are any criteria for the children.
+    select_channels = any(_i is not None for _i in (
+        location, channel, time, starttime, endtime))
+    select_stations = select_channels or station is not None
+
+    # The children of the current network and station, together with a
+    # flag if there were any children at all.
+    stations, has_stations = [], False
+    channels, has_channels = [], False
+    selected = {}
+    networks = []
+    xml_file = _open_xml(path_or_file_object)
+    try:
+        context = etree.iterparse(
+            xml_file, events=("end",),
+            tag=(_ns("Network"), _ns("Station"), _ns("Channel")))
+        for _, element in context:
+            tag = element.tag
+            if tag == _ns("Channel"):
+                # Skip empty channels.
+                if element.attrib:
+                    sta_element = element.getparent()
+                    is_selected = _is_selected(
+                        sta_element, selected, station, select) and \
+                        _is_selected(sta_element.getparent(), selected,
+                                     network, select) and \
+                        _is_selected(element, selected, channel, select,
+                                     location=location)
+                    # Channels that can not be read do not count as
+                    # children, just like in the full inventory.
+                    if is_selected and level >= 2:
+                        cha = _read_channel_of_station(
+                            element, sta_element, _ns,
+                            response=level == 3,
+                            defer_responses=defer_responses)
+                        if cha is not None:
+                            has_channels = True
+                            channels.append(cha)
+                    elif _has_coordinates(element):
+                        has_channels = True
+                        if is_selected:
+                            channels.append(None)
+            elif tag == _ns("Station"):
+                has_stations = True
+                if _is_selected(element, selected, station, select) and \
+                        _is_selected(element.getparent(), selected, network,
+                                     select) and \
+                        (channels or not has_channels or not select_channels):
+                    if level < 1:
+                        stations.append(None)
+                    else:
+                        stations.append(_read_station(
+                            element, _ns, channels=[_i for _i in channels
+                                                    if _i is not None]))
+                channels, has_channels = [], False
+                selected.pop(tag, None)
+            else:
+                if _is_selected(element, selected, network, select) and \
+                        (stations or not has_stations or not select_stations):
+                    networks.append(_read_network(
+                        element, _ns, stations=[_i for _i in stations
+                                                if _i is not None]))
+                stations, has_stations = [], False
+                selected.clear()
+            # Free the memory of the parsed subtree.
+            element.clear()
+            if element.getparent() is not None:
+                element.getparent().remove(element)
+    finally:
+        if xml_file is not path_or_file_object:
+            xml_file.close()
+    root = context.root
 
     # Source and Created field must exist in a StationXML.
     source = root.find(_ns("Source")).text
@@ -149,10 +287,6 @@ def _read_stationxml(path_or_file_object):
     module = _tag2obj(root, _ns("Module"), str)
     module_uri = _tag2obj(root, _ns("ModuleURI"), str)
 
-    networks = []
-    for network in root.findall(_ns("Network")):
-        networks.append(_read_network(network, _ns))
-
     inv = obspy.core.inventory.Inventory(networks=networks, source=source,
                                          sender=sender, created=created,
                                          module=module, module_uri=module_uri)
@@ -160,6 +294,90 @@ def _read_stationxml(path_or_file_object):
     return inv
 
 
+def _open_xml(path_or_file_object):
+    """
+    Returns the file or file like object to parse incrementally, wrapped in
+    a :class:`gzip.GzipFile` if it is gzip compressed (which
+    ``etree.parse()`` detects on its own but ``etree.iterparse()`` does
+    not).
+    """
+    if hasattr(path_or_file_object, "read"):
+        position = path_or_file_object.tell()
+        magic = path_or_file_object.read(2)
+        path_or_file_object.seek(position, 0)
+        if magic == b"\x1f\x8b":
+            return gzip.GzipFile(fileobj=path_or_file_object, mode="rb")
+    elif os.path.isfile(path_or_file_object):
+        with open(path_or_file_object, "rb") as fh:
+            magic = fh.read(2)
+        if magic == b"\x1f\x8b":
+            return gzip.GzipFile(path_or_file_object, mode="rb")
+    return path_or_file_object
+
+
+def _has_coordinates(cha_element):
+    """
+    Checks without warning if a channel element has the complete set of
+    coordinates required by :func:`_read_channel`.
+    """
+    for tag in ("Longitude", "Latitude", "Elevation", "Depth"):
+        try:
+            value = float(cha_element.find(_ns(tag)).text)
+        except Exception:
+            return False
+        if math.isnan(value):
+            return False
+    return True
+
+
+def _is_selected(element, selected, code, select, location=None):
+    """
+    Checks the code and the time range of a network, station or channel
+    element against selection criteria like
+    :meth:`~obspy.core.inventory.inventory.Inventory.select`, the results
+    are remembered in the ``selected`` dictionary.
+    """
+    key = element.tag
+    if key in selected:
+        return selected[key]
+    is_selected = _code_matches(element.get("code"), code)
+    if location is not None and is_selected:
+        is_selected = _code_matches(element.get("locationCode"), location)
+    if is_selected and any(_i is not None for _i in select.values()):
+        is_selected = _is_active(
+            _attr2obj(element, "startDate", obspy.UTCDateTime),
+            _attr2obj(element, "endDate", obspy.UTCDateTime), **select)
+    # Channels are not remembered, there are many per station.
+    if key != _ns("Channel"):
+        selected[key] = is_selected
+    return is_selected
+
+
+def _is_active(start_date, end_date, time=None, starttime=None,
+               endtime=None):
+    """
+    Same as :meth:`~obspy.core.inventory.util.BaseNode.is_active`.
+    """
+    if time is not None:
+        if start_date is not None and time < start_date:
+            return False
+        if end_date is not None and time > end_date:
+            return False
+    if starttime is not None and end_date is not None:
+        if starttime > end_date:
+            return False
+    if endtime is not None and start_date is not None:
+        if endtime < start_date:
+            return False
+    return True
+
+
+def _code_matches(value, pattern):
+    if pattern is None:
+        return True
+    return fnmatch.fnmatch((value or "").upper(), pattern.upper())
+
+
 def _read_base_node(element, object_to_write_to, _ns):
     """
     Reads the base node structure from element and saves it in
@@ -190,21 +408,22 @@ def _read_base_node(element, object_to_write_to, _ns):
     _read_extra(element, object_to_write_to)
 
 
-def _read_network(net_element, _ns):
+def _read_network(net_element, _ns, stations=None):
     network = obspy.core.inventory.Network(net_element.get("code"))
     _read_base_node(net_element, network, _ns)
     network.total_number_of_stations = \
         _tag2obj(net_element, _ns("TotalNumberStations"), int)
     network.selected_number_of_stations = \
         _tag2obj(net_element, _ns("SelectedNumberStations"), int)
-    stations = []
-    for station in net_element.findall(_ns("Station")):
-        stations.append(_read_station(station, _ns))
+    if stations is None:
+        stations = []
+        for station in net_element.findall(_ns("Station")):
+            stations.append(_read_station(station, _ns))
     network.stations = stations
     return network
 
 
-def _read_station(sta_element, _ns):
+def _read_station(sta_element, _ns, channels=None):
     longitude = _read_floattype(sta_element, _ns("Longitude"), Longitude,
                                 datum=True)
     latitude = _read_floattype(sta_element, _ns("Latitude"), Latitude,
@@ -233,28 +452,39 @@ def _read_station(sta_element, _ns):
         _tag2obj(sta_element, _ns("TotalNumberChannels"), int)
     for ref in sta_element.findall(_ns("ExternalReference")):
         station.external_references.append(_read_external_reference(ref, _ns))
-    channels = []
-    for channel in sta_element.findall(_ns("Channel")):
-        # Skip empty channels.
-        if not channel.items() and not channel.attrib:
-            continue
-        cha = _read_channel(channel, _ns)
-        # Might be None in case the channel could not be parsed.
-        if cha is None:
-            # This is None if, and only if, one of the coordinates could not
-            # be set.
-            msg = ("Channel %s.%s of station %s does not have a complete set "
-                   "of coordinates and thus it cannot be read. It will not be "
-                   "part of the final inventory object." % (
-                    channel.get("locationCode"), channel.get("code"),
-                    sta_element.get("code")))
-            warnings.warn(msg, UserWarning)
-        else:
-            channels.append(cha)
+    if channels is None:
+        channels = []
+        for channel in sta_element.findall(_ns("Channel")):
+            # Skip empty channels.
+            if not channel.items() and not channel.attrib:
+                continue
+            cha = _read_channel_of_station(channel, sta_element, _ns)
+            if cha is not None:
+                channels.append(cha)
     station.channels = channels
     return station
 
 
+def _read_channel_of_station(cha_element, sta_element, _ns, response=True,
+                             defer_responses=False):
+    """
+    Reads a channel, warns and returns ``None`` if it could not be parsed.
+    """
+    cha = _read_channel(cha_element, _ns, response=response,
+                        defer_responses=defer_responses)
+    # Might be None in case the channel could not be parsed.
+    if cha is None:
+        # This is None if, and only if, one of the coordinates could not
+        # be set.
+        msg = ("Channel %s.%s of station %s does not have a complete set "
+               "of coordinates and thus it cannot be read. It will not be "
+               "part of the final inventory object." % (
+                cha_element.get("locationCode"), cha_element.get("code"),
+                sta_element.get("code")))
+        warnings.warn(msg, UserWarning)
+    return cha
+
+
 def _read_floattype(parent, tag, cls, unit=False, datum=False,
                     additional_mapping={}):
     elem = parent.find(tag)
@@ -307,11 +537,14 @@ def _read_floattype_list(parent, tag, cls, unit=False, datum=False,
     return objs
 
 
-def _read_channel(cha_element, _ns):
+def _read_channel(cha_element, _ns, response=True, defer_responses=False):
     """
     Returns either a :class:`~obspy.core.inventory.channel.Channel` object or
     ``None``.
 
+    The response is not read if ``response`` is ``False`` and only read on
+    first access if ``defer_responses`` is ``True``.
+
     It should return ``None`` if and only if it did not manage to
     successfully create a :class:`~obspy.core.inventory.channel.Channel`
     object which can only happen if one of the coordinates is not set. All the
@@ -385,12 +618,23 @@ def _read_channel(cha_element, _ns):
     if equipment is not None:
         channel.equipment = _read_equipment(equipment, _ns)
     # Finally parse the response.
-    response = cha_element.find(_ns("Response"))
-    if response is not None:
-        channel.response = _read_response(response, _ns)
+    resp_element = cha_element.find(_ns("Response")) if response else None
+    if resp_element is not None:
+        if defer_responses:
+            channel.response = _DeferredResponse(
+                _read_response_from_string, etree.tostring(resp_element))
+        else:
+            channel.response = _read_response(resp_element, _ns)
     return channel
 
 
+def _read_response_from_string(xml):
+    """
+    Reads a response from a serialized Response element.
+    """
+    return _read_response(etree.fromstring(xml), _ns)
+
+
 def _read_response(resp_element, _ns):
     response = obspy.core.inventory.response.Response()
     response.resource_id = resp_element.attrib.get('resourceId')
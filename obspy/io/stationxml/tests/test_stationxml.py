@@ -14,6 +14,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import fnmatch
+import gzip
 import inspect
 import io
 import os
@@ -1093,6 +1094,104 @@ class StationXMLTestCase(unittest.TestCase):
             {'networks': ['IV'], 'stations': ['IV.LATE (Latera)'],
              'channels': []})
 
+    def test_read_with_selection(self):
+        """
+        Selecting while reading gives the same result as selecting
+        afterwards.
+        """
+        buf = io.BytesIO()
+        obspy.read_inventory().write(buf, format="STATIONXML")
+        buf.seek(0)
+        full = obspy.read_inventory(buf)
+        t = obspy.UTCDateTime(2007, 7, 1, 12)
+        for kwargs in [
+                {}, {"network": "GR"}, {"station": "[RW]*"},
+                {"network": "B?", "channel": "*Z"},
+                {"location": "", "channel": "LH?"},
+                {"channel": "XYZ"}, {"time": t},
+                {"starttime": obspy.UTCDateTime(2050, 1, 1)},
+                {"endtime": obspy.UTCDateTime(2000, 1, 1)}]:
+            buf.seek(0)
+            inv = obspy.read_inventory(buf, format="STATIONXML", **kwargs)
+            self.assertEqual(inv, full.select(**kwargs), kwargs)
+        buf.seek(0)
+        self.assertEqual(
+            len(obspy.read_inventory(buf, channel="XYZ").networks), 0)
+
+        # channels below the level are still used for the selection
+        buf.seek(0)
+        inv = obspy.read_inventory(buf, channel="LH?", level="station")
+        self.assertEqual(inv.get_contents()["stations"],
+                         full.select(channel="LH?").get_contents()["stations"])
+        self.assertEqual(len(inv[0][0].channels), 0)
+        buf.seek(0)
+        inv = obspy.read_inventory(buf, level="network")
+        self.assertEqual([len(net.stations) for net in inv], [0, 0])
+        buf.seek(0)
+        inv = obspy.read_inventory(buf, level="channel")
+        self.assertEqual(inv.get_contents(), full.get_contents())
+        self.assertTrue(all(cha.response is None
+                            for net in inv for sta in net for cha in sta))
+        buf.seek(0)
+        self.assertRaises(ValueError, obspy.read_inventory, buf,
+                          format="STATIONXML", level="foo")
+
+        # channels that can not be read do not count as children
+        filename = os.path.join(self.data_dir,
+                                "channel_without_coordinates.xml")
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("always")
+            full = obspy.read_inventory(filename)
+            for kwargs in [
+                    {"channel": "BHZ"}, {"location": "10"},
+                    {"location": "00"}, {"time": t},
+                    {"starttime": obspy.UTCDateTime(2050, 1, 1)}]:
+                inv = obspy.read_inventory(filename, **kwargs)
+                self.assertEqual(inv, full.select(**kwargs), kwargs)
+                self.assertEqual(len(inv.networks), 1, kwargs)
+            inv = obspy.read_inventory(filename, location="10",
+                                       level="station")
+            self.assertEqual(inv.get_contents()["stations"],
+                             ["IV.LATE (Latera)"])
+
+    def test_read_gzip_compressed(self):
+        """
+        Gzip compressed files are read like uncompressed ones.
+        """
+        filename = os.path.join(self.data_dir,
+                                "IRIS_single_channel_with_response.xml")
+        expected = obspy.read_inventory(filename)
+        buf = io.BytesIO()
+        with open(filename, "rb") as fh:
+            with gzip.GzipFile(fileobj=buf, mode="wb") as gz:
+                gz.write(fh.read())
+        data = buf.getvalue()
+        with NamedTemporaryFile(suffix=".xml.gz") as tf:
+            tf.write(data)
+            tf.flush()
+            self.assertEqual(obspy.read_inventory(tf.name), expected)
+            self.assertEqual(
+                obspy.read_inventory(tf.name, format="STATIONXML",
+                                     channel="BHZ"), expected)
+        buf = io.BytesIO(data)
+        self.assertEqual(obspy.read_inventory(buf, format="STATIONXML"),
+                         expected)
+
+    def test_read_with_deferred_responses(self):
+        filename = os.path.join(self.data_dir,
+                                "IRIS_single_channel_with_response.xml")
+        inv = obspy.read_inventory(filename)
+        inv_deferred = obspy.read_inventory(filename, defer_responses=True)
+        channel = inv_deferred[0][0][0]
+        self.assertIsInstance(channel._response,
+                              obspy.core.inventory.response._DeferredResponse)
+        self.assertEqual(inv_deferred, inv)
+        self.assertEqual(channel.response, inv[0][0][0].response)
+        self.assertEqual(len(channel.response.response_stages), 3)
+        self.assertIsInstance(channel._response,
+                              obspy.core.inventory.response.Response)
+        self.assertIn("Response information available", str(channel))
+
 
 def suite():
     return unittest.makeSuite(StationXMLTestCase, "test")
@@ -67,6 +67,22 @@ def _is_wav(filename):
     return False
 
 
+def _sniff_wav(header):
+    """
+    Checks whether the first bytes of a file can be the start of an audio
+    WAV file.
+
+    :type header: bytes
+    :param header: The first bytes of the file.
+    :rtype: bool
+    :return: ``False`` or ``None`` if the file has to be checked with
+        :func:`_is_wav`.
+    """
+    if header[0:4] != b'RIFF' or header[8:12] != b'WAVE':
+        return False
+    return None
+
+
 def _read_wav(filename, headonly=False, **kwargs):  # @UnusedVariable
     """
     Reads a audio WAV file and returns an ObsPy Stream object.
@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 from future.utils import native_str
 
+import struct
 import warnings
 
 import numpy as np
@@ -53,7 +54,121 @@ def _is_win(filename, century="20"):  # @UnusedVariable
     return True
 
 
-def _read_win(filename, century="20", **kwargs):  # @UnusedVariable
+# maximum number of bytes gathered at once when decoding the samples
+DECODE_SIZE = 2 ** 22
+
+
+def _bcd(value):
+    """
+    Decodes binary coded decimal bytes.
+    """
+    return (value >> 4) * 10 + (value & 0x0f)
+
+
+def _get_packets(raw):
+    """
+    Returns the offsets and ends of all one second packets of a WIN file.
+    """
+    starts = []
+    ends = []
+    pos = 0
+    while pos + 10 <= len(raw):
+        length = struct.unpack_from(native_str('>I'), raw, pos)[0]
+        if length < 10:
+            break
+        starts.append(pos)
+        ends.append(min(pos + length, len(raw)))
+        pos += length
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+
+def _get_channel_blocks(data, starts, ends):
+    """
+    Locates the channel blocks of all packets.
+
+    The n-th channel block of all packets is located in one step, so the
+    number of steps is the maximum number of channels in a packet.
+
+    :type data: :class:`numpy.ndarray`
+    :param data: The content of the file as unsigned bytes.
+    :returns: Offsets, packet indices, channel numbers, sample sizes in
+        bytes (0 for 4 bit) and sampling rates of all channel blocks, in
+        the order of the file.
+    """
+    pos = starts + 10
+    packet = np.arange(len(starts))
+    blocks = []
+    while True:
+        # the header and the first sample have to be in the packet
+        active = pos + 8 <= ends[packet]
+        pos = pos[active]
+        packet = packet[active]
+        if not len(pos):
+            break
+        width = data[pos + 2] >> 4
+        if np.any(width > 4):
+            msg = "DATAWIDE is %s " % width[width > 4][0] + \
+                  "but only values of 0.5, 1, 2, 3 or 4 are supported."
+            raise NotImplementedError(msg)
+        channel = (data[pos].astype(np.int64) << 8) | data[pos + 1]
+        srate = ((data[pos + 2].astype(np.int64) & 0x0f) << 8) | \
+            data[pos + 3]
+        blocks.append((pos, packet, channel, width.astype(np.int64), srate))
+        pos = pos + 8 + _get_data_size(width, srate)
+    if not blocks:
+        return [np.empty(0, dtype=np.int64)] * 5
+    blocks = [np.concatenate(_i) for _i in zip(*blocks)]
+    order = np.argsort(blocks[0], kind='mergesort')
+    return [_i[order] for _i in blocks]
+
+
+def _get_data_size(width, srate):
+    """
+    Number of bytes of the differences following the first sample of a
+    channel block.
+    """
+    nbytes = np.where(width == 0, srate // 2, (srate - 1) * width)
+    return np.maximum(nbytes, 0)
+
+
+def _decode_blocks(data, offsets, width, nsamples):
+    """
+    Decodes channel blocks of equal sample size and number of samples.
+
+    :returns: The samples as 2-D int32 array with one row per block.
+    """
+    ndiff = nsamples - 1
+    nbytes = int(_get_data_size(np.int64(width), np.int64(nsamples)))
+    first = data[offsets[:, np.newaxis] + np.arange(4, 8)]
+    first = first.view(native_str('>i4'))[:, 0]
+    sdata = data[offsets[:, np.newaxis] + np.arange(8, 8 + nbytes)]
+    if width == 0:
+        # two signed 4 bit differences per byte, high nibble first
+        sdata = sdata.view(np.int8)
+        diffs = np.empty((len(offsets), 2 * nbytes), dtype=np.int8)
+        diffs[:, 0::2] = sdata >> 4
+        diffs[:, 1::2] = (sdata << 4).astype(np.int8) >> 4
+        diffs = diffs[:, :ndiff]
+    elif width == 1:
+        diffs = sdata.view(np.int8)
+    elif width == 2:
+        diffs = sdata.view(native_str('>i2'))
+    elif width == 3:
+        sdata = sdata.reshape(len(offsets), ndiff, 3).astype(np.int32)
+        diffs = (sdata[:, :, 0] << 24) | (sdata[:, :, 1] << 16) | \
+            (sdata[:, :, 2] << 8)
+        diffs >>= 8
+    else:
+        diffs = sdata.view(native_str('>i4'))
+    samples = np.empty((len(offsets), nsamples), dtype=np.int32)
+    samples[:, 0] = first
+    np.cumsum(diffs, axis=1, dtype=np.int32, out=samples[:, 1:])
+    samples[:, 1:] += samples[:, :1]
+    return samples
+
+
+def _read_win(filename, century="20", headonly=False,
+              **kwargs):  # @UnusedVariable
     """
     Reads a WIN file and returns a Stream object.
 
@@ -61,121 +176,77 @@ def _read_win(filename, century="20", **kwargs):  # @UnusedVariable
         This function should NOT be called directly, it registers via the
         ObsPy :func:`~obspy.core.stream.read` function, call this instead.
 
+    The channel blocks of all packets are located first and then decoded
+    with NumPy, all blocks with the same sample size and sampling rate at
+    once. The samples of a channel are assumed to be continuous.
+
     :type filename: str
     :param filename: WIN file to be read.
     :param century: WIN stores year as 2 numbers, need century to
         construct proper datetime.
+    :type headonly: bool
+    :param headonly: If set to ``True``, the samples are not decoded and
+        only the headers of the traces (including the number of samples)
+        are returned.
     :rtype: :class:`~obspy.core.stream.Stream`
     :returns: Stream object containing header and data.
     """
-    output = {}
-    srates = {}
-
-    # read win file
     with open(filename, "rb") as fpin:
-        fpin.seek(0, 2)
-        sz = fpin.tell()
-        fpin.seek(0)
-        leng = 0
-        status0 = 0
-        start = 0
-        while leng < sz:
-            pklen = fpin.read(4)
-            if len(pklen) < 4:
-                break
-            leng = 4
-            truelen = from_buffer(pklen, native_str('>i'))[0]
-            if truelen == 0:
-                break
-            buff = fpin.read(6)
-            leng += 6
-
-            yy = "%s%02x" % (century, ord(buff[0:1]))
-            mm = "%x" % ord(buff[1:2])
-            dd = "%x" % ord(buff[2:3])
-            hh = "%x" % ord(buff[3:4])
-            mi = "%x" % ord(buff[4:5])
-            sec = "%x" % ord(buff[5:6])
-
-            date = UTCDateTime(int(yy), int(mm), int(dd), int(hh), int(mi),
-                               int(sec))
-            if start == 0:
-                start = date
-            if status0 == 0:
-                sdata = None
-            while leng < truelen:
-                buff = fpin.read(4)
-                leng += 4
-                flag = '%02x' % ord(buff[0:1])
-                chanum = '%02x' % ord(buff[1:2])
-                chanum = "%02s%02s" % (flag, chanum)
-                datawide = int('%x' % (ord(buff[2:3]) >> 4))
-                srate = ord(buff[3:4])
-                xlen = (srate - 1) * datawide
-                if datawide == 0:
-                    xlen = srate // 2
-                    datawide = 0.5
-
-                idata00 = fpin.read(4)
-                leng += 4
-                idata22 = from_buffer(idata00, native_str('>i'))[0]
-
-                if chanum in output:
-                    output[chanum].append(idata22)
-                else:
-                    output[chanum] = [idata22, ]
-                    srates[chanum] = srate
-                sdata = fpin.read(xlen)
-                leng += xlen
-
-                if len(sdata) < xlen:
-                    fpin.seek(-(xlen - len(sdata)), 1)
-                    sdata += fpin.read(xlen - len(sdata))
-                    msg = "This shouldn't happen, it's weird..."
-                    warnings.warn(msg)
-
-                if datawide == 0.5:
-                    for i in range(xlen):
-                        idata2 = output[chanum][-1] + \
-                            from_buffer(sdata[i:i + 1], np.int8)[0] >> 4
-                        output[chanum].append(idata2)
-                        idata2 = idata2 +\
-                            (from_buffer(sdata[i:i + 1],
-                                         np.int8)[0] << 4) >> 4
-                        output[chanum].append(idata2)
-                elif datawide == 1:
-                    for i in range((xlen // datawide)):
-                        idata2 = output[chanum][-1] +\
-                            from_buffer(sdata[i:i + 1], np.int8)[0]
-                        output[chanum].append(idata2)
-                elif datawide == 2:
-                    for i in range((xlen // datawide)):
-                        idata2 = output[chanum][-1] +\
-                            from_buffer(sdata[2 * i:2 * (i + 1)],
-                                        native_str('>h'))[0]
-                        output[chanum].append(idata2)
-                elif datawide == 3:
-                    for i in range((xlen // datawide)):
-                        idata2 = output[chanum][-1] +\
-                            from_buffer(sdata[3 * i:3 * (i + 1)] + b' ',
-                                        native_str('>i'))[0] >> 8
-                        output[chanum].append(idata2)
-                elif datawide == 4:
-                    for i in range((xlen // datawide)):
-                        idata2 = output[chanum][-1] +\
-                            from_buffer(sdata[4 * i:4 * (i + 1)],
-                                        native_str('>i'))[0]
-                        output[chanum].append(idata2)
-                else:
-                    msg = "DATAWIDE is %s " % datawide + \
-                          "but only values of 0.5, 1, 2, 3 or 4 are supported."
-                    raise NotImplementedError(msg)
+        raw = fpin.read()
+    data = from_buffer(raw, np.uint8)
+    starts, ends = _get_packets(raw)
+    offsets, packets, channels, widths, srates = \
+        _get_channel_blocks(data, starts, ends)
+    nsamples = np.maximum(srates, 1)
+
+    # drop blocks that are cut off at the end of the file
+    complete = offsets + 8 + _get_data_size(widths, srates) <= ends[packets]
+    if not np.all(complete):
+        msg = "Dropping %d channel block(s) extending beyond the end of " \
+              "their packet or file." % np.sum(~complete)
+        warnings.warn(msg)
+        offsets, packets, channels, widths, srates, nsamples = [
+            _i[complete] for _i in (offsets, packets, channels, widths,
+                                    srates, nsamples)]
+
+    # sort the blocks by channel, keeping the order in the file, and
+    # determine where the samples of each block go
+    order = np.argsort(channels, kind='mergesort')
+    positions = np.empty(len(order), dtype=np.int64)
+    positions[order] = np.cumsum(nsamples[order]) - nsamples[order]
+    _, first_blocks, inverse = np.unique(channels, return_index=True,
+                                         return_inverse=True)
+    npts = np.bincount(inverse, weights=nsamples).astype(np.int64)
+
+    samples = None
+    if not headonly:
+        samples = np.empty(nsamples.sum(), dtype=np.int32)
+        for width, nsamp in sorted(set(zip(widths.tolist(),
+                                           nsamples.tolist()))):
+            group = np.nonzero((widths == width) & (nsamples == nsamp))[0]
+            chunk_size = max(1, DECODE_SIZE // (8 + nsamp * 4))
+            for i in range(0, len(group), chunk_size):
+                chunk = group[i:i + chunk_size]
+                decoded = _decode_blocks(data, offsets[chunk], width, nsamp)
+                samples[positions[chunk][:, np.newaxis] +
+                        np.arange(nsamp)] = decoded
 
     traces = []
-    for i in output.keys():
-        t = Trace(data=np.array(output[i]))
-        t.stats.channel = str(i)
-        t.stats.sampling_rate = float(srates[i])
-        t.stats.starttime = start
-        traces.append(t)
+    # one trace per channel, in order of appearance
+    for i in np.argsort(first_blocks):
+        block = first_blocks[i]
+        start = positions[block]
+        time = _bcd(data[starts[packets[block]] + 4:
+                         starts[packets[block]] + 10].astype(np.int64))
+        header = {
+            'channel': '%04x' % channels[block],
+            'sampling_rate': float(srates[block]),
+            'starttime': UTCDateTime(int(century) * 100 + int(time[0]),
+                                     *[int(_i) for _i in time[1:]])}
+        if headonly:
+            header['npts'] = int(npts[i])
+            traces.append(Trace(header=header))
+        else:
+            traces.append(Trace(data=samples[start:start + npts[i]],
+                                header=header))
     return Stream(traces=traces)
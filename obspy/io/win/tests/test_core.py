@@ -8,13 +8,56 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import os
+import struct
 import unittest
+import warnings
+
+import numpy as np
 
 from obspy import read
 from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.util.base import NamedTemporaryFile
 from obspy.io.win.core import _read_win
 
 
+def _bcd(value):
+    return int('%d' % value, 16)
+
+
+def _encode_block(channel, width, samples):
+    """
+    Encodes one second of samples of a channel, ``width`` is the sample size
+    in bytes, 0 for 4 bit.
+    """
+    srate = len(samples)
+    diffs = np.diff(samples)
+    head = struct.pack(str('>HBBi'), channel, (width << 4) | (srate >> 8),
+                       srate & 0xff, samples[0])
+    if width == 0:
+        nibbles = np.zeros(2 * (srate // 2), dtype=np.uint8)
+        nibbles[:len(diffs)] = diffs & 0x0f
+        return head + ((nibbles[0::2] << 4) | nibbles[1::2]).tobytes()
+    elif width == 3:
+        return head + b''.join(struct.pack(str('>i'), d)[1:] for d in diffs)
+    dtype = {1: '>i1', 2: '>i2', 4: '>i4'}[width]
+    return head + diffs.astype(str(dtype)).tobytes()
+
+
+def _write_win(filename, starttime, channels):
+    """
+    Writes a WIN file from a list of ``(channel, width, samples)`` tuples
+    with one second of samples per row of ``samples``.
+    """
+    with open(filename, 'wb') as fh:
+        for i in range(len(channels[0][2])):
+            t = starttime + i
+            body = struct.pack(str('6B'), *[_bcd(_j) for _j in (
+                t.year % 100, t.month, t.day, t.hour, t.minute, t.second)])
+            body += b''.join(_encode_block(channel, width, samples[i])
+                             for channel, width, samples in channels)
+            fh.write(struct.pack(str('>I'), len(body) + 4) + body)
+
+
 class CoreTestCase(unittest.TestCase):
     """
     Test cases for win core interface
@@ -63,6 +106,56 @@ class CoreTestCase(unittest.TestCase):
         self.assertAlmostEqual(st[0].stats.sampling_rate, 100.0)
         self.assertEqual(st[0].stats.channel, 'a100')
 
+    def test_sample_sizes(self):
+        """
+        Reads differences of all sample sizes with odd and even sampling
+        rates.
+        """
+        rng = np.random.RandomState(42)
+        start = UTCDateTime(2018, 1, 2, 3, 4, 5)
+        channels = []
+        expected = []
+        for channel, (width, limit) in enumerate(
+                [(0, 7), (1, 127), (2, 2 ** 15 - 1), (3, 2 ** 23 - 1),
+                 (4, 2 ** 25)]):
+            for srate in (100, 21):
+                diffs = rng.randint(-limit, limit + 1, (5, srate))
+                samples = np.cumsum(diffs, axis=1) + 10 ** 6
+                channels.append((channel * 256 + srate, width, samples))
+                expected.append(samples.ravel())
+        with NamedTemporaryFile() as tf:
+            _write_win(tf.name, start, channels)
+            st = read(tf.name)
+            st_head = read(tf.name, headonly=True)
+        self.assertEqual(len(st), len(channels))
+        for tr, tr_head, (channel, _, samples), data in zip(
+                st, st_head, channels, expected):
+            self.assertEqual(tr.stats.channel, '%04x' % channel)
+            self.assertEqual(tr.stats.starttime, start)
+            self.assertEqual(tr.stats.sampling_rate, samples.shape[1])
+            self.assertEqual(tr.data.dtype, np.int32)
+            np.testing.assert_array_equal(tr.data, data)
+            self.assertEqual(tr_head.stats, tr.stats)
+            self.assertEqual(len(tr_head.data), 0)
+
+    def test_truncated_file(self):
+        with open(os.path.join(self.path, '10030302.00'), 'rb') as fh:
+            data = fh.read()
+        with NamedTemporaryFile() as tf:
+            with open(tf.name, 'wb') as fh:
+                fh.write(data[:-100])
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter('always')
+                st = _read_win(tf.name)
+        self.assertEqual(len(w), 1)
+        self.assertIn('Dropping 1 channel block', str(w[0].message))
+        st.sort(keys=['channel'])
+        self.assertEqual([len(tr) for tr in st], [6000, 5900])
+        np.testing.assert_array_equal(
+            st[1].data, _read_win(os.path.join(
+                self.path, '10030302.00')).select(channel='a101')[0].data[
+                    :5900])
+
 
 def suite():
     return unittest.makeSuite(CoreTestCase, 'test')
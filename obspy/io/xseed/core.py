@@ -19,6 +19,7 @@ import warnings
 
 import obspy
 import obspy.core.inventory
+from obspy.core.inventory.response import _DeferredResponse
 
 from . import InvalidResponseError
 from .parser import Parser, is_xseed
@@ -122,7 +123,8 @@ def _internal_is_resp(fh):
         return False
 
 
-def _read_seed(filename, skip_invalid_responses=True, *args, **kwargs):
+def _read_seed(filename, skip_invalid_responses=True, defer_responses=False,
+               *args, **kwargs):
     """
     Read dataless SEED files to an ObsPy inventory object
 
@@ -131,15 +133,20 @@ def _read_seed(filename, skip_invalid_responses=True, *args, **kwargs):
     :param skip_invalid_responses: If True, invalid responses will be replaced
         by None but a warning will be raised. Otherwise an exception will be
         raised. Only responses which are clearly invalid will not be read.
+    :type defer_responses: bool
+    :param defer_responses: Only calculate the responses of the channels
+        from the blockettes when they are accessed.
     """
     p = Parser(filename)
 
     # Parse to an inventory object.
     return _parse_to_inventory_object(
-        p, skip_invalid_responses=skip_invalid_responses)
+        p, skip_invalid_responses=skip_invalid_responses,
+        defer_responses=defer_responses)
 
 
-def _read_xseed(filename, skip_invalid_responses=True, *args, **kwargs):
+def _read_xseed(filename, skip_invalid_responses=True, defer_responses=False,
+                *args, **kwargs):
     """
     Read XML-SEED files to an ObsPy inventory object
 
@@ -148,13 +155,17 @@ def _read_xseed(filename, skip_invalid_responses=True, *args, **kwargs):
     :param skip_invalid_responses: If True, invalid responses will be replaced
         by None but a warning will be raised. Otherwise an exception will be
         raised. Only responses which are clearly invalid will not be read.
+    :type defer_responses: bool
+    :param defer_responses: Only calculate the responses of the channels
+        from the blockettes when they are accessed.
     """
     return _read_seed(filename=filename,
                       skip_invalid_responses=skip_invalid_responses,
-                      *args, **kwargs)
+                      defer_responses=defer_responses, *args, **kwargs)
 
 
-def _read_resp(filename, skip_invalid_responses=True, *args, **kwargs):
+def _read_resp(filename, skip_invalid_responses=True, defer_responses=False,
+               *args, **kwargs):
     """
     Read resp files to an ObsPy inventory object
 
@@ -166,6 +177,9 @@ def _read_resp(filename, skip_invalid_responses=True, *args, **kwargs):
     :param skip_invalid_responses: If True, invalid responses will be replaced
         by None but a warning will be raised. Otherwise an exception will be
         raised. Only responses which are clearly invalid will not be read.
+    :type defer_responses: bool
+    :param defer_responses: Only calculate the responses of the channels
+        from the blockettes when they are accessed.
     """
     if hasattr(filename, "read"):
         data = filename.read()
@@ -179,10 +193,12 @@ def _read_resp(filename, skip_invalid_responses=True, *args, **kwargs):
 
     # Parse to an inventory object.
     return _parse_to_inventory_object(
-        p, skip_invalid_responses=skip_invalid_responses)
+        p, skip_invalid_responses=skip_invalid_responses,
+        defer_responses=defer_responses)
 
 
-def _parse_to_inventory_object(p, skip_invalid_responses=True):
+def _parse_to_inventory_object(p, skip_invalid_responses=True,
+                               defer_responses=False):
     """
     Parses a Parser object to an obspy.core.inventory.Inventory object.
 
@@ -190,6 +206,8 @@ def _parse_to_inventory_object(p, skip_invalid_responses=True):
     :param skip_invalid_responses: If True, invalid responses will be replaced
         by None but a warning will be raised. Otherwise an exception will be
         raised. Only responses which are clearly invalid will not be read.
+    :param defer_responses: If True, the responses are only calculated when
+        they are accessed.
     """
     # The volume time in blockette 10 will be mapped to the creation data of
     # all the ObsPy objects. If it is not given, the current time will be used.
@@ -394,25 +412,16 @@ def _parse_to_inventory_object(p, skip_invalid_responses=True):
                         begin_effective_time=_start,
                         end_effective_time=_end))
 
-            try:
-                # Epoch string used to generate nice warning and error
-                # messages.
-                epoch_str = "%s.%s.%s.%s [%s - %s]" % (
-                    network_code, s.code, c.location_code, c.code,
-                    c.start_date, c.end_date)
-                resp = p.get_response_for_channel(
-                    blockettes_for_channel=channel, epoch_str=epoch_str)
-            except InvalidResponseError as e:
-                if not skip_invalid_responses:
-                    raise
-                trace_id = "%s.%s.%s.%s" % (network_code, s.code,
-                                            c.location_code, c.code)
-                msg = ("Failed to calculate response for %s with epoch "
-                       "%s - %s because: %s" % (trace_id, c.start_date,
-                                                c.end_date, str(e)))
-                warnings.warn(msg)
-                resp = None
-            c.response = resp
+            trace_id = "%s.%s.%s.%s" % (network_code, s.code,
+                                        c.location_code, c.code)
+            if defer_responses:
+                c.response = _DeferredResponse(
+                    _get_response, p, channel, trace_id, c.start_date,
+                    c.end_date, skip_invalid_responses)
+            else:
+                c.response = _get_response(
+                    p, channel, trace_id, c.start_date, c.end_date,
+                    skip_invalid_responses)
 
             s.channels.append(c)
 
@@ -433,6 +442,32 @@ def _parse_to_inventory_object(p, skip_invalid_responses=True):
     return inv
 
 
+def _get_response(p, blockettes_for_channel, trace_id, start_date, end_date,
+                  skip_invalid_responses=True):
+    """
+    Calculates the response of a channel epoch from its blockettes.
+
+    :param p: A Parser object.
+    :param skip_invalid_responses: If True, invalid responses will be replaced
+        by None but a warning will be raised. Otherwise an exception will be
+        raised.
+    """
+    try:
+        # Epoch string used to generate nice warning and error
+        # messages.
+        epoch_str = "%s [%s - %s]" % (trace_id, start_date, end_date)
+        return p.get_response_for_channel(
+            blockettes_for_channel=blockettes_for_channel, epoch_str=epoch_str)
+    except InvalidResponseError as e:
+        if not skip_invalid_responses:
+            raise
+        msg = ("Failed to calculate response for %s with epoch "
+               "%s - %s because: %s" % (trace_id, start_date,
+                                        end_date, str(e)))
+        warnings.warn(msg)
+        return None
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -148,6 +148,26 @@ class CoreTestCase(unittest.TestCase):
         for f in self.xseed_files:
             _read_xseed(f)
 
+    def test_read_seed_with_deferred_responses(self):
+        """
+        Deferred responses are the same as the directly calculated ones,
+        including the warnings for invalid responses.
+        """
+        for f in self.seed_files + self.xseed_files:
+            with warnings.catch_warnings(record=True) as w:
+                warnings.simplefilter("always")
+                inv = obspy.read_inventory(f)
+            with warnings.catch_warnings(record=True) as w_deferred:
+                warnings.simplefilter("always")
+                inv_deferred = obspy.read_inventory(f, defer_responses=True)
+                # stations without creation dates are created "now"
+                self.assertEqual(
+                    [cha for net in inv_deferred for sta in net
+                     for cha in sta],
+                    [cha for net in inv for sta in net for cha in sta], f)
+            self.assertEqual([str(_i.message) for _i in w_deferred],
+                             [str(_i.message) for _i in w])
+
     def test_read_resp_metadata(self):
         """
         Manually assert that the meta-data is read correctly for all the
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Module for handling preallocated sample buffers of real time traces.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (https://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import numpy as np
+
+
+class RingBuffer(object):
+    """
+    Preallocated buffer holding the latest samples of a continuous series.
+
+    The buffer holds at most ``capacity`` samples, appending more samples
+    discards the oldest ones. Samples are stored in an array of twice the
+    capacity and are only moved to its beginning when the end of the array
+    is reached, so the buffered samples are always available as a single
+    contiguous view (:attr:`data`) without copying and appending does not
+    allocate any memory.
+
+    .. note::
+
+        Views returned by :attr:`data` and :meth:`reserve` share memory with
+        the buffer and are only valid until the next call to :meth:`reserve`
+        or :meth:`append`. Copy them if they have to be kept.
+
+    :type capacity: int
+    :param capacity: Maximum number of samples in the buffer.
+    :type dtype: :class:`numpy.dtype`
+    :param dtype: Data type of the samples.
+
+    .. rubric:: Example
+
+    >>> buf = RingBuffer(5, dtype=np.int32)
+    >>> buf.append(np.arange(4, dtype=np.int32))
+    >>> buf.data
+    array([0, 1, 2, 3], dtype=int32)
+    >>> buf.append(np.arange(10, 13, dtype=np.int32))
+    >>> buf.data
+    array([ 2,  3, 10, 11, 12], dtype=int32)
+    """
+    def __init__(self, capacity, dtype=np.float64):
+        capacity = int(capacity)
+        if capacity <= 0:
+            raise ValueError("Input capacity out of bounds: %s" % capacity)
+        self.capacity = capacity
+        self._buffer = np.empty(2 * capacity, dtype=dtype)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def dtype(self):
+        return self._buffer.dtype
+
+    @property
+    def data(self):
+        """
+        Contiguous view of the buffered samples, oldest sample first.
+        """
+        return self._buffer[self._start:self._end]
+
+    def clear(self):
+        """
+        Remove all samples from the buffer.
+        """
+        self._start = 0
+        self._end = 0
+
+    def reserve(self, npts):
+        """
+        Return a writable view for the next ``npts`` samples.
+
+        The samples have to be written into the returned view and then be
+        added to the buffer with :meth:`commit`. This allows to decode data
+        directly into the buffer.
+
+        :type npts: int
+        :param npts: Number of samples to reserve space for, at most the
+            capacity of the buffer.
+        :rtype: :class:`numpy.ndarray`
+        """
+        if npts > self.capacity:
+            msg = "Can not reserve %d samples in buffer of capacity %d"
+            raise ValueError(msg % (npts, self.capacity))
+        if self._end + npts > len(self._buffer):
+            # Move the samples that are kept after the next commit to the
+            # beginning of the buffer. Source and destination never overlap
+            # as the kept samples all lie in the second half of the array.
+            keep = min(len(self), self.capacity - npts)
+            self._buffer[:keep] = self._buffer[self._end - keep:self._end]
+            self._start = 0
+            self._end = keep
+        return self._buffer[self._end:self._end + npts]
+
+    def commit(self, npts):
+        """
+        Add ``npts`` samples written into the view returned by
+        :meth:`reserve` to the buffer.
+
+        :type npts: int
+        :param npts: Number of samples to add.
+        """
+        if self._end + npts > len(self._buffer):
+            msg = "Can not commit more samples than were reserved"
+            raise ValueError(msg)
+        self._end += npts
+        self._start = max(self._start, self._end - self.capacity)
+
+    def append(self, data):
+        """
+        Copy samples into the buffer.
+
+        :type data: :class:`numpy.ndarray`
+        :param data: Samples to append. If there are more samples than the
+            capacity of the buffer, only the latest ones are kept.
+        """
+        data = data[-self.capacity:]
+        self.reserve(len(data))[:] = data
+        self.commit(len(data))
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
@@ -21,6 +21,7 @@ from obspy import Trace
 from obspy.core import Stats
 from obspy.realtime import signal
 from obspy.realtime.rtmemory import RtMemory
+from obspy.realtime.ringbuffer import RingBuffer
 
 
 # dictionary to map given type-strings to processing functions keys must be all
@@ -48,6 +49,13 @@ class RtTrace(Trace):
 
     :type max_length: int, optional
     :param max_length: maximum trace length in seconds
+    :type ring_buffer: bool, optional
+    :param ring_buffer: Keep the samples in a preallocated
+        :class:`~obspy.realtime.ringbuffer.RingBuffer` of ``max_length``
+        seconds instead of concatenating a new data array for every appended
+        packet. :attr:`data` then is a view into the buffer which is only
+        valid until the next packet is appended, use :meth:`copy` to keep
+        it. Requires ``max_length``.
 
     .. rubric:: Example
 
@@ -129,7 +137,8 @@ class RtTrace(Trace):
             string += str(REALTIME_PROCESS_FUNCTIONS[key][0].__doc__)
         return(string)
 
-    def __init__(self, max_length=None, *args, **kwargs):  # @UnusedVariable
+    def __init__(self, max_length=None, ring_buffer=False, *args,
+                 **kwargs):  # @UnusedVariable
         """
         Initializes an RtTrace.
 
@@ -138,7 +147,13 @@ class RtTrace(Trace):
         # set window length attribute
         if max_length is not None and max_length <= 0:
             raise ValueError("Input max_length out of bounds: %s" % max_length)
+        if ring_buffer and max_length is None:
+            raise ValueError("A ring buffer requires max_length to be set")
         self.max_length = max_length
+        self.ring_buffer = ring_buffer
+        # the buffer is allocated with the first data once sampling rate and
+        # data type are known
+        self._ring = None
 
         # initialize processing list
         self.processing = []
@@ -197,70 +212,20 @@ class RtTrace(Trace):
             # only add Trace objects
             raise TypeError("Only obspy.core.trace.Trace objects are allowed")
 
-        # sanity checks
-        if self.have_appended_data:
-            #  check id
-            if self.get_id() != trace.get_id():
-                raise TypeError("Trace ID differs:", self.get_id(),
-                                trace.get_id())
-            #  check sample rate
-            if self.stats.sampling_rate != trace.stats.sampling_rate:
-                raise TypeError("Sampling rate differs:",
-                                self.stats.sampling_rate,
-                                trace.stats.sampling_rate)
-            #  check calibration factor
-            if self.stats.calib != trace.stats.calib:
-                raise TypeError("Calibration factor differs:",
-                                self.stats.calib, trace.stats.calib)
-            # check data type
-            if self.data.dtype != trace.data.dtype:
-                raise TypeError("Data type differs:",
-                                self.data.dtype, trace.data.dtype)
-        # TODO: IMPORTANT? Should improve check for gaps and overlaps
-        # and handle more elegantly
-        # check times
-        gap_or_overlap = False
-        if self.have_appended_data:
-            # delta = int(math.floor(\
-            #    round((rt.stats.starttime - lt.stats.endtime) * sr, 5) )) - 1
-            diff = trace.stats.starttime - self.stats.endtime
-            delta = diff * self.stats.sampling_rate - 1.0
+        gap_or_overlap, diff, delta = self._check_continuity(
+            trace.stats, trace.data.dtype, gap_overlap_check, verbose)
+        if self.have_appended_data and not gap_or_overlap and \
+                self._ring is None:
+            # correct start time to pin absolute trace timing to start of
+            # appended trace, this prevents slow drift of nominal trace
+            # timing from absolute time when nominal sample rate differs
+            # from true sample rate
+            self.stats.starttime = \
+                self.stats.starttime + diff - self.stats.delta
             if verbose:
-                msg = "%s: Overlap/gap of (%g) samples in data: (%s) (%s) " + \
-                    "diff=%gs  dt=%gs"
-                print(msg % (self.__class__.__name__,
-                             delta, self.stats.endtime, trace.stats.starttime,
-                             diff, self.stats.delta))
-            if delta < -0.1:
-                msg = "Overlap of (%g) samples in data: (%s) (%s) diff=%gs" + \
-                    "  dt=%gs"
-                msg = msg % (-delta, self.stats.endtime, trace.stats.starttime,
-                             diff, self.stats.delta)
-                if gap_overlap_check:
-                    raise TypeError(msg)
-                gap_or_overlap = True
-            if delta > 0.1:
-                msg = "Gap of (%g) samples in data: (%s) (%s) diff=%gs" + \
-                    "  dt=%gs"
-                msg = msg % (delta, self.stats.endtime, trace.stats.starttime,
-                             diff, self.stats.delta)
-                if gap_overlap_check:
-                    raise TypeError(msg)
-                gap_or_overlap = True
-            if gap_or_overlap:
-                msg += " - Trace processing memory will be re-initialized."
-                warnings.warn(msg, UserWarning)
-            else:
-                # correct start time to pin absolute trace timing to start of
-                # appended trace, this prevents slow drift of nominal trace
-                # timing from absolute time when nominal sample rate differs
-                # from true sample rate
-                self.stats.starttime = \
-                    self.stats.starttime + diff - self.stats.delta
-                if verbose:
-                    print("%s: self.stats.starttime adjusted by: %gs"
-                          % (self.__class__.__name__, diff -
-                             self.stats.delta))
+                print("%s: self.stats.starttime adjusted by: %gs"
+                      % (self.__class__.__name__, diff -
+                         self.stats.delta))
         # first apply all registered processing to Trace
         for proc in self.processing:
             process_name, options, rtmemory_list = proc
@@ -283,10 +248,22 @@ class RtTrace(Trace):
             trace.data = np.require(trace.data, dtype=dtype)
         # if first data, set stats
         if not self.have_appended_data:
-            self.data = np.array(trace.data)
             self.stats = Stats(header=trace.stats)
+            if self.ring_buffer:
+                self._init_ring(trace.data.dtype)
+                self._append_to_ring(trace.stats.starttime, trace.data)
+            else:
+                self.data = np.array(trace.data)
             self.have_appended_data = True
             return trace
+        if self._ring is not None:
+            data = trace.data
+            starttime = trace.stats.starttime
+            if gap_or_overlap:
+                data, starttime = self._fix_gap_or_overlap(data, starttime,
+                                                           delta)
+            self._append_to_ring(starttime, data)
+            return trace
         # handle all following data sets
         # fix Trace.__add__ parameters
         # TODO: IMPORTANT? Should check for gaps and overlaps and handle
@@ -307,6 +284,155 @@ class RtTrace(Trace):
                             fill_value=None)
         return trace
 
+    def _check_continuity(self, stats, dtype, gap_overlap_check, verbose):
+        """
+        Check that data with the given header and data type can be appended
+        to this RtTrace and whether there is a gap or overlap.
+
+        :rtype: tuple
+        :return: Whether there is a gap or overlap, the time difference
+            between the start of the new data and the end of this RtTrace and
+            the size of the gap (positive) or overlap (negative) in samples.
+        """
+        # sanity checks
+        if self.have_appended_data:
+            #  check id
+            id_ = "%(network)s.%(station)s.%(location)s.%(channel)s" % stats
+            if self.get_id() != id_:
+                raise TypeError("Trace ID differs:", self.get_id(), id_)
+            #  check sample rate
+            if self.stats.sampling_rate != stats.sampling_rate:
+                raise TypeError("Sampling rate differs:",
+                                self.stats.sampling_rate,
+                                stats.sampling_rate)
+            #  check calibration factor
+            if self.stats.calib != stats.calib:
+                raise TypeError("Calibration factor differs:",
+                                self.stats.calib, stats.calib)
+            # check data type
+            if self.data.dtype != dtype:
+                raise TypeError("Data type differs:",
+                                self.data.dtype, dtype)
+        # TODO: IMPORTANT? Should improve check for gaps and overlaps
+        # and handle more elegantly
+        # check times
+        gap_or_overlap = False
+        diff = delta = None
+        if self.have_appended_data:
+            # delta = int(math.floor(\
+            #    round((rt.stats.starttime - lt.stats.endtime) * sr, 5) )) - 1
+            diff = stats.starttime - self.stats.endtime
+            delta = diff * self.stats.sampling_rate - 1.0
+            if verbose:
+                msg = "%s: Overlap/gap of (%g) samples in data: (%s) (%s) " + \
+                    "diff=%gs  dt=%gs"
+                print(msg % (self.__class__.__name__,
+                             delta, self.stats.endtime, stats.starttime,
+                             diff, self.stats.delta))
+            if delta < -0.1:
+                msg = "Overlap of (%g) samples in data: (%s) (%s) diff=%gs" + \
+                    "  dt=%gs"
+                msg = msg % (-delta, self.stats.endtime, stats.starttime,
+                             diff, self.stats.delta)
+                if gap_overlap_check:
+                    raise TypeError(msg)
+                gap_or_overlap = True
+            if delta > 0.1:
+                msg = "Gap of (%g) samples in data: (%s) (%s) diff=%gs" + \
+                    "  dt=%gs"
+                msg = msg % (delta, self.stats.endtime, stats.starttime,
+                             diff, self.stats.delta)
+                if gap_overlap_check:
+                    raise TypeError(msg)
+                gap_or_overlap = True
+            if gap_or_overlap:
+                msg += " - Trace processing memory will be re-initialized."
+                warnings.warn(msg, UserWarning)
+        return gap_or_overlap, diff, delta
+
+    def _init_ring(self, dtype):
+        """
+        Allocate the ring buffer for ``max_length`` seconds of data.
+        """
+        capacity = int(self.max_length * self.stats.sampling_rate + 0.5)
+        self._ring = RingBuffer(max(capacity, 1), dtype=dtype)
+
+    def _update_from_ring(self, last_sample_time):
+        """
+        Point data to the samples in the ring buffer and pin the start time
+        to the time of the last appended sample.
+        """
+        self.data = self._ring.data
+        self.stats.starttime = \
+            last_sample_time - (len(self._ring) - 1) * self.stats.delta
+
+    def _append_to_ring(self, starttime, data):
+        """
+        Copy continuous data starting at ``starttime`` into the ring buffer.
+        """
+        if not len(data):
+            return
+        self._ring.append(data)
+        self._update_from_ring(starttime + (len(data) - 1) * self.stats.delta)
+
+    def _fix_gap_or_overlap(self, data, starttime, delta):
+        """
+        Make data continuous with the ring buffer. Gaps are filled with the
+        latest value, overlapping samples of the new data are discarded.
+        """
+        num = int(round(delta))
+        if num > 0:
+            fill = np.empty(num, dtype=data.dtype)
+            fill[:] = self._ring.data[-1]
+            return (np.concatenate((fill, data)),
+                    starttime - num * self.stats.delta)
+        num = min(-num, len(data))
+        return data[num:], starttime + num * self.stats.delta
+
+    def append_packet(self, packet, gap_overlap_check=False, verbose=False):
+        """
+        Appends the data of a SeedLink packet to this RtTrace.
+
+        If this RtTrace uses a ring buffer and no processing is registered,
+        the samples of the packet are decoded directly into the ring buffer
+        without creating an intermediate
+        :class:`~obspy.core.trace.Trace` object. Otherwise this is the same
+        as appending the trace of the packet with :meth:`append`.
+
+        :type packet: :class:`~obspy.clients.seedlink.slpacket.SLPacket`
+        :param packet: SeedLink data packet (or any other object providing
+            ``get_header()``, ``get_data(out=None)`` and ``get_trace()``
+            methods, see :meth:`SLPacket.get_header()
+            <obspy.clients.seedlink.slpacket.SLPacket.get_header>` for the
+            required header fields) to append to this RtTrace.
+        :type gap_overlap_check: bool, optional
+        :param gap_overlap_check: See :meth:`append`.
+        :type verbose: bool, optional
+        :param verbose: Print additional information to stdout
+        """
+        if self._ring is None or self.processing:
+            self.append(packet.get_trace(),
+                        gap_overlap_check=gap_overlap_check, verbose=verbose)
+            return
+        stats = Stats(header=packet.get_header())
+        stats.npts = stats.pop('samplecnt')
+        dtype = stats.pop('dtype')
+        gap_or_overlap, _, delta = self._check_continuity(
+            stats, dtype, gap_overlap_check, verbose)
+        if gap_or_overlap or stats.npts > self._ring.capacity:
+            data = packet.get_data()
+            starttime = stats.starttime
+            if gap_or_overlap:
+                data, starttime = self._fix_gap_or_overlap(data, starttime,
+                                                           delta)
+            self._append_to_ring(starttime, data)
+            return
+        if not stats.npts:
+            return
+        packet.get_data(out=self._ring.reserve(stats.npts))
+        self._ring.commit(stats.npts)
+        self._update_from_ring(stats.endtime)
+
     def register_rt_process(self, process, **options):
         """
         Adds real-time processing algorithm to processing list of this RtTrace.
@@ -381,6 +507,9 @@ class RtTrace(Trace):
         self.processing = []
         new = copy.deepcopy(self, *args, **kwargs)
         new.processing = temp
+        if new._ring is not None:
+            # restore data as view into the copied ring buffer
+            new.data = new._ring.data
         return new
 
 
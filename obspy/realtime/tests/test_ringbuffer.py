@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+The obspy.realtime.ringbuffer test suite.
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import io
+import unittest
+import warnings
+
+import numpy as np
+
+from obspy import Trace, UTCDateTime
+from obspy.clients.seedlink.slpacket import SLPacket
+from obspy.realtime import RtTrace
+from obspy.realtime.ringbuffer import RingBuffer
+
+
+def _make_traces(num_traces, npts=100, starttime=UTCDateTime(2018, 1, 1)):
+    """
+    Create contiguous traces of 1 Hz integer data.
+    """
+    traces = []
+    for i in range(num_traces):
+        tr = Trace(data=np.arange(i * npts, (i + 1) * npts, dtype=np.int32))
+        tr.stats.network = 'XX'
+        tr.stats.station = 'ABC'
+        tr.stats.channel = 'BHZ'
+        tr.stats.starttime = starttime + i * npts
+        traces.append(tr)
+    return traces
+
+
+def _make_packet(trace, encoding='STEIM2'):
+    """
+    Create a SeedLink packet containing a 512 byte MiniSEED record.
+    """
+    buf = io.BytesIO()
+    trace.write(buf, format='MSEED', reclen=512, encoding=encoding)
+    return SLPacket(b'SL000000' + buf.getvalue(), 0)
+
+
+class RingBufferTestCase(unittest.TestCase):
+
+    def test_append(self):
+        buf = RingBuffer(10, dtype=np.int32)
+        self.assertEqual(len(buf), 0)
+        self.assertEqual(buf.dtype, np.int32)
+        expected = np.empty(0, dtype=np.int32)
+        for i in range(20):
+            data = np.arange(i * 3, (i + 1) * 3, dtype=np.int32)
+            buf.append(data)
+            expected = np.concatenate((expected, data))[-10:]
+            np.testing.assert_array_equal(buf.data, expected)
+            self.assertTrue(buf.data.flags.c_contiguous)
+        # more samples than the capacity
+        buf.append(np.arange(25, dtype=np.int32))
+        np.testing.assert_array_equal(buf.data, np.arange(15, 25))
+        buf.clear()
+        self.assertEqual(len(buf), 0)
+
+    def test_reserve_and_commit(self):
+        buf = RingBuffer(4, dtype=np.float64)
+        # writing into the reserved view does not allocate new arrays
+        base = buf.reserve(3).base
+        for i in range(10):
+            view = buf.reserve(3)
+            self.assertIs(view.base, base)
+            view[:] = [i, i + 0.25, i + 0.5]
+            buf.commit(3)
+        np.testing.assert_array_equal(buf.data, [8.5, 9.0, 9.25, 9.5])
+        self.assertRaises(ValueError, buf.reserve, 5)
+        self.assertRaises(ValueError, RingBuffer, 0)
+
+
+class RtTraceRingBufferTestCase(unittest.TestCase):
+
+    def test_ring_buffer_requires_max_length(self):
+        self.assertRaises(ValueError, RtTrace, ring_buffer=True)
+
+    def test_append(self):
+        """
+        Appending to a ring buffer has to give the same results as appending
+        to a plain RtTrace.
+        """
+        rt_plain = RtTrace(max_length=250)
+        rt_ring = RtTrace(max_length=250, ring_buffer=True)
+        for tr in _make_traces(6):
+            rt_plain.append(tr, gap_overlap_check=True)
+            rt_ring.append(tr, gap_overlap_check=True)
+            self.assertEqual(rt_ring.stats.starttime,
+                             rt_plain.stats.starttime)
+            self.assertEqual(rt_ring.stats.npts, rt_plain.stats.npts)
+            np.testing.assert_array_equal(rt_ring.data, rt_plain.data)
+        self.assertEqual(rt_ring.stats.npts, 250)
+        self.assertEqual(rt_ring.stats.starttime,
+                         UTCDateTime(2018, 1, 1, 0, 5, 50))
+        # data is a view into the buffer
+        self.assertIs(rt_ring.data.base, rt_ring._ring.data.base)
+        copied = rt_ring.copy()
+        self.assertEqual(copied, rt_ring)
+        self.assertIs(copied.data.base, copied._ring.data.base)
+
+    def test_append_gap_and_overlap(self):
+        traces = _make_traces(3)
+        rt = RtTrace(max_length=1000, ring_buffer=True)
+        rt.append(traces[0])
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter("ignore")
+            # gap of 100 samples is filled with the latest value
+            rt.append(traces[2])
+            np.testing.assert_array_equal(rt.data[:100], np.arange(100))
+            np.testing.assert_array_equal(rt.data[100:200], 99)
+            np.testing.assert_array_equal(rt.data[200:], np.arange(200, 300))
+            # overlapping samples are discarded
+            tr = traces[2].copy()
+            tr.stats.starttime += 50
+            tr.data += 1000
+            rt.append(tr)
+        self.assertEqual(rt.stats.starttime, traces[0].stats.starttime)
+        self.assertEqual(rt.stats.endtime, tr.stats.endtime)
+        np.testing.assert_array_equal(rt.data[200:300], np.arange(200, 300))
+        np.testing.assert_array_equal(rt.data[300:], np.arange(1250, 1300))
+
+    def test_append_packet(self):
+        """
+        Packets are decoded straight into the ring buffer.
+        """
+        traces = _make_traces(5)
+        rt_plain = RtTrace(max_length=320)
+        rt_ring = RtTrace(max_length=320, ring_buffer=True)
+        for tr in traces:
+            packet = _make_packet(tr)
+            rt_plain.append_packet(packet)
+            rt_ring.append_packet(packet)
+            np.testing.assert_array_equal(rt_ring.data, rt_plain.data)
+            self.assertEqual(rt_ring.stats.starttime,
+                             rt_plain.stats.starttime)
+            self.assertEqual(rt_ring.get_id(), 'XX.ABC..BHZ')
+        self.assertEqual(len(rt_ring), 320)
+        np.testing.assert_array_equal(rt_ring.data, np.arange(180, 500))
+
+    def test_append_packet_sanity_checks(self):
+        traces = _make_traces(2)
+        rt = RtTrace(max_length=320, ring_buffer=True)
+        rt.append_packet(_make_packet(traces[0]))
+        traces[1].stats.station = 'DEF'
+        self.assertRaises(TypeError, rt.append_packet,
+                          _make_packet(traces[1]))
+
+    def test_append_packet_data_type_differs(self):
+        """
+        Packets with a different sample type are rejected before the ring
+        buffer is touched, both when they are contiguous and when there is
+        a gap.
+        """
+        traces = _make_traces(3, npts=50)
+        rt = RtTrace(max_length=320, ring_buffer=True)
+        rt.append_packet(_make_packet(traces[0]))
+        for tr in traces[1:]:
+            tr.data = tr.data.astype(np.float32)
+            packet = _make_packet(tr, encoding='FLOAT32')
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter('always')
+                self.assertRaises(TypeError, rt.append_packet, packet)
+            self.assertEqual(rt.data.dtype, np.int32)
+            self.assertEqual(rt.stats.endtime, traces[0].stats.endtime)
+            np.testing.assert_array_equal(rt.data, traces[0].data)
+            # same error as for appending the trace of the packet
+            self.assertRaises(TypeError, rt.append, packet.get_trace())
+
+
+class SLPacketDecodingTestCase(unittest.TestCase):
+
+    def test_get_header_and_data(self):
+        tr = _make_traces(1)[0]
+        packet = _make_packet(tr)
+        header = packet.get_header()
+        self.assertEqual(header['samplecnt'], 100)
+        self.assertEqual(header['starttime'], tr.stats.starttime)
+        self.assertEqual(header['sampling_rate'], 1.0)
+        self.assertEqual(header['station'], 'ABC')
+        self.assertEqual(header['dtype'], np.int32)
+        np.testing.assert_array_equal(packet.get_data(), tr.data)
+        out = np.zeros(150, dtype=np.int32)
+        data = packet.get_data(out=out)
+        self.assertIs(data.base, out)
+        np.testing.assert_array_equal(out[:100], tr.data)
+        np.testing.assert_array_equal(out[100:], 0)
+        self.assertRaises(ValueError, packet.get_data,
+                          out=np.empty(50, dtype=np.int32))
+        self.assertRaises(TypeError, packet.get_data,
+                          out=np.empty(100, dtype=np.float64))
+        tr.data = tr.data.astype(np.float64)
+        header = _make_packet(tr, encoding='FLOAT64').get_header()
+        self.assertEqual(header['dtype'], np.float64)
+
+
+def suite():
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(RingBufferTestCase, 'test'))
+    suite.addTest(unittest.makeSuite(RtTraceRingBufferTestCase, 'test'))
+    suite.addTest(unittest.makeSuite(SLPacketDecodingTestCase, 'test'))
+    return suite
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
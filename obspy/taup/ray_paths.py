@@ -15,24 +15,149 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA @UnusedWildImport
 
+import heapq
+import multiprocessing
 import warnings
 import numpy as np
 
 import obspy.geodetics.base as geodetics
+from . import travel_times
+from .taup_geo import add_geo_to_arrivals, calc_dist
+from .taup_path import TauPPath
+
+
+def _simplify_path(gcircle, xyz, tolerance=None, max_points=None):
+    """
+    Reduce the number of points of a path.
+
+    Points are selected top-down: starting from the first and the last point
+    of the path, the point with the largest distance to the current
+    simplified path is added until the largest remaining distance is smaller
+    than ``tolerance`` or ``max_points`` points are selected.
+
+    :param gcircle: Path coordinates of shape ``[3, npoints]``.
+    :param xyz: Cartesian coordinates of the path of shape ``[3, npoints]``,
+        used to measure the distances.
+    :param tolerance: Maximum allowed distance of any original point to the
+        simplified path, in units of the planet's radius.
+    :param max_points: Maximum number of points of the simplified path.
+    :returns: Contiguous array of shape ``[3, n]`` with the selected points.
+    """
+    npts = xyz.shape[1]
+    if max_points is not None and max_points < 2:
+        raise ValueError("max_points must be at least 2.")
+    if npts <= 2 or (max_points is not None and npts <= max_points and
+                     tolerance is None):
+        return np.ascontiguousarray(gcircle)
+    tolerance = tolerance or 0.0
+
+    def _push(first, last):
+        if last - first < 2:
+            return
+        start = xyz[:, first:first + 1]
+        segment = xyz[:, last:last + 1] - start
+        points = xyz[:, first + 1:last] - start
+        length = np.sum(segment ** 2)
+        if length > 0:
+            t = np.clip(np.sum(points * segment, axis=0) / length, 0, 1)
+            points = points - segment * t
+        distances = np.sqrt(np.sum(points ** 2, axis=0))
+        index = np.argmax(distances)
+        heapq.heappush(heap, (-distances[index], first, last,
+                              first + 1 + index))
+
+    heap = []
+    keep = [0, npts - 1]
+    _push(0, npts - 1)
+    while heap:
+        if max_points is not None and len(keep) >= max_points:
+            break
+        distance, first, last, index = heapq.heappop(heap)
+        if -distance <= tolerance:
+            break
+        keep.append(index)
+        _push(first, index)
+        _push(index, last)
+    return np.ascontiguousarray(gcircle[:, sorted(keep)])
+
+
+def _calc_ray_paths_for_depth(model, source_depth_in_km, pairs, phase_list,
+                              coordinate_system, max_points, tolerance):
+    """
+    Calculate ray paths for a single source depth and many source-receiver
+    pairs.
+
+    The model is depth corrected and the seismic phases are constructed only
+    once for all pairs.
+
+    :returns: A list with one entry per pair, each being a list of
+        ``(gcircle, phase_name)`` tuples sorted by travel time.
+    """
+    tp = TauPPath(model.model, phase_list, source_depth_in_km, None)
+    tp.depth_correct(source_depth_in_km)
+    tp.recalc_phases()
+    r_earth = model.model.radius_of_planet
+    results = []
+    for evlat, evlon, stlat, stlon in pairs:
+        distance = calc_dist(evlat, evlon, stlat, stlon, r_earth,
+                             model.planet_flattening)
+        tp.arrivals = []
+        tp.calculate_path(distance)
+        arrivals = sorted(tp.arrivals, key=lambda x: x.time)
+        arrivals = add_geo_to_arrivals(arrivals, evlat, evlon, stlat, stlon,
+                                       r_earth, model.planet_flattening,
+                                       resample=True)
+        paths = []
+        for arr in arrivals:
+            radii = (r_earth - arr.path['depth']) / r_earth
+            thetas = np.radians(90. - arr.path['lat'])
+            phis = np.radians(arr.path['lon'])
+
+            xyz = np.array([radii * np.sin(thetas) * np.cos(phis),
+                            radii * np.sin(thetas) * np.sin(phis),
+                            radii * np.cos(thetas)])
+            if coordinate_system == 'RTP':
+                gcircle = np.array([radii, thetas, phis])
+            if coordinate_system == 'XYZ':
+                gcircle = xyz
+
+            if max_points is not None or tolerance is not None:
+                gcircle = _simplify_path(gcircle, xyz, tolerance=tolerance,
+                                         max_points=max_points)
+            paths.append((gcircle, arr.name))
+        results.append(paths)
+    return results
+
+
+def _worker(args):
+    return _calc_ray_paths_for_depth(travel_times._WORKER_MODEL, *args)
 
 
 def get_ray_paths(inventory, catalog, phase_list=['P'],
-                  coordinate_system='XYZ', taup_model='iasp91'):
+                  coordinate_system='XYZ', taup_model='iasp91', processes=1,
+                  max_points=None, tolerance=None):
     """
     This function returns lat, lon, depth coordinates from an event
     location to all stations in the inventory object
 
+    Source-receiver pairs are grouped by source depth so that each depth
+    corrected model and its seismic phases are only computed once. The
+    groups can optionally be processed in a pool of worker processes.
+
     :param inventory: an obspy station inventory
     :param catalog: an obspy event catalog
     :param phase_list: a list of seismic phase names that is passed to taup
     :param coordinate_system: can be either 'XYZ' or 'RTP'.
     :param taup_model: the taup model for which the greatcircle paths are
                   computed
+    :param processes: number of worker processes to use. ``1`` (the default)
+        calculates everything in the current process, ``None`` uses as many
+        processes as there are CPUs.
+    :param max_points: if given, paths are simplified to at most this many
+        points, keeping the points that deviate most from a straight line.
+    :param tolerance: if given, paths are simplified by dropping points as
+        long as no point of the full path is further away from the
+        simplified path than this distance (in units of the planet's radius).
     :returns: a list of tuples
         ``[(gcircle, phase_name, station_label, event_timestamp,
         event_magnitude, event_id, origin_id), ...]``. ``gcircle`` is an array
@@ -47,20 +172,8 @@ def get_ray_paths(inventory, catalog, phase_list=['P'],
         raise ImportError('Geographiclib not found but required by ray path '
                           'routine')
 
-    stlats = []
-    stlons = []
-    stlabels = []
-    for network in inventory:
-        for station in network:
-            label_ = ".".join((network.code, station.code))
-            if station.latitude is None or station.longitude is None:
-                msg = ("Station '%s' does not have latitude/longitude "
-                       "information and will not be plotted." % label_)
-                warnings.warn(msg)
-                continue
-            stlats.append(station.latitude)
-            stlons.append(station.longitude)
-            stlabels.append(label_)
+    stlats, stlons, stlabels = \
+        travel_times._get_station_coordinates(inventory)
 
     # make a big list of event coordinates and names
     # this part should be included as a subroutine of catalog that extracts
@@ -100,39 +213,47 @@ def get_ray_paths(inventory, catalog, phase_list=['P'],
         times.append(origin.time.timestamp)
 
     # initialize taup model if it is not provided
-    if isinstance(taup_model, str):
-        from obspy.taup import TauPyModel
-        model = TauPyModel(model=taup_model)
+    model = travel_times._get_model(taup_model)
+
+    # One task per unique source depth with all source-receiver pairs of the
+    # events at that depth.
+    depths, inverse = np.unique(np.array(evdepths, dtype=np.float64),
+                                return_inverse=True)
+    tasks = []
+    for i, depth in enumerate(depths):
+        pairs = [(evlats[j], evlons[j], stlat, stlon)
+                 for j in np.nonzero(inverse == i)[0]
+                 for stlat, stlon in zip(stlats, stlons)]
+        tasks.append((float(depth), pairs, phase_list, coordinate_system,
+                      max_points, tolerance))
+
+    if processes == 1:
+        results = [_calc_ray_paths_for_depth(model, *task) for task in tasks]
     else:
-        model = taup_model
+        pool = multiprocessing.Pool(processes,
+                                    initializer=travel_times._init_worker,
+                                    initargs=(model,))
+        try:
+            results = pool.map(_worker, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    # sort the results of the depth groups back into station/event order
+    paths = {}
+    for i, result in enumerate(results):
+        event_indices = np.nonzero(inverse == i)[0]
+        for k, event_index in enumerate(event_indices):
+            for station_index in range(len(stlats)):
+                paths[(station_index, event_index)] = \
+                    result[k * len(stlats) + station_index]
 
-    # now loop through all stations and source combinations
-    r_earth = model.model.radius_of_planet
     greatcircles = []
-    for stlat, stlon, stlabel in zip(stlats, stlons, stlabels):
-        for evlat, evlon, evdepth_km, time, magnitude, event_id, origin_id \
-                in zip(evlats, evlons, evdepths, times, magnitudes, event_ids,
-                       origin_ids):
-            arrivals = model.get_ray_paths_geo(
-                    evdepth_km, evlat, evlon, stlat, stlon,
-                    phase_list=phase_list, resample=True)
-            if len(arrivals) == 0:
-                continue
-
-            for arr in arrivals:
-                radii = (r_earth - arr.path['depth']) / r_earth
-                thetas = np.radians(90. - arr.path['lat'])
-                phis = np.radians(arr.path['lon'])
-
-                if coordinate_system == 'RTP':
-                    gcircle = np.array([radii, thetas, phis])
-
-                if coordinate_system == 'XYZ':
-                    gcircle = np.array([radii * np.sin(thetas) * np.cos(phis),
-                                        radii * np.sin(thetas) * np.sin(phis),
-                                        radii * np.cos(thetas)])
-
-                greatcircles.append((gcircle, arr.name, stlabel, time,
+    for station_index, stlabel in enumerate(stlabels):
+        for event_index, (time, magnitude, event_id, origin_id) in \
+                enumerate(zip(times, magnitudes, event_ids, origin_ids)):
+            for gcircle, phase_name in paths[(station_index, event_index)]:
+                greatcircles.append((gcircle, phase_name, stlabel, time,
                                      magnitude, event_id, origin_id))
 
     return greatcircles
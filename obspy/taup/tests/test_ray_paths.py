@@ -177,6 +177,84 @@ class RayPathCalculationsTestCase(unittest.TestCase):
         np.testing.assert_allclose(path[:, ::10], path_steps_expected,
                                    rtol=1e-6)
 
+    def _get_inventory_and_catalog(self):
+        stations = [obspy.core.inventory.Station(
+            code='STA%d' % i, latitude=lat, longitude=lon, elevation=0.)
+            for i, (lat, lon) in enumerate([(0., 30.), (20., 10.)])]
+        network = obspy.core.inventory.Network(code='NET', stations=stations)
+        inventory = obspy.core.inventory.Inventory(source='ME',
+                                                   networks=[network])
+        events = []
+        for i, (lat, lon, depth) in enumerate([(0., 90., 100e3),
+                                               (10., 80., 10e3),
+                                               (-5., 100., 100e3)]):
+            origin = obspy.core.event.Origin(
+                latitude=lat, longitude=lon, depth=depth,
+                time=obspy.UTCDateTime(2017, 2, 3, i))
+            magnitude = obspy.core.event.Magnitude(mag=5. + i)
+            events.append(obspy.core.event.Event(origins=[origin],
+                                                 magnitudes=[magnitude]))
+        catalog = obspy.core.event.Catalog(events=events)
+        return inventory, catalog
+
+    @unittest.skipIf(not geodetics.GEOGRAPHICLIB_VERSION_AT_LEAST_1_34,
+                     'test needs geographiclib >= 1.34')
+    def test_compute_ray_paths_processes(self):
+        """
+        Using a process pool must not change the results or their order.
+        """
+        inventory, catalog = self._get_inventory_and_catalog()
+        kwargs = dict(phase_list=['P', 'S'], coordinate_system='RTP',
+                      taup_model='iasp91')
+        serial = get_ray_paths(inventory, catalog, processes=1, **kwargs)
+        parallel = get_ray_paths(inventory, catalog, processes=2, **kwargs)
+        self.assertEqual(len(serial), 12)
+        self.assertEqual(len(serial), len(parallel))
+        for circ_serial, circ_parallel in zip(serial, parallel):
+            self.assertEqual(circ_serial[1:], circ_parallel[1:])
+            np.testing.assert_array_equal(circ_serial[0], circ_parallel[0])
+        # stations are the outer loop, events the inner loop
+        self.assertEqual([circ[2] for circ in serial],
+                         ['NET.STA0'] * 6 + ['NET.STA1'] * 6)
+        self.assertEqual([circ[4] for circ in serial[:6]],
+                         [5., 5., 6., 6., 7., 7.])
+
+    @unittest.skipIf(not geodetics.GEOGRAPHICLIB_VERSION_AT_LEAST_1_34,
+                     'test needs geographiclib >= 1.34')
+    def test_compute_ray_paths_simplified(self):
+        inventory, catalog = self._get_inventory_and_catalog()
+        full = get_ray_paths(inventory, catalog, phase_list=['P', 'PP'])
+        reduced = get_ray_paths(inventory, catalog, phase_list=['P', 'PP'],
+                                max_points=20)
+        tolerance = 1e-3
+        simplified = get_ray_paths(inventory, catalog,
+                                   phase_list=['P', 'PP'],
+                                   tolerance=tolerance)
+        self.assertEqual(len(full), len(reduced))
+        self.assertEqual(len(full), len(simplified))
+        for circ_full, circ_reduced, circ_simplified in zip(full, reduced,
+                                                            simplified):
+            self.assertEqual(circ_full[1:], circ_reduced[1:])
+            path = circ_full[0]
+            for simple in (circ_reduced[0], circ_simplified[0]):
+                self.assertTrue(simple.flags['C_CONTIGUOUS'])
+                # start and end points are always kept
+                np.testing.assert_array_equal(simple[:, 0], path[:, 0])
+                np.testing.assert_array_equal(simple[:, -1], path[:, -1])
+            self.assertEqual(circ_reduced[0].shape, (3, 20))
+            self.assertLess(circ_simplified[0].shape[1], path.shape[1])
+            # all points of the full path are within the tolerance of the
+            # simplified path
+            simple = circ_simplified[0]
+            for point in path.T:
+                a = simple[:, :-1].T
+                ab = simple[:, 1:].T - a
+                t = np.clip(np.sum((point - a) * ab, axis=1) /
+                            np.sum(ab ** 2, axis=1), 0, 1)
+                distances = np.linalg.norm(point - a - ab * t[:, None],
+                                           axis=1)
+                self.assertLessEqual(distances.min(), tolerance + 1e-12)
+
 
 def suite():
     return unittest.makeSuite(RayPathCalculationsTestCase, 'test')
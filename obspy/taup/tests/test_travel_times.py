@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+import unittest
+import warnings
+
+import obspy
+from obspy.taup import TauPyModel
+from obspy.taup.travel_times import get_travel_times, get_travel_times_many
+
+
+class TravelTimesTestCase(unittest.TestCase):
+    """
+    Test suite for obspy.taup.travel_times
+    """
+    def setUp(self):
+        self.model = TauPyModel("iasp91")
+        self.stations = [(0.0, 30.0), (10.0, 40.0), (-20.0, 100.0)]
+        # two sources share a depth and thus end up in the same group
+        self.sources = [(100.0, 0.0, 90.0), (10.0, 5.0, 5.0),
+                        (100.0, -10.0, 60.0)]
+
+    def _get_inventory_and_catalog(self):
+        stations = [obspy.core.inventory.Station(
+            code='STA%d' % i, latitude=lat, longitude=lon, elevation=0.0)
+            for i, (lat, lon) in enumerate(self.stations)]
+        network = obspy.core.inventory.Network(code='NET', stations=stations)
+        inventory = obspy.core.inventory.Inventory(source='ME',
+                                                   networks=[network])
+        otime = obspy.UTCDateTime('2017-02-03T12:00:00.0Z')
+        events = []
+        for i, (depth, lat, lon) in enumerate(self.sources):
+            origin = obspy.core.event.Origin(
+                latitude=lat, longitude=lon, depth=depth * 1e3, time=otime,
+                resource_id='smi:local/origin%d' % i)
+            events.append(obspy.core.event.Event(
+                origins=[origin], resource_id='smi:local/event%d' % i))
+        catalog = obspy.core.event.Catalog(events=events)
+        return inventory, catalog, otime
+
+    def test_get_travel_times_many(self):
+        """
+        Results have to match the single pair calculations.
+        """
+        depths, evlats, evlons = zip(*self.sources)
+        stlats, stlons = zip(*self.stations)
+        times = get_travel_times_many(depths, evlats, evlons, stlats, stlons,
+                                      phase_list=["P", "S", "PcP"],
+                                      taup_model=self.model)
+        self.assertEqual(len(times), len(self.sources))
+        for i, (depth, evlat, evlon) in enumerate(self.sources):
+            self.assertEqual(len(times[i]), len(self.stations))
+            for j, (stlat, stlon) in enumerate(self.stations):
+                expected = self.model.get_travel_times_geo(
+                    depth, evlat, evlon, stlat, stlon,
+                    phase_list=["P", "S", "PcP"])
+                self.assertEqual(len(times[i][j]), len(expected))
+                for (name, time), arr in zip(times[i][j], expected):
+                    self.assertEqual(name, arr.name)
+                    self.assertAlmostEqual(time, arr.time, places=6)
+
+    def test_get_travel_times_many_processes(self):
+        """
+        Running in a process pool must not change the results.
+        """
+        depths, evlats, evlons = zip(*self.sources)
+        stlats, stlons = zip(*self.stations)
+        kwargs = dict(phase_list=["P", "S"], taup_model="iasp91")
+        serial = get_travel_times_many(depths, evlats, evlons, stlats, stlons,
+                                       processes=1, **kwargs)
+        parallel = get_travel_times_many(depths, evlats, evlons, stlats,
+                                         stlons, processes=2, **kwargs)
+        self.assertEqual(serial, parallel)
+
+    def test_get_travel_times_many_invalid_input(self):
+        with self.assertRaises(ValueError):
+            get_travel_times_many([10.0], [0.0, 1.0], [0.0], [0.0], [0.0])
+        with self.assertRaises(ValueError):
+            get_travel_times_many([10.0], [0.0], [0.0], [0.0], [0.0, 1.0])
+
+    def test_get_travel_times(self):
+        inventory, catalog, otime = self._get_inventory_and_catalog()
+        arrivals = get_travel_times(inventory, catalog, phase_list=["P"],
+                                    taup_model=self.model)
+        expected_count = sum(
+            len(self.model.get_travel_times_geo(
+                depth, evlat, evlon, stlat, stlon, phase_list=["P"]))
+            for depth, evlat, evlon in self.sources
+            for stlat, stlon in self.stations)
+        self.assertEqual(len(arrivals), expected_count)
+        arrival_time, phase_name, station_label, travel_time, distance, \
+            event_id, origin_id = arrivals[0]
+        expected = self.model.get_travel_times_geo(
+            100.0, 0.0, 90.0, 0.0, 30.0, phase_list=["P"])[0]
+        self.assertEqual(phase_name, "P")
+        self.assertEqual(station_label, "NET.STA0")
+        self.assertAlmostEqual(travel_time, expected.time, places=6)
+        self.assertAlmostEqual(distance, 60.0, places=6)
+        self.assertEqual(arrival_time, otime + expected.time)
+        self.assertEqual(event_id, "smi:local/event0")
+        self.assertEqual(origin_id, "smi:local/origin0")
+        # events are the outer loop, stations the inner loop
+        self.assertEqual([arr[5] for arr in arrivals],
+                         sorted(arr[5] for arr in arrivals))
+
+    def test_get_travel_times_skips_events_without_origin(self):
+        inventory, catalog, _ = self._get_inventory_and_catalog()
+        catalog[1].origins = []
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            arrivals = get_travel_times(inventory, catalog, phase_list=["P"],
+                                        taup_model=self.model)
+        w = [w_ for w_ in w if "does not have an origin" in str(w_.message)]
+        self.assertEqual(len(w), 1)
+        self.assertIn("smi:local/event1", str(w[0].message))
+        self.assertNotIn("smi:local/event1", [arr[5] for arr in arrivals])
+
+
+def suite():
+    return unittest.makeSuite(TravelTimesTestCase, 'test')
+
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='suite')
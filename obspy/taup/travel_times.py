@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Batch travel time calculations for many source-receiver combinations.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (http://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA @UnusedWildImport
+from future.utils import native_str
+
+import multiprocessing
+import warnings
+
+import numpy as np
+
+from obspy.geodetics import locations2degrees
+from .taup_geo import calc_dist
+from .taup_time import TauPTime
+
+
+# Model used by the worker processes of the pool. It is set once per process
+# by the pool initializer so the model does not have to be sent along with
+# every single task.
+_WORKER_MODEL = None
+
+
+def _get_model(taup_model):
+    """
+    Return a :class:`~obspy.taup.tau.TauPyModel` for a model name or an
+    already initialized model.
+    """
+    if isinstance(taup_model, (str, native_str)):
+        from obspy.taup import TauPyModel
+        return TauPyModel(model=taup_model)
+    return taup_model
+
+
+def _get_station_coordinates(inventory):
+    """
+    Extract station coordinates and labels from an inventory.
+
+    Stations without coordinates are skipped with a warning.
+
+    :returns: Station latitudes, longitudes and ``"NET.STA"`` labels.
+    """
+    latitudes = []
+    longitudes = []
+    labels = []
+    for network in inventory:
+        for station in network:
+            label_ = ".".join((network.code, station.code))
+            if station.latitude is None or station.longitude is None:
+                msg = ("Station '%s' does not have latitude/longitude "
+                       "information and will be skipped." % label_)
+                warnings.warn(msg)
+                continue
+            latitudes.append(station.latitude)
+            longitudes.append(station.longitude)
+            labels.append(label_)
+    return latitudes, longitudes, labels
+
+
+def _get_event_coordinates(catalog):
+    """
+    Extract origin coordinates of the preferred (or first) origin of each
+    event in a catalog.
+
+    Events without an origin are skipped with a warning, origins without a
+    depth are assumed to be at the surface.
+
+    :returns: Dictionary of lists with keys ``"latitudes"``, ``"longitudes"``,
+        ``"depths_in_km"``, ``"times"``, ``"event_ids"`` and ``"origin_ids"``.
+    """
+    coordinates = dict(latitudes=[], longitudes=[], depths_in_km=[],
+                       times=[], event_ids=[], origin_ids=[])
+    for event in catalog:
+        if not event.origins:
+            msg = ("Event '%s' does not have an origin and will be "
+                   "skipped." % str(event.resource_id))
+            warnings.warn(msg)
+            continue
+        origin = event.preferred_origin() or event.origins[0]
+        coordinates["latitudes"].append(origin.latitude)
+        coordinates["longitudes"].append(origin.longitude)
+        coordinates["depths_in_km"].append((origin.depth or 0.0) * 1e-3)
+        coordinates["times"].append(origin.time)
+        coordinates["event_ids"].append(str(event.resource_id))
+        coordinates["origin_ids"].append(str(origin.resource_id))
+    return coordinates
+
+
+def _distance_matrix(source_latitudes, source_longitudes,
+                     receiver_latitudes, receiver_longitudes,
+                     radius_of_planet_in_km, flattening_of_planet):
+    """
+    Epicentral distances in degrees for all source-receiver combinations as
+    an array of shape ``(number of sources, number of receivers)``.
+    """
+    source_latitudes = np.asarray(source_latitudes, dtype=np.float64)
+    source_longitudes = np.asarray(source_longitudes, dtype=np.float64)
+    receiver_latitudes = np.asarray(receiver_latitudes, dtype=np.float64)
+    receiver_longitudes = np.asarray(receiver_longitudes, dtype=np.float64)
+    if flattening_of_planet == 0.0:
+        # On a sphere the great circle distance can be computed for all
+        # combinations at once.
+        return locations2degrees(source_latitudes[:, np.newaxis],
+                                 source_longitudes[:, np.newaxis],
+                                 receiver_latitudes[np.newaxis, :],
+                                 receiver_longitudes[np.newaxis, :])
+    distances = np.empty((len(source_latitudes), len(receiver_latitudes)),
+                         dtype=np.float64)
+    for i, (evlat, evlon) in enumerate(zip(source_latitudes,
+                                           source_longitudes)):
+        for j, (stlat, stlon) in enumerate(zip(receiver_latitudes,
+                                               receiver_longitudes)):
+            distances[i, j] = calc_dist(evlat, evlon, stlat, stlon,
+                                        radius_of_planet_in_km,
+                                        flattening_of_planet)
+    return distances
+
+
+def _calc_travel_times_for_depth(model, source_depth_in_km, distances,
+                                 phase_list):
+    """
+    Calculate travel times for a single source depth and many distances.
+
+    The model is depth corrected and the seismic phases are constructed only
+    once, which is by far the most expensive part of the calculation.
+
+    :returns: A list with one entry per distance, each being a list of
+        ``(phase_name, travel_time)`` tuples sorted by travel time.
+    """
+    tt = TauPTime(model.model, phase_list, source_depth_in_km, None)
+    tt.depth_correct(source_depth_in_km)
+    tt.recalc_phases()
+    results = []
+    for distance in distances:
+        tt.calc_time(float(distance))
+        results.append([(arr.name, arr.time) for arr in tt.arrivals])
+    return results
+
+
+def _init_worker(taup_model):
+    global _WORKER_MODEL
+    _WORKER_MODEL = _get_model(taup_model)
+
+
+def _worker(args):
+    return _calc_travel_times_for_depth(_WORKER_MODEL, *args)
+
+
+def get_travel_times_many(source_depths_in_km, source_latitudes,
+                          source_longitudes, receiver_latitudes,
+                          receiver_longitudes, phase_list=("ttall",),
+                          taup_model="iasp91", processes=1):
+    """
+    Calculate travel times for all combinations of the given sources and
+    receivers.
+
+    Sources are grouped by depth so that each depth corrected model and its
+    seismic phases are only computed once for all receivers of all sources at
+    that depth. The groups can optionally be processed in a pool of worker
+    processes.
+
+    :param source_depths_in_km: Source depths in km.
+    :type source_depths_in_km: list of float or :class:`numpy.ndarray`
+    :param source_latitudes: Source latitudes in degrees.
+    :type source_latitudes: list of float or :class:`numpy.ndarray`
+    :param source_longitudes: Source longitudes in degrees.
+    :type source_longitudes: list of float or :class:`numpy.ndarray`
+    :param receiver_latitudes: Receiver latitudes in degrees.
+    :type receiver_latitudes: list of float or :class:`numpy.ndarray`
+    :param receiver_longitudes: Receiver longitudes in degrees.
+    :type receiver_longitudes: list of float or :class:`numpy.ndarray`
+    :param phase_list: List of phases for which travel times should be
+        calculated.
+    :type phase_list: list of str
+    :param taup_model: Model name or an already initialized model.
+    :type taup_model: str or :class:`~obspy.taup.tau.TauPyModel`
+    :param processes: Number of worker processes to use. ``1`` (the
+        default) calculates everything in the current process, ``None`` uses
+        as many processes as there are CPUs.
+    :type processes: int
+    :returns: Nested list ``times[i][j]`` with a list of
+        ``(phase_name, travel_time)`` tuples, sorted by travel time, for
+        source ``i`` and receiver ``j``.
+
+    >>> times = get_travel_times_many(
+    ...     [10.0, 10.0], [0.0, 10.0], [0.0, 10.0], [0.0], [20.0],
+    ...     phase_list=["P"])
+    >>> print("%s %.2f" % times[0][0][0])
+    P 272.68
+    """
+    source_depths_in_km = np.asarray(source_depths_in_km, dtype=np.float64)
+    if not (len(source_depths_in_km) == len(source_latitudes) ==
+            len(source_longitudes)):
+        msg = "Source depths, latitudes and longitudes must have equal length."
+        raise ValueError(msg)
+    if len(receiver_latitudes) != len(receiver_longitudes):
+        msg = "Receiver latitudes and longitudes must have equal length."
+        raise ValueError(msg)
+
+    model = _get_model(taup_model)
+    distances = _distance_matrix(source_latitudes, source_longitudes,
+                                 receiver_latitudes, receiver_longitudes,
+                                 model.model.radius_of_planet,
+                                 model.planet_flattening)
+    return _calc_travel_times(model, source_depths_in_km, distances,
+                              phase_list, processes)
+
+
+def _calc_travel_times(model, source_depths_in_km, distances, phase_list,
+                       processes):
+    """
+    Calculate travel times for a matrix of epicentral distances of shape
+    ``(number of sources, number of receivers)``.
+
+    See :func:`get_travel_times_many` for the meaning of the parameters and
+    the returned values.
+    """
+    # One task per unique source depth containing the distances to all
+    # receivers of all sources at that depth.
+    depths, inverse = np.unique(source_depths_in_km, return_inverse=True)
+    tasks = []
+    for i, depth in enumerate(depths):
+        tasks.append((float(depth), distances[inverse == i].ravel(),
+                      phase_list))
+
+    if processes == 1:
+        results = [_calc_travel_times_for_depth(model, *task)
+                   for task in tasks]
+    else:
+        pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                    initargs=(model,))
+        try:
+            results = pool.map(_worker, tasks, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+    # Scatter the results of the depth groups back to source/receiver order.
+    num_receivers = distances.shape[1]
+    times = [None] * len(source_depths_in_km)
+    for i, result in enumerate(results):
+        for k, source_index in enumerate(np.nonzero(inverse == i)[0]):
+            times[source_index] = \
+                result[k * num_receivers:(k + 1) * num_receivers]
+    return times
+
+
+def get_travel_times(inventory, catalog, phase_list=("ttall",),
+                     taup_model="iasp91", processes=1):
+    """
+    Calculate predicted arrival times for all event-station combinations.
+
+    The preferred origin (or the first origin if no preferred origin is set)
+    of each event is used as the source location. See
+    :func:`get_travel_times_many` for details on how the calculation is
+    organized.
+
+    :param inventory: Station inventory.
+    :type inventory: :class:`~obspy.core.inventory.inventory.Inventory`
+    :param catalog: Event catalog.
+    :type catalog: :class:`~obspy.core.event.Catalog`
+    :param phase_list: List of phases for which travel times should be
+        calculated.
+    :type phase_list: list of str
+    :param taup_model: Model name or an already initialized model.
+    :type taup_model: str or :class:`~obspy.taup.tau.TauPyModel`
+    :param processes: Number of worker processes to use. ``1`` (the
+        default) calculates everything in the current process, ``None`` uses
+        as many processes as there are CPUs.
+    :type processes: int
+    :returns: A list of tuples
+        ``[(arrival_time, phase_name, station_label, travel_time,
+        distance_in_degree, event_id, origin_id), ...]``. ``arrival_time`` is
+        the predicted absolute arrival time as a
+        :class:`~obspy.core.utcdatetime.UTCDateTime`, ``travel_time`` the
+        travel time in seconds and ``station_label`` the network and station
+        code of the receiver. ``event_id`` and ``origin_id`` describe the
+        event and origin that belong to the arrival.
+
+    >>> from obspy import read_events, read_inventory
+    >>> from obspy.taup.travel_times import get_travel_times
+    >>> inv = read_inventory()
+    >>> cat = read_events()
+    >>> arrivals = get_travel_times(inv, cat, phase_list=["P", "S"])
+    >>> print(len(arrivals))
+    116
+    >>> print(arrivals[0][0], arrivals[0][1], arrivals[0][2])
+    2012-04-04T14:30:16.322582Z P GR.FUR
+    """
+    stlats, stlons, stlabels = _get_station_coordinates(inventory)
+    events = _get_event_coordinates(catalog)
+
+    model = _get_model(taup_model)
+    distances = _distance_matrix(events["latitudes"], events["longitudes"],
+                                 stlats, stlons, model.model.radius_of_planet,
+                                 model.planet_flattening)
+    times = _calc_travel_times(model, events["depths_in_km"], distances,
+                               phase_list, processes)
+
+    arrivals = []
+    for i, origin_time in enumerate(events["times"]):
+        for j, stlabel in enumerate(stlabels):
+            for phase_name, travel_time in times[i][j]:
+                arrivals.append((origin_time + travel_time, phase_name,
+                                 stlabel, travel_time, float(distances[i, j]),
+                                 events["event_ids"][i],
+                                 events["origin_ids"][i]))
+    return arrivals
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
@@ -170,11 +170,13 @@ ENTRY_POINTS = {
         ],
     'obspy.plugin.waveform.TSPAIR': [
         'isFormat = obspy.io.ascii.core:_is_tspair',
+        'sniffFormat = obspy.io.ascii.core:_sniff_ascii',
         'readFormat = obspy.io.ascii.core:_read_tspair',
         'writeFormat = obspy.io.ascii.core:_write_tspair',
         ],
     'obspy.plugin.waveform.SLIST': [
         'isFormat = obspy.io.ascii.core:_is_slist',
+        'sniffFormat = obspy.io.ascii.core:_sniff_ascii',
         'readFormat = obspy.io.ascii.core:_read_slist',
         'writeFormat = obspy.io.ascii.core:_write_slist',
         ],
@@ -201,15 +203,18 @@ ENTRY_POINTS = {
         ],
     'obspy.plugin.waveform.GSE1': [
         'isFormat = obspy.io.gse2.core:_is_gse1',
+        'sniffFormat = obspy.io.gse2.core:_sniff_gse1',
         'readFormat = obspy.io.gse2.core:_read_gse1',
         ],
     'obspy.plugin.waveform.GSE2': [
         'isFormat = obspy.io.gse2.core:_is_gse2',
+        'sniffFormat = obspy.io.gse2.core:_sniff_gse2',
         'readFormat = obspy.io.gse2.core:_read_gse2',
         'writeFormat = obspy.io.gse2.core:_write_gse2',
         ],
     'obspy.plugin.waveform.MSEED': [
         'isFormat = obspy.io.mseed.core:_is_mseed',
+        'sniffFormat = obspy.io.mseed.core:_sniff_mseed',
         'readFormat = obspy.io.mseed.core:_read_mseed',
         'writeFormat = obspy.io.mseed.core:_write_mseed',
         ],
@@ -219,6 +224,7 @@ ENTRY_POINTS = {
         ],
     'obspy.plugin.waveform.SAC': [
         'isFormat = obspy.io.sac.core:_is_sac',
+        'sniffFormat = obspy.io.sac.core:_sniff_sac',
         'readFormat = obspy.io.sac.core:_read_sac',
         'writeFormat = obspy.io.sac.core:_write_sac',
         ],
@@ -229,6 +235,7 @@ ENTRY_POINTS = {
         ],
     'obspy.plugin.waveform.SEG2': [
         'isFormat = obspy.io.seg2.seg2:_is_seg2',
+        'sniffFormat = obspy.io.seg2.seg2:_sniff_seg2',
         'readFormat = obspy.io.seg2.seg2:_read_seg2',
         ],
     'obspy.plugin.waveform.SEGY': [
@@ -243,20 +250,24 @@ ENTRY_POINTS = {
         ],
     'obspy.plugin.waveform.SEISAN': [
         'isFormat = obspy.io.seisan.core:_is_seisan',
+        'sniffFormat = obspy.io.seisan.core:_sniff_seisan',
         'readFormat = obspy.io.seisan.core:_read_seisan',
         ],
     'obspy.plugin.waveform.Q': [
         'isFormat = obspy.io.sh.core:_is_q',
+        'sniffFormat = obspy.io.sh.core:_sniff_q',
         'readFormat = obspy.io.sh.core:_read_q',
         'writeFormat = obspy.io.sh.core:_write_q',
         ],
     'obspy.plugin.waveform.SH_ASC': [
         'isFormat = obspy.io.sh.core:_is_asc',
+        'sniffFormat = obspy.io.sh.core:_sniff_asc',
         'readFormat = obspy.io.sh.core:_read_asc',
         'writeFormat = obspy.io.sh.core:_write_asc',
         ],
     'obspy.plugin.waveform.WAV': [
         'isFormat = obspy.io.wav.core:_is_wav',
+        'sniffFormat = obspy.io.wav.core:_sniff_wav',
         'readFormat = obspy.io.wav.core:_read_wav',
         'writeFormat = obspy.io.wav.core:_write_wav',
         ],
@@ -303,14 +314,18 @@ ENTRY_POINTS = {
         'FNETMT = obspy.io.nied.fnetmt',
         'GSE2 = obspy.io.gse2.bulletin',
         'IMS10BULLETIN = obspy.io.iaspei.core',
+        'COLUMNAR = obspy.io.columnar.core',
         ],
     'obspy.plugin.event.QUAKEML': [
         'isFormat = obspy.io.quakeml.core:_is_quakeml',
+        'sniffFormat = obspy.io.quakeml.core:_sniff_quakeml',
         'readFormat = obspy.io.quakeml.core:_read_quakeml',
         'writeFormat = obspy.io.quakeml.core:_write_quakeml',
+        'iterFormat = obspy.io.quakeml.core:iter_events',
         ],
     'obspy.plugin.event.SC3ML': [
         'isFormat = obspy.io.seiscomp.core:_is_sc3ml',
+        'sniffFormat = obspy.io.seiscomp.core:_sniff_sc3ml',
         'readFormat = obspy.io.seiscomp.event:_read_sc3ml',
         'writeFormat = obspy.io.seiscomp.event:_write_sc3ml',
         ],
@@ -373,6 +388,12 @@ ENTRY_POINTS = {
         'isFormat = obspy.io.iaspei.core:_is_ims10_bulletin',
         'readFormat = obspy.io.iaspei.core:_read_ims10_bulletin',
         ],
+    'obspy.plugin.event.COLUMNAR': [
+        'isFormat = obspy.io.columnar.core:_is_columnar',
+        'sniffFormat = obspy.io.columnar.core:_sniff_columnar',
+        'readFormat = obspy.io.columnar.core:_read_columnar',
+        'writeFormat = obspy.io.columnar.core:_write_columnar',
+        ],
     'obspy.plugin.inventory': [
         'STATIONXML = obspy.io.stationxml.core',
         'INVENTORYXML = obspy.io.arclink.inventory',
@@ -388,15 +409,18 @@ ENTRY_POINTS = {
         ],
     'obspy.plugin.inventory.STATIONXML': [
         'isFormat = obspy.io.stationxml.core:_is_stationxml',
+        'sniffFormat = obspy.io.stationxml.core:_sniff_stationxml',
         'readFormat = obspy.io.stationxml.core:_read_stationxml',
         'writeFormat = obspy.io.stationxml.core:_write_stationxml',
         ],
     'obspy.plugin.inventory.INVENTORYXML': [
         'isFormat = obspy.io.arclink.inventory:_is_inventory_xml',
+        'sniffFormat = obspy.io.arclink.inventory:_sniff_inventory_xml',
         'readFormat = obspy.io.arclink.inventory:_read_inventory_xml',
         ],
     'obspy.plugin.inventory.SC3ML': [
         'isFormat = obspy.io.seiscomp.core:_is_sc3ml',
+        'sniffFormat = obspy.io.seiscomp.core:_sniff_sc3ml',
         'readFormat = obspy.io.seiscomp.inventory:_read_sc3ml',
         ],
     'obspy.plugin.inventory.SACPZ': [